@@ -1,7 +1,7 @@
 # src/app.py
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QTextEdit, QPushButton, QLabel, QMessageBox,
-                             QScrollArea, QFrame)
+                             QScrollArea, QFrame, QFileDialog, QDockWidget)
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
@@ -15,6 +15,14 @@ try:
     from .core.partida import Partida
     # Asume que ArbolBinarioPartida está en src/tree/arbol_partida.py
     from .tree.arbol_partida import ArbolBinarioPartida
+    # Reproducción de la partida para mostrar la posición (FEN) del nodo seleccionado.
+    from .core.reproduccion import ReproduccionPartida
+    # Resaltado de turnos y jugadas válidas/inválidas en el editor mientras se escribe.
+    from .ui.resaltador_san import ResaltadorSAN
+    # Lista virtualizada de las partidas de un archivo con muchas partidas.
+    from .ui.navegador_partidas import NavegadorPartidas
+    # Deshacer/rehacer entre análisis con turnos y árboles compartidos entre versiones.
+    from .core.historial import HistorialEdicion
     # Podría ser necesario para type hinting o si se instancia directamente.
     # from .tree.nodo_arbol import NodoArbol
 except ImportError as e:
@@ -22,6 +30,10 @@ except ImportError as e:
     print("Usando placeholders para las clases no encontradas. Asegúrese de que la estructura del proyecto y PYTHONPATH sean correctos.")
     # Placeholders para el caso de que las importaciones fallen.
     # Esto es principalmente para desarrollo y no debería ocurrir en la aplicación final.
+    ReproduccionPartida = None # Sin reproducción, al seleccionar un nodo no se muestra su posición.
+    ResaltadorSAN = None # Sin resaltado, el editor muestra el texto plano.
+    NavegadorPartidas = None # Sin navegador, no se pueden abrir archivos de partidas.
+    HistorialEdicion = None # Sin historial, no se puede deshacer un análisis.
     class TreeVisualizerWidget(QWidget):
         def __init__(self, parent=None):
             super().__init__(parent)
@@ -29,7 +41,7 @@ except ImportError as e:
             layout = QHBoxLayout(self)
             layout.addWidget(self.placeholder_label)
             self.placeholder_label.setAlignment(Qt.AlignCenter)
-        def set_tree_data(self, root_node):
+        def set_tree_data(self, root_node, layout=None, num_nodos=None):
             if hasattr(self, 'placeholder_label'):
                 self.placeholder_label.setText(f"TreeVisualizer Placeholder: set_tree_data con nodo raíz: {root_node.valor if root_node else 'None'}")
             print(f"TreeVisualizer Placeholder (app.py): set_tree_data con nodo raíz: {root_node.valor if root_node else 'None'}")
@@ -96,6 +108,9 @@ class AplicacionAjedrezGUI(QMainWindow):
         self._crear_boton_analisis()
         self._crear_etiqueta_estado()
         self._crear_visualizador_arbol()
+        self.reproduccion = None # ReproduccionPartida de la última partida válida analizada.
+        self.historial = HistorialEdicion() if HistorialEdicion is not None else None
+        self._actualizar_botones_historial()
 
         self.show() # Mostrar la ventana principal al inicializar.
 
@@ -109,6 +124,8 @@ class AplicacionAjedrezGUI(QMainWindow):
         self.san_text_edit.setFixedHeight(120)
         self.san_text_edit.setFont(QFont("Consolas", 10))
         self.main_layout.addWidget(self.san_text_edit)
+        # Se guarda la referencia: el resaltador deja de actuar si se destruye.
+        self.resaltador_san = ResaltadorSAN(self.san_text_edit.document()) if ResaltadorSAN is not None else None
         
         # Ejemplo de partida para pruebas rápidas.
         self.san_text_edit.setText(
@@ -131,7 +148,27 @@ class AplicacionAjedrezGUI(QMainWindow):
             "QPushButton:pressed { background-color: #3e8e41; }"
         )
         self.analyze_button.clicked.connect(self._on_analyze_clicked)
-        self.main_layout.addWidget(self.analyze_button)
+
+        self.open_file_button = QPushButton("Abrir archivo de partidas...")
+        self.open_file_button.setFixedHeight(40)
+        self.open_file_button.clicked.connect(self._on_open_file_clicked)
+        self.open_file_button.setEnabled(NavegadorPartidas is not None)
+        self.navegador_dock = None # QDockWidget con el NavegadorPartidas del archivo abierto.
+
+        # Deshacer/rehacer recorren las partidas válidas analizadas (no las ediciones de texto).
+        self.undo_button = QPushButton("Deshacer análisis")
+        self.undo_button.setFixedHeight(40)
+        self.undo_button.clicked.connect(self._on_undo_clicked)
+        self.redo_button = QPushButton("Rehacer análisis")
+        self.redo_button.setFixedHeight(40)
+        self.redo_button.clicked.connect(self._on_redo_clicked)
+
+        botones_layout = QHBoxLayout()
+        botones_layout.addWidget(self.analyze_button, 3)
+        botones_layout.addWidget(self.undo_button, 1)
+        botones_layout.addWidget(self.redo_button, 1)
+        botones_layout.addWidget(self.open_file_button, 1)
+        self.main_layout.addLayout(botones_layout)
 
     def _crear_etiqueta_estado(self):
         """Crea la etiqueta para mostrar el estado o errores."""
@@ -147,6 +184,8 @@ class AplicacionAjedrezGUI(QMainWindow):
     def _crear_visualizador_arbol(self):
         """Crea el widget para visualizar el árbol, dentro de un QScrollArea."""
         self.tree_visualizer_widget = TreeVisualizerWidget()
+        if hasattr(self.tree_visualizer_widget, 'nodo_seleccionado'):
+            self.tree_visualizer_widget.nodo_seleccionado.connect(self._on_nodo_seleccionado)
         
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
@@ -157,6 +196,107 @@ class AplicacionAjedrezGUI(QMainWindow):
         
         self.main_layout.addWidget(self.scroll_area)
 
+    def _on_nodo_seleccionado(self, nodo):
+        """Muestra en la etiqueta de estado la posición (FEN) tras la jugada del nodo pulsado."""
+        # En el árbol por niveles, el índice de cada nodo coincide con su número de ply.
+        indice = getattr(nodo, 'indice', None)
+        if self.reproduccion is None or indice is None or indice > len(self.reproduccion):
+            return
+        self.status_label.setText(f"Ply {indice} ({nodo.valor}): {self.reproduccion.fen(indice)}")
+
+    def _actualizar_botones_historial(self):
+        self.undo_button.setEnabled(self.historial is not None and self.historial.puede_deshacer())
+        self.redo_button.setEnabled(self.historial is not None and self.historial.puede_rehacer())
+
+    def _registrar_en_historial(self, texto, partida_obj, raiz_arbol):
+        """Añade la partida analizada al historial y retorna la raíz (compartida) que se debe dibujar."""
+        if self.historial is None:
+            return raiz_arbol
+        version = self.historial.registrar(texto, partida_obj, raiz_arbol)
+        self._actualizar_botones_historial()
+        return version.raiz
+
+    def _guardar_layout_version_actual(self):
+        """Guarda el layout dibujado si corresponde a la versión actual del historial."""
+        version = self.historial.version_actual
+        if version is not None and self.tree_visualizer_widget.root_node is version.raiz:
+            self.historial.guardar_layout(version, self.tree_visualizer_widget.exportar_layout())
+
+    def _on_undo_clicked(self):
+        self._guardar_layout_version_actual()
+        self._mostrar_version(self.historial.deshacer())
+
+    def _on_redo_clicked(self):
+        self._guardar_layout_version_actual()
+        self._mostrar_version(self.historial.rehacer())
+
+    def _mostrar_version(self, version):
+        """Muestra una versión del historial sin volver a analizar su texto."""
+        if version is None:
+            return
+        self.san_text_edit.setPlainText(self.historial.texto_actual)
+        self._mostrar_partida_valida(version.partida(), version.raiz, self.historial.layout(version))
+        self._actualizar_botones_historial()
+
+    def _on_open_file_clicked(self):
+        """Abre un archivo con muchas partidas en un navegador acoplado a la ventana."""
+        ruta, _ = QFileDialog.getOpenFileName(self, "Abrir archivo de partidas", "",
+                                              "Partidas SAN (*.txt *.san);;Todos los archivos (*)")
+        if ruta:
+            self.abrir_archivo_partidas(ruta)
+
+    def abrir_archivo_partidas(self, ruta):
+        """Muestra las partidas de 'ruta' en el navegador (reemplaza al archivo anterior)."""
+        try:
+            navegador = NavegadorPartidas(ruta)
+        except OSError as e:
+            QMessageBox.critical(self, "Error al abrir", f"No se pudo abrir el archivo:\n\n{e}")
+            return
+        if self.navegador_dock is None:
+            self.navegador_dock = QDockWidget("Partidas", self)
+            self.addDockWidget(Qt.LeftDockWidgetArea, self.navegador_dock)
+        else:
+            self.navegador_dock.widget().close()
+        navegador.partida_seleccionada.connect(self._on_partida_navegador_seleccionada)
+        self.navegador_dock.setWidget(navegador)
+        self.navegador_dock.show()
+
+    def _on_partida_navegador_seleccionada(self, fila):
+        """Muestra la partida elegida en el navegador, reutilizando su Partida y su árbol en caché."""
+        modelo = self.navegador_dock.widget().modelo
+        partida_obj = modelo.partida(fila)
+        self.san_text_edit.setPlainText(partida_obj.texto_original)
+        if partida_obj.es_valida_sintacticamente:
+            arbol = modelo.arbol(fila)
+            self._mostrar_partida_valida(partida_obj, arbol.raiz, num_nodos=arbol.num_nodos_lleno)
+        else:
+            self.reproduccion = None
+            self.tree_visualizer_widget.set_tree_data(None)
+            self.status_label.setText(f"Estado: Partida {fila + 1} INVÁLIDA. {partida_obj.obtener_primer_error()}")
+            self.status_label.setStyleSheet(
+                "background-color: #F8D7DA; color: #721C24; border: 1px solid #F5C6CB; padding: 5px; border-radius: 4px;"
+            )
+
+    def _mostrar_partida_valida(self, partida_obj, raiz_arbol, layout=None, num_nodos=None):
+        """Dibuja el árbol de una partida válida y prepara la consulta de posiciones."""
+        self.tree_visualizer_widget.set_tree_data(raiz_arbol, layout=layout, num_nodos=num_nodos)
+        self.status_label.setText(f"Estado: Partida VÁLIDA. Árbol generado con {len(partida_obj.turnos)} turno(s).")
+        self.status_label.setStyleSheet(
+            "background-color: #D4EDDA; color: #155724; border: 1px solid #C3E6CB; padding: 5px; border-radius: 4px;"
+        )
+
+        # Instantáneas del tablero para consultar la posición de cualquier nodo.
+        # Una partida sintácticamente válida puede contener jugadas imposibles.
+        self.reproduccion = None
+        if ReproduccionPartida is not None:
+            try:
+                self.reproduccion = ReproduccionPartida(partida_obj)
+            except ValueError as ve:
+                self.status_label.setText(f"Estado: Partida VÁLIDA, pero no se puede reproducir: {ve}")
+                self.status_label.setStyleSheet(
+                    "background-color: #FFF3CD; color: #856404; border: 1px solid #FFEEBA; padding: 5px; border-radius: 4px;"
+                )
+
     def _on_analyze_clicked(self):
         """
         Manejador del evento click del botón "Analizar Partida".
@@ -189,9 +329,10 @@ class AplicacionAjedrezGUI(QMainWindow):
 
                 arbol_constructor = ArbolBinarioPartida()
                 raiz_arbol = arbol_constructor.construir_arbol(partida_obj.turnos)
-                
-                self.tree_visualizer_widget.set_tree_data(raiz_arbol)
-                self.status_label.setText(f"Estado: Partida VÁLIDA. Árbol generado con {len(partida_obj.turnos)} turno(s).")
+                # El historial comparte con la versión anterior los nodos que no cambian.
+                raiz_arbol = self._registrar_en_historial(san_input, partida_obj, raiz_arbol)
+
+                self._mostrar_partida_valida(partida_obj, raiz_arbol, num_nodos=arbol_constructor.num_nodos_lleno)
 
             else:
                 error_msg = partida_obj.obtener_primer_error()
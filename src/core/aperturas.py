@@ -0,0 +1,342 @@
+# src/core/aperturas.py
+import hashlib
+import json
+import os
+import threading
+
+from .bnf_rules import _directorio_cache
+from .partida import tokenizar, TOKEN_JUGADA
+
+# --- Clasificación de aperturas (códigos ECO) ---
+# La tabla de aperturas es un archivo TSV con columnas eco, name y pgn (el formato de las
+# tablas a.tsv ... e.tsv de lichess-org/chess-openings, que pueden usarse directamente):
+#   C60	Ruy Lopez	1. e4 e5 2. Nf3 Nc6 3. Bb5
+# Las secuencias de jugadas se compilan a un autómata sobre tokens SAN (un trie con la
+# función de salida de Aho-Corasick precalculada): clasificar una partida es avanzar una
+# transición por jugada hasta que la partida se sale de la tabla, así que el coste depende
+# de la longitud de la apertura, no de la partida ni del tamaño de la tabla.
+
+RUTA_TABLA_ECO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "aperturas_eco.tsv")
+
+# Se incrementa cuando cambia el formato del autómata guardado en disco.
+_VERSION_FORMATO_CACHE = 1
+
+
+def normalizar_san(san):
+    """
+    Forma de una jugada con la que se comparan partida y tabla: sin jaque, mate ni
+    anotaciones ("Bb5+" -> "Bb5", "Nf3!?" -> "Nf3") y con el enroque escrito con la
+    letra O, como en PGN ("0-0" -> "O-O"; el 0 no aparece en ninguna otra jugada SAN).
+    """
+    return san.rstrip("+#!?").replace("0", "O")
+
+
+def _grafias(san):
+    """Formas en que una jugada de la tabla puede aparecer escrita en una partida."""
+    base = normalizar_san(san)
+    enroques = (base, base.replace("O", "0")) if base.startswith("O-O") else (base,)
+    return [forma + sufijo for forma in enroques for sufijo in ("", "+", "#")]
+
+
+class Apertura:
+    """
+    Una entrada de la tabla de aperturas.
+
+    Atributos:
+        eco (str): Código ECO, ej: "C60".
+        nombre (str): Nombre de la apertura, ej: "Ruy Lopez".
+        plies (int): Jugadas (plies) de la secuencia que la define.
+    """
+
+    __slots__ = ("eco", "nombre", "plies")
+
+    def __init__(self, eco, nombre, plies):
+        self.eco = eco
+        self.nombre = nombre
+        self.plies = plies
+
+    def a_dict(self):
+        """Representación serializable (ej: para una línea de resultados JSON)."""
+        return {"eco": self.eco, "nombre": self.nombre, "plies": self.plies}
+
+    def __eq__(self, otra):
+        return isinstance(otra, Apertura) and \
+            (self.eco, self.nombre, self.plies) == (otra.eco, otra.nombre, otra.plies)
+
+    def __hash__(self):
+        return hash((self.eco, self.nombre, self.plies))
+
+    def __str__(self):
+        return f"{self.eco} {self.nombre}"
+
+    def __repr__(self):
+        return f"Apertura({self.eco!r}, {self.nombre!r}, plies={self.plies})"
+
+
+class ClasificadorAperturas:
+    """
+    Clasifica partidas según su apertura: la entrada más larga de la tabla cuya secuencia
+    de jugadas es un prefijo de la partida.
+
+    Las secuencias ECO se comparan desde la primera jugada, así que el autómata solo
+    necesita la función de transición (goto) de Aho-Corasick, sin enlaces de fallo, y
+    en cada estado guarda ya la entrada más profunda de su camino: la clasificación es
+    una búsqueda en un diccionario por jugada y una lectura de lista al final.
+    """
+
+    def __init__(self, aperturas, hijos, resultado):
+        """
+        Args:
+            aperturas (list): Objetos Apertura de la tabla.
+            hijos (list): hijos[estado] es un dict jugada SAN -> estado siguiente (con una
+                          clave por cada grafía de la jugada, ver _grafias).
+            resultado (list): resultado[estado] es el índice en 'aperturas' de la entrada
+                              más larga alcanzada en ese estado, o -1.
+        """
+        self.aperturas = aperturas
+        self._hijos = hijos
+        self._resultado = resultado
+
+    @classmethod
+    def compilar(cls, filas):
+        """
+        Construye el autómata a partir de filas (eco, nombre, jugadas SAN).
+        Si dos filas tienen la misma secuencia de jugadas, cuenta la primera.
+        """
+        aperturas = []
+        hijos = [{}]
+        entrada = [-1]
+        for eco, nombre, jugadas in filas:
+            estado = 0
+            for san in jugadas:
+                siguiente = hijos[estado].get(san)
+                if siguiente is None:
+                    siguiente = len(hijos)
+                    hijos.append({})
+                    entrada.append(-1)
+                    for grafia in _grafias(san):
+                        hijos[estado][grafia] = siguiente
+                estado = siguiente
+            if jugadas and entrada[estado] == -1:
+                entrada[estado] = len(aperturas)
+                aperturas.append(Apertura(eco, nombre, len(jugadas)))
+        # Cada estado se crea después que su padre: basta una pasada en orden.
+        resultado = entrada[:]
+        for estado, destinos in enumerate(hijos):
+            for siguiente in set(destinos.values()):
+                if resultado[siguiente] == -1:
+                    resultado[siguiente] = resultado[estado]
+        return cls(aperturas, hijos, resultado)
+
+    @staticmethod
+    def leer_tabla(ruta):
+        """
+        Lee un archivo TSV de aperturas (eco, name, pgn, con o sin cabecera).
+
+        Returns:
+            list: Filas (eco, nombre, lista de jugadas SAN).
+
+        Raises:
+            ValueError: Si una línea no tiene las tres columnas o no tiene jugadas.
+        """
+        filas = []
+        with open(ruta, encoding="utf-8") as archivo:
+            for numero, linea in enumerate(archivo, 1):
+                linea = linea.rstrip("\r\n")
+                if not linea.strip() or (numero == 1 and linea.lower().startswith("eco\t")):
+                    continue
+                columnas = linea.split("\t")
+                if len(columnas) < 3:
+                    raise ValueError(f"{ruta}, línea {numero}: se esperaban las columnas eco, name y pgn.")
+                eco, nombre, pgn = columnas[0].strip(), columnas[1].strip(), columnas[2]
+                jugadas = [pgn[inicio:fin] for tipo, inicio, fin in tokenizar(pgn) if tipo == TOKEN_JUGADA]
+                if not jugadas:
+                    raise ValueError(f"{ruta}, línea {numero}: la apertura '{nombre}' no tiene jugadas.")
+                filas.append((eco, nombre, [normalizar_san(san) for san in jugadas]))
+        return filas
+
+    @classmethod
+    def desde_archivos(cls, *rutas, usar_cache=True):
+        """
+        Compila el clasificador de una o varias tablas TSV (por defecto, RUTA_TABLA_ECO).
+
+        Si usar_cache es True, el autómata se lee del disco cuando ya se compiló antes con
+        el mismo contenido de las tablas, y se guarda allí después de compilar.
+
+        Raises:
+            OSError: Si no se puede leer una tabla.
+            ValueError: Si una tabla está mal formada.
+        """
+        rutas = rutas or (RUTA_TABLA_ECO,)
+        resumen = hashlib.sha256(f"{_VERSION_FORMATO_CACHE}\n".encode("utf-8"))
+        for ruta in rutas:
+            with open(ruta, "rb") as archivo:
+                resumen.update(archivo.read())
+            resumen.update(b"\0")
+        clave = resumen.hexdigest()
+        ruta_cache = os.path.join(_directorio_cache(), f"eco_{clave[:32]}.json")
+        if usar_cache:
+            try:
+                with open(ruta_cache, encoding="utf-8") as archivo:
+                    datos = json.load(archivo)
+                if datos.get("clave") == clave:
+                    return cls([Apertura(*fila) for fila in datos["aperturas"]], datos["hijos"], datos["resultado"])
+            except (OSError, ValueError, KeyError, TypeError):
+                pass  # Sin caché válida: se compila de nuevo.
+
+        filas = []
+        for ruta in rutas:
+            filas.extend(cls.leer_tabla(ruta))
+        clasificador = cls.compilar(filas)
+        if usar_cache:
+            try:
+                os.makedirs(os.path.dirname(ruta_cache), exist_ok=True)
+                temporal = f"{ruta_cache}.{os.getpid()}.tmp"
+                with open(temporal, "w", encoding="utf-8") as archivo:
+                    json.dump({"clave": clave,
+                               "aperturas": [[a.eco, a.nombre, a.plies] for a in clasificador.aperturas],
+                               "hijos": clasificador._hijos,
+                               "resultado": clasificador._resultado}, archivo, ensure_ascii=False)
+                os.replace(temporal, ruta_cache)  # Escritura atómica.
+            except OSError:
+                pass  # La caché es solo una optimización.
+        return clasificador
+
+    def clasificar_jugadas(self, jugadas):
+        """
+        Apertura de una secuencia de jugadas SAN (iterable, se consume solo hasta que la
+        secuencia se sale de la tabla), o None si ni la primera jugada está en la tabla.
+        """
+        hijos = self._hijos
+        estado = 0
+        for san in jugadas:
+            destinos = hijos[estado]
+            siguiente = destinos.get(san)
+            if siguiente is None:
+                siguiente = destinos.get(normalizar_san(san))   # Ej: jugada con anotación "Nf3!"
+                if siguiente is None:
+                    break
+            estado = siguiente
+        indice = self._resultado[estado]
+        return self.aperturas[indice] if indice >= 0 else None
+
+    def clasificar(self, partida):
+        """
+        Apertura de una Partida, o None si la partida no es válida o no empieza por
+        ninguna apertura de la tabla.
+        """
+        if not partida.es_valida_sintacticamente:
+            return None
+        hijos = self._hijos
+        estado = 0
+        for turno in partida.turnos:
+            for jugada in (turno.jugada_blanca, turno.jugada_negra):
+                if jugada is None:
+                    break
+                destinos = hijos[estado]
+                siguiente = destinos.get(jugada.san_string)
+                if siguiente is None:
+                    siguiente = destinos.get(normalizar_san(jugada.san_string))
+                    if siguiente is None:
+                        break
+                estado = siguiente
+            else:
+                continue
+            break
+        indice = self._resultado[estado]
+        return self.aperturas[indice] if indice >= 0 else None
+
+    def clasificar_texto(self, texto):
+        """
+        Apertura del texto SAN de una partida, sin validarla ni construir la Partida: solo
+        se tokenizan las jugadas necesarias para salir de la tabla (ej: en un flujo de
+        partidas que ya se validaron aparte).
+        """
+        return self.clasificar_jugadas(
+            texto[inicio:fin] for tipo, inicio, fin in tokenizar(texto) if tipo == TOKEN_JUGADA)
+
+    def __len__(self):
+        return len(self.aperturas)
+
+    def __repr__(self):
+        return f"ClasificadorAperturas(aperturas={len(self.aperturas)}, estados={len(self._hijos)})"
+
+
+_CLASIFICADORES = {}
+_CERROJO_CLASIFICADORES = threading.Lock()
+
+
+def obtener_clasificador(*rutas, usar_cache=True):
+    """
+    Retorna el clasificador de aperturas compilado para las tablas indicadas (por defecto,
+    la tabla ECO incluida en el proyecto).
+
+    Los clasificadores se comparten dentro del proceso y entre hilos (no cambian tras
+    compilarse): cada combinación de tablas se compila (o se lee del disco) solo la
+    primera vez.
+    """
+    clave = tuple(rutas)
+    clasificador = _CLASIFICADORES.get(clave)
+    if clasificador is None:
+        with _CERROJO_CLASIFICADORES:
+            clasificador = _CLASIFICADORES.get(clave)
+            if clasificador is None:
+                clasificador = ClasificadorAperturas.desde_archivos(*rutas, usar_cache=usar_cache)
+                _CLASIFICADORES[clave] = clasificador
+    return clasificador
+
+
+# Medición del clasificador frente a comparar cada entrada de la tabla con la partida.
+# Ejecutar desde la raíz del proyecto: python -m src.core.aperturas [tabla.tsv ...]
+if __name__ == '__main__':
+    import random
+    import sys
+    import tempfile
+    import time
+    from .partida import Partida
+
+    rutas = sys.argv[1:] or [RUTA_TABLA_ECO]
+    os.environ.setdefault("AJEDREZ_CACHE_DIR", tempfile.mkdtemp())
+    inicio = time.perf_counter()
+    clasificador = ClasificadorAperturas.desde_archivos(*rutas)
+    compilacion = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    ClasificadorAperturas.desde_archivos(*rutas)
+    carga = time.perf_counter() - inicio
+    print(f"{clasificador}: compilación {compilacion * 1000:.1f} ms, carga desde la caché {carga * 1000:.1f} ms")
+
+    # Partidas que empiezan por una línea de la tabla (a veces cortada) y siguen con jugadas de relleno.
+    filas = [fila for ruta in rutas for fila in ClasificadorAperturas.leer_tabla(ruta)]
+    aleatorio = random.Random(7)
+    relleno = ["h3", "a6", "Kh1", "Kh8", "Rb1", "Rb8"] * 12
+    textos = []
+    for _ in range(20000):
+        jugadas = [san.replace("O", "0") for san in aleatorio.choice(filas)[2]]
+        jugadas = jugadas[:aleatorio.randint(1, len(jugadas))] + relleno
+        textos.append(" ".join(f"{n // 2 + 1}. {' '.join(jugadas[n:n + 2])}" for n in range(0, len(jugadas), 2)))
+    partidas = [Partida(texto) for texto in textos]
+
+    def por_recorrido(partida):
+        jugadas = [normalizar_san(j.san_string) for t in partida.turnos
+                   for j in (t.jugada_blanca, t.jugada_negra) if j]
+        mejor = None
+        for eco, nombre, secuencia in filas:
+            if jugadas[:len(secuencia)] == secuencia and (mejor is None or len(secuencia) > mejor[2]):
+                mejor = (eco, nombre, len(secuencia))
+        return mejor
+
+    for nombre, funcion, entradas in (("clasificar(Partida)", clasificador.clasificar, partidas),
+                                      ("clasificar_texto(texto)", clasificador.clasificar_texto, textos),
+                                      ("recorrido de la tabla", por_recorrido, partidas[:2000])):
+        inicio = time.perf_counter()
+        for entrada in entradas:
+            funcion(entrada)
+        duracion = time.perf_counter() - inicio
+        print(f"{nombre}: {len(entradas) / duracion:,.0f} partidas/s")
+
+    def por_automata(partida):
+        apertura = clasificador.clasificar(partida)
+        return apertura and (apertura.eco, apertura.nombre, apertura.plies)
+
+    distintas = sum(1 for partida in partidas[:2000] if por_automata(partida) != por_recorrido(partida))
+    print(f"Diferencias con el recorrido de la tabla: {distintas}")
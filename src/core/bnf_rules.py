@@ -0,0 +1,512 @@
+# src/core/bnf_rules.py
+import hashlib
+import json
+import os
+import re
+import threading
+
+# --- Carga y compilación de la gramática BNF de las jugadas SAN ---
+# La gramática se describe en un archivo .bnf (por defecto, gramatica_san.bnf junto a este
+# módulo) y se compila una sola vez a un autómata finito determinista (DFA) representado
+# como tablas de transición. Las tablas compiladas se guardan en disco, de modo que las
+# siguientes ejecuciones solo tienen que leerlas.
+
+RUTA_GRAMATICA_SAN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gramatica_san.bnf")
+
+# Se incrementa cuando cambia el formato de las tablas guardadas en disco.
+_VERSION_FORMATO_CACHE = 1
+
+# Número máximo de veredictos que un reconocedor recuerda antes de vaciar su caché.
+# El vocabulario real de jugadas es pequeño, así que casi todas las consultas aciertan.
+_LIMITE_CACHE_VEREDICTOS = 100000
+
+# Variantes de la gramática. Cada dialecto sustituye (o añade) reglas de la gramática base
+# y pueden combinarse: obtener_reconocedor("enroque_o", "anotaciones").
+DIALECTOS = {
+    "estandar": {},
+    # Enroque escrito con la letra O, como en PGN.
+    "enroque_o": {"enroque": '"O-O" | "O-O-O"'},
+    # Acepta ambas formas de enroque.
+    "enroque_mixto": {"enroque": '"0-0" | "0-0-0" | "O-O" | "O-O-O"'},
+    # Captura al paso marcada explícitamente, ej: "exd6e.p.".
+    "en_passant": {"peon_captura": '<letra> "x" <casilla> (<promocion> | "e.p.")? <jaque_mate>?'},
+    # Anotaciones de calidad de la jugada al final, ej: "Nf3!?", "Qxe6+!!".
+    "anotaciones": {
+        "jugada": ("<enroque> <anotacion>? | <movimiento_pieza> <anotacion>? "
+                   "| <peon_avance> <anotacion>? | <peon_captura> <anotacion>?"),
+        "anotacion": '"!" | "?" | "!!" | "??" | "!?" | "?!"',
+    },
+    # Letras de las piezas en español: Rey, Dama, Torre, Alfil, Caballo.
+    "espanol": {"pieza": '"R" | "D" | "T" | "A" | "C"'},
+}
+
+
+def _directorio_cache():
+    """Directorio donde se guardan las tablas compiladas (configurable con AJEDREZ_CACHE_DIR)."""
+    return os.environ.get("AJEDREZ_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "practica3_ajedrez")
+
+
+class GramaticaBNF:
+    """
+    Representa una gramática BNF (no recursiva) de jugadas SAN.
+
+    Las reglas se conservan como texto, en el orden en que aparecen, para poder derivar
+    dialectos sustituyendo reglas sueltas. La primera regla es el símbolo inicial y cada
+    una de sus alternativas define un tipo de jugada (la etiqueta es el primer no terminal
+    de la alternativa).
+    """
+
+    _PATRON_TOKEN = re.compile(r'\s*(?:(<[A-Za-z_][A-Za-z0-9_]*>)|("[^"]*")|(::=)|([|()?*+]))')
+    _PATRON_INICIO_REGLA = re.compile(r"^\s*<([A-Za-z_][A-Za-z0-9_]*)>\s*::=", re.MULTILINE)
+
+    def __init__(self, texto_bnf):
+        """
+        Inicializa la gramática a partir de su descripción textual.
+
+        Args:
+            texto_bnf (str): Reglas en formato "<nombre> ::= alternativas". Las líneas
+                             que comienzan con '#' se ignoran.
+
+        Raises:
+            ValueError: Si el texto no contiene reglas o contiene reglas duplicadas.
+        """
+        lineas = [l for l in texto_bnf.splitlines() if not l.lstrip().startswith("#")]
+        texto = "\n".join(lineas)
+        inicios = list(self._PATRON_INICIO_REGLA.finditer(texto))
+        if not inicios:
+            raise ValueError("La gramática BNF no contiene ninguna regla '<nombre> ::= ...'.")
+        if texto[:inicios[0].start()].strip():
+            raise ValueError(f"Texto inesperado antes de la primera regla: '{texto[:inicios[0].start()].strip()}'")
+
+        self.reglas = {}
+        for i, inicio in enumerate(inicios):
+            fin = inicios[i + 1].start() if i + 1 < len(inicios) else len(texto)
+            nombre = inicio.group(1)
+            if nombre in self.reglas:
+                raise ValueError(f"La regla <{nombre}> está definida más de una vez.")
+            self.reglas[nombre] = " ".join(texto[inicio.end():fin].split())
+        self.simbolo_inicial = inicios[0].group(1)
+
+    @classmethod
+    def desde_archivo(cls, ruta=RUTA_GRAMATICA_SAN):
+        """Carga una gramática desde un archivo .bnf."""
+        with open(ruta, encoding="utf-8") as archivo:
+            return cls(archivo.read())
+
+    def con_reglas(self, sustituciones):
+        """
+        Retorna una nueva gramática con algunas reglas sustituidas o añadidas.
+
+        Args:
+            sustituciones (dict): Nombre de regla (sin '<>') -> cuerpo de la regla en BNF.
+        """
+        reglas = dict(self.reglas)
+        reglas.update(sustituciones)
+        nueva = GramaticaBNF.__new__(GramaticaBNF)
+        nueva.reglas = reglas
+        nueva.simbolo_inicial = self.simbolo_inicial
+        return nueva
+
+    def texto_canonico(self):
+        """Texto normalizado de la gramática (una regla por línea), usado como clave de caché."""
+        return "\n".join(f"<{nombre}> ::= {cuerpo}" for nombre, cuerpo in self.reglas.items())
+
+    # --- Análisis del cuerpo de las reglas ---
+
+    def _tokenizar(self, nombre, cuerpo):
+        tokens = []
+        posicion = 0
+        cuerpo = cuerpo.rstrip()
+        while posicion < len(cuerpo):
+            match = self._PATRON_TOKEN.match(cuerpo, posicion)
+            if not match:
+                raise ValueError(f"Símbolo no reconocido en la regla <{nombre}>: '{cuerpo[posicion:].strip()}'")
+            no_terminal, literal, _, operador = match.groups()
+            if no_terminal:
+                tokens.append(("nt", no_terminal[1:-1]))
+            elif literal:
+                if len(literal) == 2:
+                    raise ValueError(f"Literal vacío en la regla <{nombre}>.")
+                tokens.append(("lit", literal[1:-1]))
+            elif operador:
+                tokens.append(("op", operador))
+            else:
+                raise ValueError(f"'::=' inesperado dentro de la regla <{nombre}>.")
+            posicion = match.end()
+        return tokens
+
+    def _analizar(self, nombre):
+        """Convierte el cuerpo de una regla en un árbol sintáctico de expresiones."""
+        tokens = self._tokenizar(nombre, self.reglas[nombre])
+        posicion = 0
+
+        def ver():
+            return tokens[posicion] if posicion < len(tokens) else None
+
+        def alternativas():
+            nonlocal posicion
+            opciones = [secuencia()]
+            while ver() == ("op", "|"):
+                posicion += 1
+                opciones.append(secuencia())
+            return opciones[0] if len(opciones) == 1 else ("alt", opciones)
+
+        def secuencia():
+            elementos = []
+            while ver() is not None and ver() not in (("op", "|"), ("op", ")")):
+                elementos.append(elemento())
+            if not elementos:
+                raise ValueError(f"Alternativa vacía en la regla <{nombre}>.")
+            return elementos[0] if len(elementos) == 1 else ("seq", elementos)
+
+        def elemento():
+            nonlocal posicion
+            token = ver()
+            posicion += 1
+            if token == ("op", "("):
+                nodo = alternativas()
+                if ver() != ("op", ")"):
+                    raise ValueError(f"Falta ')' en la regla <{nombre}>.")
+                posicion += 1
+            elif token[0] in ("nt", "lit"):
+                nodo = token
+            else:
+                raise ValueError(f"Operador '{token[1]}' inesperado en la regla <{nombre}>.")
+            while ver() in (("op", "?"), ("op", "*"), ("op", "+")):
+                nodo = ({"?": "opt", "*": "star", "+": "plus"}[ver()[1]], nodo)
+                posicion += 1
+            return nodo
+
+        arbol = alternativas()
+        if posicion != len(tokens):
+            raise ValueError(f"Símbolo '{tokens[posicion][1]}' inesperado en la regla <{nombre}>.")
+        return arbol
+
+    # --- Compilación ---
+
+    def compilar(self, usar_cache=True):
+        """
+        Compila la gramática a un ReconocedorSAN (tablas de un DFA).
+
+        Si usar_cache es True, las tablas se leen del disco cuando ya se compilaron antes
+        con el mismo texto de gramática, y se guardan allí después de compilar.
+
+        Raises:
+            ValueError: Si la gramática es recursiva o referencia reglas inexistentes.
+        """
+        clave = hashlib.sha256(
+            f"{_VERSION_FORMATO_CACHE}\n{self.texto_canonico()}".encode("utf-8")).hexdigest()
+        ruta_cache = os.path.join(_directorio_cache(), f"dfa_{clave[:32]}.json")
+        if usar_cache:
+            try:
+                with open(ruta_cache, encoding="utf-8") as archivo:
+                    datos = json.load(archivo)
+                if datos.get("clave") == clave:
+                    return ReconocedorSAN(datos["transiciones"], datos["etiquetas"])
+            except (OSError, ValueError, KeyError):
+                pass  # Sin caché válida: se compila de nuevo.
+
+        transiciones, etiquetas = self._construir_dfa()
+        if usar_cache:
+            try:
+                os.makedirs(os.path.dirname(ruta_cache), exist_ok=True)
+                temporal = f"{ruta_cache}.{os.getpid()}.tmp"
+                with open(temporal, "w", encoding="utf-8") as archivo:
+                    json.dump({"clave": clave, "transiciones": transiciones, "etiquetas": etiquetas}, archivo)
+                os.replace(temporal, ruta_cache)  # Escritura atómica.
+            except OSError:
+                pass  # La caché es solo una optimización.
+        return ReconocedorSAN(transiciones, etiquetas)
+
+    def _construir_dfa(self):
+        """Construye un NFA de Thompson a partir de las reglas y lo determiniza."""
+        epsilon = []   # epsilon[estado] -> lista de estados destino
+        aristas = []   # aristas[estado] -> lista de (carácter, estado destino)
+
+        def nuevo_estado():
+            epsilon.append([])
+            aristas.append([])
+            return len(epsilon) - 1
+
+        arboles = {}
+
+        def fragmento(nodo, pila):
+            tipo = nodo[0]
+            if tipo == "lit":
+                inicio = actual = nuevo_estado()
+                for caracter in nodo[1]:
+                    siguiente = nuevo_estado()
+                    aristas[actual].append((caracter, siguiente))
+                    actual = siguiente
+                return inicio, actual
+            if tipo == "nt":
+                nombre = nodo[1]
+                if nombre not in self.reglas:
+                    raise ValueError(f"La regla <{nombre}> se usa pero no está definida.")
+                if nombre in pila:
+                    raise ValueError(f"La regla <{nombre}> es recursiva; solo se admiten gramáticas regulares.")
+                if nombre not in arboles:
+                    arboles[nombre] = self._analizar(nombre)
+                return fragmento(arboles[nombre], pila | {nombre})
+            if tipo == "seq":
+                inicio, fin = fragmento(nodo[1][0], pila)
+                for hijo in nodo[1][1:]:
+                    inicio_hijo, fin_hijo = fragmento(hijo, pila)
+                    epsilon[fin].append(inicio_hijo)
+                    fin = fin_hijo
+                return inicio, fin
+            inicio, fin = nuevo_estado(), nuevo_estado()
+            if tipo == "alt":
+                for hijo in nodo[1]:
+                    inicio_hijo, fin_hijo = fragmento(hijo, pila)
+                    epsilon[inicio].append(inicio_hijo)
+                    epsilon[fin_hijo].append(fin)
+                return inicio, fin
+            inicio_hijo, fin_hijo = fragmento(nodo[1], pila)
+            epsilon[inicio].append(inicio_hijo)
+            epsilon[fin_hijo].append(fin)
+            if tipo in ("opt", "star"):
+                epsilon[inicio].append(fin)
+            if tipo in ("star", "plus"):
+                epsilon[fin_hijo].append(inicio_hijo)
+            return inicio, fin
+
+        # Cada alternativa del símbolo inicial termina en un estado de aceptación etiquetado.
+        inicial = self.simbolo_inicial
+        arbol_inicial = self._analizar(inicial)
+        alternativas = arbol_inicial[1] if arbol_inicial[0] == "alt" else [arbol_inicial]
+        estado_inicial = nuevo_estado()
+        aceptacion = {}  # estado NFA -> (prioridad, etiqueta)
+        for prioridad, alternativa in enumerate(alternativas):
+            inicio, fin = fragmento(alternativa, {inicial})
+            epsilon[estado_inicial].append(inicio)
+            aceptacion[fin] = (prioridad, self._etiqueta_alternativa(alternativa))
+
+        def clausura(estados):
+            pendientes = list(estados)
+            resultado = set(estados)
+            while pendientes:
+                for destino in epsilon[pendientes.pop()]:
+                    if destino not in resultado:
+                        resultado.add(destino)
+                        pendientes.append(destino)
+            return frozenset(resultado)
+
+        # Construcción por subconjuntos.
+        primero = clausura([estado_inicial])
+        indices = {primero: 0}
+        pendientes = [primero]
+        transiciones = [{}]
+        etiquetas = [None]
+        while pendientes:
+            conjunto = pendientes.pop()
+            indice = indices[conjunto]
+            aceptadas = [aceptacion[e] for e in conjunto if e in aceptacion]
+            etiquetas[indice] = min(aceptadas)[1] if aceptadas else None
+            destinos = {}
+            for estado in conjunto:
+                for caracter, destino in aristas[estado]:
+                    destinos.setdefault(caracter, set()).add(destino)
+            for caracter, estados in sorted(destinos.items()):
+                siguiente = clausura(estados)
+                if siguiente not in indices:
+                    indices[siguiente] = len(transiciones)
+                    transiciones.append({})
+                    etiquetas.append(None)
+                    pendientes.append(siguiente)
+                transiciones[indice][caracter] = indices[siguiente]
+        return transiciones, etiquetas
+
+    @staticmethod
+    def _etiqueta_alternativa(alternativa):
+        """Nombre con el que se reporta una alternativa del símbolo inicial."""
+        elementos = alternativa[1] if alternativa[0] == "seq" else [alternativa]
+        for elemento in elementos:
+            if elemento[0] == "nt":
+                return elemento[1]
+        return "jugada"
+
+
+def _longitud_maxima(transiciones, etiquetas):
+    """
+    Longitud de la cadena más larga que acepta el DFA, o None si no hay máximo (el DFA
+    tiene un ciclo desde el que se llega a un estado de aceptación).
+    """
+    # Estados desde los que se puede aceptar: los demás no cuentan para la longitud.
+    utiles = {estado for estado, etiqueta in enumerate(etiquetas) if etiqueta is not None}
+    cambio = True
+    while cambio:
+        cambio = False
+        for estado, salidas in enumerate(transiciones):
+            if estado not in utiles and any(destino in utiles for destino in salidas.values()):
+                utiles.add(estado)
+                cambio = True
+    if 0 not in utiles:
+        return 0
+
+    maximos = {}  # Estado -> longitud de la cadena más larga aceptada desde él
+    en_curso = set()
+    pila = [(0, False)]
+    while pila:
+        estado, cerrar = pila.pop()
+        if cerrar:
+            en_curso.discard(estado)
+            maximos[estado] = max([0 if etiquetas[estado] is not None else -1] +
+                                  [1 + maximos[d] for d in transiciones[estado].values() if d in utiles])
+            continue
+        if estado in maximos:
+            continue
+        en_curso.add(estado)
+        pila.append((estado, True))
+        for destino in transiciones[estado].values():
+            if destino in en_curso:
+                return None
+            if destino in utiles and destino not in maximos:
+                pila.append((destino, False))
+    return maximos[0]
+
+
+class ReconocedorSAN:
+    """
+    Reconocedor de jugadas dirigido por tablas (DFA compilado desde una GramaticaBNF).
+
+    Además de las tablas, guarda los veredictos de las cadenas ya consultadas: en una
+    partida real el vocabulario de jugadas se repite mucho, así que la mayoría de las
+    consultas se resuelven con una única búsqueda en un diccionario.
+
+    Un mismo reconocedor puede usarse a la vez desde varios hilos: las tablas no cambian
+    tras compilarse y la caché de veredictos solo se lee, se amplía o se vacía con
+    operaciones sueltas de diccionario, que son atómicas (también sin GIL). Dos hilos
+    pueden calcular el mismo veredicto a la vez, pero siempre guardan el mismo valor.
+
+    Solo se guardan los veredictos de cadenas no más largas que la jugada más larga que
+    acepta la gramática: una cadena mayor es inválida, el DFA lo descubre en cuanto se sale
+    de sus tablas, y recordarla solo retendría memoria (ej: tokens enormes de 1 MiB).
+    """
+
+    def __init__(self, transiciones, etiquetas):
+        """
+        Args:
+            transiciones (list): transiciones[estado] es un dict carácter -> estado siguiente.
+            etiquetas (list): etiquetas[estado] es el nombre de la regla aceptada en ese
+                              estado, o None si el estado no es de aceptación.
+        """
+        self.transiciones = transiciones
+        self.etiquetas = etiquetas
+        self.longitud_maxima = _longitud_maxima(transiciones, etiquetas)
+        self._veredictos = {}
+
+    def reconocer(self, cadena):
+        """
+        Retorna el nombre de la regla que reconoce 'cadena' completa, o None si ninguna la reconoce.
+        """
+        try:
+            return self._veredictos[cadena]
+        except KeyError:
+            pass
+        transiciones = self.transiciones
+        estado = 0
+        for caracter in cadena:
+            estado = transiciones[estado].get(caracter)
+            if estado is None:
+                regla = None
+                break
+        else:
+            regla = self.etiquetas[estado]
+        if self.longitud_maxima is not None and len(cadena) > self.longitud_maxima:
+            return regla
+        if len(self._veredictos) >= _LIMITE_CACHE_VEREDICTOS:
+            self._veredictos.clear()
+        self._veredictos[cadena] = regla
+        return regla
+
+    def es_valida(self, cadena):
+        """Indica si 'cadena' es una jugada completa según la gramática."""
+        return self.reconocer(cadena) is not None
+
+    def __repr__(self):
+        return f"ReconocedorSAN(estados={len(self.transiciones)})"
+
+
+_RECONOCEDORES = {}
+_CERROJO_RECONOCEDORES = threading.Lock()
+
+
+def obtener_reconocedor(*dialectos, usar_cache=True):
+    """
+    Retorna el reconocedor compilado para la gramática SAN con los dialectos indicados.
+
+    Los reconocedores se comparten dentro del proceso y entre hilos: la gramática de cada
+    combinación de dialectos se compila (o se lee del disco) solo la primera vez.
+
+    Args:
+        *dialectos (str): Nombres de DIALECTOS a aplicar, en orden. Sin argumentos se usa
+                          la gramática estándar.
+
+    Raises:
+        ValueError: Si se pide un dialecto desconocido.
+    """
+    clave = tuple(dialectos)
+    reconocedor = _RECONOCEDORES.get(clave)
+    if reconocedor is None:
+        with _CERROJO_RECONOCEDORES:
+            reconocedor = _RECONOCEDORES.get(clave)   # Otro hilo pudo compilarla mientras se esperaba.
+            if reconocedor is None:
+                gramatica = GramaticaBNF.desde_archivo()
+                for nombre in dialectos:
+                    if nombre not in DIALECTOS:
+                        raise ValueError(f"Dialecto desconocido: '{nombre}'. Opciones: {', '.join(DIALECTOS)}.")
+                    gramatica = gramatica.con_reglas(DIALECTOS[nombre])
+                reconocedor = gramatica.compilar(usar_cache=usar_cache)
+                _RECONOCEDORES[clave] = reconocedor
+    return reconocedor
+
+
+# Medición comparativa contra la validación anterior con expresiones regulares (útil durante el desarrollo).
+# Ejecutar desde la raíz del proyecto: python -m src.core.bnf_rules
+if __name__ == '__main__':
+    import time
+
+    # Validación anterior de Movimiento: un patrón por alternativa de <jugada>, probados en orden.
+    pieza, casilla = "[KQRBN]", "[a-h][1-8]"
+    sufijos = f"(?:={pieza})?[+#]?"
+    patrones = (re.compile(r"0-0|0-0-0"),
+                re.compile(f"{pieza}(?:[a-h]|[1-8]|[a-h][1-8])?x?{casilla}{sufijos}"),
+                re.compile(f"{casilla}{sufijos}"),
+                re.compile(f"[a-h]x{casilla}{sufijos}"))
+
+    def por_regex(cadena):
+        for patron in patrones:
+            if patron.fullmatch(cadena):
+                return True
+        return False
+
+    inicio = time.perf_counter()
+    reconocedor = GramaticaBNF.desde_archivo().compilar(usar_cache=False)
+    print(f"Compilación: {(time.perf_counter() - inicio) * 1000:.1f} ms, {len(reconocedor.transiciones)} estados.")
+    inicio = time.perf_counter()
+    GramaticaBNF.desde_archivo().compilar()
+    print(f"Carga (con caché en disco): {(time.perf_counter() - inicio) * 1000:.1f} ms.")
+
+    muestra = ["e4", "Nf3", "0-0", "exd5", "Qxe6+", "Rfb8", "e8=Q#", "Kh8", "zz9", "Nbd7"] * 100000
+    inicio = time.perf_counter()
+    for s in muestra:
+        por_regex(s)
+    t_regex = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    for s in muestra:
+        reconocedor.reconocer(s)
+    t_dfa = time.perf_counter() - inicio
+    # Recorrido de las tablas sin la caché de veredictos (peor caso: todas las jugadas distintas).
+    inicio = time.perf_counter()
+    tablas = reconocedor.transiciones
+    for s in muestra:
+        estado = 0
+        for caracter in s:
+            estado = tablas[estado].get(caracter)
+            if estado is None:
+                break
+    t_tablas = time.perf_counter() - inicio
+    print(f"{len(muestra)} jugadas: regex {t_regex:.2f}s, DFA con veredictos {t_dfa:.2f}s, "
+          f"solo tablas DFA {t_tablas:.2f}s.")
@@ -0,0 +1,48 @@
+# src/core/cache_lru.py
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """
+    Caché LRU con un límite de coste total (ej: bytes estimados).
+    Al superar el límite se descartan primero las entradas usadas hace más tiempo.
+    """
+
+    def __init__(self, limite, coste=lambda valor: 1):
+        """
+        Args:
+            limite (int): Coste total máximo de las entradas guardadas.
+            coste (callable): Función que estima el coste de un valor.
+        """
+        self.limite = limite
+        self.coste = coste
+        self.coste_total = 0
+        self._entradas = OrderedDict()  # clave -> (valor, coste)
+
+    def obtener(self, clave):
+        """Retorna el valor de 'clave' (o None) y lo marca como el más reciente."""
+        entrada = self._entradas.get(clave)
+        if entrada is None:
+            return None
+        self._entradas.move_to_end(clave)
+        return entrada[0]
+
+    def guardar(self, clave, valor, coste=None):
+        """Guarda 'valor' con el coste indicado (por defecto, el que estima self.coste)."""
+        anterior = self._entradas.pop(clave, None)
+        if anterior is not None:
+            self.coste_total -= anterior[1]
+        if coste is None:
+            coste = self.coste(valor)
+        self._entradas[clave] = (valor, coste)
+        self.coste_total += coste
+        # Se conserva siempre la entrada recién guardada, aunque supere el límite por sí sola.
+        while self.coste_total > self.limite and len(self._entradas) > 1:
+            _, (_, coste_descartado) = self._entradas.popitem(last=False)
+            self.coste_total -= coste_descartado
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __contains__(self, clave):
+        return clave in self._entradas
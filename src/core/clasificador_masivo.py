@@ -0,0 +1,256 @@
+# src/core/clasificador_masivo.py
+"""
+Clasificación masiva (vectorizada) de jugadas SAN.
+
+Crear un objeto Movimiento por cada token resulta costoso cuando se procesan
+corpus de millones de jugadas: el tiempo se va en la creación de objetos y en
+las llamadas al reconocedor. Este módulo une el lote de tokens en un solo texto,
+traduce cada byte a su clase de carácter de la gramática BNF con bytes.translate
+y reduce cada token a una clave de 64 bits con las clases de sus caracteres. La
+validez y la regla de una jugada solo dependen de esa secuencia de clases, así
+que se deciden buscando la clave en una tabla de las secuencias válidas. Con tokens
+ya separados (como los que da str.split()) ningún paso los recorre uno a uno en Python.
+
+Requiere NumPy (opcional para el resto del proyecto): pip install numpy
+"""
+
+from itertools import product
+
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+except ImportError:  # NumPy es una dependencia opcional.
+    np = None
+
+# Identificadores de regla devueltos por clasificar_lote().
+# El orden coincide con el orden de las alternativas de <jugada> en la gramática.
+REGLA_INVALIDA = 0
+REGLA_ENROQUE = 1
+REGLA_MOVIMIENTO_PIEZA = 2
+REGLA_PEON_AVANCE = 3
+REGLA_PEON_CAPTURA = 4
+
+NOMBRES_REGLAS = {
+    REGLA_INVALIDA: "invalida",
+    REGLA_ENROQUE: "enroque",
+    REGLA_MOVIMIENTO_PIEZA: "movimiento_pieza",
+    REGLA_PEON_AVANCE: "peon_avance",
+    REGLA_PEON_CAPTURA: "peon_captura",
+}
+
+# La jugada válida más larga es un movimiento de pieza completo, ej: "Qa1xb2=Q#" (9 caracteres).
+# Cualquier token más largo es inválido sin necesidad de mirarlo.
+LONGITUD_MAXIMA_JUGADA = 9
+
+
+def _requerir_numpy():
+    if np is None:
+        raise ImportError("La clasificación masiva requiere NumPy. Instálelo con: pip install numpy")
+
+
+# Clases de carácter: cada byte del texto se traduce a una de ellas (un byte por carácter).
+_FIN = 0        # Separador entre tokens
+_LETRA = 1      # <letra>      ::= a-h
+_NUMERO = 2     # <numero>     ::= 1-8
+_PIEZA = 3      # <pieza>      ::= K Q R B N
+_JAQUE = 4      # <jaque_mate> ::= + #
+_IGUAL = 5      # "=" de <promocion>
+_CAPTURA = 6    # "x" de <captura>
+_CERO = 7       # "0" de <enroque>
+_GUION = 8      # "-" de <enroque>
+_OTRO = 9       # Cualquier otro carácter: nunca válido
+_ESPACIO = 10   # Espacio en blanco (Movimiento lo recorta en los extremos con strip())
+
+# Caracteres ASCII que str.strip() considera espacio en blanco.
+_ESPACIOS_ASCII = " \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+# Secuencias de clases de cada alternativa de <jugada>, con sus partes opcionales.
+_OPCIONALES = {
+    "promocion": ((), (_IGUAL, _PIEZA)),
+    "jaque_mate": ((), (_JAQUE,)),
+    "desambiguacion": ((), (_LETRA,), (_NUMERO,), (_LETRA, _NUMERO)),
+    "captura": ((), (_CAPTURA,)),
+}
+
+_TABLAS = {}
+
+
+def _secuencias_validas():
+    """
+    Todas las secuencias de clases que reconoce la gramática, con su regla. Las
+    alternativas de <jugada> empiezan por clases distintas, así que no se solapan.
+    """
+    secuencias = {(_CERO, _GUION, _CERO): REGLA_ENROQUE,
+                  (_CERO, _GUION, _CERO, _GUION, _CERO): REGLA_ENROQUE}
+    casilla = (_LETRA, _NUMERO)
+    for promocion, jaque in product(_OPCIONALES["promocion"], _OPCIONALES["jaque_mate"]):
+        secuencias[casilla + promocion + jaque] = REGLA_PEON_AVANCE
+        secuencias[(_LETRA, _CAPTURA) + casilla + promocion + jaque] = REGLA_PEON_CAPTURA
+        for desambiguacion, captura in product(_OPCIONALES["desambiguacion"], _OPCIONALES["captura"]):
+            secuencias[(_PIEZA,) + desambiguacion + captura + casilla + promocion + jaque] = REGLA_MOVIMIENTO_PIEZA
+    return secuencias
+
+
+def _clave_de_secuencia(secuencia):
+    """Clave de 64 bits de una secuencia de clases (ver empaquetar_tokens)."""
+    clave = 0
+    for posicion, clase in enumerate(secuencia[:8]):
+        clave |= clase << (8 * posicion)
+    if len(secuencia) > 8:
+        clave |= secuencia[8] << 60
+    return clave
+
+
+def _tablas():
+    """
+    Construye (una sola vez) la tabla de traducción byte -> clase y la tabla hash perfecta
+    de las claves válidas: el primer módulo con el que no colisiona ninguna clave.
+    """
+    if not _TABLAS:
+        traduccion = bytearray([_OTRO] * 256)
+        traduccion[0] = _FIN
+        for caracteres, clase in (("abcdefgh", _LETRA), ("12345678", _NUMERO), ("KQRBN", _PIEZA),
+                                  ("+#", _JAQUE), ("=", _IGUAL), ("x", _CAPTURA), ("0", _CERO),
+                                  ("-", _GUION), (_ESPACIOS_ASCII, _ESPACIO)):
+            for caracter in caracteres:
+                traduccion[ord(caracter)] = clase
+
+        reglas_por_clave = {_clave_de_secuencia(s): regla for s, regla in _secuencias_validas().items()}
+        claves = np.array(list(reglas_por_clave), dtype=np.uint64)
+        modulo = len(claves)
+        while len(np.unique(claves % np.uint64(modulo))) < len(claves):
+            modulo += 1
+        # Cada casilla guarda la única clave válida que cae en ella (o una clave imposible).
+        tabla_claves = np.full(modulo, np.uint64(2 ** 64 - 1), dtype=np.uint64)
+        tabla_reglas = np.zeros(modulo, dtype=np.uint8)
+        tabla_claves[claves % np.uint64(modulo)] = claves
+        tabla_reglas[claves % np.uint64(modulo)] = list(reglas_por_clave.values())
+
+        # Máscara de los bytes de la clave que pertenecen a un token de cada longitud.
+        mascaras = np.array([(1 << (8 * min(n, 8))) - 1 for n in range(LONGITUD_MAXIMA_JUGADA + 1)],
+                            dtype=np.uint64)
+        _TABLAS.update(traduccion=bytes(traduccion), modulo=np.uint64(modulo), claves=tabla_claves,
+                       reglas=tabla_reglas, mascaras=mascaras)
+    return _TABLAS
+
+
+# Relleno tras el último token (ver empaquetar_tokens).
+_RELLENO = "\x00" * 16
+
+
+def _limpiar(token):
+    """Token como lo vería Movimiento (strip), con los NUL sustituidos por un carácter inválido."""
+    return token.strip().replace("\x00", "?")
+
+
+def empaquetar_tokens(tokens):
+    """
+    Reduce cada token SAN a una clave de 64 bits con las clases de sus caracteres.
+
+    Los tokens se unen en un solo texto separado por NUL, que se traduce a clases con
+    bytes.translate; la clave de cada token son sus ocho primeros bytes de clase (el
+    noveno, si lo hay, en los 4 bits altos). Solo si el lote tiene espacios en blanco,
+    caracteres no ASCII o NUL se limpia token a token como Movimiento (strip()); los NUL
+    y los caracteres no ASCII se tratan como caracteres inválidos.
+
+    Args:
+        tokens (list): Cadenas con las jugadas SAN.
+
+    Returns:
+        (numpy.ndarray, numpy.ndarray): Tupla (clave uint64 de cada token, vector con la
+                                        longitud de cada token).
+    """
+    _requerir_numpy()
+    tablas = _tablas()
+    n = len(tokens)
+    if n == 0:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+
+    # Tras el último separador se añaden NUL de relleno para que la ventana de 16 bytes de
+    # cualquier token quede dentro del texto.
+    texto = "\x00".join(tokens) + _RELLENO
+    clases = texto.encode("ascii", "replace").translate(tablas["traduccion"]) if texto.isascii() else None
+    if clases is not None:
+        datos = np.frombuffer(clases, dtype=np.uint8)
+        fines = np.flatnonzero(datos[:1 - len(_RELLENO)] == _FIN)
+    if clases is None or len(fines) != n or bytes([_ESPACIO]) in clases:
+        # Lote con espacios, NUL o caracteres no ASCII: se limpia cada token.
+        texto = "\x00".join(map(_limpiar, tokens)) + _RELLENO
+        clases = texto.encode("ascii", "replace").translate(tablas["traduccion"])
+        datos = np.frombuffer(clases, dtype=np.uint8)
+        fines = np.flatnonzero(datos[:1 - len(_RELLENO)] == _FIN)
+
+    inicios = np.empty_like(fines)
+    inicios[0] = 0
+    inicios[1:] = fines[:-1] + 1
+    longitudes = fines - inicios
+    # Ventana de 16 bytes desde el inicio de cada token, vista como dos enteros de 64 bits.
+    ventanas = sliding_window_view(datos, 16)[inicios]
+    palabras = ventanas.view("<u8")
+    claves = palabras[:, 0] & tablas["mascaras"][np.minimum(longitudes, LONGITUD_MAXIMA_JUGADA)]
+    noveno = (palabras[:, 1] & np.uint64(0xFF)) * (longitudes == LONGITUD_MAXIMA_JUGADA)
+    claves |= noveno << np.uint64(60)
+    return claves, longitudes
+
+
+def clasificar_empaquetados(claves, longitudes):
+    """
+    Clasifica tokens ya empaquetados con empaquetar_tokens(), con una búsqueda en la
+    tabla hash perfecta de las secuencias de clases válidas.
+
+    Args:
+        claves (numpy.ndarray): Clave uint64 de cada token.
+        longitudes (numpy.ndarray): Longitud de cada token.
+
+    Returns:
+        (numpy.ndarray, numpy.ndarray): Tupla (máscara booleana de validez, vector uint8
+                                        con el identificador de regla REGLA_*).
+    """
+    _requerir_numpy()
+    tablas = _tablas()
+    casillas = claves % tablas["modulo"]
+    validos = (tablas["claves"][casillas] == claves) & (longitudes >= 1) & (longitudes <= LONGITUD_MAXIMA_JUGADA)
+    reglas = tablas["reglas"][casillas] * validos
+    return validos, reglas.astype(np.uint8)
+
+
+def clasificar_lote(tokens):
+    """
+    Clasifica un lote de jugadas SAN de una sola vez.
+
+    Args:
+        tokens (iterable): Cadenas con las jugadas SAN (ej: ["e4", "Nf3", "0-0", "zz"]).
+
+    Returns:
+        (numpy.ndarray, numpy.ndarray): Tupla (máscara booleana de validez, vector uint8
+                                        con el identificador de regla REGLA_*).
+    """
+    claves, longitudes = empaquetar_tokens(list(tokens))
+    return clasificar_empaquetados(claves, longitudes)
+
+
+# Medición contra Movimiento (la comparación exacta de resultados está en
+# tests/test_clasificador_masivo.py). Ejecutar desde la raíz del proyecto:
+#   python -m src.core.clasificador_masivo
+if __name__ == '__main__':
+    import time
+    from .movimiento import Movimiento
+
+    def medir(funcion, repeticiones=3):
+        mejor = None
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            resultado = funcion()
+            duracion = time.perf_counter() - inicio
+            mejor = duracion if mejor is None else min(mejor, duracion)
+        return mejor, resultado
+
+    base = ["e4", "Nf3", "0-0", "exd5", "Qxe6+", "Rfb8", "e8=Q#", "Kh8", "zz9", "Nbd7"]
+    for nombre, muestra in (("sin espacios", base * 200000),
+                            ("con espacios (se limpia token a token)", [" e4 "] + base * 200000)):
+        t_empaquetado, (claves, longitudes) = medir(lambda: empaquetar_tokens(muestra))
+        t_clasificacion, _ = medir(lambda: clasificar_empaquetados(claves, longitudes))
+        t_objetos, _ = medir(lambda: [Movimiento(s).es_valido for s in muestra], repeticiones=1)
+        t_vector = t_empaquetado + t_clasificacion
+        print(f"{len(muestra)} tokens {nombre}: empaquetado {t_empaquetado:.3f}s + clasificación "
+              f"{t_clasificacion:.3f}s, Movimiento {t_objetos:.2f}s (x{t_objetos / t_vector:.1f} en total).")
@@ -0,0 +1,292 @@
+# src/core/historial.py
+from collections import OrderedDict
+
+from .partida import Partida
+from ..tree.nodo_arbol import NodoArbol
+from ..tree.arbol_partida import ArbolBinarioPartida
+
+# Turnos por bloque de SecuenciaTurnos. Un bloque sin cambios se comparte entre versiones.
+TURNOS_POR_BLOQUE = 32
+
+
+class SecuenciaTurnos:
+    """
+    Secuencia inmutable de turnos dividida en bloques, que comparte con la versión
+    anterior todos los bloques que no cambian (estructura persistente).
+
+    Cada versión guarda solo una tupla con sus bloques (un puntero por cada
+    TURNOS_POR_BLOQUE turnos) y los bloques que sí cambiaron; los Turno de los bloques
+    compartidos son los mismos objetos que en la versión anterior.
+    """
+
+    __slots__ = ("bloques", "num_turnos")
+
+    def __init__(self, bloques, num_turnos):
+        self.bloques = bloques
+        self.num_turnos = num_turnos
+
+    @staticmethod
+    def _clave(bloque):
+        return tuple((t.numero_turno, t.jugada_blanca.san_string,
+                      t.jugada_negra.san_string if t.jugada_negra else None) for t in bloque)
+
+    @classmethod
+    def desde_turnos(cls, turnos, anterior=None):
+        """
+        Crea la secuencia de 'turnos' reutilizando los bloques iguales de 'anterior'.
+
+        Args:
+            turnos (list): Turnos validados de la nueva versión.
+            anterior (SecuenciaTurnos, optional): Versión anterior con la que compartir bloques.
+        """
+        bloques = []
+        for n, inicio in enumerate(range(0, len(turnos), TURNOS_POR_BLOQUE)):
+            bloque = tuple(turnos[inicio:inicio + TURNOS_POR_BLOQUE])
+            if anterior is not None and n < len(anterior.bloques):
+                bloque_anterior = anterior.bloques[n]
+                if cls._clave(bloque_anterior) == cls._clave(bloque):
+                    bloque = bloque_anterior
+            bloques.append(bloque)
+        return cls(tuple(bloques), len(turnos))
+
+    def turnos(self):
+        """Lista de los turnos de la secuencia."""
+        return [turno for bloque in self.bloques for turno in bloque]
+
+    def bloques_compartidos(self, otra):
+        """Número de bloques que esta secuencia comparte (mismo objeto) con 'otra'."""
+        return sum(1 for a, b in zip(self.bloques, otra.bloques) if a is b)
+
+    def __len__(self):
+        return self.num_turnos
+
+
+def _valores_por_indice(raiz):
+    """Diccionario indice -> valor de los nodos de un árbol construido por ArbolBinarioPartida."""
+    valores = {}
+    pendientes = [raiz] if raiz is not None else []
+    while pendientes:
+        nodo = pendientes.pop()
+        valores[nodo.indice] = nodo.valor
+        if nodo.izquierda:
+            pendientes.append(nodo.izquierda)
+        if nodo.derecha:
+            pendientes.append(nodo.derecha)
+    return valores
+
+
+def arbol_persistente(raiz_nueva, raiz_anterior):
+    """
+    Versión de 'raiz_nueva' que reutiliza los subárboles sin cambios de 'raiz_anterior'
+    (copia de caminos).
+
+    Como el árbol se llena por niveles, una jugada distinta en el índice i solo afecta
+    al nodo i y a sus antecesores: se crean nodos nuevos para ese camino (O(log n) por
+    jugada cambiada) y el resto de nodos se comparte con la versión anterior. Los nodos
+    compartidos no deben modificarse después (ej: con ArbolBinarioPartida.agregar_turno).
+
+    Args:
+        raiz_nueva (NodoArbol): Árbol recién construido con ArbolBinarioPartida (con índices).
+        raiz_anterior (NodoArbol): Árbol de la versión anterior (o None).
+
+    Returns:
+        tuple: (raíz del árbol persistente, número de nodos creados)
+    """
+    nuevos = _valores_por_indice(raiz_nueva)
+    anteriores = _valores_por_indice(raiz_anterior)
+    # Índices cuyo nodo cambia, aparece o desaparece, y todos sus antecesores.
+    sucios = set()
+    for indice in nuevos.keys() | anteriores.keys():
+        if nuevos.get(indice) != anteriores.get(indice):
+            while indice not in sucios:
+                sucios.add(indice)
+                if indice == 0:
+                    break
+                indice = (indice - 1) // 2
+    creados = 0
+
+    def copiar(nodo_anterior, indice):
+        nonlocal creados
+        if indice not in nuevos:
+            return None
+        if indice not in sucios:
+            return nodo_anterior
+        nodo = NodoArbol(nuevos[indice])
+        nodo.indice = indice
+        creados += 1
+        nodo.izquierda = copiar(nodo_anterior.izquierda if nodo_anterior else None, 2 * indice + 1)
+        nodo.derecha = copiar(nodo_anterior.derecha if nodo_anterior else None, 2 * indice + 2)
+        return nodo
+
+    return copiar(raiz_anterior, 0), creados
+
+
+class VersionPartida:
+    """Una versión del historial: turnos y árbol persistentes, y el cambio de texto que la creó."""
+
+    __slots__ = ("secuencia", "raiz", "cambio_texto", "nodos_creados")
+
+    def __init__(self, secuencia, raiz, cambio_texto, nodos_creados):
+        self.secuencia = secuencia        # SecuenciaTurnos
+        self.raiz = raiz                  # NodoArbol raíz (árbol persistente)
+        self.cambio_texto = cambio_texto  # (inicio, texto anterior, texto nuevo) respecto a la versión previa
+        self.nodos_creados = nodos_creados
+
+    def partida(self):
+        """Reconstruye la Partida de la versión sin analizar texto."""
+        return Partida.desde_turnos(self.secuencia.turnos())
+
+
+def _cambio_de_texto(anterior, nuevo):
+    """Diferencia mínima entre dos textos como (inicio, fragmento anterior, fragmento nuevo)."""
+    limite = min(len(anterior), len(nuevo))
+    inicio = 0
+    while inicio < limite and anterior[inicio] == nuevo[inicio]:
+        inicio += 1
+    fin = 0
+    while fin < limite - inicio and anterior[-1 - fin] == nuevo[-1 - fin]:
+        fin += 1
+    return inicio, anterior[inicio:len(anterior) - fin], nuevo[inicio:len(nuevo) - fin]
+
+
+class HistorialEdicion:
+    """
+    Historial lineal de deshacer/rehacer de las partidas analizadas en el editor.
+
+    Cada paso guarda solo lo que cambió respecto al anterior: los bloques de turnos
+    nuevos (SecuenciaTurnos), los nodos del árbol en los caminos modificados
+    (arbol_persistente) y el fragmento de texto editado. Deshacer y rehacer recuperan
+    la partida y el árbol de una versión sin volver a analizar nada; los layouts de las
+    últimas versiones visitadas se conservan en una caché para redibujarlas sin recalcular.
+    """
+
+    def __init__(self, layouts_en_cache=10):
+        """
+        Args:
+            layouts_en_cache (int, optional): Versiones cuyo layout de dibujo se conserva.
+        """
+        self._versiones = []
+        self._actual = -1
+        self._texto = ""   # Texto de la versión actual (se reconstruye aplicando los cambios)
+        self._layouts = OrderedDict()  # id(versión) -> layout (ver TreeVisualizerWidget.exportar_layout)
+        self._layouts_en_cache = layouts_en_cache
+
+    @property
+    def version_actual(self):
+        return self._versiones[self._actual] if self._actual >= 0 else None
+
+    @property
+    def texto_actual(self):
+        return self._texto
+
+    def puede_deshacer(self):
+        return self._actual > 0
+
+    def puede_rehacer(self):
+        return self._actual < len(self._versiones) - 1
+
+    def registrar(self, texto, partida, raiz_arbol=None):
+        """
+        Añade una nueva versión tras la actual (descarta las versiones que se podían rehacer).
+
+        Args:
+            texto (str): Texto del editor que se analizó.
+            partida (Partida): La partida válida resultante.
+            raiz_arbol (NodoArbol, optional): Su árbol ya construido con ArbolBinarioPartida.
+                                              Si no se da, se construye aquí.
+
+        Returns:
+            VersionPartida: La versión registrada; su raíz comparte nodos con la anterior.
+        """
+        if raiz_arbol is None:
+            raiz_arbol = ArbolBinarioPartida().construir_arbol(partida.turnos)
+        anterior = self.version_actual
+        secuencia = SecuenciaTurnos.desde_turnos(partida.turnos, anterior.secuencia if anterior else None)
+        raiz, creados = arbol_persistente(raiz_arbol, anterior.raiz if anterior else None)
+        version = VersionPartida(secuencia, raiz, _cambio_de_texto(self._texto, texto), creados)
+
+        for descartada in self._versiones[self._actual + 1:]:
+            self._layouts.pop(id(descartada), None)
+        del self._versiones[self._actual + 1:]
+        self._versiones.append(version)
+        self._actual += 1
+        self._texto = texto
+        return version
+
+    def deshacer(self):
+        """Vuelve a la versión anterior y la retorna (None si no hay)."""
+        if not self.puede_deshacer():
+            return None
+        inicio, anterior, nuevo = self._versiones[self._actual].cambio_texto
+        self._texto = self._texto[:inicio] + anterior + self._texto[inicio + len(nuevo):]
+        self._actual -= 1
+        return self.version_actual
+
+    def rehacer(self):
+        """Avanza a la versión siguiente y la retorna (None si no hay)."""
+        if not self.puede_rehacer():
+            return None
+        self._actual += 1
+        inicio, anterior, nuevo = self._versiones[self._actual].cambio_texto
+        self._texto = self._texto[:inicio] + nuevo + self._texto[inicio + len(anterior):]
+        return self.version_actual
+
+    def guardar_layout(self, version, layout):
+        """Conserva el layout de dibujo de 'version' (se descarta el menos reciente si no cabe)."""
+        self._layouts[id(version)] = layout
+        self._layouts.move_to_end(id(version))
+        while len(self._layouts) > self._layouts_en_cache:
+            self._layouts.popitem(last=False)
+
+    def layout(self, version):
+        """Layout guardado de 'version', o None."""
+        layout = self._layouts.get(id(version))
+        if layout is not None:
+            self._layouts.move_to_end(id(version))
+        return layout
+
+    def __len__(self):
+        return len(self._versiones)
+
+
+# Memoria de 300 ediciones de una jugada sobre una partida de 200 plies (útil durante el desarrollo).
+# Las comprobaciones de deshacer/rehacer y de los nodos compartidos están en tests/test_historial.py.
+# Ejecutar desde la raíz del proyecto: python -m src.core.historial
+if __name__ == '__main__':
+    import random
+    import tracemalloc
+
+    rng = random.Random(0)
+    jugadas = ["Nf3", "Nf6", "Ng1", "Ng8", "Nc3", "Nc6", "Nb1", "Nb8", "e4", "e5", "d4", "d5"]
+    plies = [jugadas[i % 8] for i in range(200)]
+
+    def texto_de(plies):
+        return " ".join(f"{n // 2 + 1}. {plies[n]} {plies[n + 1]}" for n in range(0, len(plies), 2))
+
+    historial = HistorialEdicion()
+    historial.registrar(texto_de(plies), Partida(texto_de(plies)))
+    ediciones = []
+    for _ in range(300):
+        plies = list(plies)
+        plies[rng.randrange(len(plies))] = rng.choice(jugadas)
+        texto = texto_de(plies)
+        ediciones.append((texto, Partida(texto), ArbolBinarioPartida()))
+
+    tracemalloc.start()
+    for texto, partida, arbol in ediciones:
+        historial.registrar(texto, partida, arbol.construir_arbol(partida.turnos))
+    del ediciones  # Solo queda en memoria lo que retiene el historial
+    en_historial = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    completa = Partida(texto_de(plies))
+    tracemalloc.start()
+    copia = (completa.texto_original, Partida(completa.texto_original),
+             ArbolBinarioPartida().construir_arbol(completa.turnos))
+    por_copia = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    creados = sum(v.nodos_creados for v in historial._versiones[1:]) / 300
+    print(f"300 ediciones: {en_historial / 1024:.0f} KiB en el historial "
+          f"({en_historial / 300 / 1024:.1f} KiB/paso, {creados:.1f} nodos nuevos/paso); "
+          f"una copia completa (texto + Partida + árbol) ocupa {por_copia / 1024:.1f} KiB")
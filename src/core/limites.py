@@ -0,0 +1,117 @@
+# src/core/limites.py
+import re
+import time
+
+# Límites razonables para validar texto recibido de fuentes no confiables (ej: subidas de
+# archivos). Una partida real ronda los 1-2 KB y rara vez supera los 300 turnos.
+MAX_BYTES_POR_DEFECTO = 256 * 1024
+MAX_LONGITUD_TOKEN_POR_DEFECTO = 32     # La jugada SAN más larga posible ("Qa1xb2=Q#") tiene 9 caracteres
+MAX_TURNOS_POR_DEFECTO = 1000
+PRESUPUESTO_SEGUNDOS_POR_DEFECTO = 0.5
+
+# Tokens entre dos consultas del reloj (consultarlo en cada token cuesta más que analizarlo).
+_TOKENS_POR_CONSULTA_RELOJ = 256
+
+
+class LimiteExcedido(ValueError):
+    """
+    Error estructurado que se lanza en cuanto la entrada supera uno de los límites de
+    LimitesValidacion. El análisis se detiene en ese punto, sin recorrer el resto del texto.
+
+    Atributos:
+        limite (str): Límite superado: "bytes", "longitud_token", "turnos" o "tiempo".
+        maximo: Valor máximo permitido para ese límite.
+        valor: Valor observado (para "longitud_token", un mínimo: el token no se lee entero).
+        posicion (int): Posición del texto en la que se detectó (None para "bytes").
+    """
+
+    def __init__(self, limite, maximo, valor, posicion=None):
+        self.limite = limite
+        self.maximo = maximo
+        self.valor = valor
+        self.posicion = posicion
+        donde = f" en la posición {posicion}" if posicion is not None else ""
+        super().__init__(f"Límite '{limite}' excedido{donde}: {valor} (máximo {maximo}).")
+
+    def a_dict(self):
+        """Representación serializable (ej: para una respuesta JSON)."""
+        return {"limite": self.limite, "maximo": self.maximo, "valor": self.valor, "posicion": self.posicion}
+
+
+class LimitesValidacion:
+    """
+    Límites del modo de validación endurecido de Partida (ver Partida(texto, limites=...)).
+
+    En este modo el texto se recorre con una variante del analizador léxico sin retroceso
+    (cuantificadores posesivos y acotados): cada carácter se examina un número constante
+    de veces, de modo que el análisis es lineal en el tamaño de la entrada, y un token de
+    varios megabytes se rechaza tras leer max_longitud_token + 1 caracteres. La validación
+    de cada jugada (un DFA, ver bnf_rules) es lineal en la longitud del token, que está acotada.
+    Cualquier límite a None queda desactivado.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES_POR_DEFECTO, max_longitud_token=MAX_LONGITUD_TOKEN_POR_DEFECTO,
+                 max_turnos=MAX_TURNOS_POR_DEFECTO, presupuesto_segundos=PRESUPUESTO_SEGUNDOS_POR_DEFECTO):
+        """
+        Args:
+            max_bytes (int, optional): Tamaño máximo de la entrada, en bytes UTF-8.
+            max_longitud_token (int, optional): Caracteres máximos de un token (jugada o número de turno).
+            max_turnos (int, optional): Números de turno máximos en la partida.
+            presupuesto_segundos (float, optional): Tiempo máximo de análisis y validación.
+        """
+        self.max_bytes = max_bytes
+        self.max_longitud_token = max_longitud_token
+        self.max_turnos = max_turnos
+        self.presupuesto_segundos = presupuesto_segundos
+        # Mismos grupos que partida._PATRON_LEXICO: lastindex == 1 es un número de turno, 2 una jugada.
+        # Posesivos: \d, \s y "." son disjuntos, así que no retroceder no cambia qué se reconoce.
+        cota = f"{{1,{max_longitud_token}}}" if max_longitud_token else "+"
+        self._patron = re.compile(rf"(\d{cota}+)\s*+\.|(\S{cota}+)")
+
+    def comprobar_tamano(self, entrada):
+        """
+        Rechaza una entrada demasiado grande sin recorrerla (salvo en el caso dudoso de un
+        texto con caracteres no ASCII cerca del límite). Acepta str o bytes, para poder
+        comprobar el cuerpo de una petición antes de decodificarlo.
+
+        Raises:
+            LimiteExcedido: Si la entrada supera max_bytes.
+        """
+        if self.max_bytes is None:
+            return
+        tamano = len(entrada)
+        if isinstance(entrada, str) and tamano <= self.max_bytes < tamano * 4:
+            # Un carácter ocupa de 1 a 4 bytes en UTF-8: solo aquí hace falta codificar.
+            tamano = len(entrada.encode("utf-8", "surrogatepass"))
+        if tamano > self.max_bytes:
+            raise LimiteExcedido("bytes", self.max_bytes, tamano)
+
+    def tokens(self, texto):
+        """
+        Genera los tokens (re.Match) de 'texto' como partida._PATRON_LEXICO.finditer,
+        comprobando los límites de token, turnos y tiempo a medida que avanza.
+
+        Raises:
+            LimiteExcedido: Al encontrar el primer límite superado.
+        """
+        inicio = time.perf_counter()
+        limite_token = self.max_longitud_token
+        turnos = 0
+        for n, match in enumerate(self._patron.finditer(texto), 1):
+            fin = match.end()
+            if match.lastindex == 2 and limite_token and fin - match.start() == limite_token \
+                    and fin < len(texto) and not texto[fin].isspace():
+                raise LimiteExcedido("longitud_token", limite_token, limite_token + 1, match.start())
+            if match.lastindex == 1:
+                turnos += 1
+                if self.max_turnos is not None and turnos > self.max_turnos:
+                    raise LimiteExcedido("turnos", self.max_turnos, turnos, match.start())
+            if self.presupuesto_segundos is not None and n % _TOKENS_POR_CONSULTA_RELOJ == 0:
+                transcurrido = time.perf_counter() - inicio
+                if transcurrido > self.presupuesto_segundos:
+                    raise LimiteExcedido("tiempo", self.presupuesto_segundos, round(transcurrido, 4), match.start())
+            yield match
+
+    def __repr__(self):
+        return (f"LimitesValidacion(max_bytes={self.max_bytes}, max_longitud_token={self.max_longitud_token}, "
+                f"max_turnos={self.max_turnos}, presupuesto_segundos={self.presupuesto_segundos})")
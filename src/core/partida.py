@@ -1,131 +1,273 @@
 # src/core/partida.py
+import hashlib
 import re
 from .turno import Turno # Usar import relativo
+from .limites import LimitesValidacion, LimiteExcedido
+
+# Tipos de token que emite tokenizar().
+TOKEN_TURNO = "turno"      # Número de turno con su punto. Ej: "12." o "12 ."
+TOKEN_JUGADA = "jugada"    # Cualquier secuencia de caracteres sin espacios. Ej: "Nf3"
+
+# Expresión regular del analizador léxico. Se aplica una sola vez sobre el texto original:
+# (\d+)\s*\.  -> Número de turno, espacios opcionales y un punto. Ej: "1.", "1 ."
+# (\S+)       -> Jugada (uno o más caracteres que no sean espacio). Ej: "e4"
+_PATRON_LEXICO = re.compile(r"(\d+)\s*\.|(\S+)")
+
+
+def tokenizar(texto, inicio=0, fin=None):
+    """
+    Recorre 'texto' una sola vez y genera sus tokens sin copiarlo ni normalizarlo.
+
+    Args:
+        texto (str): Texto original de la partida.
+        inicio (int, optional): Posición desde la que se empieza a analizar.
+        fin (int, optional): Posición en la que se deja de analizar (por defecto, el final).
+
+    Yields:
+        tuple: (tipo, inicio, fin) con tipo TOKEN_TURNO o TOKEN_JUGADA y las posiciones
+               del token dentro de 'texto'.
+    """
+    if fin is None:
+        fin = len(texto)
+    for match in _PATRON_LEXICO.finditer(texto, inicio, fin):
+        yield (TOKEN_TURNO if match.lastindex == 1 else TOKEN_JUGADA), match.start(), match.end()
+
+
+def texto_canonico(texto):
+    """
+    Forma canónica de una partida: sus tokens separados por un espacio y los números de
+    turno escritos como "N." (sin ceros a la izquierda ni espacios antes del punto).
+    Dos textos que solo difieren en espacios o en el formato de los números de turno
+    tienen la misma forma canónica.
+    """
+    partes = []
+    for match in _PATRON_LEXICO.finditer(texto):
+        partes.append(f"{int(match.group(1))}." if match.lastindex == 1 else match.group(2))
+    return " ".join(partes)
+
+
+def huella_canonica(texto_canonico_partida):
+    """Huella de 16 bytes (BLAKE2b) de un texto ya canónico (ver texto_canonico)."""
+    return hashlib.blake2b(texto_canonico_partida.encode("utf-8"), digest_size=16).digest()
+
+
+def linea_y_columna(texto, posicion):
+    """Convierte una posición de 'texto' en (línea, columna), ambas empezando en 1."""
+    linea = texto.count("\n", 0, posicion) + 1
+    columna = posicion - (texto.rfind("\n", 0, posicion) + 1) + 1
+    return linea, columna
+
 
 class Partida:
     """
     Representa una partida de ajedrez completa leída en notación SAN.
     Se encarga de parsear la cadena de la partida en turnos y validar
     la sintaxis general de la partida.
+
+    Se pueden crear partidas a la vez desde varios hilos (ver corpus/paralelo.validar_partidas):
+    cada Partida, con sus Turno y Movimiento, solo se modifica mientras se construye, y lo
+    único que comparten es la gramática compilada, que es segura entre hilos.
     """
 
-    # Expresión regular para parsear un turno completo.
-    # Captura: 1. Número de turno, 2. Jugada blanca, 3. Jugada negra (opcional)
-    # Ejemplos: "1. e4 e5", "23. cxd5", "36. Qf5+"
-    _PATRON_TURNO_COMPLETO = re.compile(
-        r"(\d+)\.\s*([^\s]+)(?:\s+([^\s]+))?"
-        # (\d+)\.      -> Número de turno seguido de un punto. Ej: "1."
-        # \s* -> Cero o más espacios.
-        # ([^\s]+)      -> Jugada blanca (uno o más caracteres que no sean espacio). Ej: "e4"
-        # (?:\s+        -> Grupo opcional (no capturador) para la jugada negra.
-        #   ([^\s]+)    -> Jugada negra (uno o más caracteres que no sean espacio). Ej: "e5"
-        # )?            -> Fin del grupo opcional.
-    )
-
-    def __init__(self, san_completa):
+    def __init__(self, san_completa, reconocedor=None, limites=None):
         """
         Inicializa una Partida.
 
         Args:
             san_completa (str): La cadena completa de la partida en notación SAN.
+            reconocedor (ReconocedorSAN, optional): Gramática compilada con la que se validan
+                                                    las jugadas (ver bnf_rules.obtener_reconocedor),
+                                                    ej: obtener_reconocedor("enroque_o").
+                                                    Por defecto, la gramática SAN estándar.
+            limites (LimitesValidacion, optional): Activa el modo endurecido para texto no
+                                                   confiable: análisis lineal y límites de tamaño,
+                                                   longitud de token, turnos y tiempo.
+
+        Raises:
+            LimiteExcedido: En modo endurecido, en cuanto se supera un límite. Los errores de
+                            sintaxis no se lanzan: quedan en la partida como siempre.
         """
-        self.san_completa = san_completa.strip() if san_completa else ""
+        if limites is not None:
+            limites.comprobar_tamano(san_completa or "")
+        self.limites = limites
+        self.texto_original = san_completa or ""
+        self.san_completa = self.texto_original.strip()
+        self.reconocedor = reconocedor
         self.turnos = []
         self.es_valida_sintacticamente = False
         self.error_parseo_general = None # Error general del parseo de la partida
+        self.posicion_error = None # Posición del error dentro de texto_original
 
         self._parsear_y_validar()
 
+    @classmethod
+    def desde_turnos(cls, turnos, texto_original=None, reconocedor=None):
+        """
+        Crea una Partida válida a partir de turnos ya validados, sin analizar ningún texto.
+        Pensado para cargar partidas guardadas tras validarse (ver src/corpus/binario.py).
+
+        Args:
+            turnos (list): Objetos Turno válidos, en orden.
+            texto_original (str, optional): Texto de la partida. Por defecto, su forma canónica.
+            reconocedor (ReconocedorSAN, optional): Gramática con la que se validaron las jugadas.
+        """
+        partida = cls.__new__(cls)
+        partida.reconocedor = reconocedor
+        partida.limites = None
+        partida.turnos = list(turnos)
+        partida.es_valida_sintacticamente = bool(partida.turnos)
+        partida.error_parseo_general = None if partida.turnos else "La cadena de la partida está vacía."
+        partida.posicion_error = None
+        if texto_original is None:
+            texto_original = partida.texto_canonico() if partida.turnos else ""
+        partida.texto_original = texto_original
+        partida.san_completa = partida.texto_original.strip()
+        return partida
+
+    def _registrar_error(self, mensaje, posicion):
+        """Marca la partida como inválida con un mensaje que indica línea y columna del texto original."""
+        linea, columna = linea_y_columna(self.texto_original, posicion)
+        self.es_valida_sintacticamente = False
+        self.posicion_error = posicion
+        self.error_parseo_general = f"{mensaje} (línea {linea}, columna {columna})"
+
     def _parsear_y_validar(self):
         """
         Parsea la cadena SAN de la partida completa, la divide en turnos y jugadas,
         y valida la sintaxis de cada uno.
         Actualiza self.turnos, self.es_valida_sintacticamente y self.error_parseo_general.
+
+        El texto se analiza en una sola pasada con tokenizar(): no se crean copias
+        normalizadas, de modo que las posiciones de los errores apuntan al texto original.
+        Un turno es un número de turno seguido de dos jugadas (o de una sola, si es el
+        último turno); cualquier otra jugada es texto inesperado.
         """
         if not self.san_completa:
             self.es_valida_sintacticamente = False # Considerar una partida vacía como inválida o válida según se requiera.
             self.error_parseo_general = "La cadena de la partida está vacía."
             return
 
-        # Limpiar múltiples espacios entre jugadas o antes/después de números de turno
-        # para facilitar el parseo con la regex.
-        # Ej: "1.   e4   e5" -> "1. e4 e5"
-        #     "1 . e4" -> "1. e4"
-        partida_limpia = re.sub(r'\s*\.\s*', '. ', self.san_completa) # Normaliza "N . jugada" a "N. jugada"
-        partida_limpia = re.sub(r'\s+', ' ', partida_limpia).strip()  # Reduce múltiples espacios a uno
-
-        posicion_actual = 0
-        turnos_encontrados = 0
-
-        for match_turno in self._PATRON_TURNO_COMPLETO.finditer(partida_limpia):
-            turnos_encontrados += 1
-            if match_turno.start() != posicion_actual:
-                # Hay texto entre el final del último turno parseado y el inicio del actual
-                texto_residual = partida_limpia[posicion_actual:match_turno.start()].strip()
-                if texto_residual: # Solo si hay caracteres no espaciales
-                    self.es_valida_sintacticamente = False
-                    self.error_parseo_general = (
-                        f"Texto inesperado o formato incorrecto antes del turno {match_turno.group(1)}: "
-                        f"'{texto_residual}'"
-                    )
-                    return
+        texto = self.texto_original
+        turno_abierto = None   # Match del número del turno en curso
+        jugadas = []           # Matches de las jugadas del turno en curso
+        inicio_residual = None # Inicio del texto que no pertenece a ningún turno
 
-            num_turno_str = match_turno.group(1)
-            jugada_blanca_str = match_turno.group(2)
-            jugada_negra_str = match_turno.group(3) # Puede ser None
-
-            try:
-                num_turno = int(num_turno_str)
-                if self.turnos and num_turno <= self.turnos[-1].numero_turno:
-                    self.es_valida_sintacticamente = False
-                    self.error_parseo_general = (
-                        f"Error de secuencia de turnos: Turno {num_turno} encontrado después "
-                        f"del turno {self.turnos[-1].numero_turno}."
-                    )
+        # Se recorre directamente _PATRON_LEXICO (lo mismo que tokenizar(), sin el generador
+        # intermedio): lastindex == 1 indica un número de turno, 2 una jugada.
+        # En modo endurecido, los tokens pasan por los límites (ver LimitesValidacion.tokens).
+        tokens = self.limites.tokens(texto) if self.limites is not None else _PATRON_LEXICO.finditer(texto)
+        for match in tokens:
+            if match.lastindex == 1:
+                if turno_abierto is not None:
+                    if not jugadas:
+                        # Un número de turno sin jugadas se trata como texto inesperado.
+                        inicio_residual = turno_abierto.start()
+                    elif not self._cerrar_turno(turno_abierto, jugadas):
+                        return
+                    elif len(jugadas) == 1:
+                        # Solo el último turno puede quedar sin jugada negra.
+                        self._registrar_error(
+                            f"Falta la jugada negra del turno {turno_abierto.group(1)} antes del turno "
+                            f"{match.group(1)} (solo el último turno puede no tenerla).", match.start())
+                        return
+                if inicio_residual is not None:
+                    self._registrar_error(
+                        f"Texto inesperado o formato incorrecto antes del turno {match.group(1)}: "
+                        f"'{texto[inicio_residual:match.start()].strip()}'", inicio_residual)
                     return
-                if not self.turnos and num_turno != 1 and turnos_encontrados == 1: # Si es el primer turno parseado
-                    # Esta validación es opcional, algunas partidas pueden empezar en un turno N.
-                    # print(f"Advertencia: La partida no comienza en el turno 1 (comienza en {num_turno}).")
-                    pass
-
+                turno_abierto = match
+                jugadas = []
+            elif turno_abierto is not None and len(jugadas) < 2:
+                jugadas.append(match)
+            else:
+                # Tercera jugada de un turno, o jugada antes del primer número de turno.
+                if turno_abierto is not None and not self._cerrar_turno(turno_abierto, jugadas):
+                    return
+                turno_abierto = None
+                if inicio_residual is None:
+                    inicio_residual = match.start()
 
-                turno_actual = Turno(num_turno, jugada_blanca_str, jugada_negra_str)
-            except ValueError as ve:
-                self.es_valida_sintacticamente = False
-                self.error_parseo_general = f"Error al crear turno {num_turno_str}: {ve}"
+        if turno_abierto is not None:
+            if not jugadas:
+                inicio_residual = turno_abierto.start()
+            elif not self._cerrar_turno(turno_abierto, jugadas):
                 return
 
-            self.turnos.append(turno_actual)
-            if not turno_actual.es_valido:
-                self.es_valida_sintacticamente = False
-                # El error específico ya está en turno_actual.obtener_error_detalle()
-                # Se puede propagar aquí si se desea un error general de partida más específico.
-                self.error_parseo_general = turno_actual.obtener_error_detalle()
-                return # Detener al primer error de sintaxis en una jugada
-
-            posicion_actual = match_turno.end()
-
-        # Después del bucle, verificar si sobró texto al final de la partida
-        if posicion_actual < len(partida_limpia):
-            texto_residual_final = partida_limpia[posicion_actual:].strip()
-            if texto_residual_final: # Solo si hay caracteres no espaciales
-                self.es_valida_sintacticamente = False
-                self.error_parseo_general = (
-                    f"Texto inesperado al final de la partida: '{texto_residual_final}'"
-                )
-                return
+        # Después del recorrido, verificar si sobró texto al final de la partida
+        if inicio_residual is not None:
+            self._registrar_error(
+                f"Texto inesperado al final de la partida: '{texto[inicio_residual:].strip()}'", inicio_residual)
+            return
 
-        if not self.turnos and self.san_completa: # Si no se parseó ningún turno pero había texto
+        if not self.turnos: # Si no se parseó ningún turno pero había texto
             self.es_valida_sintacticamente = False
             self.error_parseo_general = "No se pudieron parsear turnos. Verifique el formato general (ej: '1. e4 e5 2. Nf3')."
             return
 
-        if not self.turnos and not self.san_completa: # Partida vacía
-             self.es_valida_sintacticamente = True # O False, según definición. Asumamos True.
-             return
+        self.es_valida_sintacticamente = True
 
+    def _cerrar_turno(self, turno_abierto, jugadas):
+        """
+        Crea y valida el Turno formado por un número de turno y sus jugadas.
 
-        self.es_valida_sintacticamente = True
+        Args:
+            turno_abierto (re.Match): Token del número de turno.
+            jugadas (list): Uno o dos tokens (re.Match) con las jugadas del turno.
+
+        Returns:
+            bool: True si el turno es válido y se añadió a self.turnos; False si se registró un error.
+        """
+        try:
+            num_turno = int(turno_abierto.group(1))
+        except ValueError:
+            # Más dígitos de los que int() admite (sys.get_int_max_str_digits()).
+            self._registrar_error(f"Número de turno demasiado largo ({len(turno_abierto.group(1))} dígitos).",
+                                  turno_abierto.start())
+            return False
+        if self.turnos and num_turno <= self.turnos[-1].numero_turno:
+            self._registrar_error(
+                f"Error de secuencia de turnos: Turno {num_turno} encontrado después "
+                f"del turno {self.turnos[-1].numero_turno}.", turno_abierto.start())
+            return False
+
+        jugada_negra_str = jugadas[1].group(2) if len(jugadas) > 1 else None
+        try:
+            turno_actual = Turno(num_turno, jugadas[0].group(2), jugada_negra_str, self.reconocedor)
+        except ValueError as ve:
+            self._registrar_error(f"Error al crear turno {num_turno}: {ve}", turno_abierto.start())
+            return False
+
+        self.turnos.append(turno_actual)
+        if not turno_actual.es_valido:
+            # Detener al primer error de sintaxis en una jugada, señalando la jugada exacta.
+            erronea = jugadas[0] if not turno_actual.jugada_blanca.es_valido else jugadas[1]
+            self._registrar_error(turno_actual.obtener_error_detalle(), erronea.start())
+            return False
+        return True
+
+    def texto_canonico(self):
+        """
+        Secuencia canónica de jugadas de la partida, ej: "1. e4 e5 2. Nf3".
+        Coincide con texto_canonico(self.texto_original), pero si la partida es válida
+        se construye directamente a partir de los turnos ya validados.
+        """
+        if not self.es_valida_sintacticamente:
+            return texto_canonico(self.texto_original)
+        partes = []
+        for turno in self.turnos:
+            partes.append(f"{turno.numero_turno}.")
+            partes.append(turno.jugada_blanca.san_string)
+            if turno.jugada_negra:
+                partes.append(turno.jugada_negra.san_string)
+        return " ".join(partes)
+
+    def huella(self):
+        """
+        Identidad de la partida: huella de 16 bytes de su secuencia canónica de jugadas.
+        Las partidas que solo difieren en espacios o en el formato de los números de
+        turno tienen la misma huella.
+        """
+        return huella_canonica(self.texto_canonico())
 
     def obtener_primer_error(self):
         """
@@ -148,3 +290,56 @@ class Partida:
         """Representación oficial del objeto."""
         return self.__str__()
 
+
+
+# Medición del analizador léxico frente al preprocesado anterior (dos re.sub y un finditer
+# sobre la copia normalizada). Ejecutar desde la raíz: python -m src.core.partida
+if __name__ == '__main__':
+    import time
+    import tracemalloc
+
+    turno_re_anterior = re.compile(r"(\d+)\.\s*([^\s]+)(?:\s+([^\s]+))?")
+    texto = " ".join(f"{n}. Nf3  Nc6\n" for n in range(1, 200001))
+
+    def pasada_anterior(t):
+        limpia = re.sub(r'\s*\.\s*', '. ', t)
+        limpia = re.sub(r'\s+', ' ', limpia).strip()
+        return sum(1 for _ in turno_re_anterior.finditer(limpia))
+
+    def pasada_lexica(t):
+        return sum(1 for _ in tokenizar(t))
+
+    for nombre, funcion in (("re.sub + finditer", pasada_anterior), ("tokenizar", pasada_lexica)):
+        inicio = time.perf_counter()
+        funcion(texto)
+        duracion = time.perf_counter() - inicio
+        tracemalloc.start()
+        funcion(texto)
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{nombre}: {duracion:.2f}s, memoria adicional máxima {pico / 1e6:.1f} MB "
+              f"(texto de {len(texto) / 1e6:.1f} MB)")
+
+    inicio = time.perf_counter()
+    partida = Partida(texto)
+    print(f"Partida completa ({len(partida.turnos)} turnos): {time.perf_counter() - inicio:.2f}s")
+
+    # Entradas hostiles: modo normal frente a modo endurecido (límites por defecto salvo el tamaño,
+    # para que cada caso llegue al analizador).
+    limites = LimitesValidacion(max_bytes=None)
+    hostiles = {
+        "token de 5 MB": "1. " + "e" * 5_000_000,
+        "número de turno de 3 MB": "1" * 3_000_000 + ". e4",
+        "200000 turnos": texto,
+    }
+    for nombre, hostil in hostiles.items():
+        inicio = time.perf_counter()
+        Partida(hostil)
+        normal = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        try:
+            Partida(hostil, limites=limites)
+            resultado = "aceptada"
+        except LimiteExcedido as e:
+            resultado = f"rechazada ({e.limite})"
+        print(f"{nombre}: normal {normal * 1000:.1f} ms; endurecido {(time.perf_counter() - inicio) * 1000:.2f} ms, {resultado}")
@@ -0,0 +1,379 @@
+# src/core/pgn.py
+
+# Lectura en streaming de archivos PGN (Portable Game Notation).
+#
+# Cada partida PGN tiene una sección de etiquetas ([Event "..."], [Result "1-0"]...) y
+# el texto de las jugadas, que además de la notación SAN puede contener comentarios
+# ({...} o ';' hasta fin de línea), NAGs ($1), variantes entre paréntesis, números de
+# jugada de las negras ("12...") y el resultado final ("1-0", "0-1", "1/2-1/2", "*").
+# Los números de jugada y la etiqueta FEN (con SetUp "1") fijan el turno y el color de
+# cada jugada; un número que no corresponde a la jugada siguiente es un error.
+# Las jugadas se validan con Movimiento (la misma gramática que Partida) y se enlazan
+# en un ArbolVariantes; la línea principal se puede obtener como una Partida normal.
+
+import re
+from functools import lru_cache
+
+from .bnf_rules import obtener_reconocedor
+from .movimiento import Movimiento
+from .turno import Turno
+from .partida import Partida
+from ..tree.arbol_variantes import ArbolVariantes
+
+RESULTADOS = ("1-0", "0-1", "1/2-1/2", "*")
+
+# Etiqueta de la cabecera: [Nombre "valor"] (el valor admite \" y \\ escapados).
+_PATRON_ETIQUETA = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+
+# Analizador léxico del texto de las jugadas. El orden importa: el resultado va antes
+# que los números de jugada y que las jugadas (para que "1-0" no se lea como jugada).
+_PATRON_JUGADAS = re.compile(r"""
+    (?P<comentario>\{[^}]*\}|;[^\n]*)
+  | (?P<nag>\$\d+)
+  | (?P<abre>\()
+  | (?P<cierra>\))
+  | (?P<resultado>1-0|0-1|1/2-1/2|\*)
+  | (?P<numero>\d+(?:\s*\.)+)
+  | (?P<jugada>[^\s{}();$]+)
+""", re.VERBOSE)
+
+# Sufijos de valoración pegados a la jugada ("Nf3!?") y su NAG equivalente.
+_PATRON_SUFIJO = re.compile(r"[!?]+$")
+_NAG_DE_SUFIJO = {"!": 1, "?": 2, "!!": 3, "??": 4, "!?": 5, "?!": 6}
+
+
+@lru_cache(maxsize=1024)
+def _ply_de_numero(numero):
+    """
+    Ply de la jugada que anuncia un número de jugada: "12." (blancas) es el ply 23 y
+    "12..." o "12. ..." (negras), el 24. Retorna 0 si el número no es un turno válido.
+    """
+    digitos = numero.split(".", 1)[0].rstrip()
+    if len(digitos) > 6 or int(digitos) < 1:
+        return 0
+    return 2 * int(digitos) - (0 if numero.count(".") > 1 else 1)
+
+
+def turno_inicial_fen(fen):
+    """
+    Turno y color de la primera jugada desde una posición FEN.
+
+    Args:
+        fen (str): La posición, ej: "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1".
+
+    Returns:
+        tuple: (número de turno, True si juegan las negras)
+
+    Raises:
+        ValueError: Si el FEN no indica el color que juega o su número de jugada no es válido.
+    """
+    campos = fen.split()
+    if len(campos) < 2 or campos[1] not in ("w", "b"):
+        raise ValueError(f"el FEN '{fen}' no indica qué color juega ('w' o 'b').")
+    numero_turno = 1
+    if len(campos) >= 6:
+        if not campos[5].isdigit() or len(campos[5]) > 6 or int(campos[5]) < 1:
+            raise ValueError(f"número de jugada '{campos[5]}' inválido en el FEN.")
+        numero_turno = int(campos[5])
+    return numero_turno, campos[1] == "b"
+
+
+class PartidaPGN:
+    """
+    Una partida leída de un archivo PGN: etiquetas, árbol de jugadas con variantes,
+    resultado y errores de validación.
+
+    La partida es válida si todas sus jugadas (también las de las variantes que se
+    conservan) cumplen la gramática y los paréntesis están equilibrados.
+    """
+
+    def __init__(self, etiquetas, texto_jugadas, reconocedor=None, con_anotaciones=True, con_variantes=True):
+        """
+        Args:
+            etiquetas (dict): Etiquetas de la cabecera (nombre -> valor).
+            texto_jugadas (str): Texto de las jugadas, tal como aparece en el archivo.
+            reconocedor (ReconocedorSAN, optional): Gramática de las jugadas. Por defecto la
+                                                    estándar con enroques "O-O" y "0-0".
+            con_anotaciones (bool, optional): Si es False, los comentarios y NAGs se saltan
+                                              sin guardarse en el árbol.
+            con_variantes (bool, optional): Si es False, las variantes se saltan sin validarse.
+        """
+        self.etiquetas = etiquetas
+        self.texto_jugadas = texto_jugadas
+        self.reconocedor = reconocedor if reconocedor is not None else obtener_reconocedor("enroque_mixto")
+        self.arbol = ArbolVariantes()
+        self.resultado = etiquetas.get("Result")
+        self.errores = []  # (mensaje, posición en texto_jugadas)
+        self._analizar(con_anotaciones, con_variantes)
+
+    @property
+    def es_valida(self):
+        return not self.errores
+
+    def _fijar_inicio_fen(self):
+        """
+        Fija el turno y el color de la primera jugada según las etiquetas SetUp y FEN.
+
+        Returns:
+            bool: True si las etiquetas fijan el inicio (o tienen un error ya anotado).
+        """
+        fen = self.etiquetas.get("FEN")
+        if self.etiquetas.get("SetUp") == "0":
+            return False
+        if fen is None:
+            if self.etiquetas.get("SetUp") == "1":
+                self.errores.append(("Etiqueta SetUp \"1\" sin etiqueta FEN.", 0))
+            return False
+        try:
+            numero_turno, negras = turno_inicial_fen(fen)
+        except ValueError as e:
+            self.errores.append((f"Etiqueta FEN inválida: {e}", 0))
+            return True
+        self.arbol.empezar_en(numero_turno, negras)
+        return True
+
+    def _analizar(self, con_anotaciones, con_variantes):
+        """Recorre el texto de las jugadas una sola vez y construye el árbol."""
+        texto = self.texto_jugadas
+        arbol = self.arbol
+        reconocedor = self.reconocedor
+        actual = arbol.raiz   # Nodo tras el que se añade la siguiente jugada
+        pila = []             # Nodos 'actual' de las líneas que contienen las variantes abiertas
+        saltando = 0          # Profundidad de variantes que se están saltando (con_variantes=False)
+        # Sin FEN, el primer número de jugada (ej: "1..." en un fragmento) fija el inicio.
+        inicio_fijado = self._fijar_inicio_fen()
+
+        for match in _PATRON_JUGADAS.finditer(texto):
+            tipo = match.lastgroup
+            if saltando:
+                if tipo == "abre":
+                    saltando += 1
+                elif tipo == "cierra":
+                    saltando -= 1
+                continue
+            if tipo == "jugada":
+                san = match.group("jugada")
+                nag = None
+                sufijo = _PATRON_SUFIJO.search(san)
+                if sufijo and sufijo.start() > 0:
+                    nag = _NAG_DE_SUFIJO.get(sufijo.group())
+                    san = san[:sufijo.start()]
+                movimiento = Movimiento(san, reconocedor)
+                if not movimiento.es_valido:
+                    self.errores.append((f"Jugada '{san}' inválida: {movimiento.tipo_error}.", match.start()))
+                actual = arbol.agregar(actual, movimiento)
+                inicio_fijado = True
+                if nag is not None and con_anotaciones:
+                    actual.nags = [nag]
+            elif tipo == "numero":
+                ply = _ply_de_numero(match.group())
+                if not inicio_fijado and ply:
+                    arbol.empezar_en((ply + 1) // 2, negras=ply % 2 == 0)
+                    inicio_fijado = True
+                    continue
+                if ply != actual.ply + 1:
+                    esperado = f"{(actual.ply + 2) // 2}." if actual.ply % 2 == 0 else f"{(actual.ply + 1) // 2}..."
+                    self.errores.append((f"Número de jugada '{match.group()}' incorrecto (se esperaba "
+                                         f"'{esperado}').", match.start()))
+            elif tipo == "comentario" or tipo == "nag":
+                if not con_anotaciones or actual is arbol.raiz:
+                    continue
+                if tipo == "nag":
+                    if actual.nags is None:
+                        actual.nags = []
+                    actual.nags.append(int(match.group()[1:]))
+                elif match.group().startswith("{"):
+                    comentario = match.group()[1:-1].strip()
+                    actual.comentario = comentario if actual.comentario is None else f"{actual.comentario} {comentario}"
+            elif tipo == "abre":
+                if not con_variantes:
+                    saltando = 1
+                    continue
+                if actual is arbol.raiz:
+                    self.errores.append(("Variante antes de la primera jugada.", match.start()))
+                    pila.append(actual)
+                    continue
+                # La variante es una alternativa a la última jugada: cuelga de su padre.
+                pila.append(actual)
+                actual = actual.padre
+            elif tipo == "cierra":
+                if not pila:
+                    self.errores.append(("Paréntesis de cierre sin variante abierta.", match.start()))
+                    continue
+                actual = pila.pop()
+            elif tipo == "resultado":
+                if pila:
+                    self.errores.append(("Resultado dentro de una variante.", match.start()))
+                self.resultado = match.group()
+        if pila:
+            self.errores.append((f"{len(pila)} variante(s) sin cerrar.", len(texto)))
+
+    def obtener_primer_error(self):
+        """Retorna el primer error de la partida (con su posición), o None si es válida."""
+        if not self.errores:
+            return None
+        mensaje, posicion = self.errores[0]
+        return f"{mensaje} (posición {posicion} del texto de las jugadas)"
+
+    def partida_principal(self):
+        """
+        Línea principal como una Partida (sin variantes), reutilizando los Movimiento ya
+        validados; sirve para ArbolBinarioPartida y el resto del programa.
+
+        Returns:
+            Partida: La partida, con los números de turno de la línea principal (que pueden
+                     empezar después del 1 si hay etiqueta FEN). None si la línea principal
+                     tiene jugadas inválidas, o si empieza con una jugada negra (un Turno
+                     siempre tiene jugada blanca).
+        """
+        nodos = self.arbol.linea_principal()
+        if any(not nodo.jugada.es_valido for nodo in nodos):
+            return None
+        if nodos and not nodos[0].es_blanca:
+            return None
+        turnos = []
+        for i in range(0, len(nodos), 2):
+            negra = nodos[i + 1].jugada if i + 1 < len(nodos) else None
+            turnos.append(Turno.desde_movimientos(nodos[i].numero_turno, nodos[i].jugada, negra))
+        return Partida.desde_turnos(turnos, reconocedor=self.reconocedor)
+
+    def __str__(self):
+        return (f"PartidaPGN({self.etiquetas.get('White', '?')} - {self.etiquetas.get('Black', '?')}, "
+                f"{self.resultado}, jugadas={self.arbol.num_nodos}, variantes={self.arbol.num_variantes}, "
+                f"válida={self.es_valida})")
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def _desescapar(valor):
+    return valor.replace('\\"', '"').replace("\\\\", "\\")
+
+
+def _fin_de_codigo(linea, en_comentario):
+    """
+    Sigue los comentarios de una línea del texto de las jugadas.
+
+    Args:
+        linea (str): La línea.
+        en_comentario (bool): Si la línea empieza dentro de un comentario {...} abierto antes.
+
+    Returns:
+        tuple: (en_comentario, fin): si la línea termina dentro de un comentario {...}, y la
+               posición donde empieza su comentario ';' final (o su longitud si no lo tiene).
+    """
+    posicion = 0
+    if en_comentario:
+        cierre = linea.find("}")
+        if cierre < 0:
+            return True, len(linea)
+        posicion = cierre + 1
+    while True:
+        apertura = linea.find("{", posicion)
+        punto_y_coma = linea.find(";", posicion)
+        if 0 <= punto_y_coma and (apertura < 0 or punto_y_coma < apertura):
+            return False, punto_y_coma
+        if apertura < 0:
+            return False, len(linea)
+        cierre = linea.find("}", apertura)
+        if cierre < 0:
+            return True, len(linea)
+        posicion = cierre + 1
+
+
+def leer_pgn(origen, codificacion="utf-8", reconocedor=None, con_anotaciones=True, con_variantes=True):
+    """
+    Genera las partidas de un archivo PGN, una por una.
+
+    Solo se mantiene en memoria el texto de la partida en curso. Una partida termina al
+    encontrar su resultado fuera de comentarios y variantes, o al empezar la cabecera
+    de la siguiente.
+
+    Args:
+        origen (str | file): Ruta del archivo, o cualquier iterable de líneas de texto.
+        codificacion (str, optional): Codificación usada si 'origen' es una ruta.
+        reconocedor, con_anotaciones, con_variantes: Ver PartidaPGN.
+
+    Yields:
+        PartidaPGN: Cada partida del archivo.
+    """
+    if isinstance(origen, str):
+        with open(origen, encoding=codificacion, errors="replace") as archivo:
+            yield from leer_pgn(archivo, codificacion, reconocedor, con_anotaciones, con_variantes)
+        return
+
+    etiquetas = {}
+    lineas = []
+    en_comentario = False  # Dentro de un comentario {...} que continúa en la línea siguiente
+
+    def terminar():
+        return PartidaPGN(etiquetas, "\n".join(lineas), reconocedor, con_anotaciones, con_variantes)
+
+    for linea in origen:
+        if not en_comentario:
+            inicio = linea.lstrip()
+            if inicio.startswith("["):
+                if lineas:  # Cabecera de la partida siguiente sin resultado en la anterior.
+                    yield terminar()
+                    etiquetas, lineas = {}, []
+                etiqueta = _PATRON_ETIQUETA.match(inicio)
+                if etiqueta:
+                    etiquetas[etiqueta.group(1)] = _desescapar(etiqueta.group(2))
+                continue
+            if not inicio or inicio.startswith("%"):  # Línea vacía o de escape ('%')
+                continue
+        linea = linea.rstrip("\r\n")
+        lineas.append(linea)
+
+        fin = len(linea)
+        if en_comentario or "{" in linea or ";" in linea:
+            en_comentario, fin = _fin_de_codigo(linea, en_comentario)
+            if en_comentario:
+                continue
+        # Fin de partida: la línea termina con un resultado (caso habitual en PGN).
+        codigo = linea[:fin].split()
+        if codigo and codigo[-1] in RESULTADOS:
+            yield terminar()
+            etiquetas, lineas = {}, []
+    if lineas or etiquetas:
+        yield terminar()
+
+
+# Medición de la lectura de una base PGN sintética, o de un archivo real.
+# Uso: python -m src.core.pgn [archivo.pgn] [--sin-anotaciones] [--sin-variantes]
+if __name__ == '__main__':
+    import argparse
+    import io
+    import time
+
+    parser = argparse.ArgumentParser(description="Lee y valida un archivo PGN, y mide partidas por segundo.")
+    parser.add_argument("entrada", nargs="?", help="Archivo PGN. Sin él se usa una base sintética.")
+    parser.add_argument("--partidas", type=int, default=20000, help="Partidas de la base sintética.")
+    parser.add_argument("--sin-anotaciones", action="store_true", help="Salta comentarios y NAGs.")
+    parser.add_argument("--sin-variantes", action="store_true", help="Salta las variantes sin validarlas.")
+    argumentos = parser.parse_args()
+
+    if argumentos.entrada:
+        origen = argumentos.entrada
+    else:
+        partida = (
+            '[Event "Prueba"]\n[Site "?"]\n[Date "2024.01.01"]\n[Round "1"]\n'
+            '[White "Blancas"]\n[Black "Negras"]\n[Result "1-0"]\n\n'
+            "1. e4 e5 2. Nf3 Nc6 3. Bb5 {La española} a6 (3... Nf6 4. O-O Nxe4 $1) 4. Ba4 Nf6\n"
+            "5. O-O Be7 6. Re1 b5 7. Bb3 d6 8. c3 O-O 9. h3 Nb8!? 10. d4 Nbd7 11. c4 c6\n"
+            "12. cxb5 axb5 13. Nc3 Bb7 14. Bg5 b4 15. Nb1 h6 16. Bh4 c5 17. dxe5 Nxe4\n"
+            "18. Bxe7 Qxe7 19. exd6 Qf6 20. Nbd2 Nxd6 21. Nc4 Nxc4 22. Bxc4 Nb6 1-0\n\n"
+        )
+        origen = io.StringIO(partida * argumentos.partidas)
+
+    inicio = time.perf_counter()
+    partidas = validas = jugadas = variantes = 0
+    for pgn in leer_pgn(origen, con_anotaciones=not argumentos.sin_anotaciones,
+                        con_variantes=not argumentos.sin_variantes):
+        partidas += 1
+        validas += pgn.es_valida
+        jugadas += pgn.arbol.num_nodos
+        variantes += pgn.arbol.num_variantes
+    duracion = time.perf_counter() - inicio
+    print(f"{partidas} partidas ({validas} válidas, {jugadas} jugadas, {variantes} variantes) "
+          f"en {duracion:.2f}s: {partidas / duracion:.0f} partidas/s, {jugadas / duracion:.0f} jugadas/s")
@@ -0,0 +1,110 @@
+# src/core/reproduccion.py
+from .tablero import Tablero
+
+
+class ReproduccionPartida:
+    """
+    Acceso aleatorio a la posición después de cualquier ply de una partida.
+
+    Al crearse reproduce la partida una vez y guarda una instantánea compacta del
+    tablero cada 'intervalo' plies. Para obtener la posición tras el ply N se parte de
+    la instantánea anterior más cercana y se reproducen como mucho intervalo - 1 jugadas,
+    en lugar de reproducir la partida desde el principio.
+
+    El ply 0 es la posición inicial; el ply N es la posición después de la N-ésima jugada.
+    """
+
+    def __init__(self, partida, intervalo=10):
+        """
+        Args:
+            partida (Partida): Partida válida sintácticamente.
+            intervalo (int): Plies entre instantáneas (k). Menor = consultas más rápidas y más memoria.
+
+        Raises:
+            ValueError: Si la partida no es válida, si un turno intermedio no tiene jugada
+                        negra, o si alguna jugada es imposible en su posición.
+        """
+        if not partida.es_valida_sintacticamente:
+            raise ValueError("Solo se pueden reproducir partidas válidas sintácticamente.")
+        if intervalo < 1:
+            raise ValueError("El intervalo entre instantáneas debe ser al menos 1.")
+        self.intervalo = intervalo
+        self.plies = []
+        for i, turno in enumerate(partida.turnos):
+            self.plies.append(turno.jugada_blanca.san_string)
+            if turno.jugada_negra:
+                self.plies.append(turno.jugada_negra.san_string)
+            elif i != len(partida.turnos) - 1:
+                raise ValueError(f"El turno {turno.numero_turno} no tiene jugada negra y no es el último.")
+
+        tablero = Tablero()
+        if partida.turnos:
+            tablero.numero_jugada = partida.turnos[0].numero_turno
+        self._instantaneas = [tablero.instantanea()]
+        for ply, san in enumerate(self.plies, start=1):
+            try:
+                tablero.aplicar_san(san)
+            except ValueError as ve:
+                raise ValueError(f"Ply {ply} ('{san}'): {ve}") from None
+            if ply % intervalo == 0:
+                self._instantaneas.append(tablero.instantanea())
+
+    def __len__(self):
+        """Número de plies de la partida."""
+        return len(self.plies)
+
+    def posicion(self, ply):
+        """
+        Retorna un Tablero nuevo con la posición después de 'ply' jugadas.
+
+        Raises:
+            IndexError: Si 'ply' está fuera de 0..len(self).
+        """
+        if not 0 <= ply <= len(self.plies):
+            raise IndexError(f"Ply {ply} fuera de rango (0..{len(self.plies)}).")
+        indice = ply // self.intervalo
+        tablero = Tablero.desde_instantanea(self._instantaneas[indice])
+        for san in self.plies[indice * self.intervalo:ply]:
+            tablero.aplicar_san(san)
+        return tablero
+
+    def fen(self, ply):
+        """Posición en FEN después de 'ply' jugadas."""
+        return self.posicion(ply).fen()
+
+    def fens(self):
+        """Genera el FEN de cada ply (0..len) reproduciendo la partida una sola vez."""
+        tablero = Tablero.desde_instantanea(self._instantaneas[0])
+        yield tablero.fen()
+        for san in self.plies:
+            tablero.aplicar_san(san)
+            yield tablero.fen()
+
+
+# Medición de memoria y latencia en partidas de 300 plies (útil durante el desarrollo).
+# Ejecutar desde la raíz del proyecto: python -m src.core.reproduccion
+if __name__ == '__main__':
+    import random
+    import sys
+    import time
+    from .partida import Partida
+
+    # Partida de 300 plies: los caballos van y vienen sin que la posición se repita en su forma.
+    ciclo = ["Nf3", "Nf6", "Ng1", "Ng8", "Nc3", "Nc6", "Nb1", "Nb8"]
+    plies = ["e4", "e5"] + [ciclo[i % len(ciclo)] for i in range(298)]
+    texto = " ".join(f"{n // 2 + 1}. {plies[n]} {plies[n + 1]}" for n in range(0, len(plies), 2))
+    partida = Partida(texto)
+
+    rng = random.Random(0)
+    consultas = [rng.randint(0, len(plies)) for _ in range(2000)]
+    for k in (1, 5, 10, 25, 50, 300):
+        inicio = time.perf_counter()
+        reproduccion = ReproduccionPartida(partida, intervalo=k)
+        t_construccion = time.perf_counter() - inicio
+        memoria = sum(sys.getsizeof(i) + sys.getsizeof(i[0]) for i in reproduccion._instantaneas)
+        inicio = time.perf_counter()
+        for ply in consultas:
+            reproduccion.fen(ply)
+        t_consulta = (time.perf_counter() - inicio) / len(consultas)
+        print(f"k={k:3d}: {len(reproduccion._instantaneas):3d} instantáneas, {memoria / 1024:6.1f} KiB, "
+              f"construcción {t_construccion * 1000:.1f} ms, consulta media {t_consulta * 1e6:.0f} µs")
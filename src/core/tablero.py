@@ -0,0 +1,305 @@
+# src/core/tablero.py
+import re
+
+# Representación del tablero: lista de 64 caracteres, índice = fila * 8 + columna,
+# con a1 = 0, h1 = 7, a8 = 56. Las piezas blancas van en mayúscula ("PNBRQK"), las
+# negras en minúscula y las casillas vacías son ".".
+_VACIA = "."
+_POSICION_INICIAL = (
+    "RNBQKBNR"
+    "PPPPPPPP"
+    "........"
+    "........"
+    "........"
+    "........"
+    "pppppppp"
+    "rnbqkbnr"
+)
+
+_SALTOS_CABALLO = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+_PASOS_REY = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+_DIRECCIONES_TORRE = ((1, 0), (-1, 0), (0, 1), (0, -1))
+_DIRECCIONES_ALFIL = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+# Jugada SAN sin sufijos de jaque/anotación: pieza, desambiguación, captura, destino, promoción.
+_PATRON_SAN = re.compile(r"([KQRBN])?([a-h])?([1-8])?(x)?([a-h][1-8])(?:=?([QRBN]))?(?:e\.p\.)?")
+
+
+def _casilla(nombre):
+    """Convierte "e4" en su índice (28)."""
+    return (int(nombre[1]) - 1) * 8 + (ord(nombre[0]) - ord("a"))
+
+
+def _nombre_casilla(indice):
+    return "abcdefgh"[indice % 8] + str(indice // 8 + 1)
+
+
+class Tablero:
+    """
+    Posición de ajedrez con las reglas necesarias para reproducir jugadas SAN:
+    resolución de la pieza que mueve (incluida la desambiguación y las clavadas),
+    enroques, captura al paso, promoción y exportación a FEN.
+
+    Movimiento solo valida la sintaxis; aquí se detectan las jugadas imposibles en la
+    posición (ValueError en aplicar_san).
+    """
+
+    def __init__(self):
+        self.casillas = list(_POSICION_INICIAL)
+        self.turno = "w"            # "w" = mueven blancas, "b" = mueven negras (como en FEN)
+        self.enroques = "KQkq"      # Derechos de enroque en formato FEN ("" si no quedan)
+        self.al_paso = None         # Casilla (índice) de captura al paso, o None
+        self.medio_movimientos = 0  # Plies desde la última captura o jugada de peón
+        self.numero_jugada = 1      # Número de turno, como en FEN
+
+    # --- Instantáneas compactas ---
+
+    def instantanea(self):
+        """Estado completo en forma compacta e inmutable (unos 100 bytes)."""
+        return ("".join(self.casillas).encode("ascii"), self.turno, self.enroques,
+                self.al_paso, self.medio_movimientos, self.numero_jugada)
+
+    @classmethod
+    def desde_instantanea(cls, instantanea):
+        tablero = cls.__new__(cls)
+        casillas, tablero.turno, tablero.enroques, tablero.al_paso, \
+            tablero.medio_movimientos, tablero.numero_jugada = instantanea
+        tablero.casillas = list(casillas.decode("ascii"))
+        return tablero
+
+    # --- Consultas ---
+
+    @staticmethod
+    def _es_blanca(pieza):
+        return pieza.isupper()
+
+    def _pieza_propia(self, pieza, color):
+        return pieza.upper() if color == "w" else pieza.lower()
+
+    def _atacada(self, casilla, por_color):
+        """Indica si 'casilla' está atacada por alguna pieza del color 'por_color'."""
+        c = self.casillas
+        fila, columna = divmod(casilla, 8)
+
+        def pieza_en(df, dc):
+            f, col = fila + df, columna + dc
+            if 0 <= f < 8 and 0 <= col < 8:
+                return c[f * 8 + col]
+            return None
+
+        caballo, rey, peon = (("N", "K", "P") if por_color == "w" else ("n", "k", "p"))
+        torre, alfil, dama = (("R", "B", "Q") if por_color == "w" else ("r", "b", "q"))
+        if any(pieza_en(df, dc) == caballo for df, dc in _SALTOS_CABALLO):
+            return True
+        if any(pieza_en(df, dc) == rey for df, dc in _PASOS_REY):
+            return True
+        direccion_peon = -1 if por_color == "w" else 1  # Un peón blanco ataca desde la fila inferior.
+        if pieza_en(direccion_peon, -1) == peon or pieza_en(direccion_peon, 1) == peon:
+            return True
+        for direcciones, piezas in ((_DIRECCIONES_TORRE, (torre, dama)), (_DIRECCIONES_ALFIL, (alfil, dama))):
+            for df, dc in direcciones:
+                f, col = fila + df, columna + dc
+                while 0 <= f < 8 and 0 <= col < 8:
+                    pieza = c[f * 8 + col]
+                    if pieza != _VACIA:
+                        if pieza in piezas:
+                            return True
+                        break
+                    f += df
+                    col += dc
+        return False
+
+    def en_jaque(self, color=None):
+        """Indica si el rey del color indicado (por defecto, el que mueve) está en jaque."""
+        color = color or self.turno
+        rey = self.casillas.index("K" if color == "w" else "k")
+        return self._atacada(rey, "b" if color == "w" else "w")
+
+    # --- Aplicación de jugadas ---
+
+    def _origenes(self, tipo, destino, color, captura, columna_peon):
+        """Casillas desde las que una pieza 'tipo' de 'color' puede llegar a 'destino' (sin mirar clavadas)."""
+        c = self.casillas
+        pieza = self._pieza_propia(tipo, color)
+        fila, columna = divmod(destino, 8)
+        origenes = []
+        if tipo == "P":
+            avance = 1 if color == "w" else -1
+            if captura:
+                f, col = fila - avance, columna_peon
+                if 0 <= f < 8 and abs(col - columna) == 1 and c[f * 8 + col] == pieza:
+                    origenes.append(f * 8 + col)
+            else:
+                f = fila - avance
+                if 0 <= f < 8 and c[f * 8 + columna] == pieza:
+                    origenes.append(f * 8 + columna)
+                elif 0 <= f < 8 and c[f * 8 + columna] == _VACIA and fila == (3 if color == "w" else 4) \
+                        and c[(f - avance) * 8 + columna] == pieza:
+                    origenes.append((f - avance) * 8 + columna)
+            return origenes
+        if tipo in ("N", "K"):
+            for df, dc in (_SALTOS_CABALLO if tipo == "N" else _PASOS_REY):
+                f, col = fila + df, columna + dc
+                if 0 <= f < 8 and 0 <= col < 8 and c[f * 8 + col] == pieza:
+                    origenes.append(f * 8 + col)
+            return origenes
+        direcciones = {"R": _DIRECCIONES_TORRE, "B": _DIRECCIONES_ALFIL,
+                       "Q": _DIRECCIONES_TORRE + _DIRECCIONES_ALFIL}[tipo]
+        for df, dc in direcciones:
+            f, col = fila + df, columna + dc
+            while 0 <= f < 8 and 0 <= col < 8:
+                contenido = c[f * 8 + col]
+                if contenido != _VACIA:
+                    if contenido == pieza:
+                        origenes.append(f * 8 + col)
+                    break
+                f += df
+                col += dc
+        return origenes
+
+    def aplicar_san(self, san):
+        """
+        Aplica una jugada SAN a la posición.
+
+        Acepta los sufijos "+", "#", anotaciones ("!", "?") y los enroques "0-0"/"O-O".
+
+        Raises:
+            ValueError: Si la jugada no es posible en la posición actual.
+        """
+        color = self.turno
+        rival = "b" if color == "w" else "w"
+        jugada = san.strip().rstrip("+#!?")
+        if jugada in ("0-0", "O-O", "0-0-0", "O-O-O"):
+            self._enrocar(len(jugada) == 5, san)
+        else:
+            match = _PATRON_SAN.fullmatch(jugada)
+            if not match:
+                raise ValueError(f"Jugada no reconocida: '{san}'.")
+            tipo = match.group(1) or "P"
+            columna_origen = match.group(2)
+            fila_origen = match.group(3)
+            captura = match.group(4) is not None
+            destino = _casilla(match.group(5))
+            promocion = match.group(6)
+
+            if tipo == "P":
+                if columna_origen is None and captura:
+                    raise ValueError(f"Captura de peón sin columna de origen: '{san}'.")
+                columna_peon = ord(columna_origen) - ord("a") if columna_origen else None
+                origenes = self._origenes("P", destino, color, captura, columna_peon)
+            else:
+                origenes = self._origenes(tipo, destino, color, captura, None)
+                if columna_origen:
+                    origenes = [o for o in origenes if o % 8 == ord(columna_origen) - ord("a")]
+                if fila_origen:
+                    origenes = [o for o in origenes if o // 8 == int(fila_origen) - 1]
+
+            destino_ocupado = self.casillas[destino]
+            es_al_paso = tipo == "P" and captura and destino_ocupado == _VACIA and destino == self.al_paso
+            if destino_ocupado != _VACIA and (self._es_blanca(destino_ocupado) == (color == "w")):
+                raise ValueError(f"La casilla de destino de '{san}' está ocupada por una pieza propia.")
+            if captura and destino_ocupado == _VACIA and not es_al_paso:
+                raise ValueError(f"'{san}' indica captura pero la casilla de destino está vacía.")
+            if not captura and destino_ocupado != _VACIA:
+                raise ValueError(f"'{san}' no indica captura pero la casilla de destino está ocupada.")
+
+            legales = [o for o in origenes if self._es_legal(o, destino, es_al_paso)]
+            if not legales:
+                raise ValueError(f"Ninguna pieza puede jugar '{san}' en esta posición.")
+            if len(legales) > 1:
+                raise ValueError(f"La jugada '{san}' es ambigua en esta posición.")
+            origen = legales[0]
+
+            ultima_fila = 7 if color == "w" else 0
+            if tipo == "P" and destino // 8 == ultima_fila and not promocion:
+                raise ValueError(f"Falta la pieza de promoción en '{san}'.")
+            if promocion and (tipo != "P" or destino // 8 != ultima_fila):
+                raise ValueError(f"Promoción imposible en '{san}'.")
+
+            self._mover(origen, destino, es_al_paso, promocion)
+            self.medio_movimientos = 0 if (tipo == "P" or captura) else self.medio_movimientos + 1
+            self.al_paso = (origen + destino) // 2 if tipo == "P" and abs(destino - origen) == 16 else None
+
+        self.turno = rival
+        if color == "b":
+            self.numero_jugada += 1
+
+    def _es_legal(self, origen, destino, es_al_paso):
+        """Comprueba que mover de 'origen' a 'destino' no deja al propio rey en jaque."""
+        c = self.casillas
+        color = self.turno
+        guardado = (c[origen], c[destino])
+        capturada_al_paso = None
+        c[destino], c[origen] = c[origen], _VACIA
+        if es_al_paso:
+            capturada_al_paso = destino - 8 if color == "w" else destino + 8
+            guardado_al_paso = c[capturada_al_paso]
+            c[capturada_al_paso] = _VACIA
+        try:
+            return not self.en_jaque(color)
+        finally:
+            c[origen], c[destino] = guardado
+            if capturada_al_paso is not None:
+                c[capturada_al_paso] = guardado_al_paso
+
+    def _mover(self, origen, destino, es_al_paso, promocion):
+        c = self.casillas
+        pieza = c[origen]
+        c[origen] = _VACIA
+        c[destino] = self._pieza_propia(promocion, self.turno) if promocion else pieza
+        if es_al_paso:
+            c[destino - 8 if self.turno == "w" else destino + 8] = _VACIA
+        # Los derechos de enroque se pierden al mover el rey o una torre, o al capturar una torre.
+        for casilla, derechos in ((4, "KQ"), (60, "kq"), (0, "Q"), (7, "K"), (56, "q"), (63, "k")):
+            if origen == casilla or destino == casilla:
+                self.enroques = "".join(d for d in self.enroques if d not in derechos)
+
+    def _enrocar(self, largo, san):
+        color = self.turno
+        base = 0 if color == "w" else 56
+        derecho = ("Q" if largo else "K") if color == "w" else ("q" if largo else "k")
+        if derecho not in self.enroques:
+            raise ValueError(f"Enroque '{san}' no permitido: el rey o la torre ya se movieron.")
+        rival = "b" if color == "w" else "w"
+        if largo:
+            vacias, recorrido, torre_origen, torre_destino, rey_destino = (1, 2, 3), (4, 3, 2), 0, 3, 2
+        else:
+            vacias, recorrido, torre_origen, torre_destino, rey_destino = (5, 6), (4, 5, 6), 7, 5, 6
+        c = self.casillas
+        if any(c[base + i] != _VACIA for i in vacias):
+            raise ValueError(f"Enroque '{san}' no permitido: hay piezas entre el rey y la torre.")
+        if any(self._atacada(base + i, rival) for i in recorrido):
+            raise ValueError(f"Enroque '{san}' no permitido: el rey está en jaque o cruza una casilla atacada.")
+        c[base + rey_destino], c[base + 4] = c[base + 4], _VACIA
+        c[base + torre_destino], c[base + torre_origen] = c[base + torre_origen], _VACIA
+        self.enroques = "".join(d for d in self.enroques if d not in (("K", "Q") if color == "w" else ("k", "q")))
+        self.al_paso = None
+        self.medio_movimientos += 1
+
+    # --- Exportación ---
+
+    def fen(self):
+        """Posición en notación FEN."""
+        filas = []
+        for fila in range(7, -1, -1):
+            texto, vacias = [], 0
+            for pieza in self.casillas[fila * 8:fila * 8 + 8]:
+                if pieza == _VACIA:
+                    vacias += 1
+                    continue
+                if vacias:
+                    texto.append(str(vacias))
+                    vacias = 0
+                texto.append(pieza)
+            if vacias:
+                texto.append(str(vacias))
+            filas.append("".join(texto))
+        al_paso = _nombre_casilla(self.al_paso) if self.al_paso is not None else "-"
+        return (f"{'/'.join(filas)} {self.turno} {self.enroques or '-'} {al_paso} "
+                f"{self.medio_movimientos} {self.numero_jugada}")
+
+    def __str__(self):
+        return "\n".join("".join(self.casillas[f * 8:f * 8 + 8]) for f in range(7, -1, -1))
+
+    def __repr__(self):
+        return f"Tablero('{self.fen()}')"
@@ -7,7 +7,7 @@ class Turno:
     Un turno consiste en un número de turno, una jugada de las blancas
     y, opcionalmente, una jugada de las negras.
     """
-    def __init__(self, numero_turno, san_jugada_blanca, san_jugada_negra=None):
+    def __init__(self, numero_turno, san_jugada_blanca, san_jugada_negra=None, reconocedor=None):
         """
         Inicializa un objeto Turno.
 
@@ -16,6 +16,8 @@ class Turno:
             san_jugada_blanca (str): La jugada de las blancas en notación SAN.
             san_jugada_negra (str, optional): La jugada de las negras en notación SAN.
                                                Defaults to None.
+            reconocedor (ReconocedorSAN, optional): Gramática compilada con la que se validan
+                                                    las jugadas. Por defecto, la estándar.
         """
         if not isinstance(numero_turno, int) or numero_turno <= 0:
             raise ValueError("El número de turno debe ser un entero positivo.")
@@ -24,15 +26,31 @@ class Turno:
         if not san_jugada_blanca or not isinstance(san_jugada_blanca, str):
             # Aunque Movimiento maneja strings vacíos, es bueno validar aquí también.
             raise ValueError("La jugada de las blancas no puede estar vacía y debe ser una cadena.")
-        self.jugada_blanca = Movimiento(san_jugada_blanca)
+        self.jugada_blanca = Movimiento(san_jugada_blanca, reconocedor)
 
         self.jugada_negra = None
         if san_jugada_negra and isinstance(san_jugada_negra, str):
-            self.jugada_negra = Movimiento(san_jugada_negra)
+            self.jugada_negra = Movimiento(san_jugada_negra, reconocedor)
         elif san_jugada_negra is not None: # Si se proveyó algo que no es un string válido
              raise ValueError("La jugada de las negras, si se provee, debe ser una cadena.")
 
 
+    @classmethod
+    def desde_movimientos(cls, numero_turno, jugada_blanca, jugada_negra=None):
+        """
+        Crea un Turno a partir de objetos Movimiento ya construidos, sin validarlos de nuevo.
+
+        Args:
+            numero_turno (int): El número de turno.
+            jugada_blanca (Movimiento): La jugada de las blancas.
+            jugada_negra (Movimiento, optional): La jugada de las negras.
+        """
+        turno = cls.__new__(cls)
+        turno.numero_turno = numero_turno
+        turno.jugada_blanca = jugada_blanca
+        turno.jugada_negra = jugada_negra
+        return turno
+
     @property
     def es_valido(self):
         """
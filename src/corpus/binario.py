@@ -0,0 +1,456 @@
+# src/corpus/binario.py
+
+# Formato binario compacto y versionado para guardar partidas ya validadas.
+#
+# Cada jugada se guarda como un código de 16 bits de un diccionario fijo de jugadas SAN
+# (ver _construir_diccionario); las que no están en el diccionario (desambiguación por
+# casilla completa, dialectos...) se guardan en línea tras el código de escape. Al leer
+# no se vuelve a aplicar ninguna expresión regular ni la gramática: el veredicto de la
+# validación viaja con la partida.
+#
+# Estructura del archivo (todos los enteros en little-endian):
+#   Cabecera:  magia "AJZB", versión u16, reservado u16, número de partidas u64,
+#              posición del índice u64.
+#   Registros: uno por partida (ver _REGISTRO), alineados a 4 bytes.
+#   Índice:    posición u64 de cada registro, para acceso aleatorio.
+
+import mmap
+import struct
+import sys
+import threading
+from array import array
+
+from ..core.movimiento import Movimiento
+from ..core.turno import Turno
+from ..core.partida import Partida
+from ..tree.arbol_partida import ArbolBinarioPartida
+
+MAGIA = b"AJZB"
+VERSION = 1
+
+_CABECERA = struct.Struct("<4sHHQQ")
+# longitud del registro, veredicto, banderas, reservado, campo_a, campo_b.
+#   Partida válida:   campo_a = primer turno (o número de turnos si BANDERA_TURNOS_EXPLICITOS),
+#                     campo_b = número de unidades u16 del flujo de códigos.
+#   Partida inválida: campo_a = bytes del texto UTF-8, campo_b = posición del error (o _SIN_POSICION).
+_REGISTRO = struct.Struct("<IBBHII")
+# Jugada escapada en el flujo de códigos: CODIGO_ESCAPE, bytes de la jugada (u16), índice
+# de su regla en _REGLAS (u16) y la jugada en UTF-8 rellena hasta un número par de bytes.
+
+VEREDICTO_INVALIDA = 0
+VEREDICTO_VALIDA = 1
+
+# Los turnos no son consecutivos o alguno intermedio no tiene jugada negra: se guardan
+# explícitamente el número y las jugadas (1 o 2) de cada turno.
+BANDERA_TURNOS_EXPLICITOS = 1
+# El flujo de códigos contiene jugadas escapadas (no se puede leer como un array plano).
+BANDERA_ESCAPES = 2
+
+CODIGO_ESCAPE = 0xFFFF
+_SIN_POSICION = 0xFFFFFFFF
+
+# Reglas de <jugada> (el índice es el que se guarda en las jugadas escapadas).
+_REGLAS = (None, "enroque", "movimiento_pieza", "peon_avance", "peon_captura")
+_INDICE_REGLA = {regla: i for i, regla in enumerate(_REGLAS)}
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+_diccionario = None
+_cerrojo_diccionario = threading.Lock()
+
+
+def _construir_diccionario():
+    """
+    Enumera el diccionario fijo de jugadas de la versión 1 del formato.
+
+    El orden forma parte del formato: cambiarlo exige subir VERSION. Contiene los
+    enroques, las jugadas de pieza con desambiguación por columna o fila, los avances y
+    las capturas de peón, cada una con promoción opcional (peones) y jaque o mate
+    opcionales. En total 41.282 jugadas, por lo que cada código cabe en 16 bits.
+
+    Returns:
+        tuple: (lista de (san, regla) indexada por código, dict san -> código)
+    """
+    letras = "abcdefgh"
+    casillas = [l + n for n in "12345678" for l in letras]
+    sufijos = ("", "+", "#")
+    promociones = ("", "=Q", "=R", "=B", "=N")
+
+    tabla = [("0-0", "enroque"), ("0-0-0", "enroque")]
+    for pieza in "KQRBN":
+        for desambiguacion in ("",) + tuple(letras) + tuple("12345678"):
+            for captura in ("", "x"):
+                for casilla in casillas:
+                    for sufijo in sufijos:
+                        tabla.append((pieza + desambiguacion + captura + casilla + sufijo, "movimiento_pieza"))
+    for casilla in casillas:
+        for promocion in promociones:
+            for sufijo in sufijos:
+                tabla.append((casilla + promocion + sufijo, "peon_avance"))
+    for origen in letras:
+        for casilla in casillas:
+            for promocion in promociones:
+                for sufijo in sufijos:
+                    tabla.append((origen + "x" + casilla + promocion + sufijo, "peon_captura"))
+    return tabla, {san: codigo for codigo, (san, _) in enumerate(tabla)}
+
+
+def diccionario_jugadas():
+    """Retorna (tabla código -> (san, regla), dict san -> código), construidos una sola vez."""
+    global _diccionario
+    if _diccionario is None:
+        with _cerrojo_diccionario:
+            if _diccionario is None:
+                _diccionario = _construir_diccionario()
+    return _diccionario
+
+
+def _alinear(bytes_, multiplo):
+    return bytes_ + b"\0" * (-len(bytes_) % multiplo)
+
+
+def codificar_partida(partida):
+    """
+    Codifica una Partida ya construida como un registro del formato binario.
+
+    Args:
+        partida (Partida): Partida validada (válida o no).
+
+    Returns:
+        bytes: El registro completo, con su cabecera.
+    """
+    if not partida.es_valida_sintacticamente:
+        texto = partida.texto_original.encode("utf-8")
+        posicion = _SIN_POSICION if partida.posicion_error is None else partida.posicion_error
+        cuerpo = _alinear(texto, 4)
+        return _REGISTRO.pack(_REGISTRO.size + len(cuerpo), VEREDICTO_INVALIDA, 0, 0,
+                              len(texto), posicion) + cuerpo
+
+    _, codigos_por_san = diccionario_jugadas()
+    turnos = partida.turnos
+    primer_turno = turnos[0].numero_turno
+    banderas = 0
+    for i, turno in enumerate(turnos):
+        if turno.numero_turno != primer_turno + i or (turno.jugada_negra is None and i != len(turnos) - 1):
+            banderas |= BANDERA_TURNOS_EXPLICITOS
+            break
+
+    codigos = array("H")
+    for turno in turnos:
+        for jugada in (turno.jugada_blanca, turno.jugada_negra):
+            if jugada is None:
+                continue
+            codigo = codigos_por_san.get(jugada.san_string)
+            if codigo is not None:
+                codigos.append(codigo)
+                continue
+            banderas |= BANDERA_ESCAPES
+            san = jugada.san_string.encode("utf-8")
+            codigos.extend((CODIGO_ESCAPE, len(san), _INDICE_REGLA.get(jugada.regla, 0)))
+            codigos.frombytes(_alinear(san, 2))
+    if not _LITTLE_ENDIAN:
+        codigos.byteswap()
+
+    partes = []
+    if banderas & BANDERA_TURNOS_EXPLICITOS:
+        campo_a = len(turnos)
+        partes.append(struct.pack(f"<{len(turnos)}I", *(t.numero_turno for t in turnos)))
+        partes.append(_alinear(bytes(1 if t.jugada_negra is None else 2 for t in turnos), 4))
+    else:
+        campo_a = primer_turno
+    partes.append(_alinear(codigos.tobytes(), 4))
+    cuerpo = b"".join(partes)
+    return _REGISTRO.pack(_REGISTRO.size + len(cuerpo), VEREDICTO_VALIDA, banderas, 0,
+                          campo_a, len(codigos)) + cuerpo
+
+
+class EscritorBinario:
+    """
+    Escribe partidas en un archivo del formato binario, en streaming.
+
+    El índice de posiciones se acumula en memoria (8 bytes por partida) y se escribe al
+    cerrar, junto con la cabecera definitiva. Usar como gestor de contexto.
+    """
+
+    def __init__(self, ruta):
+        self.archivo = open(ruta, "wb")
+        self.archivo.write(_CABECERA.pack(MAGIA, VERSION, 0, 0, 0))
+        self._posiciones = array("Q")
+        self._posicion = _CABECERA.size
+
+    def agregar(self, partida):
+        """Añade una Partida (válida o no) al final del archivo."""
+        registro = codificar_partida(partida)
+        self.archivo.write(registro)
+        self._posiciones.append(self._posicion)
+        self._posicion += len(registro)
+
+    def agregar_texto(self, texto_partida, reconocedor=None):
+        """Valida el texto SAN de una partida y la añade. Retorna la Partida creada."""
+        partida = Partida(texto_partida, reconocedor)
+        self.agregar(partida)
+        return partida
+
+    def __len__(self):
+        return len(self._posiciones)
+
+    def cerrar(self):
+        if self.archivo.closed:
+            return
+        posiciones = self._posiciones
+        if not _LITTLE_ENDIAN:
+            posiciones = array("Q", posiciones)
+            posiciones.byteswap()
+        self.archivo.write(posiciones.tobytes())
+        self.archivo.seek(0)
+        self.archivo.write(_CABECERA.pack(MAGIA, VERSION, 0, len(self._posiciones), self._posicion))
+        self.archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def escribir_partidas(ruta, partidas):
+    """
+    Guarda un iterable de partidas en 'ruta'.
+
+    Args:
+        ruta (str): Archivo de salida.
+        partidas (iterable): Objetos Partida o textos SAN (que se validan al escribirse).
+
+    Returns:
+        int: Número de partidas escritas.
+    """
+    with EscritorBinario(ruta) as escritor:
+        for partida in partidas:
+            if isinstance(partida, str):
+                escritor.agregar_texto(partida)
+            else:
+                escritor.agregar(partida)
+        return len(escritor)
+
+
+class LectorBinario:
+    """
+    Lee un archivo del formato binario proyectándolo en memoria (mmap).
+
+    Abrir el archivo no lee las partidas: cada registro se decodifica solo al pedirlo,
+    por índice (acceso aleatorio mediante el índice del final del archivo) o en un
+    recorrido secuencial. Usar como gestor de contexto.
+    """
+
+    def __init__(self, ruta):
+        """
+        Raises:
+            ValueError: Si el archivo no es del formato o es de una versión no soportada.
+        """
+        self.ruta = ruta
+        with open(ruta, "rb") as archivo:
+            self._mm = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < _CABECERA.size:
+            self._mm.close()
+            raise ValueError(f"'{ruta}' es demasiado corto para ser un archivo de partidas binario.")
+        magia, version, _, self._num_partidas, posicion_indice = _CABECERA.unpack_from(self._mm, 0)
+        if magia != MAGIA:
+            self._mm.close()
+            raise ValueError(f"'{ruta}' no es un archivo de partidas binario (magia {magia!r}).")
+        if version != VERSION:
+            self._mm.close()
+            raise ValueError(f"Versión {version} del formato no soportada (se esperaba {VERSION}).")
+        self._posicion_indice = posicion_indice
+        self._tabla = diccionario_jugadas()[0]
+        self._sanes = [san for san, _ in self._tabla]
+
+    def __len__(self):
+        return self._num_partidas
+
+    def _posicion_registro(self, i):
+        if not -self._num_partidas <= i < self._num_partidas:
+            raise IndexError(f"Partida {i} fuera de rango (0..{self._num_partidas - 1}).")
+        return struct.unpack_from("<Q", self._mm, self._posicion_indice + 8 * (i % self._num_partidas))[0]
+
+    def _codigos(self, inicio, unidades):
+        """Array u16 con el flujo de códigos que empieza en 'inicio'."""
+        codigos = array("H")
+        codigos.frombytes(self._mm[inicio:inicio + 2 * unidades])
+        if not _LITTLE_ENDIAN:
+            codigos.byteswap()
+        return codigos
+
+    def _decodificar(self, posicion):
+        """
+        Decodifica el registro que empieza en 'posicion'.
+
+        Returns:
+            tuple: (veredicto, turnos, jugadas, longitud). Para partidas válidas, 'turnos' es
+                   una lista de (número, jugadas del turno) o, si son consecutivos, el número
+                   del primer turno; 'jugadas' es la lista de (san, regla) de cada ply. Para
+                   inválidas, 'turnos' es la posición del error y 'jugadas' el texto original.
+        """
+        longitud, veredicto, banderas, _, campo_a, campo_b = _REGISTRO.unpack_from(self._mm, posicion)
+        inicio = posicion + _REGISTRO.size
+        if veredicto == VEREDICTO_INVALIDA:
+            texto = self._mm[inicio:inicio + campo_a].decode("utf-8")
+            return veredicto, (None if campo_b == _SIN_POSICION else campo_b), texto, longitud
+
+        turnos = campo_a
+        if banderas & BANDERA_TURNOS_EXPLICITOS:
+            numeros = struct.unpack_from(f"<{campo_a}I", self._mm, inicio)
+            inicio += 4 * campo_a
+            turnos = list(zip(numeros, self._mm[inicio:inicio + campo_a]))
+            inicio += campo_a + (-campo_a % 4)
+
+        codigos = self._codigos(inicio, campo_b)
+        tabla = self._tabla
+        if not banderas & BANDERA_ESCAPES:
+            return veredicto, turnos, [tabla[c] for c in codigos], longitud
+        jugadas = []
+        i = 0
+        while i < len(codigos):
+            codigo = codigos[i]
+            if codigo != CODIGO_ESCAPE:
+                jugadas.append(tabla[codigo])
+                i += 1
+                continue
+            bytes_san, regla = codigos[i + 1], codigos[i + 2]
+            desde = inicio + 2 * (i + 3)
+            jugadas.append((self._mm[desde:desde + bytes_san].decode("utf-8"), _REGLAS[regla]))
+            i += 3 + (bytes_san + 1) // 2
+        return veredicto, turnos, jugadas, longitud
+
+    def es_valida(self, i):
+        """Veredicto de validación de la partida i, sin decodificar sus jugadas."""
+        return self._mm[self._posicion_registro(i) + 4] == VEREDICTO_VALIDA
+
+    def plies(self, i):
+        """Jugadas SAN de la partida i (lista vacía si es inválida)."""
+        veredicto, _, jugadas, _ = self._decodificar(self._posicion_registro(i))
+        if veredicto != VEREDICTO_VALIDA:
+            return []
+        return [san for san, _ in jugadas]
+
+    def _a_partida(self, veredicto, turnos, jugadas):
+        if veredicto != VEREDICTO_VALIDA:
+            # Las inválidas se guardan como texto: se vuelven a analizar para obtener el error.
+            return Partida(jugadas)
+        if not isinstance(turnos, list):
+            primer_turno = turnos
+            turnos = [(primer_turno + n, min(2, len(jugadas) - 2 * n)) for n in range((len(jugadas) + 1) // 2)]
+        movimientos = iter(jugadas)
+        resultado = []
+        for numero, cantidad in turnos:
+            blanca = Movimiento.desde_validada(*next(movimientos))
+            negra = Movimiento.desde_validada(*next(movimientos)) if cantidad == 2 else None
+            resultado.append(Turno.desde_movimientos(numero, blanca, negra))
+        return Partida.desde_turnos(resultado)
+
+    def partida(self, i):
+        """Reconstruye la Partida i sin analizar texto (las inválidas sí se vuelven a analizar)."""
+        veredicto, turnos, jugadas, _ = self._decodificar(self._posicion_registro(i))
+        return self._a_partida(veredicto, turnos, jugadas)
+
+    def arbol(self, i):
+        """Reconstruye el ArbolBinarioPartida de la partida i a partir de sus jugadas codificadas."""
+        partida = self.partida(i)
+        arbol = ArbolBinarioPartida()
+        if partida.es_valida_sintacticamente:
+            arbol.construir_arbol(partida.turnos)
+        return arbol
+
+    def __getitem__(self, i):
+        return self.partida(i)
+
+    def iterar_plies(self):
+        """
+        Recorre el archivo secuencialmente (sin usar el índice).
+
+        Yields:
+            tuple: (es_valida, lista de jugadas SAN) de cada partida, en orden.
+        """
+        posicion = _CABECERA.size
+        for _ in range(self._num_partidas):
+            veredicto, _, jugadas, longitud = self._decodificar(posicion)
+            posicion += longitud
+            if veredicto == VEREDICTO_VALIDA:
+                yield True, [san for san, _ in jugadas]
+            else:
+                yield False, []
+
+    def iterar_partidas(self):
+        """Recorre el archivo secuencialmente y genera cada Partida reconstruida."""
+        posicion = _CABECERA.size
+        for _ in range(self._num_partidas):
+            veredicto, turnos, jugadas, longitud = self._decodificar(posicion)
+            posicion += longitud
+            yield self._a_partida(veredicto, turnos, jugadas)
+
+    def cerrar(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+# Conversión de un corpus de texto y medición de la carga.
+# Uso: python -m src.corpus.binario entrada.txt salida.ajzb
+#      python -m src.corpus.binario --prueba N   (corpus sintético de N partidas)
+if __name__ == '__main__':
+    import argparse
+    import os
+    import tempfile
+    import time
+    from .lectura import leer_partidas
+
+    parser = argparse.ArgumentParser(description="Convierte un corpus SAN al formato binario y mide la carga.")
+    parser.add_argument("entrada", nargs="?", help="Archivo con partidas separadas por líneas en blanco.")
+    parser.add_argument("salida", nargs="?", help="Archivo binario de salida.")
+    parser.add_argument("--prueba", type=int, default=0, help="Genera un corpus sintético de N partidas.")
+    argumentos = parser.parse_args()
+
+    if argumentos.prueba:
+        aperturas = ["e4 e5", "d4 d5", "c4 e5", "Nf3 Nf6", "e4 c5"]
+        medio = ["Nc3 Nc6", "Bb5 a6", "Ba4 Nf6", "0-0 Be7", "Re1 b5", "Bb3 d6", "c3 0-0", "h3 Nb8"]
+        textos = []
+        for n in range(argumentos.prueba):
+            jugadas = [aperturas[n % len(aperturas)]] + medio * (1 + n % 5)
+            if n % 100 == 0:
+                jugadas.append("Qd1e2 Kg8")  # Desambiguación por casilla: se guarda escapada.
+            elif n % 100 == 50:
+                jugadas.append("Qe2 Kxg8??")  # Partida inválida.
+            textos.append(" ".join(f"{t + 1}. {j}" for t, j in enumerate(jugadas)))
+        descriptor, ruta_salida = tempfile.mkstemp(suffix=".ajzb")
+        os.close(descriptor)
+    else:
+        if not (argumentos.entrada and argumentos.salida):
+            parser.error("Se necesitan entrada y salida (o --prueba N).")
+        textos = list(leer_partidas(argumentos.entrada))
+        ruta_salida = argumentos.salida
+
+    inicio = time.perf_counter()
+    partidas = [Partida(t) for t in textos]
+    t_parseo = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    escribir_partidas(ruta_salida, partidas)
+    t_escritura = time.perf_counter() - inicio
+    bytes_texto = sum(len(t.encode("utf-8")) for t in textos)
+    print(f"{len(textos)} partidas: texto {bytes_texto / 1e6:.1f} MB -> binario "
+          f"{os.path.getsize(ruta_salida) / 1e6:.1f} MB")
+    print(f"Parseo con Partida (regex + gramática): {t_parseo:.2f}s; escritura: {t_escritura:.2f}s")
+
+    with LectorBinario(ruta_salida) as lector:
+        inicio = time.perf_counter()
+        plies = sum(len(p) for _, p in lector.iterar_plies())
+        print(f"Lectura de jugadas ({plies} plies): {time.perf_counter() - inicio:.2f}s")
+        inicio = time.perf_counter()
+        reconstruidas = list(lector.iterar_partidas())
+        print(f"Reconstrucción de objetos Partida: {time.perf_counter() - inicio:.2f}s")
+        distintas = sum(a.texto_canonico() != b.texto_canonico() or a.es_valida_sintacticamente != b.es_valida_sintacticamente
+                        for a, b in zip(partidas, reconstruidas))
+        print(f"Partidas que difieren del original: {distintas}")
+    if argumentos.prueba:
+        os.remove(ruta_salida)
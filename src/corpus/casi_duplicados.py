@@ -0,0 +1,399 @@
+# src/corpus/casi_duplicados.py
+
+# Detección de partidas casi duplicadas: las mismas jugadas salvo unas pocas erratas de
+# transcripción o un final distinto. La deduplicación exacta (deduplicacion.py) no las
+# ve, porque su huella cambia con una sola jugada.
+#
+# Cada partida se resume en una firma MinHash de sus n-gramas de jugadas: la proporción de
+# componentes iguales entre dos firmas estima la similitud de Jaccard de sus conjuntos de
+# n-gramas. Las firmas se cortan en bandas (LSH): dos partidas son candidatas si coinciden
+# en todas las componentes de alguna banda, lo que con similitud s ocurre con probabilidad
+# 1 - (1 - s^filas)^bandas. Así solo se comparan los pares candidatos, no todos los pares,
+# y cada candidato se confirma calculando su similitud exacta.
+#
+# Requiere NumPy (opcional para el resto del proyecto): pip install numpy
+
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es una dependencia opcional.
+    np = None
+
+from ..core.partida import Partida, tokenizar, TOKEN_JUGADA
+from .lectura import en_lotes, indexar_partidas, leer_partida, leer_partidas
+from .paralelo import procesar_en_paralelo
+
+# Primo mayor que 2^32 para las permutaciones (a·x + b) mod p. Con x < 2^32 y a < 2^31
+# el producto cabe en 64 bits sin desbordar.
+_PRIMO = (1 << 32) + 15
+# Partidas cuyas firmas se calculan juntas (matrices de permutaciones × n-gramas acotadas).
+_PARTIDAS_POR_BLOQUE = 64
+
+
+def _requerir_numpy():
+    if np is None:
+        raise ImportError("La detección de casi duplicados requiere NumPy. Instálelo con: pip install numpy")
+
+
+def plies_de(texto_partida):
+    """
+    Jugadas (plies) de una partida en orden. Para una partida válida son las de
+    Partida.turnos; si no es válida (ej: una errata deja una jugada mal escrita), son
+    todos sus tokens de jugada, para que pueda emparejarse con su versión correcta.
+    """
+    partida = Partida(texto_partida)
+    if partida.es_valida_sintacticamente:
+        plies = []
+        for turno in partida.turnos:
+            plies.append(turno.jugada_blanca.san_string)
+            if turno.jugada_negra:
+                plies.append(turno.jugada_negra.san_string)
+        return plies
+    texto = partida.texto_original
+    return [texto[inicio:fin] for tipo, inicio, fin in tokenizar(texto) if tipo == TOKEN_JUGADA]
+
+
+def ngramas(plies, n):
+    """Conjunto de n-gramas (tuplas) de jugadas; una partida más corta que n es un único n-grama."""
+    if len(plies) < n:
+        return {tuple(plies)} if plies else set()
+    return set(zip(*(plies[k:] for k in range(n))))
+
+
+def jaccard(a, b):
+    """Similitud de Jaccard de dos conjuntos (1.0 si ambos están vacíos)."""
+    if not a and not b:
+        return 1.0
+    comunes = len(a & b)
+    return comunes / (len(a) + len(b) - comunes)
+
+
+class FirmasMinHash:
+    """
+    Parámetros de las firmas MinHash y de sus bandas LSH.
+
+    Dos partidas con similitud de Jaccard s (sobre n-gramas) acaban como candidatas con
+    probabilidad 1 - (1 - s^filas)^bandas: una curva en S centrada en umbral_lsh. Con los
+    valores por defecto (20 bandas de 5 filas) el umbral LSH ronda 0.55, por debajo del
+    umbral de similitud habitual (0.7): un par con similitud 0.7 llega a candidato con
+    probabilidad 0.975 y uno con 0.3, con 0.05 (y la comparación exacta lo descarta).
+    """
+
+    def __init__(self, bandas=20, filas=5, n=3, semilla=1):
+        """
+        Args:
+            bandas (int, optional): Bandas de la firma.
+            filas (int, optional): Componentes por banda (la firma tiene bandas × filas).
+            n (int, optional): Longitud de los n-gramas de jugadas.
+            semilla (int, optional): Semilla de las permutaciones. Solo son comparables las
+                                     firmas calculadas con los mismos parámetros.
+        """
+        _requerir_numpy()
+        self.bandas = bandas
+        self.filas = filas
+        self.n = n
+        aleatorio = np.random.default_rng(semilla)
+        componentes = bandas * filas
+        self._a = aleatorio.integers(1, 1 << 31, size=(componentes, 1), dtype=np.uint64)
+        self._b = aleatorio.integers(0, 1 << 31, size=(componentes, 1), dtype=np.uint64)
+        # Multiplicadores impares para mezclar las filas de cada banda en una clave de 64 bits.
+        self._mezcla = aleatorio.integers(1, 1 << 63, size=filas, dtype=np.uint64) | np.uint64(1)
+
+    @property
+    def umbral_lsh(self):
+        """Similitud a partir de la cual un par tiene más de ~50% de probabilidad de ser candidato."""
+        return (1.0 / self.bandas) ** (1.0 / self.filas)
+
+    def _hashes(self, plies):
+        """Hash de 32 bits (CRC-32) de cada n-grama distinto, como array uint64."""
+        return np.fromiter(sorted({zlib.crc32(" ".join(ngrama).encode("utf-8")) for ngrama in ngramas(plies, self.n)}),
+                           dtype=np.uint64)
+
+    def firmas(self, lista_plies):
+        """
+        Firmas MinHash de varias partidas.
+
+        Args:
+            lista_plies (list): Jugadas de cada partida (ver plies_de).
+
+        Returns:
+            tuple: (matriz uint64 de forma (partidas, bandas × filas), máscara booleana de
+                   las partidas con jugadas; las filas de las demás no tienen significado).
+        """
+        firmas = np.zeros((len(lista_plies), self.bandas * self.filas), dtype=np.uint64)
+        con_jugadas = np.array([bool(plies) for plies in lista_plies], dtype=bool)
+        for inicio in range(0, len(lista_plies), _PARTIDAS_POR_BLOQUE):
+            hashes = [self._hashes(plies) for plies in lista_plies[inicio:inicio + _PARTIDAS_POR_BLOQUE] if plies]
+            if not hashes:
+                continue
+            # Todas las permutaciones sobre todos los n-gramas del bloque a la vez; el mínimo
+            # de cada partida es el mínimo de su tramo de columnas.
+            tramos = np.cumsum([0] + [len(h) for h in hashes[:-1]])
+            permutados = (self._a * np.concatenate(hashes)[None, :] + self._b) % np.uint64(_PRIMO)
+            filas = np.flatnonzero(con_jugadas[inicio:inicio + _PARTIDAS_POR_BLOQUE]) + inicio
+            firmas[filas] = np.minimum.reduceat(permutados, tramos, axis=1).T
+        return firmas, con_jugadas
+
+    def claves_bandas(self, firmas):
+        """Clave de 64 bits de cada banda de cada firma: matriz uint64 (partidas, bandas)."""
+        por_banda = firmas.reshape(len(firmas), self.bandas, self.filas)
+        claves = (por_banda * self._mezcla).sum(axis=2, dtype=np.uint64)   # Aritmética módulo 2^64
+        return claves ^ (claves >> np.uint64(29))
+
+
+def _claves_de_lote(tarea):
+    """
+    Fase 1 (en un proceso del pool): claves LSH de un lote de partidas.
+
+    Args:
+        tarea (tuple): (FirmasMinHash, índice de la primera partida, textos del lote).
+
+    Returns:
+        tuple: (índice de la primera partida, claves uint64 (partidas, bandas), máscara de partidas con jugadas)
+    """
+    minhash, inicio, textos = tarea
+    firmas, con_jugadas = minhash.firmas([plies_de(texto) for texto in textos])
+    return inicio, minhash.claves_bandas(firmas), con_jugadas
+
+
+def _puntuar_lote(tarea):
+    """
+    Fase 3 (en un proceso del pool): similitud exacta de un lote de pares candidatos.
+
+    Args:
+        tarea (tuple): (n, umbral, pares (i, j), dict índice -> texto de las partidas de los pares).
+
+    Returns:
+        list: (i, j, similitud) de los pares con similitud >= umbral.
+    """
+    n, umbral, pares, textos = tarea
+    conjuntos = {i: ngramas(plies_de(texto), n) for i, texto in textos.items()}
+    resultado = []
+    for i, j in pares:
+        similitud = jaccard(conjuntos[i], conjuntos[j])
+        if similitud >= umbral:
+            resultado.append((i, j, similitud))
+    return resultado
+
+
+def pares_candidatos(claves, con_jugadas=None, max_cubeta=64):
+    """
+    Fase 2: pares de partidas que comparten la clave de alguna banda.
+
+    Las cubetas con más de 'max_cubeta' partidas (casi siempre copias exactas de una misma
+    partida, ver deduplicacion.py) no generan todos sus pares: cada partida se empareja
+    con la primera de la cubeta, lo que basta para agruparlas.
+
+    Args:
+        claves (numpy.ndarray): Claves uint64 (partidas, bandas) (ver FirmasMinHash.claves_bandas).
+        con_jugadas (numpy.ndarray, optional): Máscara de las partidas a considerar.
+        max_cubeta (int, optional): Tamaño máximo de cubeta que se empareja por completo.
+
+    Returns:
+        numpy.ndarray: Pares (i, j) con i < j, sin repetir, de forma (pares, 2).
+    """
+    _requerir_numpy()
+    total = len(claves)
+    indices = np.flatnonzero(con_jugadas) if con_jugadas is not None else np.arange(total)
+    codigos = []
+    for banda in range(claves.shape[1]):
+        columna = claves[indices, banda]
+        orden = np.argsort(columna, kind="stable")
+        ordenada = columna[orden]
+        cortes = np.flatnonzero(ordenada[1:] != ordenada[:-1]) + 1
+        inicios = np.concatenate(([0], cortes))
+        fines = np.concatenate((cortes, [len(ordenada)]))
+        for inicio, fin in zip(inicios[fines - inicios > 1], fines[fines - inicios > 1]):
+            miembros = np.sort(indices[orden[inicio:fin]]).astype(np.int64)
+            if len(miembros) > max_cubeta:
+                primeros, segundos = np.full(len(miembros) - 1, miembros[0]), miembros[1:]
+            else:
+                a, b = np.triu_indices(len(miembros), k=1)
+                primeros, segundos = miembros[a], miembros[b]
+            codigos.append(primeros * total + segundos)
+    if not codigos:
+        return np.zeros((0, 2), dtype=np.int64)
+    codigos = np.unique(np.concatenate(codigos))
+    return np.stack((codigos // total, codigos % total), axis=1)
+
+
+class CorpusIndexado:
+    """
+    Partidas de un archivo de corpus como secuencia: se recorren en streaming y se leen
+    sueltas por su posición (ver lectura.indexar_partidas), sin cargar el archivo en memoria.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._inicios, self._fines = indexar_partidas(ruta)
+        self._archivo = open(ruta, "rb")
+
+    def __len__(self):
+        return len(self._inicios)
+
+    def __getitem__(self, i):
+        return leer_partida(self._archivo, self._inicios[i], self._fines[i])
+
+    def __iter__(self):
+        return iter(leer_partidas(self.ruta))
+
+    def cerrar(self):
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def buscar_casi_duplicados(textos, umbral=0.7, minhash=None, procesos=None, tam_lote=1000,
+                           max_cubeta=64, pares_por_lote=5000, estadisticas=None):
+    """
+    Busca los pares de partidas casi duplicadas de un corpus.
+
+    Fases: (1) firmas MinHash y claves LSH de cada partida, en paralelo; (2) pares
+    candidatos por coincidencia de banda; (3) similitud de Jaccard exacta de los
+    n-gramas de cada candidato, en paralelo. En memoria solo quedan las claves de las
+    bandas (8 bytes por banda y partida) y los candidatos.
+
+    Args:
+        textos (sequence): Textos SAN de las partidas, con len() e indexación (ej: una lista
+                           o un CorpusIndexado). Se recorre una vez en orden y después solo
+                           se leen las partidas candidatas.
+        umbral (float, optional): Similitud de Jaccard mínima de un par casi duplicado.
+        minhash (FirmasMinHash, optional): Parámetros de las firmas. Por defecto, FirmasMinHash().
+        procesos (int, optional): Número de procesos (por defecto, uno por núcleo).
+        tam_lote (int, optional): Partidas por tarea de la fase 1.
+        max_cubeta (int, optional): Ver pares_candidatos.
+        pares_por_lote (int, optional): Pares candidatos por tarea de la fase 3.
+        estadisticas (dict, optional): Si se da, se rellena con "partidas" y "candidatos".
+
+    Returns:
+        list: (i, j, similitud) de cada par con i < j y similitud >= umbral, ordenados.
+    """
+    _requerir_numpy()
+    minhash = minhash or FirmasMinHash()
+    total = len(textos)
+    claves = np.zeros((total, minhash.bandas), dtype=np.uint64)
+    con_jugadas = np.zeros(total, dtype=bool)
+    tareas = ((minhash, n * tam_lote, lote) for n, lote in enumerate(en_lotes(iter(textos), tam_lote)))
+    for inicio, claves_lote, con_jugadas_lote in procesar_en_paralelo(_claves_de_lote, tareas, procesos):
+        claves[inicio:inicio + len(claves_lote)] = claves_lote
+        con_jugadas[inicio:inicio + len(claves_lote)] = con_jugadas_lote
+
+    candidatos = pares_candidatos(claves, con_jugadas, max_cubeta)
+    del claves
+    if estadisticas is not None:
+        estadisticas["partidas"] = total
+        estadisticas["candidatos"] = len(candidatos)
+
+    def tareas_puntuacion():
+        for inicio in range(0, len(candidatos), pares_por_lote):
+            pares = [(int(i), int(j)) for i, j in candidatos[inicio:inicio + pares_por_lote]]
+            necesarias = sorted({k for par in pares for k in par})
+            yield minhash.n, umbral, pares, {k: textos[k] for k in necesarias}
+
+    resultado = []
+    for confirmados in procesar_en_paralelo(_puntuar_lote, tareas_puntuacion(), procesos):
+        resultado.extend(confirmados)
+    resultado.sort()
+    return resultado
+
+
+# Uso: python -m src.corpus.casi_duplicados corpus.txt [--umbral 0.7] [--salida pares.tsv] [--procesos N]
+# Sin archivo: evalúa recall y precisión sobre un corpus sintético con casi duplicados etiquetados.
+if __name__ == '__main__':
+    import argparse
+    import random
+    import sys
+    import time
+    from .sintetico import GeneradorCorpus
+
+    parser = argparse.ArgumentParser(description="Pares de partidas casi duplicadas de un corpus SAN.")
+    parser.add_argument("entrada", nargs="?", help="Archivo con partidas separadas por líneas en blanco.")
+    parser.add_argument("--umbral", type=float, default=0.7, help="Similitud de Jaccard mínima (n-gramas de jugadas).")
+    parser.add_argument("--salida", help="Archivo TSV (i, j, similitud). Sin él se imprimen los pares.")
+    parser.add_argument("--procesos", type=int, default=None, help="Número de procesos (por defecto, uno por núcleo).")
+    parser.add_argument("--partidas", type=int, default=20000, help="Partidas base del corpus sintético.")
+    argumentos = parser.parse_args()
+
+    if argumentos.entrada:
+        inicio = time.perf_counter()
+        datos = {}
+        with CorpusIndexado(argumentos.entrada) as corpus:
+            pares = buscar_casi_duplicados(corpus, argumentos.umbral, procesos=argumentos.procesos, estadisticas=datos)
+        with (open(argumentos.salida, "w", encoding="utf-8") if argumentos.salida else sys.stdout) as salida:
+            for i, j, similitud in pares:
+                salida.write(f"{i}\t{j}\t{similitud:.4f}\n")
+        print(f"{datos['partidas']} partidas, {datos['candidatos']} candidatos, {len(pares)} pares casi duplicados "
+              f"en {time.perf_counter() - inicio:.2f}s", file=sys.stderr)
+        sys.exit(0)
+
+    # Corpus sintético: partidas base independientes y, para un 10% de ellas, una copia con
+    # erratas (1-3 jugadas cambiadas, a veces mal escritas), con otro final (se cortan 3-10
+    # plies y a veces se añaden otros) o con ambas cosas. Los pares (base, copia) son los etiquetados.
+    generador = GeneradorCorpus(semilla=11)
+    aleatorio = random.Random(5)
+    textos = [texto for texto, _ in generador.partidas(argumentos.partidas)]
+
+    def texto_de(plies):
+        return " ".join(f"{i // 2 + 1}. {' '.join(plies[i:i + 2])}" for i in range(0, len(plies), 2))
+
+    def con_erratas(plies):
+        plies = list(plies)
+        for posicion in aleatorio.sample(range(len(plies)), min(len(plies), aleatorio.randint(1, 3))):
+            if aleatorio.random() < 0.3:
+                plies[posicion] = plies[posicion].rstrip("+#")[:-1] + "9"   # Casilla inexistente
+            else:
+                plies[posicion] = aleatorio.choice(generador.repertorio)
+        return plies
+
+    def con_otro_final(plies):
+        plies = plies[:max(1, len(plies) - aleatorio.randint(3, 10))]
+        if aleatorio.random() < 0.5:
+            plies += aleatorio.choices(generador.repertorio, k=aleatorio.randint(1, 6))
+        return plies
+
+    etiquetados = {}
+    for base in aleatorio.sample(range(len(textos)), len(textos) // 10):
+        tipo = aleatorio.choice(("erratas", "final", "ambas"))
+        plies = plies_de(textos[base])
+        if tipo in ("erratas", "ambas"):
+            plies = con_erratas(plies)
+        if tipo in ("final", "ambas"):
+            plies = con_otro_final(plies)
+        etiquetados[(base, len(textos))] = tipo
+        textos.append(texto_de(plies))
+
+    inicio = time.perf_counter()
+    datos = {}
+    pares = buscar_casi_duplicados(textos, argumentos.umbral, procesos=argumentos.procesos, estadisticas=datos)
+    duracion = time.perf_counter() - inicio
+    encontrados = {(i, j) for i, j, _ in pares}
+    # Además de los etiquetados, son correctos los pares de partidas base con exactamente las
+    # mismas jugadas (el generador repite algunas partidas muy cortas, ej: "1. 0-0 0-0").
+    por_jugadas = {}
+    for i in range(argumentos.partidas):
+        por_jugadas.setdefault(tuple(plies_de(textos[i])), []).append(i)
+    identicos = {(a, b) for grupo in por_jugadas.values() for k, a in enumerate(grupo) for b in grupo[k + 1:]}
+    aciertos = encontrados & (set(etiquetados) | identicos)
+    todos_los_pares = len(textos) * (len(textos) - 1) // 2
+    print(f"{len(textos)} partidas ({len(etiquetados)} casi duplicados etiquetados), umbral {argumentos.umbral}, "
+          f"umbral LSH {FirmasMinHash().umbral_lsh:.2f}")
+    print(f"{duracion:.1f}s ({len(textos) / duracion:,.0f} partidas/s); {datos['candidatos']} candidatos de "
+          f"{todos_los_pares:,} pares posibles ({datos['candidatos'] / todos_los_pares:.2e})")
+    print(f"Precisión {len(aciertos) / max(1, len(encontrados)):.3f} ({len(encontrados)} pares reportados, "
+          f"{len(encontrados & identicos)} de ellos copias exactas entre las partidas base), "
+          f"recall {len(encontrados & set(etiquetados)) / len(etiquetados):.3f}")
+    for tipo in ("erratas", "final", "ambas"):
+        del_tipo = [par for par, t in etiquetados.items() if t == tipo]
+        print(f"  {tipo:<8} recall {sum(par in encontrados for par in del_tipo) / len(del_tipo):.3f} ({len(del_tipo)} pares)")
+    # Recall de la fase LSH: de los pares etiquetados cuya similitud exacta supera el umbral,
+    # cuántos llegaron a ser candidatos (el resto de pérdidas se deben al propio umbral).
+    n = FirmasMinHash().n
+    sobre_umbral = [par for par in etiquetados
+                    if jaccard(ngramas(plies_de(textos[par[0]]), n), ngramas(plies_de(textos[par[1]]), n)) >= argumentos.umbral]
+    print(f"Recall de LSH sobre los {len(sobre_umbral)} pares etiquetados con similitud >= umbral: "
+          f"{sum(par in encontrados for par in sobre_umbral) / max(1, len(sobre_umbral)):.3f}")
@@ -0,0 +1,176 @@
+# src/corpus/deduplicacion.py
+import math
+import os
+import sqlite3
+
+from ..core.partida import texto_canonico, huella_canonica
+from .lectura import leer_partidas
+
+
+class FiltroBloom:
+    """
+    Filtro de Bloom sobre huellas de 16 bytes.
+
+    Responde "seguro que no está" o "puede que esté": permite descartar sin ir a disco
+    la gran mayoría de las partidas nuevas. La memoria es fija y se calcula a partir de
+    la capacidad esperada y la tasa de falsos positivos deseada.
+    """
+
+    def __init__(self, capacidad, tasa_falsos_positivos=0.01):
+        """
+        Args:
+            capacidad (int): Número esperado de elementos distintos.
+            tasa_falsos_positivos (float): Probabilidad de "puede que esté" para un elemento nuevo.
+        """
+        capacidad = max(1, capacidad)
+        self.num_bits = max(8, int(-capacidad * math.log(tasa_falsos_positivos) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacidad * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _posiciones(self, huella):
+        # Doble hashing: las dos mitades de la huella generan las k posiciones.
+        h1 = int.from_bytes(huella[:8], "little")
+        h2 = int.from_bytes(huella[8:16], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def agregar_y_comprobar(self, huella):
+        """
+        Añade la huella al filtro.
+
+        Returns:
+            bool: True si la huella quizá ya estaba; False si seguro que es nueva.
+        """
+        bits = self.bits
+        estaba = True
+        for posicion in self._posiciones(huella):
+            byte, mascara = posicion >> 3, 1 << (posicion & 7)
+            if not bits[byte] & mascara:
+                estaba = False
+                bits[byte] |= mascara
+        return estaba
+
+    def __contains__(self, huella):
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._posiciones(huella))
+
+
+class ConjuntoHuellasDisco:
+    """Conjunto exacto de huellas guardado en una base SQLite (memoria acotada)."""
+
+    def __init__(self, ruta, inserciones_por_transaccion=50000):
+        self.conexion = sqlite3.connect(ruta)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("PRAGMA synchronous=OFF")
+        self.conexion.execute("CREATE TABLE IF NOT EXISTS huellas (huella BLOB PRIMARY KEY) WITHOUT ROWID")
+        self._inserciones_por_transaccion = inserciones_por_transaccion
+        self._pendientes = 0
+
+    def contiene(self, huella):
+        cursor = self.conexion.execute("SELECT 1 FROM huellas WHERE huella = ?", (huella,))
+        return cursor.fetchone() is not None
+
+    def agregar(self, huella):
+        self.conexion.execute("INSERT OR IGNORE INTO huellas (huella) VALUES (?)", (huella,))
+        self._pendientes += 1
+        if self._pendientes >= self._inserciones_por_transaccion:
+            self.conexion.commit()
+            self._pendientes = 0
+
+    def huellas(self):
+        """Genera todas las huellas guardadas."""
+        return (fila[0] for fila in self.conexion.execute("SELECT huella FROM huellas"))
+
+    def cerrar(self):
+        self.conexion.commit()
+        self.conexion.close()
+
+
+class Deduplicador:
+    """
+    Elimina partidas duplicadas exactas de un flujo, en una sola pasada.
+
+    Dos partidas son duplicadas si tienen la misma secuencia canónica de jugadas (ver
+    Partida.huella): las diferencias de espacios o de formato de los números de turno
+    no cuentan. Un filtro de Bloom en memoria evita consultar el disco para las partidas
+    que seguro son nuevas; solo los "quizá repetida" se confirman contra el conjunto
+    exacto en SQLite.
+    """
+
+    def __init__(self, ruta_conjunto, capacidad_estimada=10_000_000, tasa_falsos_positivos=0.01):
+        """
+        Args:
+            ruta_conjunto (str): Archivo SQLite del conjunto exacto. Si ya existe, las huellas
+                                 que contiene cuentan como vistas (deduplicación incremental).
+            capacidad_estimada (int): Número esperado de partidas únicas (dimensiona el filtro).
+            tasa_falsos_positivos (float): Tasa de falsos positivos del filtro de Bloom.
+        """
+        self.filtro = FiltroBloom(capacidad_estimada, tasa_falsos_positivos)
+        self.conjunto = ConjuntoHuellasDisco(ruta_conjunto)
+        for huella in self.conjunto.huellas():
+            self.filtro.agregar_y_comprobar(huella)
+        self.unicas = 0
+        self.duplicadas = 0
+        self.consultas_disco = 0  # Veces que el filtro dijo "quizá" y hubo que mirar el disco.
+
+    def es_nueva(self, huella):
+        """Registra la huella y retorna True si no se había visto antes."""
+        if self.filtro.agregar_y_comprobar(huella):
+            self.consultas_disco += 1
+            if self.conjunto.contiene(huella):
+                self.duplicadas += 1
+                return False
+        self.conjunto.agregar(huella)
+        self.unicas += 1
+        return True
+
+    def filtrar(self, textos_partidas):
+        """
+        Genera solo las partidas no vistas antes, en el orden de entrada.
+
+        Args:
+            textos_partidas (iterable): Textos SAN de las partidas (se consume en streaming).
+        """
+        for texto in textos_partidas:
+            if self.es_nueva(huella_canonica(texto_canonico(texto))):
+                yield texto
+
+    def cerrar(self):
+        self.conjunto.cerrar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def __str__(self):
+        return (f"Deduplicador(únicas={self.unicas}, duplicadas={self.duplicadas}, "
+                f"consultas a disco={self.consultas_disco})")
+
+
+# Uso: python -m src.corpus.deduplicacion entrada.txt salida.txt [--conjunto huellas.sqlite]
+if __name__ == '__main__':
+    import argparse
+    import tempfile
+    import time
+
+    parser = argparse.ArgumentParser(description="Elimina partidas duplicadas de un corpus SAN.")
+    parser.add_argument("entrada", help="Archivo con partidas separadas por líneas en blanco.")
+    parser.add_argument("salida", help="Archivo donde se escriben las partidas únicas.")
+    parser.add_argument("--conjunto", help="Base SQLite de huellas (por defecto, una temporal).")
+    parser.add_argument("--capacidad", type=int, default=10_000_000, help="Partidas únicas esperadas.")
+    argumentos = parser.parse_args()
+
+    ruta_conjunto = argumentos.conjunto
+    if ruta_conjunto is None:
+        descriptor, ruta_conjunto = tempfile.mkstemp(suffix=".sqlite")
+        os.close(descriptor)
+    inicio = time.perf_counter()
+    with Deduplicador(ruta_conjunto, argumentos.capacidad) as deduplicador, \
+            open(argumentos.salida, "w", encoding="utf-8") as salida:
+        for texto in deduplicador.filtrar(leer_partidas(argumentos.entrada)):
+            salida.write(texto)
+            salida.write("\n\n")
+    print(f"{deduplicador} en {time.perf_counter() - inicio:.2f}s")
+    if argumentos.conjunto is None:
+        os.remove(ruta_conjunto)
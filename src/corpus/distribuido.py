@@ -0,0 +1,378 @@
+# src/corpus/distribuido.py
+
+# Validación distribuida de un corpus: un coordinador reparte los fragmentos de un
+# TrabajoValidacion entre trabajadores conectados por TCP (solo biblioteca estándar).
+#
+# Protocolo: cada mensaje es un objeto JSON en UTF-8 precedido de su longitud (4 bytes,
+# big-endian). Los trabajadores no necesitan acceso al corpus ni al directorio del trabajo:
+#   trabajador -> coordinador  {"tipo": "hola", "nombre": ...}
+#   coordinador -> trabajador  {"tipo": "fragmento", "numero": n, "primera": i, "texto": ...}
+#   trabajador -> coordinador  {"tipo": "resultado", "numero": n, "partidas": ..., "validas": ...,
+#                               "resultados": <archivo del fragmento>, "estadisticas": {...}}
+#   coordinador -> trabajador  {"tipo": "fin"}
+#
+# El coordinador escribe los resultados y el diario del trabajo, así que una ejecución
+# distribuida interrumpida se reanuda igual que una local (ver trabajos.py).
+
+import collections
+import json
+import socket
+import struct
+import threading
+import time
+
+from .estadisticas import EstadisticasPartidas
+from .trabajos import validar_texto_fragmento
+
+_LONGITUD = struct.Struct(">I")
+MAX_MENSAJE = 1 << 28  # Un mensaje mayor indica un error de protocolo (o un par que no es de los nuestros)
+
+
+def enviar_mensaje(conexion, mensaje):
+    datos = json.dumps(mensaje, ensure_ascii=False).encode("utf-8")
+    conexion.sendall(_LONGITUD.pack(len(datos)) + datos)
+
+
+def _recibir_exacto(conexion, n):
+    partes = []
+    while n:
+        parte = conexion.recv(min(n, 1 << 20))
+        if not parte:
+            raise ConnectionError("Conexión cerrada por el otro extremo.")
+        partes.append(parte)
+        n -= len(parte)
+    return b"".join(partes)
+
+
+def recibir_mensaje(conexion):
+    """
+    Returns:
+        dict: El siguiente mensaje de la conexión.
+
+    Raises:
+        ConnectionError: Si la conexión se cierra.
+        ValueError: Si el mensaje no respeta el protocolo.
+    """
+    (longitud,) = _LONGITUD.unpack(_recibir_exacto(conexion, _LONGITUD.size))
+    if longitud > MAX_MENSAJE:
+        raise ValueError(f"Mensaje de {longitud} bytes (máximo {MAX_MENSAJE}).")
+    return json.loads(_recibir_exacto(conexion, longitud).decode("utf-8"))
+
+
+class CoordinadorValidacion:
+    """
+    Reparte los fragmentos pendientes de un TrabajoValidacion entre trabajadores TCP.
+
+    Cada trabajador tiene hasta 'en_vuelo' fragmentos asignados, para que al terminar
+    uno ya tenga el siguiente en el socket. Cuando no quedan fragmentos sin asignar, un
+    trabajador ocioso se lleva una copia del fragmento en curso más antiguo de otro
+    trabajador (robo de trabajo: un trabajador lento no retrasa el final); vale el primer
+    resultado que llegue y el duplicado se descarta. Si un trabajador se desconecta, sus
+    fragmentos vuelven a la cola.
+    """
+
+    def __init__(self, trabajo, host="127.0.0.1", puerto=0, en_vuelo=2, max_fragmentos=None, espera_saludo=10.0):
+        """
+        Args:
+            trabajo (TrabajoValidacion): Trabajo cuyos fragmentos pendientes se reparten.
+            host (str, optional): Interfaz en la que escuchar.
+            puerto (int, optional): Puerto (0: uno libre, ver direccion).
+            en_vuelo (int, optional): Fragmentos asignados a la vez a cada trabajador.
+            max_fragmentos (int, optional): Repartir como máximo este número de fragmentos.
+            espera_saludo (float, optional): Segundos que una conexión nueva tiene para enviar
+                "hola" antes de cerrarla (escaneos de puertos, clientes a medio abrir).
+        """
+        self.trabajo = trabajo
+        self.en_vuelo = en_vuelo
+        self.espera_saludo = espera_saludo
+        trabajo.limpiar_temporales()
+        pendientes = trabajo.pendientes()
+        if max_fragmentos is not None:
+            pendientes = pendientes[:max_fragmentos]
+        self._total = len(pendientes)
+        self._pendientes = collections.deque(pendientes)
+        self._en_curso = {}  # Fragmento -> {id de trabajador: instante de asignación}
+        self._terminados = set()
+        self.estadisticas = EstadisticasPartidas()  # De los fragmentos terminados en esta ejecución
+        self.fragmentos_por_trabajador = collections.Counter()
+        self.duplicados_descartados = 0
+        self.reasignados = 0
+        self.trabajadores_perdidos = []  # (trabajador, error) de los que se desconectaron con fragmentos asignados
+        self._cond = threading.Condition()
+        self._hilos = []
+        self._conexiones = {}  # Trabajador -> (socket, fragmentos asignados), para cortarlas todas al terminar
+        self._servidor = socket.create_server((host, puerto))
+        self._servidor.settimeout(0.2)
+        self.direccion = self._servidor.getsockname()[:2]
+
+    def _completo(self):
+        return len(self._terminados) == self._total
+
+    def _siguiente_fragmento(self, trabajador, asignados):
+        """Elige el próximo fragmento para 'trabajador' (se llama con el lock tomado)."""
+        if self._pendientes:
+            return self._pendientes.popleft()
+        if asignados:
+            return None
+        # Robo: el fragmento en curso más antiguo que solo tiene otro trabajador.
+        candidatos = [(min(duenos.values()), numero) for numero, duenos in self._en_curso.items()
+                      if len(duenos) == 1 and trabajador not in duenos]
+        return min(candidatos)[1] if candidatos else None
+
+    def _atender(self, conexion, trabajador, asignados):
+        """Hilo de un trabajador: le envía fragmentos y recoge sus resultados."""
+        try:
+            saludo = recibir_mensaje(conexion)
+            if saludo.get("tipo") != "hola":
+                raise ValueError(f"Saludo inesperado: {saludo.get('tipo')}")
+            nombre = saludo.get("nombre", trabajador)
+            conexion.settimeout(None)
+            while True:
+                enviar = []
+                with self._cond:
+                    while True:
+                        while len(asignados) < self.en_vuelo:
+                            numero = self._siguiente_fragmento(trabajador, asignados)
+                            if numero is None:
+                                break
+                            asignados.add(numero)
+                            self._en_curso.setdefault(numero, {})[trabajador] = time.monotonic()
+                            enviar.append(numero)
+                        if asignados or self._completo():
+                            break
+                        self._cond.wait(0.5)
+                if not asignados:
+                    enviar_mensaje(conexion, {"tipo": "fin"})
+                    return
+                for numero in enviar:
+                    texto, primera = self.trabajo.texto_fragmento(numero)
+                    enviar_mensaje(conexion, {"tipo": "fragmento", "numero": numero, "primera": primera, "texto": texto})
+
+                respuesta = recibir_mensaje(conexion)
+                if respuesta.get("tipo") != "resultado" or respuesta.get("numero") not in asignados:
+                    raise ValueError(f"Mensaje inesperado del trabajador {nombre}: {respuesta.get('tipo')}")
+                numero = respuesta["numero"]
+                asignados.discard(numero)
+                with self._cond:
+                    if numero in self._terminados:
+                        self.duplicados_descartados += 1
+                    else:
+                        self.trabajo.guardar_fragmento(self._diario, numero, respuesta["resultados"].encode("utf-8"),
+                                                       respuesta["partidas"], respuesta["validas"])
+                        self.estadisticas.combinar(EstadisticasPartidas.desde_dict(respuesta["estadisticas"]))
+                        self._terminados.add(numero)
+                        self._en_curso.pop(numero, None)
+                        self.fragmentos_por_trabajador[nombre] += 1
+                    self._cond.notify_all()
+        except (OSError, ValueError, KeyError) as e:
+            with self._cond:
+                if asignados and not self._completo():
+                    self.trabajadores_perdidos.append((trabajador, str(e)))
+        finally:
+            conexion.close()
+            with self._cond:
+                self._conexiones.pop(trabajador, None)
+                for numero in asignados:
+                    duenos = self._en_curso.get(numero, {})
+                    duenos.pop(trabajador, None)
+                    if numero not in self._terminados and not duenos:
+                        self._en_curso.pop(numero, None)
+                        self._pendientes.appendleft(numero)
+                        self.reasignados += 1
+                self._cond.notify_all()
+
+    def _aceptar(self):
+        contador = 0
+        while True:
+            with self._cond:
+                if self._completo():
+                    return
+            try:
+                conexion, _ = self._servidor.accept()
+            except socket.timeout:
+                continue
+            # Hasta el saludo, una conexión que no envía nada se cierra por tiempo.
+            conexion.settimeout(self.espera_saludo)
+            contador += 1
+            trabajador, asignados = f"t{contador}", set()
+            with self._cond:
+                if self._completo():
+                    conexion.close()
+                    return
+                self._conexiones[trabajador] = (conexion, asignados)
+            hilo = threading.Thread(target=self._atender, args=(conexion, trabajador, asignados), daemon=True)
+            hilo.start()
+            self._hilos.append(hilo)
+
+    def ejecutar(self):
+        """
+        Atiende trabajadores hasta terminar todos los fragmentos repartibles.
+
+        Returns:
+            dict: El resumen del trabajo (ver TrabajoValidacion.resumen).
+        """
+        with self.trabajo.abrir_diario() as self._diario:
+            aceptador = threading.Thread(target=self._aceptar, daemon=True)
+            aceptador.start()
+            with self._cond:
+                while not self._completo():
+                    self._cond.wait()
+                # No se espera a nadie: se cortan todas las conexiones, tanto las de trabajadores
+                # que aún calculan un duplicado robado (lo interpretan como el final del trabajo)
+                # como las que no han llegado a saludar.
+                for conexion, _ in self._conexiones.values():
+                    try:
+                        conexion.shutdown(socket.SHUT_RDWR)
+                    except OSError:
+                        pass
+            aceptador.join()
+            for hilo in self._hilos:
+                hilo.join()
+        self._servidor.close()
+        return self.trabajo.resumen()
+
+
+def ejecutar_trabajador(host, puerto, nombre=None, retardo=0.0, reintentos=50):
+    """
+    Conecta con un coordinador y valida los fragmentos que le envía hasta recibir "fin".
+
+    Args:
+        host (str): Dirección del coordinador.
+        puerto (int): Puerto del coordinador.
+        nombre (str, optional): Nombre con el que se identifica (solo para los informes).
+        retardo (float, optional): Segundos de espera extra por fragmento (simula un nodo lento).
+        reintentos (int, optional): Intentos de conexión, con 0.1 s entre ellos.
+
+    Returns:
+        int: Fragmentos validados.
+    """
+    for intento in range(reintentos):
+        try:
+            conexion = socket.create_connection((host, puerto))
+            break
+        except OSError:
+            if intento == reintentos - 1:
+                raise
+            time.sleep(0.1)
+    validados = 0
+    with conexion:
+        enviar_mensaje(conexion, {"tipo": "hola", "nombre": nombre or socket.gethostname()})
+        while True:
+            try:
+                mensaje = recibir_mensaje(conexion)
+            except ConnectionError:
+                # El coordinador terminó mientras este trabajador calculaba un fragmento que
+                # otro ya había entregado (ver CoordinadorValidacion).
+                return validados
+            if mensaje["tipo"] == "fin":
+                return validados
+            estadisticas = EstadisticasPartidas()
+            datos, partidas, validas = validar_texto_fragmento(mensaje["texto"], mensaje["primera"], estadisticas)
+            if retardo:
+                time.sleep(retardo)
+            try:
+                enviar_mensaje(conexion, {"tipo": "resultado", "numero": mensaje["numero"], "partidas": partidas,
+                                          "validas": validas, "resultados": datos.decode("utf-8"),
+                                          "estadisticas": estadisticas.a_dict()})
+            except OSError:
+                return validados
+            validados += 1
+
+
+# Uso:
+#   python -m src.corpus.distribuido coordinador corpus.txt directorio_trabajo [--puerto 5555]
+#   python -m src.corpus.distribuido trabajador HOST:PUERTO        (uno por máquina o núcleo)
+#   python -m src.corpus.distribuido local [corpus.txt]            (prueba con procesos locales)
+if __name__ == '__main__':
+    import argparse
+    import multiprocessing
+    import os
+    import shutil
+    import sys
+    import tempfile
+
+    from .trabajos import TrabajoValidacion
+
+    parser = argparse.ArgumentParser(description="Validación distribuida de un corpus de partidas SAN.")
+    modos = parser.add_subparsers(dest="modo", required=True)
+    coordinador = modos.add_parser("coordinador")
+    coordinador.add_argument("entrada")
+    coordinador.add_argument("directorio")
+    coordinador.add_argument("--host", default="0.0.0.0")
+    coordinador.add_argument("--puerto", type=int, default=5555)
+    coordinador.add_argument("--tam-fragmento", type=int, default=5000)
+    trabajador = modos.add_parser("trabajador")
+    trabajador.add_argument("direccion", help="HOST:PUERTO del coordinador")
+    trabajador.add_argument("--retardo", type=float, default=0.0)
+    local = modos.add_parser("local")
+    local.add_argument("entrada", nargs="?", help="Corpus (por defecto, uno sintético)")
+    local.add_argument("--trabajadores", default="1,2,4", help="Números de trabajadores a probar")
+    local.add_argument("--retardo", type=float, default=0.0,
+                       help="Espera por fragmento en cada trabajador (simula nodos remotos en una máquina con pocos núcleos)")
+    argumentos = parser.parse_args()
+
+    if argumentos.modo == "coordinador":
+        trabajo = TrabajoValidacion(argumentos.entrada, argumentos.directorio, argumentos.tam_fragmento)
+        servidor = CoordinadorValidacion(trabajo, argumentos.host, argumentos.puerto)
+        print(f"Coordinador en {servidor.direccion[0]}:{servidor.direccion[1]}, "
+              f"{len(trabajo.pendientes())} fragmento(s) pendiente(s)")
+        inicio = time.perf_counter()
+        resumen = servidor.ejecutar()
+        print(f"{time.perf_counter() - inicio:.2f}s; por trabajador: {dict(servidor.fragmentos_por_trabajador)}")
+        print(json.dumps(resumen, ensure_ascii=False))
+        print(servidor.estadisticas)
+        sys.exit(0)
+
+    if argumentos.modo == "trabajador":
+        host, puerto = argumentos.direccion.rsplit(":", 1)
+        print(f"{ejecutar_trabajador(host, int(puerto), retardo=argumentos.retardo)} fragmento(s) validado(s)")
+        sys.exit(0)
+
+    # Medición local: mismo corpus con 1, 2, 4... trabajadores en procesos separados, más un
+    # trabajador lento (robo de trabajo) y uno que muere a mitad (reasignación). La aceleración
+    # está limitada por los núcleos de la máquina: con un solo núcleo, más trabajadores no
+    # van más rápido salvo con --retardo (nodos que pasan el tiempo esperando, no calculando).
+    # Las comprobaciones de que el trabajo termina y se reasigna están en tests/test_distribuido.py.
+    temporal = tempfile.mkdtemp()
+    entrada = argumentos.entrada
+    if entrada is None:
+        jugadas = ["e4 e5", "Nf3 Nc6", "Bb5 a6", "Ba4 Nf6", "0-0 Be7", "Re1 b5", "Bb3 d6", "c3 0-0"]
+        entrada = os.path.join(temporal, "corpus.txt")
+        with open(entrada, "w", encoding="utf-8") as archivo:
+            for n in range(40000):
+                turnos = [f"{t + 1}. {jugadas[(t + n) % len(jugadas)]}" for t in range(10 + n % 30)]
+                archivo.write(" ".join(turnos) + (" 99. Zz9" if n % 10 == 0 else "") + "\n\n")
+
+    def ejecutar_local(nombre, trabajadores, matar_uno=False):
+        """trabajadores: lista de retardos por fragmento, uno por proceso trabajador."""
+        directorio = os.path.join(temporal, nombre)
+        servidor = CoordinadorValidacion(TrabajoValidacion(entrada, directorio, 1000))
+        procesos = [multiprocessing.Process(target=ejecutar_trabajador, args=(*servidor.direccion, f"w{i}", retardo))
+                    for i, retardo in enumerate(trabajadores)]
+        inicio = time.perf_counter()
+        for proceso in procesos:
+            proceso.start()
+        if matar_uno:
+            threading.Timer(0.5, procesos[0].kill).start()
+        resumen = servidor.ejecutar()
+        duracion = time.perf_counter() - inicio
+        for proceso in procesos:
+            proceso.join()
+        return servidor, resumen, duracion
+
+    print(f"{os.cpu_count()} CPU(s) disponible(s)")
+    referencia = None
+    for n in [int(x) for x in argumentos.trabajadores.split(",")]:
+        servidor, resumen, duracion = ejecutar_local(f"n{n}", [argumentos.retardo] * n)
+        referencia = referencia or duracion
+        print(f"{n} trabajador(es): {duracion:.2f}s ({referencia / duracion:.2f}x), completo={resumen['completo']}, "
+              f"{resumen['validas']} válidas / {resumen['invalidas']} inválidas, reparto {sorted(servidor.fragmentos_por_trabajador.values())}")
+
+    servidor, resumen, duracion = ejecutar_local("lento", [0.0, 0.0, 2.0])
+    print(f"Con un trabajador lento (+2 s por fragmento): {duracion:.2f}s, reparto "
+          f"{dict(servidor.fragmentos_por_trabajador)}, duplicados descartados {servidor.duplicados_descartados}")
+    servidor, resumen, duracion = ejecutar_local("caida", [0.05, 0.0], matar_uno=True)
+    print(f"Con un trabajador que muere a los 0.5 s: completo={resumen['completo']}, "
+          f"{servidor.reasignados} fragmento(s) reasignado(s), trabajadores perdidos "
+          f"{servidor.trabajadores_perdidos}, {resumen['partidas_procesadas']} partidas")
+    shutil.rmtree(temporal)
@@ -0,0 +1,205 @@
+# src/corpus/estadisticas.py
+import csv
+import json
+from collections import Counter
+
+from ..core.aperturas import obtener_clasificador
+from ..core.partida import Partida
+from .lectura import leer_partidas, en_lotes
+from .paralelo import procesar_en_paralelo
+
+
+class EstadisticasPartidas:
+    """
+    Agregados de un conjunto de partidas: frecuencia de jugadas, tasas de captura y
+    jaque, momento de los enroques, promociones, aperturas (códigos ECO) y longitud de
+    las partidas.
+
+    Los agregados son combinables (ver combinar): cada proceso calcula las estadísticas
+    de un lote de partidas y luego se suman. El tamaño en memoria depende solo del
+    vocabulario de jugadas y de las longitudes distintas, no del número de partidas.
+    """
+
+    def __init__(self):
+        self.partidas_validas = 0
+        self.partidas_invalidas = 0
+        self.jugadas = 0           # Jugadas (plies) de las partidas válidas.
+        self.capturas = 0
+        self.jaques = 0            # Incluye los mates.
+        self.mates = 0
+        self.frecuencia_jugadas = Counter()    # Jugada SAN -> apariciones
+        self.promociones = Counter()           # Pieza de promoción -> apariciones
+        self.enroques_por_turno = {            # Tipo de enroque -> Counter(número de turno)
+            "blancas_corto": Counter(),
+            "blancas_largo": Counter(),
+            "negras_corto": Counter(),
+            "negras_largo": Counter(),
+        }
+        self.longitudes = Counter()            # Plies por partida -> número de partidas
+        self.aperturas = Counter()             # Código ECO -> partidas (ver core/aperturas.py)
+
+    def agregar_partida(self, partida):
+        """Acumula una Partida ya validada (las inválidas solo se cuentan)."""
+        if not partida.es_valida_sintacticamente:
+            self.partidas_invalidas += 1
+            return
+        self.partidas_validas += 1
+        plies = 0
+        for turno in partida.turnos:
+            for color, jugada in (("blancas", turno.jugada_blanca), ("negras", turno.jugada_negra)):
+                if jugada is None:
+                    continue
+                plies += 1
+                san = jugada.san_string
+                self.frecuencia_jugadas[san] += 1
+                if "x" in san:
+                    self.capturas += 1
+                if san.endswith("#"):
+                    self.mates += 1
+                    self.jaques += 1
+                elif san.endswith("+"):
+                    self.jaques += 1
+                if "=" in san:
+                    self.promociones[san[san.index("=") + 1]] += 1
+                if jugada.regla == "enroque":
+                    tipo = "largo" if san.count("-") == 2 else "corto"
+                    self.enroques_por_turno[f"{color}_{tipo}"][turno.numero_turno] += 1
+        self.jugadas += plies
+        self.longitudes[plies] += 1
+        apertura = obtener_clasificador().clasificar(partida)
+        if apertura is not None:
+            self.aperturas[apertura.eco] += 1
+
+    def combinar(self, otra):
+        """Suma en este objeto los agregados de 'otra' y retorna self."""
+        self.partidas_validas += otra.partidas_validas
+        self.partidas_invalidas += otra.partidas_invalidas
+        self.jugadas += otra.jugadas
+        self.capturas += otra.capturas
+        self.jaques += otra.jaques
+        self.mates += otra.mates
+        self.frecuencia_jugadas.update(otra.frecuencia_jugadas)
+        self.promociones.update(otra.promociones)
+        for tipo, contador in otra.enroques_por_turno.items():
+            self.enroques_por_turno[tipo].update(contador)
+        self.longitudes.update(otra.longitudes)
+        self.aperturas.update(otra.aperturas)
+        return self
+
+    def tasa(self, cantidad):
+        """Proporción de 'cantidad' sobre el total de jugadas (0.0 si no hay jugadas)."""
+        return cantidad / self.jugadas if self.jugadas else 0.0
+
+    def a_dict(self):
+        """Representación serializable en JSON (las claves numéricas se convierten en texto)."""
+        return {
+            "partidas_validas": self.partidas_validas,
+            "partidas_invalidas": self.partidas_invalidas,
+            "jugadas": self.jugadas,
+            "capturas": self.capturas,
+            "tasa_capturas": self.tasa(self.capturas),
+            "jaques": self.jaques,
+            "tasa_jaques": self.tasa(self.jaques),
+            "mates": self.mates,
+            "promociones": dict(self.promociones.most_common()),
+            "enroques_por_turno": {tipo: {str(t): n for t, n in sorted(contador.items())}
+                                   for tipo, contador in self.enroques_por_turno.items()},
+            "longitudes": {str(plies): n for plies, n in sorted(self.longitudes.items())},
+            "aperturas": dict(sorted(self.aperturas.items())),
+            "frecuencia_jugadas": dict(self.frecuencia_jugadas.most_common()),
+        }
+
+    @classmethod
+    def desde_dict(cls, datos):
+        """Reconstruye las estadísticas a partir de a_dict() (ej: recibidas por la red en JSON)."""
+        estadisticas = cls()
+        for campo in ("partidas_validas", "partidas_invalidas", "jugadas", "capturas", "jaques", "mates"):
+            setattr(estadisticas, campo, datos[campo])
+        estadisticas.frecuencia_jugadas.update(datos["frecuencia_jugadas"])
+        estadisticas.promociones.update(datos["promociones"])
+        for tipo, por_turno in datos["enroques_por_turno"].items():
+            estadisticas.enroques_por_turno[tipo].update({int(t): n for t, n in por_turno.items()})
+        estadisticas.longitudes.update({int(plies): n for plies, n in datos["longitudes"].items()})
+        estadisticas.aperturas.update(datos.get("aperturas", {}))
+        return estadisticas
+
+    def escribir_json(self, ruta):
+        """Guarda las estadísticas en un archivo JSON."""
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(self.a_dict(), archivo, ensure_ascii=False, indent=2)
+
+    def escribir_csv(self, ruta):
+        """Guarda las estadísticas en un CSV con columnas (metrica, clave, valor)."""
+        datos = self.a_dict()
+        with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(["metrica", "clave", "valor"])
+            for metrica, valor in datos.items():
+                if not isinstance(valor, dict):
+                    escritor.writerow([metrica, "", valor])
+                elif metrica == "enroques_por_turno":
+                    for tipo, por_turno in valor.items():
+                        for turno, n in por_turno.items():
+                            escritor.writerow([f"enroque_{tipo}", turno, n])
+                else:
+                    for clave, n in valor.items():
+                        escritor.writerow([metrica, clave, n])
+
+    def __str__(self):
+        return (f"EstadisticasPartidas(válidas={self.partidas_validas}, inválidas={self.partidas_invalidas}, "
+                f"jugadas={self.jugadas}, capturas={self.tasa(self.capturas):.1%}, "
+                f"jaques={self.tasa(self.jaques):.1%})")
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def _estadisticas_de_lote(textos):
+    """Fase 'map': valida un lote de partidas y retorna sus estadísticas parciales."""
+    parciales = EstadisticasPartidas()
+    for texto in textos:
+        parciales.agregar_partida(Partida(texto))
+    return parciales
+
+
+def calcular_estadisticas(textos_partidas, procesos=None, tam_lote=500):
+    """
+    Calcula las estadísticas de un corpus en paralelo (map-reduce sobre un pool de procesos).
+
+    Args:
+        textos_partidas (iterable): Textos SAN de las partidas (ej: leer_partidas(ruta)).
+                                    Se consume en streaming.
+        procesos (int, optional): Número de procesos (por defecto, uno por núcleo).
+        tam_lote (int, optional): Partidas por tarea enviada a cada proceso.
+
+    Returns:
+        EstadisticasPartidas: Los agregados de todo el corpus.
+    """
+    total = EstadisticasPartidas()
+    for parciales in procesar_en_paralelo(_estadisticas_de_lote, en_lotes(textos_partidas, tam_lote), procesos):
+        total.combinar(parciales)
+    return total
+
+
+# Uso: python -m src.corpus.estadisticas corpus.txt [--salida stats.json] [--procesos N]
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Estadísticas de jugadas de un corpus de partidas SAN.")
+    parser.add_argument("entrada", help="Archivo con partidas separadas por líneas en blanco.")
+    parser.add_argument("--salida", help="Archivo de salida (.json o .csv). Sin él se imprime un resumen.")
+    parser.add_argument("--procesos", type=int, default=None, help="Número de procesos (por defecto, uno por núcleo).")
+    parser.add_argument("--tam-lote", type=int, default=500, help="Partidas por tarea.")
+    argumentos = parser.parse_args()
+
+    inicio = time.perf_counter()
+    estadisticas = calcular_estadisticas(leer_partidas(argumentos.entrada), argumentos.procesos, argumentos.tam_lote)
+    duracion = time.perf_counter() - inicio
+    total = estadisticas.partidas_validas + estadisticas.partidas_invalidas
+    print(f"{estadisticas} en {duracion:.2f}s ({total / duracion:.0f} partidas/s)")
+    if argumentos.salida:
+        if argumentos.salida.lower().endswith(".csv"):
+            estadisticas.escribir_csv(argumentos.salida)
+        else:
+            estadisticas.escribir_json(argumentos.salida)
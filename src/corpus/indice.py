@@ -0,0 +1,382 @@
+# src/corpus/indice.py
+
+# Índice invertido de jugadas: para cada jugada SAN (y cada par de jugadas consecutivas)
+# guarda la lista de posiciones (partida, ply) en las que aparece. Las búsquedas de
+# secuencias se resuelven intersecando listas, sin volver a leer el texto del corpus.
+#
+# Cada lista se guarda comprimida: pares (partida, ply) en varint, con la partida como
+# diferencia respecto a la anterior, en bloques de POSICIONES_POR_BLOQUE posiciones. Una
+# tabla con la primera partida de cada bloque permite saltar directamente al bloque que
+# contiene una partida sin descomprimir los anteriores.
+#
+# El ply de una jugada se deduce de su número de turno: 2 * (turno - 1) para las blancas
+# y uno más para las negras, de modo que el color y el turno se pueden filtrar sin
+# consultar la partida.
+#
+# Los términos se guardan normalizados con aperturas.normalizar_san (sin jaque, mate ni
+# anotaciones y con el enroque escrito con O), igual que las consultas: "0-0-0" encuentra
+# también "O-O-O", y "Qxf7" encuentra "Qxf7+" y "Qxf7#".
+
+import os
+import struct
+from array import array
+from bisect import bisect_left
+
+from ..core.aperturas import normalizar_san
+from ..core.partida import Partida
+
+POSICIONES_POR_BLOQUE = 128
+
+_MAGIA = b"AJZI"
+_VERSION = 2                             # 2: términos normalizados con normalizar_san
+_CABECERA = struct.Struct("<4sHIQ")      # magia, versión, partidas, términos
+_TERMINO = struct.Struct("<HIIIQ")       # bytes del término, posiciones, última partida, bloques, bytes de datos
+
+
+def _escribir_varint(datos, valor):
+    while valor >= 0x80:
+        datos.append((valor & 0x7F) | 0x80)
+        valor >>= 7
+    datos.append(valor)
+
+
+class ListaPosiciones:
+    """
+    Lista comprimida de posiciones (partida, ply) de un término, ordenada por partida.
+    Solo admite añadir posiciones de partidas iguales o posteriores a la última.
+    """
+
+    __slots__ = ("datos", "primeras", "inicios", "cuenta", "ultima")
+
+    def __init__(self):
+        self.datos = bytearray()
+        self.primeras = array("I")   # Primera partida de cada bloque
+        self.inicios = array("Q")    # Posición en 'datos' de cada bloque
+        self.cuenta = 0
+        self.ultima = 0              # Última partida añadida (base de la siguiente diferencia)
+
+    def agregar(self, partida, ply):
+        if self.cuenta % POSICIONES_POR_BLOQUE == 0:
+            # Cada bloque empieza con la partida absoluta: se puede descomprimir por separado.
+            self.primeras.append(partida)
+            self.inicios.append(len(self.datos))
+            self.ultima = 0
+        diferencia = partida - self.ultima
+        if diferencia < 0x80 and ply < 0x80:
+            # Caso habitual: un byte para cada valor.
+            self.datos += bytes((diferencia, ply))
+        else:
+            _escribir_varint(self.datos, diferencia)
+            _escribir_varint(self.datos, ply)
+        self.ultima = partida
+        self.cuenta += 1
+
+    def bloque(self, numero):
+        """Posiciones del bloque 'numero' como lista de (partida, ply)."""
+        datos = self.datos
+        i = self.inicios[numero]
+        n = min(POSICIONES_POR_BLOQUE, self.cuenta - numero * POSICIONES_POR_BLOQUE)
+        posiciones = []
+        partida = 0
+        for _ in range(n):
+            valor = datos[i]
+            i += 1
+            if valor >= 0x80:
+                valor &= 0x7F
+                desplazamiento = 7
+                while True:
+                    byte = datos[i]
+                    i += 1
+                    valor |= (byte & 0x7F) << desplazamiento
+                    if byte < 0x80:
+                        break
+                    desplazamiento += 7
+            ply = datos[i]
+            i += 1
+            if ply >= 0x80:
+                ply &= 0x7F
+                desplazamiento = 7
+                while True:
+                    byte = datos[i]
+                    i += 1
+                    ply |= (byte & 0x7F) << desplazamiento
+                    if byte < 0x80:
+                        break
+                    desplazamiento += 7
+            partida += valor
+            posiciones.append((partida, ply))
+        return posiciones
+
+    def __iter__(self):
+        for numero in range(len(self.primeras)):
+            yield from self.bloque(numero)
+
+    def __len__(self):
+        return self.cuenta
+
+    def bloques_de(self, partida):
+        """Números de los bloques que pueden contener posiciones de 'partida'."""
+        # El último bloque que empieza antes de 'partida' puede terminar con posiciones suyas.
+        numero = max(bisect_left(self.primeras, partida) - 1, 0)
+        while numero < len(self.primeras) and self.primeras[numero] <= partida:
+            yield numero
+            numero += 1
+
+
+class IndiceJugadas:
+    """
+    Índice invertido jugada -> posiciones (partida, ply) de un corpus de partidas válidas.
+
+    Se indexan las jugadas sueltas y los pares de jugadas consecutivas; una secuencia de
+    k jugadas se busca como la intersección de unos k/2 pares, empezando por la lista más
+    corta y descomprimiendo de las demás solo los bloques de las partidas candidatas.
+    Las partidas se numeran en el orden en que se añaden (también las inválidas, que no se
+    indexan), así que el número coincide con la posición de la partida en el corpus.
+    """
+
+    def __init__(self):
+        self.terminos = {}   # "Nf3" o "e4 c5" (normalizados) -> ListaPosiciones
+        self.partidas = 0
+
+    def agregar_partida(self, partida):
+        """
+        Indexa una Partida (si no es válida, solo consume su número).
+
+        Returns:
+            int: Número de la partida en el índice.
+        """
+        numero = self.partidas
+        self.partidas += 1
+        if not partida.es_valida_sintacticamente:
+            return numero
+        terminos = self.terminos
+        anterior = None
+        ply_anterior = -2
+        for turno in partida.turnos:
+            base = 2 * (turno.numero_turno - 1)
+            for ply, jugada in ((base, turno.jugada_blanca), (base + 1, turno.jugada_negra)):
+                if jugada is None:
+                    continue
+                san = normalizar_san(jugada.san_string)
+                lista = terminos.get(san)
+                if lista is None:
+                    lista = terminos[san] = ListaPosiciones()
+                lista.agregar(numero, ply)
+                if ply == ply_anterior + 1:
+                    par = f"{anterior} {san}"
+                    lista = terminos.get(par)
+                    if lista is None:
+                        lista = terminos[par] = ListaPosiciones()
+                    lista.agregar(numero, ply_anterior)
+                anterior, ply_anterior = san, ply
+        return numero
+
+    def agregar_corpus(self, textos, reconocedor=None):
+        """Valida e indexa cada texto de partida (ej: leer_partidas(ruta)). Retorna las partidas añadidas."""
+        n = 0
+        for texto in textos:
+            self.agregar_partida(Partida(texto, reconocedor))
+            n += 1
+        return n
+
+    def lista(self, termino):
+        """ListaPosiciones de una jugada ("Nf3") o de un par ("e4 c5"), o None."""
+        return self.terminos.get(" ".join(normalizar_san(san) for san in termino.split()))
+
+    def buscar(self, secuencia, color=None, antes_del_turno=None, desde_turno=None):
+        """
+        Posiciones en las que empieza la secuencia de jugadas consecutivas. Las jugadas se
+        comparan normalizadas (ver normalizar_san): "Qxf7" encuentra también "Qxf7#", y
+        "0-0" y "O-O" son la misma jugada.
+
+        Args:
+            secuencia (str | list): Jugadas SAN, ej: "e4 c5 Nf3 d6" o ["Qxf7#"].
+            color (str, optional): "blancas" o "negras": color de la primera jugada.
+            antes_del_turno (int, optional): La primera jugada es de un turno menor que este.
+            desde_turno (int, optional): La primera jugada es de este turno o posterior.
+
+        Returns:
+            list: (partida, ply) ordenados, con el ply de la primera jugada de la secuencia.
+        """
+        jugadas = [normalizar_san(san) for san in (secuencia.split() if isinstance(secuencia, str) else secuencia)]
+        if not jugadas:
+            return []
+        if len(jugadas) == 1:
+            condiciones = [(jugadas[0], 0)]
+        else:
+            # Pares que cubren la secuencia: (0,1), (2,3)... y el último solapado si k es impar.
+            desplazamientos = list(range(0, len(jugadas) - 1, 2))
+            if len(jugadas) % 2:
+                desplazamientos.append(len(jugadas) - 2)
+            condiciones = [(f"{jugadas[d]} {jugadas[d + 1]}", d) for d in desplazamientos]
+
+        listas = []
+        for termino, desplazamiento in condiciones:
+            lista = self.terminos.get(termino)
+            if lista is None:
+                return []
+            listas.append((len(lista), desplazamiento, lista))
+        listas.sort(key=lambda x: x[0])
+
+        def admitida(ply):
+            if ply < 0:
+                return False
+            if color is not None and ply % 2 != (color == "negras"):
+                return False
+            turno = ply // 2 + 1
+            if antes_del_turno is not None and turno >= antes_del_turno:
+                return False
+            return desde_turno is None or turno >= desde_turno
+
+        _, desplazamiento, lista = listas[0]
+        candidatos = {(partida, ply - desplazamiento) for partida, ply in lista}
+        candidatos = {c for c in candidatos if admitida(c[1])}
+        for _, desplazamiento, lista in listas[1:]:
+            if not candidatos:
+                break
+            candidatos = self._intersecar(candidatos, lista, desplazamiento)
+        return sorted(candidatos)
+
+    @staticmethod
+    def _intersecar(candidatos, lista, desplazamiento):
+        """Candidatos (partida, ply inicial) cuya posición ply + desplazamiento está en 'lista'."""
+        if len(candidatos) * 4 >= len(lista):
+            # Casi tantos candidatos como posiciones: más barato recorrer la lista entera.
+            return candidatos & {(partida, ply - desplazamiento) for partida, ply in lista}
+        bloques = set()
+        for partida in {partida for partida, _ in candidatos}:
+            bloques.update(lista.bloques_de(partida))
+        presentes = set()
+        for numero in bloques:
+            presentes.update((partida, ply - desplazamiento) for partida, ply in lista.bloque(numero))
+        return candidatos & presentes
+
+    def partidas_con(self, secuencia, **filtros):
+        """Números de las partidas que contienen la secuencia (ver buscar), ordenados."""
+        return sorted({partida for partida, _ in self.buscar(secuencia, **filtros)})
+
+    def guardar(self, ruta):
+        """Guarda el índice en 'ruta' (de forma atómica: temporal y renombrado)."""
+        temporal = f"{ruta}.tmp{os.getpid()}"
+        with open(temporal, "wb") as archivo:
+            archivo.write(_CABECERA.pack(_MAGIA, _VERSION, self.partidas, len(self.terminos)))
+            for termino, lista in self.terminos.items():
+                clave = termino.encode("utf-8")
+                archivo.write(_TERMINO.pack(len(clave), lista.cuenta, lista.ultima, len(lista.primeras), len(lista.datos)))
+                archivo.write(clave)
+                archivo.write(lista.primeras.tobytes())
+                archivo.write(lista.inicios.tobytes())
+                archivo.write(lista.datos)
+        os.replace(temporal, ruta)
+
+    @classmethod
+    def cargar(cls, ruta):
+        """
+        Carga un índice guardado con guardar(); se le pueden seguir añadiendo partidas.
+
+        Raises:
+            ValueError: Si el archivo no es un índice de esta versión.
+        """
+        indice = cls()
+        with open(ruta, "rb") as archivo:
+            datos = archivo.read()
+        magia, version, indice.partidas, num_terminos = _CABECERA.unpack_from(datos, 0)
+        if magia != _MAGIA or version != _VERSION:
+            raise ValueError(f"'{ruta}' no es un índice de jugadas (versión {_VERSION}).")
+        posicion = _CABECERA.size
+        vista = memoryview(datos)
+        for _ in range(num_terminos):
+            bytes_clave, cuenta, ultima, bloques, bytes_datos = _TERMINO.unpack_from(datos, posicion)
+            posicion += _TERMINO.size
+            termino = datos[posicion:posicion + bytes_clave].decode("utf-8")
+            posicion += bytes_clave
+            lista = ListaPosiciones()
+            lista.cuenta, lista.ultima = cuenta, ultima
+            lista.primeras.frombytes(vista[posicion:posicion + 4 * bloques])
+            posicion += 4 * bloques
+            lista.inicios.frombytes(vista[posicion:posicion + 8 * bloques])
+            posicion += 8 * bloques
+            lista.datos = bytearray(vista[posicion:posicion + bytes_datos])
+            posicion += bytes_datos
+            indice.terminos[termino] = lista
+        return indice
+
+    def tamano_comprimido(self):
+        """Bytes de las listas de posiciones (datos y tablas de bloques)."""
+        return sum(len(l.datos) + 12 * len(l.primeras) for l in self.terminos.values())
+
+    def __len__(self):
+        return self.partidas
+
+
+# Construcción y consultas sobre un corpus sintético, comparadas con recorrer las partidas.
+# Uso: python -m src.corpus.indice [partidas]
+if __name__ == '__main__':
+    import random
+    import sys
+    import tempfile
+    import time
+
+    from .sintetico import GeneradorCorpus
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    textos = [texto for texto, _ in GeneradorCorpus(3, tasa_errores=0.02).partidas(n)]
+    partidas = [Partida(t) for t in textos]
+
+    inicio = time.perf_counter()
+    indice = IndiceJugadas()
+    for partida in partidas[:n // 2]:
+        indice.agregar_partida(partida)
+    ruta = os.path.join(tempfile.mkdtemp(), "indice.ajzi")
+    indice.guardar(ruta)
+    indice = IndiceJugadas.cargar(ruta)   # Añadido incremental sobre un índice cargado de disco
+    for partida in partidas[n // 2:]:
+        indice.agregar_partida(partida)
+    construccion = time.perf_counter() - inicio
+    indice.guardar(ruta)
+    bytes_texto = sum(len(t.encode("utf-8")) for t in textos)
+    print(f"{n} partidas indexadas en {construccion:.1f}s ({n / construccion:.0f} partidas/s); "
+          f"{len(indice.terminos)} términos, listas {indice.tamano_comprimido() / 1e6:.1f} MB, "
+          f"archivo {os.path.getsize(ruta) / 1e6:.1f} MB (texto: {bytes_texto / 1e6:.1f} MB)")
+    inicio = time.perf_counter()
+    indice = IndiceJugadas.cargar(ruta)
+    print(f"Carga desde disco: {time.perf_counter() - inicio:.2f}s")
+    os.remove(ruta)
+
+    def por_recorrido(jugadas, color=None, antes_del_turno=None):
+        """Misma consulta recorriendo las jugadas de cada partida (referencia)."""
+        encontrados = []
+        for numero, partida in enumerate(partidas):
+            if not partida.es_valida_sintacticamente:
+                continue
+            plies = {}
+            for turno in partida.turnos:
+                plies[2 * (turno.numero_turno - 1)] = normalizar_san(turno.jugada_blanca.san_string)
+                if turno.jugada_negra:
+                    plies[2 * (turno.numero_turno - 1) + 1] = normalizar_san(turno.jugada_negra.san_string)
+            for ply in sorted(plies):
+                if all(plies.get(ply + i) == normalizar_san(jugada) for i, jugada in enumerate(jugadas)) \
+                        and (color is None or ply % 2 == (color == "negras")) \
+                        and (antes_del_turno is None or ply // 2 + 1 < antes_del_turno):
+                    encontrados.append((numero, ply))
+        return encontrados
+
+    rng = random.Random(5)
+    validas = [p for p in partidas if p.es_valida_sintacticamente]
+    consultas = [(["Qxf7#"], {}), (["0-0-0"], {"color": "negras", "antes_del_turno": 10}), (["e4", "c5"], {})]
+    for _ in range(4):
+        # Secuencias tomadas de partidas reales del corpus (para que tengan resultados).
+        partida = rng.choice(validas)
+        plies = [j.san_string for t in partida.turnos for j in (t.jugada_blanca, t.jugada_negra) if j]
+        k = rng.choice((2, 3, 4, 5))
+        inicio_secuencia = rng.randrange(max(len(plies) - k, 1))
+        consultas.append((plies[inicio_secuencia:inicio_secuencia + k], {}))
+    for jugadas, filtros in consultas:
+        inicio = time.perf_counter()
+        resultado = indice.buscar(jugadas, **filtros)
+        t_indice = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        referencia = por_recorrido(jugadas, **filtros)
+        t_recorrido = time.perf_counter() - inicio
+        print(f"{' '.join(jugadas)!r} {filtros or ''}: {len(resultado)} resultado(s); índice {t_indice * 1000:.2f} ms, "
+              f"recorrido {t_recorrido * 1000:.0f} ms, {'iguales' if resultado == referencia else 'DISTINTOS'}")
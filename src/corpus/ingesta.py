@@ -0,0 +1,175 @@
+# src/corpus/ingesta.py
+
+# Ingesta de corpus comprimidos (.gz, .bz2, .xz) con la descompresión en un hilo productor.
+#
+# Los descompresores de la biblioteca estándar (zlib, bz2, lzma) liberan el GIL mientras
+# trabajan, así que un hilo puede ir descomprimiendo el siguiente bloque mientras el hilo
+# principal analiza y valida las partidas del anterior. Los bloques pasan por una cola
+# acotada: la memoria usada no depende del tamaño del archivo.
+
+import codecs
+import io
+import queue
+import threading
+
+from ..core.partida import Partida
+from .lectura import descompresor_de, leer_partidas
+
+_FIN = object()  # Marca de fin de la cola
+
+
+class _Error:
+    """Excepción del hilo productor, para relanzarla en el consumidor."""
+
+    def __init__(self, excepcion):
+        self.excepcion = excepcion
+
+
+def _producir_bloques(ruta, tam_bloque, cola, detener):
+    """Cuerpo del hilo productor: descomprime 'ruta' y pone bloques de bytes en la cola."""
+    def poner(elemento):
+        # put con espera corta para poder abandonar si el consumidor ya no lee.
+        while not detener.is_set():
+            try:
+                cola.put(elemento, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        modulo = descompresor_de(ruta)
+        with (modulo.open(ruta, "rb") if modulo else open(ruta, "rb")) as archivo:
+            while True:
+                bloque = archivo.read(tam_bloque)
+                if not bloque or not poner(bloque):
+                    break
+    except Exception as e:  # Se relanza en el hilo consumidor.
+        poner(_Error(e))
+    poner(_FIN)
+
+
+def leer_lineas_en_segundo_plano(ruta, codificacion="utf-8", tam_bloque=1 << 20, bloques_en_cola=8):
+    """
+    Genera las líneas de un archivo (comprimido o no) descomprimiéndolo en otro hilo.
+
+    Args:
+        ruta (str): Archivo .gz, .bz2, .xz o sin comprimir.
+        codificacion (str, optional): Codificación del texto.
+        tam_bloque (int, optional): Bytes descomprimidos por bloque.
+        bloques_en_cola (int, optional): Bloques que el productor puede adelantar como máximo.
+
+    Yields:
+        str: Cada línea, con su salto de línea.
+
+    Raises:
+        Las excepciones de lectura o descompresión del hilo productor (ej: OSError, EOFError).
+    """
+    cola = queue.Queue(maxsize=bloques_en_cola)
+    detener = threading.Event()
+    productor = threading.Thread(target=_producir_bloques, args=(ruta, tam_bloque, cola, detener),
+                                 name="descompresion", daemon=True)
+    productor.start()
+    decodificador = codecs.getincrementaldecoder(codificacion)()
+    resto = ""
+    try:
+        while True:
+            bloque = cola.get()
+            if bloque is _FIN:
+                break
+            if isinstance(bloque, _Error):
+                raise bloque.excepcion
+            texto = resto + decodificador.decode(bloque)
+            corte = texto.rfind("\n") + 1
+            resto = texto[corte:]
+            # StringIO separa las líneas en C (solo por '\n', como un archivo de texto).
+            yield from io.StringIO(texto[:corte])
+        resto += decodificador.decode(b"", final=True)
+        if resto:
+            yield resto
+    finally:
+        # Si el consumidor abandona antes del final, el productor termina en cuanto lo nota.
+        detener.set()
+        productor.join()
+
+
+def leer_partidas_en_segundo_plano(ruta, codificacion="utf-8", tam_bloque=1 << 20, bloques_en_cola=8):
+    """Como lectura.leer_partidas, pero con la descompresión en un hilo productor."""
+    return leer_partidas(leer_lineas_en_segundo_plano(ruta, codificacion, tam_bloque, bloques_en_cola))
+
+
+def validar_corpus(ruta, en_segundo_plano=True):
+    """
+    Valida todas las partidas de un corpus (comprimido o no).
+
+    Returns:
+        tuple: (partidas válidas, partidas inválidas)
+    """
+    partidas = leer_partidas_en_segundo_plano(ruta) if en_segundo_plano else leer_partidas(ruta)
+    validas = invalidas = 0
+    for texto in partidas:
+        if Partida(texto).es_valida_sintacticamente:
+            validas += 1
+        else:
+            invalidas += 1
+    return validas, invalidas
+
+
+# Comparación con descomprimir primero todo el archivo y después analizarlo.
+# Uso: python -m src.corpus.ingesta [archivo.gz|.bz2|.xz ...]   (sin archivos: corpus sintético)
+if __name__ == '__main__':
+    import bz2
+    import gzip
+    import lzma
+    import os
+    import sys
+    import tempfile
+    import time
+
+    def descomprimir_y_analizar(ruta):
+        modulo = descompresor_de(ruta)
+        with (modulo.open(ruta, "rb") if modulo else open(ruta, "rb")) as archivo:
+            texto = archivo.read().decode("utf-8")
+        validas = invalidas = 0
+        for partida in leer_partidas(io.StringIO(texto)):
+            if Partida(partida).es_valida_sintacticamente:
+                validas += 1
+            else:
+                invalidas += 1
+        return validas, invalidas
+
+    rutas = sys.argv[1:]
+    temporales = []
+    if not rutas:
+        jugadas = ["e4 e5", "Nf3 Nc6", "Bb5 a6", "Ba4 Nf6", "0-0 Be7", "Re1 b5", "Bb3 d6", "c3 0-0"]
+        partidas = []
+        for n in range(30000):
+            turnos = [f"{t + 1}. {jugadas[(t + n) % len(jugadas)]}" for t in range(10 + n % 30)]
+            partidas.append(" ".join(turnos) + (" 99. Zz9" if n % 10 == 0 else ""))
+        datos = "\n\n".join(partidas).encode("utf-8")
+        for extension, modulo in ((".gz", gzip), (".bz2", bz2), (".xz", lzma)):
+            descriptor, ruta = tempfile.mkstemp(suffix=extension)
+            with os.fdopen(descriptor, "wb") as archivo:
+                archivo.write(modulo.compress(datos))
+            rutas.append(ruta)
+            temporales.append(ruta)
+        print(f"Corpus sintético: {len(partidas)} partidas, {len(datos) / 1e6:.1f} MB sin comprimir")
+
+    def medir(funcion, ruta, repeticiones=3):
+        """Mejor tiempo de 'repeticiones' ejecuciones (reduce el ruido de la máquina)."""
+        mejor = None
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            resultado = funcion(ruta)
+            duracion = time.perf_counter() - inicio
+            mejor = duracion if mejor is None else min(mejor, duracion)
+        return resultado, mejor
+
+    for ruta in rutas:
+        resultado_secuencial, t_secuencial = medir(descomprimir_y_analizar, ruta)
+        resultado_solapado, t_solapado = medir(validar_corpus, ruta)
+        print(f"{os.path.basename(ruta)}: descomprimir y luego analizar {t_secuencial:.2f}s; "
+              f"en segundo plano {t_solapado:.2f}s ({t_secuencial / t_solapado:.2f}x); "
+              f"{resultado_solapado[0]} válidas, {resultado_solapado[1]} inválidas")
+    for ruta in temporales:
+        os.remove(ruta)
@@ -0,0 +1,140 @@
+# src/corpus/lectura.py
+import bz2
+import gzip
+import lzma
+from array import array
+
+# Lectura en streaming de archivos con muchas partidas SAN.
+# Formato: las partidas se separan por una o más líneas en blanco; una partida
+# puede ocupar varias líneas. Solo se mantiene en memoria la partida en curso.
+# Las líneas se separan solo por '\n' y una línea está en blanco si solo tiene blancos
+# ASCII (_BLANCOS): el mismo criterio sirve para el texto y para los bytes, de modo que
+# leer_partidas e indexar_partidas ven siempre las mismas partidas. (str.strip() quitaría
+# además el espacio duro U+00A0 y otros blancos Unicode que bytes.strip() no ve.)
+_BLANCOS = " \t\r\n\f\v"
+_BLANCOS_BYTES = _BLANCOS.encode("ascii")
+
+
+# Módulo de descompresión de cada formato, según la extensión del archivo.
+DESCOMPRESORES = {".gz": gzip, ".bz2": bz2, ".xz": lzma}
+
+
+def descompresor_de(ruta):
+    """Retorna el módulo (gzip, bz2 o lzma) que abre 'ruta', o None si no está comprimida."""
+    for extension, modulo in DESCOMPRESORES.items():
+        if ruta.lower().endswith(extension):
+            return modulo
+    return None
+
+
+def abrir_texto(ruta, codificacion="utf-8"):
+    """
+    Abre un archivo de texto para leer, descomprimiéndolo al vuelo si es .gz, .bz2 o .xz.
+    Las líneas se separan solo por '\n' (un '\r' suelto no corta la línea), como en los bytes.
+    """
+    modulo = descompresor_de(ruta)
+    if modulo is None:
+        return open(ruta, encoding=codificacion, newline="\n")
+    return modulo.open(ruta, "rt", encoding=codificacion, newline="\n")
+
+
+def leer_partidas(origen, codificacion="utf-8"):
+    """
+    Genera el texto de cada partida de un archivo de corpus, una por una.
+
+    Args:
+        origen (str | file): Ruta del archivo (puede estar comprimido, ver abrir_texto), o un
+                             objeto archivo de texto ya abierto (o cualquier iterable de líneas).
+        codificacion (str, optional): Codificación usada si 'origen' es una ruta.
+
+    Yields:
+        str: El texto de una partida (sus líneas unidas con '\n', sin líneas en blanco).
+    """
+    if isinstance(origen, str):
+        with abrir_texto(origen, codificacion) as archivo:
+            yield from leer_partidas(archivo)
+        return
+
+    lineas = []
+    for linea in origen:
+        linea = linea.rstrip("\r\n")
+        if linea.strip(_BLANCOS):
+            lineas.append(linea)
+        elif lineas:
+            yield "\n".join(lineas)
+            lineas = []
+    if lineas:
+        yield "\n".join(lineas)
+
+
+def en_lotes(iterable, tam_lote):
+    """
+    Agrupa los elementos de 'iterable' en listas de como máximo 'tam_lote' elementos.
+
+    Yields:
+        list: El siguiente lote.
+    """
+    lote = []
+    for elemento in iterable:
+        lote.append(elemento)
+        if len(lote) >= tam_lote:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def indexar_partidas(ruta):
+    """
+    Recorre el archivo una sola vez y localiza cada partida sin decodificar su texto.
+
+    Usa el mismo criterio que leer_partidas (las partidas se separan por líneas en
+    blanco), de modo que la partida i de leer_partidas es leer_partida(archivo, inicios[i], fines[i]).
+
+    Args:
+        ruta (str): Ruta del archivo de corpus (sin comprimir).
+
+    Returns:
+        tuple: (inicios, fines), dos array('Q') con la posición en bytes del inicio de cada
+               partida y del final de su última línea (sin el salto de línea).
+
+    Raises:
+        ValueError: Si el archivo está comprimido (sus posiciones no permiten leer partidas sueltas).
+    """
+    if descompresor_de(ruta) is not None:
+        raise ValueError(f"No se puede indexar un archivo comprimido: '{ruta}'. Descomprímalo antes.")
+    inicios = array("Q")
+    fines = array("Q")
+    posicion = 0
+    fin_partida = None  # Final de la última línea no vacía de la partida en curso
+    with open(ruta, "rb") as archivo:
+        for linea in archivo:
+            if linea.strip(_BLANCOS_BYTES):
+                if fin_partida is None:
+                    inicios.append(posicion)
+                fin_partida = posicion + len(linea.rstrip(b"\r\n"))
+            elif fin_partida is not None:
+                fines.append(fin_partida)
+                fin_partida = None
+            posicion += len(linea)
+    if fin_partida is not None:
+        fines.append(fin_partida)
+    return inicios, fines
+
+
+def leer_partida(archivo, inicio, fin, codificacion="utf-8"):
+    """
+    Lee una sola partida localizada con indexar_partidas.
+
+    Args:
+        archivo (file): El archivo de corpus abierto en modo binario.
+        inicio (int): Posición en bytes del inicio de la partida.
+        fin (int): Posición en bytes del final de la partida.
+        codificacion (str, optional): Codificación del archivo.
+
+    Returns:
+        str: El texto de la partida, igual que lo genera leer_partidas.
+    """
+    archivo.seek(inicio)
+    texto = archivo.read(fin - inicio).decode(codificacion)
+    return "\n".join(linea.rstrip("\r") for linea in texto.split("\n"))
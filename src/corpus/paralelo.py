@@ -0,0 +1,167 @@
+# src/corpus/paralelo.py
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from functools import partial
+
+from ..core.bnf_rules import obtener_reconocedor
+from ..core.partida import Partida
+from .lectura import en_lotes
+
+
+def gil_activo():
+    """
+    Indica si el intérprete ejecuta con GIL. Sin GIL (Python 3.13t o posterior, compilado
+    con --disable-gil y sin PYTHON_GIL=1) los hilos de procesar_en_hilos usan varios
+    núcleos a la vez; con GIL se turnan y solo el pool de procesos escala.
+    """
+    return getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def procesar_en_paralelo(funcion, lotes, procesos=None, lotes_en_vuelo=None):
+    """
+    Aplica 'funcion' a cada lote en un pool de procesos y genera los resultados
+    a medida que terminan (sin orden garantizado).
+
+    Solo se envían al pool 'lotes_en_vuelo' lotes a la vez: el iterable de lotes se
+    consume bajo demanda, de modo que la memoria no depende del tamaño del corpus.
+
+    Args:
+        funcion (callable): Función de nivel de módulo (debe poder serializarse con pickle).
+        lotes (iterable): Argumento de cada llamada a 'funcion'.
+        procesos (int, optional): Número de procesos. Por defecto, os.cpu_count().
+                                  Con 1 se procesa en el propio proceso, sin pool.
+        lotes_en_vuelo (int, optional): Máximo de lotes pendientes. Por defecto, 2 por proceso.
+
+    Yields:
+        El resultado de 'funcion' para cada lote.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1:
+        for lote in lotes:
+            yield funcion(lote)
+        return
+
+    lotes_en_vuelo = lotes_en_vuelo or 2 * procesos
+    iterador = iter(lotes)
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        pendientes = set()
+        for lote in iterador:
+            pendientes.add(pool.submit(funcion, lote))
+            if len(pendientes) >= lotes_en_vuelo:
+                terminados, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                for futuro in terminados:
+                    yield futuro.result()
+        for futuro in as_completed(pendientes):
+            yield futuro.result()
+
+
+def procesar_en_hilos(funcion, lotes, hilos=None, lotes_en_vuelo=None):
+    """
+    Como procesar_en_paralelo, pero con un pool de hilos del propio proceso: 'funcion' y
+    sus resultados no se serializan (puede ser cualquier callable y retornar, ej: objetos
+    Partida), y los resultados se generan en el orden de los lotes.
+
+    'funcion' debe poder ejecutarse a la vez desde varios hilos (ver validar_partidas).
+
+    Args:
+        funcion (callable): Función a aplicar a cada lote.
+        lotes (iterable): Argumento de cada llamada a 'funcion'. Se consume bajo demanda.
+        hilos (int, optional): Número de hilos. Por defecto, os.cpu_count().
+                               Con 1 se procesa en el hilo que llama, sin pool.
+        lotes_en_vuelo (int, optional): Máximo de lotes pendientes. Por defecto, 2 por hilo.
+
+    Yields:
+        El resultado de 'funcion' para cada lote, en orden.
+    """
+    hilos = hilos or os.cpu_count() or 1
+    if hilos == 1:
+        for lote in lotes:
+            yield funcion(lote)
+        return
+
+    lotes_en_vuelo = lotes_en_vuelo or 2 * hilos
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        pendientes = deque()
+        try:
+            for lote in lotes:
+                pendientes.append(pool.submit(funcion, lote))
+                if len(pendientes) >= lotes_en_vuelo:
+                    yield pendientes.popleft().result()
+            while pendientes:
+                yield pendientes.popleft().result()
+        finally:
+            for futuro in pendientes:   # Si se deja de consumir el generador, no se sigue validando.
+                futuro.cancel()
+
+
+def _validar_lote(textos, reconocedor=None):
+    """Valida un lote de partidas (se ejecuta en un hilo o en un proceso del pool)."""
+    return [Partida(texto, reconocedor) for texto in textos]
+
+
+def validar_partidas(textos_partidas, hilos=None, tam_lote=200, reconocedor=None):
+    """
+    Valida partidas en un pool de hilos y genera los objetos Partida en el orden de entrada.
+
+    Frente a un pool de procesos no hay que serializar textos ni resultados, y todas las
+    partidas comparten la misma gramática compilada (y su caché de veredictos). Con GIL
+    (ver gil_activo) la validación no se acelera, pero tampoco paga la serialización.
+
+    Args:
+        textos_partidas (iterable): Textos SAN de las partidas. Se consume en streaming.
+        hilos (int, optional): Número de hilos (por defecto, uno por núcleo).
+        tam_lote (int, optional): Partidas por tarea enviada a cada hilo.
+        reconocedor (ReconocedorSAN, optional): Gramática con la que se validan las jugadas.
+
+    Yields:
+        Partida: Cada partida validada.
+    """
+    if reconocedor is None:
+        obtener_reconocedor()   # Compilar o cargar la gramática antes de arrancar los hilos.
+    funcion = partial(_validar_lote, reconocedor=reconocedor)
+    for partidas in procesar_en_hilos(funcion, en_lotes(textos_partidas, tam_lote), hilos):
+        yield from partidas
+
+
+# Validación de un corpus sintético en serie, con procesos y con hilos. Ejecutar desde la
+# raíz del proyecto con cada intérprete a comparar, ej:
+#   python -m src.corpus.paralelo
+#   python3.13t -m src.corpus.paralelo
+if __name__ == '__main__':
+    import platform
+    import time
+    from .estadisticas import EstadisticasPartidas, _estadisticas_de_lote
+    from .sintetico import GeneradorCorpus
+
+    textos = [texto for texto, _ in GeneradorCorpus(semilla=3).partidas(20000)]
+    validas = sum(p.es_valida_sintacticamente for p in _validar_lote(textos))
+    print(f"Python {platform.python_version()}, GIL {'activo' if gil_activo() else 'desactivado'}, "
+          f"{os.cpu_count()} CPU(s), {len(textos)} partidas")
+
+    def medir(nombre, funcion):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        duracion = time.perf_counter() - inicio
+        aviso = "" if resultado == validas else f"  (¡{resultado} válidas, se esperaban {validas}!)"
+        print(f"  {nombre:<46} {duracion:6.2f}s  {len(textos) / duracion:8,.0f} partidas/s{aviso}")
+
+    def estadisticas(resultados):
+        total = EstadisticasPartidas()
+        for parciales in resultados:
+            total.combinar(parciales)
+        return total.partidas_validas
+
+    medir("en serie", lambda: sum(p.es_valida_sintacticamente for p in _validar_lote(textos)))
+    for n in (2, 4):
+        medir(f"{n} procesos, estadísticas (agregados)",
+              lambda: estadisticas(procesar_en_paralelo(_estadisticas_de_lote, en_lotes(textos, 200), n)))
+        medir(f"{n} hilos, estadísticas (agregados)",
+              lambda: estadisticas(procesar_en_hilos(_estadisticas_de_lote, en_lotes(textos, 200), n)))
+    for n in (2, 4):
+        medir(f"{n} procesos, objetos Partida (pickle)",
+              lambda: sum(p.es_valida_sintacticamente for lote in
+                          procesar_en_paralelo(_validar_lote, en_lotes(textos, 200), n) for p in lote))
+        medir(f"{n} hilos, objetos Partida (validar_partidas)",
+              lambda: sum(p.es_valida_sintacticamente for p in validar_partidas(textos, hilos=n)))
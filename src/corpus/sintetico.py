@@ -0,0 +1,277 @@
+# src/corpus/sintetico.py
+
+# Generador determinista de corpus sintéticos de partidas SAN para pruebas de carga.
+#
+# Con la misma semilla y los mismos parámetros se obtiene exactamente el mismo corpus,
+# byte a byte, de modo que las mediciones de rendimiento son reproducibles. Las jugadas
+# se construyen a partir de los elementos de la gramática (src/core/gramatica_san.bnf),
+# así que las partidas sin errores inyectados son válidas para Movimiento/Partida.
+
+import random
+from collections import Counter
+
+from .lectura import descompresor_de
+
+# Proporción de cada tipo de jugada (reglas de <jugada>, el enroque se trata aparte).
+MEZCLA_POR_DEFECTO = {"movimiento_pieza": 0.55, "peon_avance": 0.33, "peon_captura": 0.12}
+
+# Errores inyectables y pesos relativos por defecto.
+#   casilla:   una jugada con una casilla inexistente (ej: "Ni9").
+#   residual:  texto sobrante dentro de un turno (ej: "12. Nf3 Nc6 {ventaja}").
+#   secuencia: un número de turno menor o igual que el anterior.
+ERRORES_POR_DEFECTO = {"casilla": 1.0, "residual": 1.0, "secuencia": 1.0}
+
+# Casos patológicos y pesos relativos por defecto.
+#   larga:        partida de plies_partida_larga plies (válida).
+#   token_enorme: una "jugada" de longitud_token_enorme caracteres (inválida).
+PATOLOGICAS_POR_DEFECTO = {"larga": 1.0, "token_enorme": 1.0}
+
+_LETRAS = "abcdefgh"
+_NUMEROS = "12345678"
+_PIEZAS = "NBRQK"
+_PESOS_PIEZAS = (0.3, 0.25, 0.2, 0.15, 0.1)
+_RESIDUOS = ("1-0", "!!", "{ventaja}", "$1", "(1...Nf6)", "*")
+
+# Nivel de compresión por defecto al escribir: prioriza la velocidad.
+_NIVEL_COMPRESION_RAPIDO = {".gz": 1, ".bz2": 1, ".xz": 0}
+
+
+class GeneradorCorpus:
+    """
+    Genera partidas SAN sintéticas con una semilla fija.
+
+    Para generar millones de partidas deprisa, las jugadas no se construyen una a una:
+    al crear el generador se sortea un repertorio de jugadas con la mezcla pedida y cada
+    partida elige sus plies del repertorio con una sola llamada a random.choices.
+    """
+
+    def __init__(self, semilla=0, plies_medio=80, plies_desviacion=30, plies_min=2, plies_max=300,
+                 mezcla=None, prob_captura=0.15, prob_jaque=0.06, prob_desambiguacion=0.03,
+                 prob_promocion=0.002, prob_enroque=0.85, prob_mate=0.05, turnos_por_linea=8,
+                 tasa_errores=0.0, tipos_error=None, tasa_patologicas=0.0, tipos_patologicos=None,
+                 plies_partida_larga=20000, longitud_token_enorme=1 << 20, tam_repertorio=1 << 16):
+        """
+        Args:
+            semilla (int, optional): Semilla del generador.
+            plies_medio, plies_desviacion (int, optional): Media y desviación de la longitud (normal).
+            plies_min, plies_max (int, optional): Longitud mínima y máxima de una partida normal.
+            mezcla (dict, optional): Peso de cada tipo de jugada (ver MEZCLA_POR_DEFECTO).
+            prob_captura (float, optional): Probabilidad de que una jugada de pieza sea una captura.
+            prob_jaque (float, optional): Probabilidad de que una jugada dé jaque.
+            prob_desambiguacion (float, optional): Probabilidad de desambiguación en jugadas de pieza.
+            prob_promocion (float, optional): Probabilidad de que un avance o captura de peón corone.
+            prob_enroque (float, optional): Probabilidad de que cada bando enroque en la partida.
+            prob_mate (float, optional): Probabilidad de que la última jugada sea mate.
+            turnos_por_linea (int, optional): Turnos por línea de texto (None: la partida en una línea).
+            tasa_errores (float, optional): Fracción de partidas con un error inyectado.
+            tipos_error (dict, optional): Peso de cada tipo de error (ver ERRORES_POR_DEFECTO).
+            tasa_patologicas (float, optional): Fracción de partidas patológicas.
+            tipos_patologicos (dict, optional): Peso de cada caso (ver PATOLOGICAS_POR_DEFECTO).
+            plies_partida_larga (int, optional): Plies de una partida "larga".
+            longitud_token_enorme (int, optional): Caracteres de un "token_enorme".
+            tam_repertorio (int, optional): Jugadas distintas sorteadas para el repertorio.
+        """
+        self.rng = random.Random(semilla)
+        self.plies_medio = plies_medio
+        self.plies_desviacion = plies_desviacion
+        self.plies_min = plies_min
+        self.plies_max = plies_max
+        self.prob_captura = prob_captura
+        self.prob_jaque = prob_jaque
+        self.prob_desambiguacion = prob_desambiguacion
+        self.prob_promocion = prob_promocion
+        self.prob_enroque = prob_enroque
+        self.prob_mate = prob_mate
+        self.turnos_por_linea = turnos_por_linea
+        self.tasa_errores = tasa_errores
+        self.tipos_error = tipos_error or ERRORES_POR_DEFECTO
+        self.tasa_patologicas = tasa_patologicas
+        self.tipos_patologicos = tipos_patologicos or PATOLOGICAS_POR_DEFECTO
+        self.plies_partida_larga = plies_partida_larga
+        self.longitud_token_enorme = longitud_token_enorme
+
+        mezcla = mezcla or MEZCLA_POR_DEFECTO
+        tipos = self.rng.choices(list(mezcla), weights=list(mezcla.values()), k=tam_repertorio)
+        self.repertorio = [self._jugada(tipo) for tipo in tipos]
+        self._numeros = [f"{n}." for n in range(max(plies_max, plies_partida_larga) // 2 + 2)]
+
+    def _jugada(self, tipo):
+        """Una jugada SAN válida del tipo (regla) indicado."""
+        rng = self.rng
+        casilla = rng.choice(_LETRAS) + rng.choice(_NUMEROS)
+        if tipo == "movimiento_pieza":
+            pieza = rng.choices(_PIEZAS, weights=_PESOS_PIEZAS)[0]
+            desambiguacion = ""
+            if rng.random() < self.prob_desambiguacion:
+                desambiguacion = rng.choice((rng.choice(_LETRAS), rng.choice(_NUMEROS)))
+            captura = "x" if rng.random() < self.prob_captura else ""
+            jugada = f"{pieza}{desambiguacion}{captura}{casilla}"
+        else:
+            columna = rng.choice(_LETRAS)
+            if rng.random() < self.prob_promocion:
+                casilla = columna + rng.choice("18")
+                casilla += "=" + rng.choice("QQQQRBN")
+            else:
+                casilla = columna + rng.choice("234567")
+            if tipo == "peon_captura":
+                adyacentes = [_LETRAS[i] for i in (_LETRAS.index(columna) - 1, _LETRAS.index(columna) + 1) if 0 <= i < 8]
+                jugada = f"{rng.choice(adyacentes)}x{casilla}"
+            else:
+                jugada = casilla
+        if rng.random() < self.prob_jaque:
+            jugada += "+"
+        return jugada
+
+    def _casilla_invalida(self):
+        rng = self.rng
+        if rng.random() < 0.5:
+            casilla = rng.choice("ijkz") + rng.choice(_NUMEROS)
+        else:
+            casilla = rng.choice(_LETRAS) + rng.choice("09")
+        return rng.choice(("", "N", "B", "R", "Q")) + casilla
+
+    def _plies(self):
+        plies = int(self.rng.gauss(self.plies_medio, self.plies_desviacion))
+        return max(self.plies_min, min(self.plies_max, plies))
+
+    def partida(self):
+        """
+        Genera una partida.
+
+        Returns:
+            tuple: (texto, etiqueta) con etiqueta None para una partida normal, o el nombre del
+                   error inyectado o del caso patológico.
+        """
+        rng = self.rng
+        etiqueta = None
+        error = None
+        plies = None
+        jugada_enorme = False
+        if self.tasa_patologicas and rng.random() < self.tasa_patologicas:
+            etiqueta = rng.choices(list(self.tipos_patologicos), weights=list(self.tipos_patologicos.values()))[0]
+            if etiqueta == "larga":
+                plies = self.plies_partida_larga
+            else:
+                jugada_enorme = True
+        elif self.tasa_errores and rng.random() < self.tasa_errores:
+            etiqueta = error = rng.choices(list(self.tipos_error), weights=list(self.tipos_error.values()))[0]
+        if plies is None:
+            plies = self._plies()
+        if error == "secuencia":
+            plies = max(plies, 3)  # Hacen falta al menos dos turnos para desordenarlos
+        elif error == "residual":
+            plies = max(plies, 2)  # El residuo va tras un turno completo
+
+        jugadas = rng.choices(self.repertorio, k=plies)
+        for bando in (0, 1):
+            if rng.random() < self.prob_enroque:
+                ply = bando + 2 * rng.randrange(min(plies, 40) // 2 or 1)
+                if ply < plies:
+                    jugadas[ply] = "0-0" if rng.random() < 0.8 else "0-0-0"
+        if rng.random() < self.prob_mate and not jugadas[-1].startswith("0"):
+            jugadas[-1] = jugadas[-1].rstrip("+") + "#"
+        if error == "casilla":
+            jugadas[rng.randrange(plies)] = self._casilla_invalida()
+        elif jugada_enorme:
+            jugadas[rng.randrange(plies)] = rng.choice(_PIEZAS) * self.longitud_token_enorme
+
+        numeros = self._numeros
+        turnos = [f"{numeros[i // 2 + 1]} {jugadas[i]} {jugadas[i + 1]}" for i in range(0, plies - 1, 2)]
+        if plies % 2:
+            turnos.append(f"{numeros[plies // 2 + 1]} {jugadas[-1]}")
+        if error == "residual":
+            turnos[rng.randrange(plies // 2)] += " " + rng.choice(_RESIDUOS)
+        elif error == "secuencia":
+            turno = rng.randrange(1, len(turnos))
+            numero_malo = numeros[rng.randrange(1, turno + 1)]
+            turnos[turno] = numero_malo + turnos[turno][turnos[turno].index(" "):]
+
+        if self.turnos_por_linea:
+            paso = self.turnos_por_linea
+            texto = "\n".join(" ".join(turnos[i:i + paso]) for i in range(0, len(turnos), paso))
+        else:
+            texto = " ".join(turnos)
+        return texto, etiqueta
+
+    def partidas(self, n):
+        """Genera n partidas como (texto, etiqueta) (ver partida)."""
+        for _ in range(n):
+            yield self.partida()
+
+    def escribir(self, ruta, n, nivel_compresion=None, partidas_por_bloque=1000):
+        """
+        Escribe n partidas en 'ruta' separadas por líneas en blanco (el formato de lectura.py).
+        Si la ruta termina en .gz, .bz2 o .xz se comprime.
+
+        Args:
+            ruta (str): Archivo de salida.
+            n (int): Número de partidas.
+            nivel_compresion (int, optional): Nivel del compresor. Por defecto, el más rápido.
+            partidas_por_bloque (int, optional): Partidas unidas en cada escritura.
+
+        Returns:
+            Counter: Partidas por etiqueta (None: partidas normales).
+        """
+        modulo = descompresor_de(ruta)
+        if modulo is None:
+            salida = open(ruta, "wb")
+        else:
+            extension = ruta[ruta.rfind("."):].lower()
+            nivel = _NIVEL_COMPRESION_RAPIDO[extension] if nivel_compresion is None else nivel_compresion
+            opcion = {"preset": nivel} if extension == ".xz" else {"compresslevel": nivel}
+            salida = modulo.open(ruta, "wb", **opcion)
+        etiquetas = Counter()
+        with salida:
+            for inicio in range(0, n, partidas_por_bloque):
+                textos = []
+                for texto, etiqueta in self.partidas(min(partidas_por_bloque, n - inicio)):
+                    textos.append(texto)
+                    etiquetas[etiqueta] += 1
+                salida.write(("\n\n".join(textos) + "\n\n").encode("utf-8"))
+        return etiquetas
+
+
+# Uso: python -m src.corpus.sintetico salida.txt[.gz|.bz2|.xz] N [--semilla S] [--errores 0.05] ...
+# Sin argumentos: mide la velocidad de escritura, sin comprimir y con cada compresor.
+if __name__ == '__main__':
+    import argparse
+    import os
+    import sys
+    import tempfile
+    import time
+
+    parser = argparse.ArgumentParser(description="Generador determinista de corpus de partidas SAN.")
+    parser.add_argument("salida", nargs="?", help="Archivo de salida (.gz/.bz2/.xz para comprimir).")
+    parser.add_argument("partidas", nargs="?", type=int, default=100000)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--plies-medio", type=int, default=80)
+    parser.add_argument("--plies-max", type=int, default=300)
+    parser.add_argument("--errores", type=float, default=0.0, help="Fracción de partidas con un error inyectado.")
+    parser.add_argument("--patologicas", type=float, default=0.0, help="Fracción de partidas patológicas.")
+    parser.add_argument("--una-linea", action="store_true", help="Cada partida en una sola línea.")
+    parser.add_argument("--nivel", type=int, default=None, help="Nivel de compresión (por defecto, el más rápido).")
+    argumentos = parser.parse_args()
+
+    if argumentos.salida:
+        generador = GeneradorCorpus(argumentos.semilla, plies_medio=argumentos.plies_medio,
+                                    plies_max=argumentos.plies_max, tasa_errores=argumentos.errores,
+                                    tasa_patologicas=argumentos.patologicas,
+                                    turnos_por_linea=None if argumentos.una_linea else 8)
+        inicio = time.perf_counter()
+        etiquetas = generador.escribir(argumentos.salida, argumentos.partidas, argumentos.nivel)
+        duracion = time.perf_counter() - inicio
+        print(f"{argumentos.partidas} partidas en {duracion:.2f}s ({argumentos.partidas / duracion:.0f} partidas/s), "
+              f"{os.path.getsize(argumentos.salida) / 1e6:.1f} MB")
+        print({etiqueta or "normal": n for etiqueta, n in etiquetas.most_common()})
+        sys.exit(0)
+
+    directorio = tempfile.mkdtemp()
+    for extension in ("", ".gz", ".bz2", ".xz"):
+        ruta = os.path.join(directorio, "corpus.txt" + extension)
+        inicio = time.perf_counter()
+        GeneradorCorpus(0, tasa_errores=0.05).escribir(ruta, 100000)
+        duracion = time.perf_counter() - inicio
+        print(f"corpus.txt{extension}: 100000 partidas en {duracion:.2f}s ({100000 / duracion:.0f} partidas/s), "
+              f"{os.path.getsize(ruta) / 1e6:.1f} MB")
+        os.remove(ruta)
+    os.rmdir(directorio)
@@ -0,0 +1,289 @@
+# src/corpus/trabajos.py
+
+# Validación por lotes reanudable: el corpus se divide en fragmentos (grupos de partidas
+# consecutivas) que se validan de forma independiente. Cada fragmento terminado deja su
+# archivo de resultados y una línea en el diario; al volver a ejecutar el trabajo (tras
+# un fallo, un kill o simplemente otra vez) solo se procesan los fragmentos pendientes.
+#
+# Directorio del trabajo:
+#   plan.json                  Entrada (ruta, tamaño, fecha) y posición en bytes de cada fragmento.
+#   diario.jsonl               Una línea JSON por fragmento terminado (solo se añade al final).
+#   fragmento_00000.jsonl ...  Resultado de cada partida del fragmento, una línea JSON por partida.
+
+import io
+import json
+import os
+
+from ..core.aperturas import obtener_clasificador
+from ..core.partida import Partida
+from .lectura import indexar_partidas, leer_partidas
+from .paralelo import procesar_en_paralelo
+
+NOMBRE_PLAN = "plan.json"
+NOMBRE_DIARIO = "diario.jsonl"
+
+
+def _escribir_atomico(ruta, datos):
+    """
+    Escribe 'datos' (bytes) en 'ruta' de forma atómica: en un temporal del mismo
+    directorio, forzado a disco y renombrado. Un lector ve el archivo anterior o el
+    nuevo completo, nunca uno a medias.
+    """
+    temporal = f"{ruta}.tmp{os.getpid()}"
+    with open(temporal, "wb") as archivo:
+        archivo.write(datos)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(temporal, ruta)
+
+
+def _leer_bytes(ruta, inicio, fin):
+    with open(ruta, "rb") as archivo:
+        archivo.seek(inicio)
+        return archivo.read(fin - inicio)
+
+
+def validar_texto_fragmento(texto, primera, estadisticas=None):
+    """
+    Valida las partidas del texto de un fragmento.
+
+    Args:
+        texto (str): Partidas del fragmento, separadas por líneas en blanco.
+        primera (int): Índice en el corpus de la primera partida del fragmento.
+        estadisticas (EstadisticasPartidas, optional): Si se da, acumula en ella cada partida.
+
+    Returns:
+        tuple: (contenido del archivo de resultados en bytes, partidas, partidas válidas)
+    """
+    lineas = []
+    validas = 0
+    clasificador = obtener_clasificador()
+    for i, texto_partida in enumerate(leer_partidas(io.StringIO(texto)), start=primera):
+        partida = Partida(texto_partida)
+        validas += partida.es_valida_sintacticamente
+        if estadisticas is not None:
+            estadisticas.agregar_partida(partida)
+        apertura = clasificador.clasificar(partida)
+        lineas.append(json.dumps({
+            "partida": i,
+            "valida": partida.es_valida_sintacticamente,
+            "turnos": len(partida.turnos),
+            "error": partida.obtener_primer_error(),
+            "eco": apertura.eco if apertura else None,
+            "apertura": apertura.nombre if apertura else None,
+        }, ensure_ascii=False))
+    lineas.append("")
+    return "\n".join(lineas).encode("utf-8"), len(lineas) - 1, validas
+
+
+def _validar_fragmento(tarea):
+    """
+    Valida las partidas de un fragmento y escribe sus resultados (se ejecuta en un proceso
+    del pool, ver procesar_en_paralelo).
+
+    Args:
+        tarea (tuple): (número de fragmento, ruta de entrada, inicio, fin, índice de su primera
+                       partida, ruta del archivo de resultados).
+
+    Returns:
+        dict: Resumen del fragmento, tal como se anota en el diario.
+    """
+    numero, ruta_entrada, inicio, fin, primera, ruta_salida = tarea
+    # Un byte inválido solo invalida su partida: si abortara el fragmento, cada reanudación
+    # volvería a fallar en él y el trabajo no terminaría nunca.
+    texto = _leer_bytes(ruta_entrada, inicio, fin).decode("utf-8", errors="replace")
+    datos, partidas, validas = validar_texto_fragmento(texto, primera)
+    _escribir_atomico(ruta_salida, datos)
+    return {"fragmento": numero, "partidas": partidas, "validas": validas}
+
+
+class TrabajoValidacion:
+    """
+    Trabajo de validación de un corpus grande, dividido en fragmentos y reanudable.
+
+    El plan (la división en fragmentos) se calcula una sola vez y se guarda en el
+    directorio del trabajo. Un fragmento solo cuenta como hecho cuando su archivo de
+    resultados está escrito (de forma atómica) y su línea está en el diario, por lo que
+    si el proceso muere en cualquier punto, como mucho se repiten los fragmentos que
+    estaban en curso.
+    """
+
+    def __init__(self, ruta_entrada, directorio, partidas_por_fragmento=5000):
+        """
+        Args:
+            ruta_entrada (str): Corpus sin comprimir con partidas separadas por líneas en blanco.
+            directorio (str): Directorio del trabajo (se crea si no existe).
+            partidas_por_fragmento (int, optional): Partidas de cada fragmento. Solo se usa al
+                                                    crear el plan; un trabajo existente conserva el suyo.
+
+        Raises:
+            ValueError: Si el directorio contiene el plan de otro archivo, o si la entrada ha
+                        cambiado desde que se creó el plan, o si la entrada está comprimida.
+        """
+        self.ruta_entrada = os.path.abspath(ruta_entrada)
+        self.directorio = directorio
+        os.makedirs(directorio, exist_ok=True)
+        self.plan = self._cargar_o_crear_plan(partidas_por_fragmento)
+
+    def _firma_entrada(self):
+        estado = os.stat(self.ruta_entrada)
+        return {"entrada": self.ruta_entrada, "tamano": estado.st_size, "mtime_ns": estado.st_mtime_ns}
+
+    def _cargar_o_crear_plan(self, partidas_por_fragmento):
+        ruta_plan = os.path.join(self.directorio, NOMBRE_PLAN)
+        firma = self._firma_entrada()
+        if os.path.exists(ruta_plan):
+            with open(ruta_plan, encoding="utf-8") as archivo:
+                plan = json.load(archivo)
+            for clave, valor in firma.items():
+                if plan[clave] != valor:
+                    raise ValueError(f"El trabajo de '{self.directorio}' se creó para otra entrada o la entrada "
+                                     f"ha cambiado ({clave}: {plan[clave]} != {valor}). Use otro directorio.")
+            return plan
+
+        inicios, fines = indexar_partidas(self.ruta_entrada)
+        fragmentos = []
+        for primera in range(0, len(inicios), partidas_por_fragmento):
+            ultima = min(primera + partidas_por_fragmento, len(inicios)) - 1
+            fragmentos.append([inicios[primera], fines[ultima], primera])
+        plan = dict(firma, partidas=len(inicios), partidas_por_fragmento=partidas_por_fragmento,
+                    fragmentos=fragmentos)
+        _escribir_atomico(ruta_plan, json.dumps(plan).encode("utf-8"))
+        return plan
+
+    def ruta_fragmento(self, numero):
+        return os.path.join(self.directorio, f"fragmento_{numero:05d}.jsonl")
+
+    def _leer_diario(self):
+        """
+        Retorna {número de fragmento: resumen} de los fragmentos terminados.
+        Una última línea incompleta (el proceso murió mientras la escribía) se ignora.
+        """
+        terminados = {}
+        ruta_diario = os.path.join(self.directorio, NOMBRE_DIARIO)
+        if not os.path.exists(ruta_diario):
+            return terminados
+        with open(ruta_diario, encoding="utf-8") as archivo:
+            for linea in archivo:
+                try:
+                    registro = json.loads(linea)
+                except ValueError:
+                    continue
+                if os.path.exists(self.ruta_fragmento(registro["fragmento"])):
+                    terminados[registro["fragmento"]] = registro
+        return terminados
+
+    def texto_fragmento(self, numero):
+        """
+        Returns:
+            tuple: (texto del fragmento 'numero', índice de su primera partida)
+        """
+        inicio, fin, primera = self.plan["fragmentos"][numero]
+        return _leer_bytes(self.ruta_entrada, inicio, fin).decode("utf-8", errors="replace"), primera
+
+    def pendientes(self):
+        """Números de los fragmentos que aún no están terminados."""
+        terminados = self._leer_diario()
+        return [n for n in range(len(self.plan["fragmentos"])) if n not in terminados]
+
+    def ejecutar(self, procesos=None, max_fragmentos=None):
+        """
+        Valida los fragmentos pendientes. Si no queda ninguno, retorna de inmediato.
+
+        Args:
+            procesos (int, optional): Procesos del pool (por defecto, uno por núcleo).
+            max_fragmentos (int, optional): Detenerse tras este número de fragmentos (permite
+                                            repartir un trabajo largo en varias ejecuciones).
+
+        Returns:
+            dict: El resumen del trabajo (ver resumen).
+        """
+        self.limpiar_temporales()
+        pendientes = self.pendientes()
+        if max_fragmentos is not None:
+            pendientes = pendientes[:max_fragmentos]
+        tareas = ((n, self.ruta_entrada, *self.plan["fragmentos"][n], self.ruta_fragmento(n)) for n in pendientes)
+
+        with self.abrir_diario() as diario:
+            for registro in procesar_en_paralelo(_validar_fragmento, tareas, procesos):
+                self.anotar(diario, registro)
+        return self.resumen()
+
+    def limpiar_temporales(self):
+        """Borra los temporales de fragmentos que se escribían cuando murió una ejecución anterior."""
+        for nombre in os.listdir(self.directorio):
+            if nombre.startswith("fragmento_") and ".tmp" in nombre:
+                os.remove(os.path.join(self.directorio, nombre))
+
+    def abrir_diario(self):
+        """Abre el diario para añadir registros (ver anotar)."""
+        ruta_diario = os.path.join(self.directorio, NOMBRE_DIARIO)
+        diario = open(ruta_diario, "ab")
+        # Si la última línea quedó a medias, se cierra para no pegarle la siguiente.
+        if diario.tell() > 0:
+            with open(ruta_diario, "rb") as lectura:
+                lectura.seek(-1, os.SEEK_END)
+                if lectura.read(1) != b"\n":
+                    diario.write(b"\n")
+        return diario
+
+    def anotar(self, diario, registro):
+        """Añade al diario el registro de un fragmento terminado y lo fuerza a disco."""
+        diario.write(json.dumps(registro).encode("utf-8") + b"\n")
+        diario.flush()
+        os.fsync(diario.fileno())
+
+    def guardar_fragmento(self, diario, numero, datos, partidas, validas):
+        """
+        Da por terminado un fragmento validado en otro lugar (ej: por un trabajador remoto):
+        escribe sus resultados de forma atómica y lo anota en el diario.
+        """
+        _escribir_atomico(self.ruta_fragmento(numero), datos)
+        self.anotar(diario, {"fragmento": numero, "partidas": partidas, "validas": validas})
+
+    def resumen(self):
+        """
+        Returns:
+            dict: Fragmentos totales y terminados, y partidas procesadas, válidas e inválidas.
+        """
+        terminados = self._leer_diario()
+        partidas = sum(r["partidas"] for r in terminados.values())
+        validas = sum(r["validas"] for r in terminados.values())
+        return {
+            "fragmentos": len(self.plan["fragmentos"]),
+            "fragmentos_terminados": len(terminados),
+            "partidas": self.plan["partidas"],
+            "partidas_procesadas": partidas,
+            "validas": validas,
+            "invalidas": partidas - validas,
+            "completo": len(terminados) == len(self.plan["fragmentos"]),
+        }
+
+    def resultados(self):
+        """Genera el resultado (dict) de cada partida de los fragmentos terminados, en orden."""
+        for numero in sorted(self._leer_diario()):
+            with open(self.ruta_fragmento(numero), encoding="utf-8") as archivo:
+                for linea in archivo:
+                    yield json.loads(linea)
+
+
+# Uso: python -m src.corpus.trabajos corpus.txt directorio_trabajo [--procesos N] [--tam-fragmento N]
+# Si se interrumpe (Ctrl+C, kill, fallo), la misma orden continúa donde se quedó.
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Validación reanudable de un corpus de partidas SAN.")
+    parser.add_argument("entrada", help="Archivo con partidas separadas por líneas en blanco.")
+    parser.add_argument("directorio", help="Directorio del trabajo (plan, diario y resultados).")
+    parser.add_argument("--procesos", type=int, default=None, help="Número de procesos (por defecto, uno por núcleo).")
+    parser.add_argument("--tam-fragmento", type=int, default=5000, help="Partidas por fragmento (solo en trabajos nuevos).")
+    parser.add_argument("--max-fragmentos", type=int, default=None, help="Fragmentos a procesar en esta ejecución.")
+    argumentos = parser.parse_args()
+
+    inicio = time.perf_counter()
+    trabajo = TrabajoValidacion(argumentos.entrada, argumentos.directorio, argumentos.tam_fragmento)
+    pendientes_antes = len(trabajo.pendientes())
+    resumen = trabajo.ejecutar(argumentos.procesos, argumentos.max_fragmentos)
+    print(f"{pendientes_antes} fragmento(s) pendiente(s) al empezar; {time.perf_counter() - inicio:.2f}s")
+    print(json.dumps(resumen, ensure_ascii=False))
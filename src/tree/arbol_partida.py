@@ -2,6 +2,7 @@
 
 from collections import deque # Para usar una cola eficiente (FIFO)
 from .nodo_arbol import NodoArbol # Importación relativa
+from .texto_arbol import escribir_arbol, arbol_a_texto
 
 # Asumimos que las clases Turno y Movimiento están definidas,
 # aunque no las usemos directamente aquí más que para type hinting si fuera necesario.
@@ -19,6 +20,11 @@ class ArbolBinarioPartida:
       a una construcción por niveles (breadth-first).
     - La jugada blanca del turno es el hijo izquierdo.
     - La jugada negra del turno es el hijo derecho.
+
+    Hilos: construir o ampliar un árbol modifica la instancia (la cola de padres), así que
+    cada hilo debe construir su propio árbol. Los métodos de consulta (imprimir, obtener
+    nodos y aristas) no guardan estado en la instancia y pueden usarse a la vez desde
+    varios hilos sobre un árbol que ya no se modifica.
     """
 
     def __init__(self):
@@ -26,6 +32,37 @@ class ArbolBinarioPartida:
         Inicializa el árbol con un nodo raíz etiquetado como "Partida".
         """
         self.raiz = NodoArbol("Partida")
+        self.raiz.indice = 0
+        # Cola de nodos padres a los que se añadirán los siguientes hijos. Se conserva entre
+        # llamadas para poder añadir turnos (o jugadas sueltas) a un árbol ya construido.
+        self._nodos_padre_potenciales = deque([self.raiz])
+        # Padre cuyo hijo derecho espera la jugada negra del turno en curso (ver agregar_jugada).
+        self._padre_jugada_negra = None
+        self.num_nodos = 1       # Nodos del árbol, incluida la raíz.
+        self.indice_maximo = 0   # Mayor NodoArbol.indice del árbol.
+
+    def _reiniciar(self):
+        """Deja el árbol solo con la raíz, listo para construirse de nuevo."""
+        self.raiz.izquierda = None
+        self.raiz.derecha = None
+        self._nodos_padre_potenciales = deque([self.raiz])
+        self._padre_jugada_negra = None
+        self.num_nodos = 1
+        self.indice_maximo = 0
+
+    @property
+    def lleno_por_niveles(self):
+        """
+        True si los índices de los nodos son exactamente 0..num_nodos-1. Un turno intermedio
+        sin jugada negra deja un hueco: su padre no tiene hijo derecho, pero el turno
+        siguiente ocupa índices posteriores.
+        """
+        return self.indice_maximo + 1 == self.num_nodos
+
+    @property
+    def num_nodos_lleno(self):
+        """num_nodos si el árbol está lleno por niveles (ver lleno_por_niveles), o None."""
+        return self.num_nodos if self.lleno_por_niveles else None
 
     def construir_arbol(self, turnos_validados):
         """
@@ -44,78 +81,113 @@ class ArbolBinarioPartida:
         Returns:
             NodoArbol: El nodo raíz del árbol construido.
         """
+        self._reiniciar()
         if not turnos_validados:
             # Si no hay turnos, el árbol solo consiste en la raíz "Partida".
             return self.raiz
 
-        # Cola para gestionar los nodos padres a los que se añadirán los siguientes hijos.
-        # Se inicializa con la raíz.
-        nodos_padre_potenciales = deque([self.raiz])
-
         for turno_actual in turnos_validados:
-            if not nodos_padre_potenciales:
+            if not self._nodos_padre_potenciales:
                 # Esto no debería ocurrir si la lógica es correcta y hay turnos para procesar,
                 # a menos que la partida sea más larga que los nodos padres disponibles
                 # (lo cual indicaría un problema en cómo se forma el árbol o la entrada).
                 print("Advertencia: Se agotaron los nodos padre potenciales antes de procesar todos los turnos.")
                 break
+            self.agregar_turno(turno_actual)
 
-            # Obtener el siguiente nodo de la cola que actuará como padre para este turno.
-            padre_actual = nodos_padre_potenciales.popleft()
-
-            # Crear el nodo para la jugada blanca del turno actual.
-            # Se asume que turno_actual.jugada_blanca es un objeto Movimiento
-            # y tiene un atributo san_string.
-            if turno_actual.jugada_blanca and hasattr(turno_actual.jugada_blanca, 'san_string'):
-                nodo_blanca = NodoArbol(turno_actual.jugada_blanca.san_string)
-                padre_actual.izquierda = nodo_blanca
-                nodos_padre_potenciales.append(nodo_blanca) # Este nodo puede ser padre en el futuro.
-            else:
-                # Esto sería inesperado si el turno está validado y tiene jugada blanca.
-                # Se podría añadir un nodo placeholder o manejar el error.
-                print(f"Advertencia: Turno {turno_actual.numero_turno} no tiene jugada blanca válida para el árbol.")
-
-
-            # Crear el nodo para la jugada negra del turno actual, si existe y es válida.
-            if turno_actual.jugada_negra and hasattr(turno_actual.jugada_negra, 'san_string') and turno_actual.jugada_negra.es_valido:
-                nodo_negra = NodoArbol(turno_actual.jugada_negra.san_string)
-                padre_actual.derecha = nodo_negra
-                nodos_padre_potenciales.append(nodo_negra) # Este nodo también puede ser padre.
-            elif padre_actual.izquierda is not None and (turno_actual.jugada_negra is None or not turno_actual.jugada_negra.es_valido):
-                # Si hay jugada blanca pero no hay jugada negra válida (ej. fin de partida),
-                # el hijo derecho del padre_actual permanece None.
-                pass
-            elif padre_actual.izquierda is None and turno_actual.jugada_negra and hasattr(turno_actual.jugada_negra, 'san_string'):
-                 # Caso anómalo: jugada negra sin jugada blanca en el turno (no debería pasar la validación de Turno)
-                 print(f"Advertencia: Turno {turno_actual.numero_turno} tiene jugada negra pero no blanca válida para el árbol.")
+        return self.raiz
 
+    def agregar_turno(self, turno_actual):
+        """
+        Añade un turno al final del árbol ya construido, en tiempo O(1).
 
-        return self.raiz
+        Los hijos se enlazan al siguiente nodo de la cola de padres potenciales, igual
+        que en construir_arbol, por lo que añadir los turnos uno a uno produce el mismo
+        árbol que construirlo de una vez.
+
+        Args:
+            turno_actual (Turno): Turno validado con `jugada_blanca` y, opcionalmente, `jugada_negra`.
 
-    def imprimir_arbol_consola(self, nodo=None, nivel=0, prefijo="R:"):
+        Returns:
+            list: Los nodos NodoArbol creados (cero, uno o dos).
         """
-        Imprime una representación textual del árbol en la consola (para depuración).
-        Realiza un recorrido preorden.
+        # Un turno nuevo cierra cualquier turno anterior que hubiera quedado sin jugada negra.
+        self._padre_jugada_negra = None
+        nodos_nuevos = []
+
+        # Crear el nodo para la jugada blanca del turno actual.
+        # Se asume que turno_actual.jugada_blanca es un objeto Movimiento
+        # y tiene un atributo san_string.
+        if turno_actual.jugada_blanca and hasattr(turno_actual.jugada_blanca, 'san_string'):
+            nodos_nuevos.append(self.agregar_jugada(turno_actual.jugada_blanca.san_string))
+        else:
+            # Esto sería inesperado si el turno está validado y tiene jugada blanca.
+            print(f"Advertencia: Turno {turno_actual.numero_turno} no tiene jugada blanca válida para el árbol.")
+            return nodos_nuevos
+
+        # Crear el nodo para la jugada negra del turno actual, si existe y es válida.
+        # Si no la hay (ej. fin de partida), el hijo derecho del padre permanece None.
+        if turno_actual.jugada_negra and hasattr(turno_actual.jugada_negra, 'san_string') and turno_actual.jugada_negra.es_valido:
+            nodos_nuevos.append(self.agregar_jugada(turno_actual.jugada_negra.san_string))
+        else:
+            self._padre_jugada_negra = None
+        return nodos_nuevos
+
+    def agregar_jugada(self, san_string):
+        """
+        Añade una única jugada (un ply) al árbol, en tiempo O(1).
+
+        Las jugadas se alternan: una jugada blanca toma el siguiente padre de la cola y
+        se enlaza como su hijo izquierdo; la jugada negra que la sigue se enlaza como
+        hijo derecho del mismo padre. Pensado para seguir partidas en vivo, donde las
+        jugadas llegan de una en una.
 
         Args:
-            nodo (NodoArbol, optional): El nodo actual desde el cual imprimir.
-                                        Si es None, comienza desde la raíz.
-            nivel (int, optional): El nivel actual de profundidad en el árbol (para indentación).
-            prefijo (str, optional): Un prefijo para indicar la relación del nodo (Raíz, Izquierda, Derecha).
+            san_string (str): La jugada en notación SAN.
+
+        Returns:
+            NodoArbol: El nodo creado.
         """
-        if nodo is None and nivel == 0: # Llamada inicial
-            nodo = self.raiz
+        nodo = NodoArbol(san_string)
+        if self._padre_jugada_negra is None:
+            padre = self._nodos_padre_potenciales.popleft()
+            padre.izquierda = nodo
+            if padre.indice is not None:
+                nodo.indice = 2 * padre.indice + 1
+            self._padre_jugada_negra = padre
+        else:
+            padre = self._padre_jugada_negra
+            padre.derecha = nodo
+            if padre.indice is not None:
+                nodo.indice = 2 * padre.indice + 2
+            self._padre_jugada_negra = None
+        self._nodos_padre_potenciales.append(nodo) # Este nodo puede ser padre en el futuro.
+        self.num_nodos += 1
+        if nodo.indice is not None and nodo.indice > self.indice_maximo:
+            self.indice_maximo = nodo.indice
+        return nodo
+
+    def imprimir_arbol_consola(self, nodo=None, *, profundidad_max=None, estilo=None, salida=None):
+        """
+        Imprime una representación textual del árbol en la consola (o en 'salida'), en
+        preorden y con líneas de dibujo de cajas (ver texto_arbol.escribir_arbol). El texto
+        se escribe en bloques, por lo que volcar un árbol de 100.000 nodos tarda décimas de segundo.
+
+        Args:
+            nodo (NodoArbol, optional): El nodo desde el cual imprimir. Si es None, la raíz.
+            profundidad_max (int, optional): Niveles a mostrar bajo 'nodo' (0: solo 'nodo').
+                                             Este parámetro y los siguientes solo se pasan
+                                             por nombre (el antiguo 'nivel' ya no existe).
+            estilo (str, optional): "unicode", "ascii" o "plano" (una línea por nodo separada
+                                    por tabuladores, para tuberías). Por defecto, "unicode"
+                                    en un terminal y "ascii" en cualquier otra salida.
+            salida (file, optional): Destino del texto. Por defecto, sys.stdout.
+        """
+        escribir_arbol(nodo or self.raiz, salida, estilo, profundidad_max)
 
-        if nodo is not None:
-            print(" " * (nivel * 4) + prefijo + str(nodo.valor))
-            if nodo.izquierda is not None or nodo.derecha is not None: # Solo imprimir hijos si existen
-                self.imprimir_arbol_consola(nodo.izquierda, nivel + 1, "L:")
-                # Solo intentar imprimir el hijo derecho si el izquierdo existe o si el derecho existe
-                # para evitar imprimir "R: None" innecesariamente si solo hay hijo izquierdo.
-                if nodo.derecha is not None or (nodo.izquierda is not None and nodo.derecha is None):
-                     self.imprimir_arbol_consola(nodo.derecha, nivel + 1, "R:")
-                elif nodo.derecha is not None: # Si solo existe el derecho (raro pero posible)
-                     self.imprimir_arbol_consola(nodo.derecha, nivel + 1, "R:")
+    def a_texto(self, profundidad_max=None, estilo="unicode"):
+        """Retorna el texto que imprimiría imprimir_arbol_consola (ver texto_arbol.arbol_a_texto)."""
+        return arbol_a_texto(self.raiz, estilo, profundidad_max)
 
 
     def obtener_nodos_y_aristas_para_visualizacion(self, nodo=None, nodos_lista=None, aristas_lista=None, id_padre=None, x=0, y=0, nivel_map=None):
@@ -132,13 +204,12 @@ class ArbolBinarioPartida:
             nodo = self.raiz
             nodos_lista = []
             aristas_lista = []
-            self._node_id_counter = 0 # Para IDs únicos
             nivel_map = {0:0} # Para calcular x offset por nivel
 
-
-        node_id = self._node_id_counter
+        # IDs únicos consecutivos: el siguiente es el número de nodos ya añadidos. No se guarda
+        # un contador en la instancia, para que dos recorridos simultáneos no se pisen.
+        node_id = len(nodos_lista)
         nodos_lista.append({'id': node_id, 'label': str(nodo.valor), 'x': x, 'y': y})
-        self._node_id_counter += 1
 
         if id_padre is not None:
             aristas_lista.append({'from': id_padre, 'to': node_id})
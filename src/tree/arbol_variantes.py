@@ -0,0 +1,160 @@
+# src/tree/arbol_variantes.py
+from .texto_arbol import arbol_a_texto, escribir_arbol
+
+class NodoVariante:
+    """
+    Nodo de un árbol de jugadas con variantes: cada nodo es un ply y sus hijos son las
+    jugadas que pueden seguirle. El primer hijo es la continuación principal y los
+    demás son variantes alternativas.
+    """
+
+    __slots__ = ("jugada", "ply", "padre", "hijos", "comentario", "nags")
+
+    def __init__(self, jugada, padre=None, ply=0):
+        """
+        Args:
+            jugada (Movimiento): La jugada del nodo (None para la raíz).
+            padre (NodoVariante, optional): Nodo de la jugada anterior.
+            ply (int, optional): Ply del nodo si no tiene padre (ver ArbolVariantes.empezar_en).
+        """
+        self.jugada = jugada
+        self.padre = padre
+        self.ply = padre.ply + 1 if padre is not None else ply
+        self.hijos = []
+        self.comentario = None  # Comentario PGN que sigue a la jugada, si se conservan.
+        self.nags = None        # Lista de NAGs ($1, $2...) de la jugada, si se conservan.
+
+    @property
+    def valor(self):
+        """Texto del nodo (compatible con NodoArbol.valor)."""
+        return self.jugada.san_string if self.jugada is not None else "Partida"
+
+    @property
+    def es_blanca(self):
+        """True si la jugada la hacen las blancas (plies impares, empezando en 1)."""
+        return self.ply % 2 == 1
+
+    @property
+    def numero_turno(self):
+        return (self.ply + 1) // 2
+
+    @property
+    def numero(self):
+        """Número de la jugada como en PGN: "12." para las blancas, "12..." para las negras."""
+        return f"{self.numero_turno}." if self.es_blanca else f"{self.numero_turno}..."
+
+    def agregar_hijo(self, jugada):
+        """Crea y retorna el nodo de 'jugada' como continuación de este nodo."""
+        hijo = NodoVariante(jugada, self)
+        self.hijos.append(hijo)
+        return hijo
+
+    def __repr__(self):
+        return f"NodoVariante(valor='{self.valor}', ply={self.ply}, variantes={max(0, len(self.hijos) - 1)})"
+
+
+class ArbolVariantes:
+    """
+    Árbol de jugadas de una partida con sus variantes (ej: las de un archivo PGN).
+
+    A diferencia de ArbolBinarioPartida, que enlaza los turnos de una única línea de
+    juego por niveles, aquí cada nodo tiene tantos hijos como continuaciones distintas:
+    la línea principal se obtiene siguiendo siempre el primer hijo.
+    """
+
+    def __init__(self):
+        self.raiz = NodoVariante(None)
+        self.num_nodos = 0   # Jugadas en el árbol (sin contar la raíz)
+        self.num_variantes = 0
+
+    def agregar(self, padre, jugada):
+        """Añade 'jugada' como hijo de 'padre' y retorna el nuevo nodo."""
+        if padre.hijos:
+            self.num_variantes += 1
+        self.num_nodos += 1
+        return padre.agregar_hijo(jugada)
+
+    def linea_principal(self):
+        """Lista de nodos de la línea principal, en orden."""
+        nodos = []
+        nodo = self.raiz
+        while nodo.hijos:
+            nodo = nodo.hijos[0]
+            nodos.append(nodo)
+        return nodos
+
+    def empezar_en(self, numero_turno, negras=False):
+        """
+        Fija el turno y el color de la primera jugada, para partidas que no empiezan en la
+        posición inicial (etiqueta FEN) o fragmentos que empiezan con una jugada negra.
+
+        Args:
+            numero_turno (int): Turno de la primera jugada (1 o mayor).
+            negras (bool, optional): Si la primera jugada es de las negras.
+
+        Raises:
+            ValueError: Si el árbol ya tiene jugadas o el turno no es positivo.
+        """
+        if self.num_nodos:
+            raise ValueError("El turno inicial solo puede fijarse en un árbol sin jugadas.")
+        if numero_turno < 1:
+            raise ValueError(f"El número de turno debe ser positivo: {numero_turno}.")
+        self.raiz.ply = 2 * (numero_turno - 1) + (1 if negras else 0)
+
+    def recorrer(self):
+        """Genera todos los nodos (sin la raíz) en preorden, con la línea principal primero."""
+        pendientes = list(reversed(self.raiz.hijos))
+        while pendientes:
+            nodo = pendientes.pop()
+            yield nodo
+            pendientes.extend(reversed(nodo.hijos))
+
+    def imprimir_arbol_consola(self, *, profundidad_max=None, estilo=None, salida=None):
+        """
+        Imprime el árbol con una línea por jugada (ver texto_arbol.escribir_arbol y
+        hijos_variantes): la línea principal bajo la raíz y cada variante bajo la jugada
+        que sustituye, un nivel más adentro.
+
+        Args:
+            profundidad_max (int, optional): Niveles de variantes anidadas a mostrar.
+            estilo (str, optional): "unicode", "ascii" o "plano" (ver texto_arbol.ESTILOS).
+            salida (file, optional): Destino del texto. Por defecto, sys.stdout.
+        """
+        escribir_arbol(self.raiz, salida, estilo, profundidad_max, hijos=hijos_variantes)
+
+    def a_texto(self, profundidad_max=None, estilo="unicode"):
+        """Retorna el texto que imprimiría imprimir_arbol_consola."""
+        return arbol_a_texto(self.raiz, estilo, profundidad_max, hijos=hijos_variantes)
+
+
+def _linea_desde(nodo):
+    """Nodos de la línea que empieza en 'nodo', siguiendo siempre el primer hijo."""
+    linea = [nodo]
+    while nodo.hijos:
+        nodo = nodo.hijos[0]
+        linea.append(nodo)
+    return linea
+
+
+def hijos_variantes(nodo):
+    """
+    Hijos de un NodoVariante para texto_arbol.escribir_arbol, como (número PGN, nodo):
+
+        Partida
+        |-- 1.: e4
+        |-- 1...: e5
+        |   `-- 1...: c5
+        |       `-- 2.: Nf3
+        `-- 2.: Nf3
+
+    Bajo la raíz va la línea principal. Bajo cada jugada van las variantes que la
+    sustituyen, y bajo la primera jugada de una variante, el resto de esa variante.
+    """
+    padre = nodo.padre
+    if padre is not None and padre.hijos[0] is nodo:
+        # Continuación de una línea: debajo, las variantes que la sustituyen.
+        return [(variante.numero, variante) for variante in padre.hijos[1:]]
+    # La raíz o la primera jugada de una variante: debajo, el resto de su línea.
+    if not nodo.hijos:
+        return []
+    return [(siguiente.numero, siguiente) for siguiente in _linea_desde(nodo.hijos[0])]
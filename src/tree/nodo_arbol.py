@@ -16,6 +16,9 @@ class NodoArbol:
         self.valor = valor
         self.izquierda = None  # Hijo izquierdo, representa la jugada blanca del siguiente nivel/turno.
         self.derecha = None    # Hijo derecho, representa la jugada negra del siguiente nivel/turno.
+        # Posición del nodo en orden por niveles (raíz = 0; los hijos de i ocupan 2i+1 y 2i+2).
+        # La asigna ArbolBinarioPartida al enlazar el nodo; permite calcular el layout por índice.
+        self.indice = None
 
     def __str__(self):
         """Representación en cadena del valor del nodo."""
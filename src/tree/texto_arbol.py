@@ -0,0 +1,194 @@
+# src/tree/texto_arbol.py
+import io
+import sys
+
+# Representación en texto de los árboles de jugadas, para la consola o para un archivo.
+# Las líneas se acumulan y se escriben en bloques de _LINEAS_POR_BLOQUE con una sola
+# llamada a write(), en lugar de una llamada a print() por nodo: lo que cuesta al volcar
+# un árbol grande en un terminal o en una tubería es el número de escrituras, no el texto.
+
+# Conectores de cada estilo: (rama intermedia, última rama, continuación, sin continuación).
+ESTILOS = {
+    "unicode": ("├── ", "└── ", "│   ", "    "),
+    "ascii": ("|-- ", "`-- ", "|   ", "    "),
+}
+# Estilo "plano": una línea por nodo con profundidad, etiqueta y valor separados por
+# tabuladores, sin dibujo. Pensado para tuberías (grep, awk, sort...).
+ESTILO_PLANO = "plano"
+
+_LINEAS_POR_BLOQUE = 4096
+
+
+def hijos_binarios(nodo):
+    """Hijos de un NodoArbol como (etiqueta, hijo): "L" la jugada blanca, "R" la negra."""
+    hijos = []
+    if nodo.izquierda is not None:
+        hijos.append(("L", nodo.izquierda))
+    if nodo.derecha is not None:
+        hijos.append(("R", nodo.derecha))
+    return hijos
+
+
+def estilo_para(salida):
+    """
+    Estilo por defecto para 'salida': "unicode" en un terminal cuya codificación puede
+    escribir los caracteres de dibujo de cajas, "ascii" en cualquier otro caso (tuberías,
+    archivos, consolas con codificaciones antiguas).
+    """
+    try:
+        es_terminal = salida.isatty()
+    except (AttributeError, ValueError):
+        es_terminal = False
+    if es_terminal:
+        try:
+            "".join(ESTILOS["unicode"]).encode(getattr(salida, "encoding", None) or "ascii")
+            return "unicode"
+        except (LookupError, UnicodeEncodeError):
+            pass
+    return "ascii"
+
+
+def _contar_nodos(nodo, hijos):
+    """Nodos del subárbol de 'nodo', incluido él (sin recursión)."""
+    total = 0
+    pendientes = [nodo]
+    while pendientes:
+        nodo = pendientes.pop()
+        total += 1
+        pendientes.extend(hijo for _, hijo in hijos(nodo))
+    return total
+
+
+def escribir_arbol(raiz, salida=None, estilo=None, profundidad_max=None, hijos=hijos_binarios):
+    """
+    Escribe el árbol de 'raiz' en 'salida', una línea por nodo, en preorden:
+
+        Partida
+        ├── L: e4
+        │   ├── L: Nf3
+        │   └── R: Nc6
+        └── R: e5
+
+    Args:
+        raiz: Nodo raíz (NodoArbol, o cualquier nodo si se da 'hijos').
+        salida (file, optional): Destino de texto. Por defecto, sys.stdout.
+        estilo (str, optional): "unicode", "ascii" o "plano" (ver ESTILO_PLANO). Por defecto,
+                                según la salida (ver estilo_para).
+        profundidad_max (int, optional): Niveles a mostrar bajo la raíz (0: solo la raíz).
+                                         Los subárboles más profundos se resumen en una
+                                         línea con su número de nodos.
+        hijos (callable, optional): Función nodo -> lista de (etiqueta, hijo). Por defecto,
+                                    los hijos izquierdo y derecho de un árbol binario.
+
+    Returns:
+        int: Nodos escritos.
+
+    Raises:
+        ValueError: Si el estilo no existe.
+    """
+    if salida is None:
+        salida = sys.stdout
+    if estilo is None:
+        estilo = estilo_para(salida)
+    plano = estilo == ESTILO_PLANO
+    if not plano and estilo not in ESTILOS:
+        raise ValueError(f"Estilo desconocido: '{estilo}'. Opciones: {', '.join(ESTILOS)}, {ESTILO_PLANO}.")
+    if raiz is None:
+        return 0
+    rama, ultima, continua, vacia = ESTILOS["ascii" if plano else estilo]
+    puntos = "…" if estilo == "unicode" else "..."
+
+    escritos = 0
+    lineas = []
+    # Pila de (nodo, etiqueta, profundidad, prefijo de sus líneas, es el último hermano).
+    # La raíz no tiene etiqueta ni conector, y sus hijos no llevan prefijo.
+    pendientes = [(raiz, None, 0, "", True)]
+    while pendientes:
+        nodo, etiqueta, profundidad, prefijo, es_ultimo = pendientes.pop()
+        escritos += 1
+        if etiqueta is None:
+            lineas.append(f"0\t\t{nodo.valor}\n" if plano else f"{nodo.valor}\n")
+        elif plano:
+            lineas.append(f"{profundidad}\t{etiqueta}\t{nodo.valor}\n")
+        else:
+            lineas.append(f"{prefijo}{ultima if es_ultimo else rama}{etiqueta}: {nodo.valor}\n")
+        siguientes = hijos(nodo)
+        if siguientes:
+            prefijo_hijos = "" if etiqueta is None else prefijo + (vacia if es_ultimo else continua)
+            if profundidad_max is not None and profundidad >= profundidad_max:
+                ocultos = sum(_contar_nodos(hijo, hijos) for _, hijo in siguientes)
+                ocultos = f"{ocultos} nodo más" if ocultos == 1 else f"{ocultos} nodos más"
+                if plano:
+                    lineas.append(f"{profundidad + 1}\t{puntos}\t{ocultos}\n")
+                else:
+                    lineas.append(f"{prefijo_hijos}{ultima}{puntos} ({ocultos})\n")
+            else:
+                for posicion in range(len(siguientes) - 1, -1, -1):
+                    etiqueta_hijo, hijo = siguientes[posicion]
+                    pendientes.append((hijo, etiqueta_hijo, profundidad + 1, prefijo_hijos,
+                                       posicion == len(siguientes) - 1))
+        if len(lineas) >= _LINEAS_POR_BLOQUE:
+            salida.write("".join(lineas))
+            lineas.clear()
+    salida.write("".join(lineas))
+    salida.flush()
+    return escritos
+
+
+def arbol_a_texto(raiz, estilo="unicode", profundidad_max=None, hijos=hijos_binarios):
+    """Como escribir_arbol, pero retorna el texto en lugar de escribirlo."""
+    salida = io.StringIO()
+    escribir_arbol(raiz, salida, estilo, profundidad_max, hijos)
+    return salida.getvalue()
+
+
+# Volcado de un árbol de 100.000 nodos: un print() por nodo frente a escribir_arbol, en
+# un pseudoterminal (con búfer de línea, como una consola) y en un archivo con búfer.
+# Ejecutar desde la raíz del proyecto: python -m src.tree.texto_arbol
+if __name__ == '__main__':
+    import contextlib
+    import os
+    import pty
+    import threading
+    import time
+    from .arbol_partida import ArbolBinarioPartida
+
+    arbol = ArbolBinarioPartida()
+    for n in range(100000 - 1):
+        arbol.agregar_jugada(("e4", "e5", "Nf3", "Nc6", "Bb5", "a6")[n % 6])
+
+    def por_nodo(nodo, nivel=0, prefijo="R:"):
+        # Recorrido anterior de imprimir_arbol_consola: un print() por nodo.
+        print(" " * (nivel * 4) + prefijo + str(nodo.valor))
+        if nodo.izquierda is not None:
+            por_nodo(nodo.izquierda, nivel + 1, "L:")
+        if nodo.derecha is not None:
+            por_nodo(nodo.derecha, nivel + 1, "R:")
+
+    def medir(funcion, destino):
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(destino):
+            funcion()
+            destino.flush()
+        return (time.perf_counter() - inicio) * 1000
+
+    def vaciar(descriptor):
+        # Lee lo que llega al terminal, como haría el emulador de terminal.
+        try:
+            while os.read(descriptor, 1 << 16):
+                pass
+        except OSError:
+            pass   # El terminal se cerró.
+
+    maestro, esclavo = pty.openpty()
+    threading.Thread(target=vaciar, args=(maestro,), daemon=True).start()
+    with open(esclavo, "w", encoding="utf-8", buffering=1) as terminal, \
+            open(os.devnull, "w", encoding="utf-8") as archivo:
+        print(f"Estilo por defecto: terminal {estilo_para(terminal)!r}, archivo {estilo_para(archivo)!r}")
+        casos = [("print() por nodo", lambda: por_nodo(arbol.raiz))]
+        casos += [(f"escribir_arbol, {estilo}", lambda estilo=estilo: escribir_arbol(arbol.raiz, estilo=estilo))
+                  for estilo in ("unicode", "ascii", "plano")]
+        casos.append(("escribir_arbol, profundidad_max=4", lambda: escribir_arbol(arbol.raiz, profundidad_max=4)))
+        for nombre, funcion in casos:
+            print(f"{nombre:<36} terminal {medir(funcion, terminal):8.1f} ms   "
+                  f"archivo {medir(funcion, archivo):8.1f} ms")
@@ -0,0 +1,155 @@
+# src/ui/layout_arbol.py
+from PyQt5.QtCore import QPointF
+
+from ..core.cache_lru import CacheLRU
+
+
+class LayoutArbolCompleto:
+    """
+    Posiciones de los nodos de un árbol lleno por niveles con 'num_nodos' nodos (la forma
+    que construye ArbolBinarioPartida), indexadas por NodoArbol.indice.
+
+    Atributos:
+        num_nodos (int): Nodos del árbol.
+        posiciones (list): QPointF de cada índice, en coordenadas de layout.
+        limites (tuple): (min_x, max_x, min_y, max_y) del árbol, incluyendo el radio de los nodos.
+    """
+
+    __slots__ = ("num_nodos", "posiciones", "limites")
+
+    def __init__(self, num_nodos, posiciones, limites):
+        self.num_nodos = num_nodos
+        self.posiciones = posiciones
+        self.limites = limites
+
+
+def calcular_layout_completo(num_nodos, radio, separacion_horizontal, separacion_vertical):
+    """
+    Layout de un árbol lleno por niveles de 'num_nodos' nodos, sin necesitar los nodos.
+
+    Aplica el mismo algoritmo que TreeVisualizerWidget._calculate_node_positions_recursive
+    (mismo resultado, píxel a píxel) sobre índices: los hijos de i son 2i+1 y 2i+2 si son
+    menores que num_nodos. Las hojas de cada subárbol se cuentan una sola vez, de abajo
+    arriba, en lugar de recorrer el subárbol en cada nodo.
+
+    Returns:
+        LayoutArbolCompleto: El layout (None si num_nodos es 0).
+    """
+    if num_nodos <= 0:
+        return None
+    hojas = [1] * num_nodos
+    for i in range((num_nodos - 2) // 2, -1, -1):
+        izquierda, derecha = 2 * i + 1, 2 * i + 2
+        hojas[i] = hojas[izquierda] + (hojas[derecha] if derecha < num_nodos else 0)
+
+    ancho_hoja = 2 * radio + separacion_horizontal
+    xs = [0.0] * num_nodos
+    ys = [0.0] * num_nodos
+
+    def colocar(i, x_offset, y_pos, max_x_nivel):
+        if i >= num_nodos:
+            return max_x_nivel
+        izquierda, derecha = 2 * i + 1, 2 * i + 2
+        tiene_izquierda, tiene_derecha = izquierda < num_nodos, derecha < num_nodos
+        espacio_izquierda = hojas[izquierda] * ancho_hoja if tiene_izquierda else 0
+        x_izquierda = x_offset - espacio_izquierda / 2.0 if tiene_izquierda else x_offset
+        if tiene_izquierda and tiene_derecha:
+            x_izquierda -= separacion_horizontal / 2.0
+        max_x_izquierda = colocar(izquierda, x_izquierda, y_pos + separacion_vertical, max_x_nivel)
+
+        x = max_x_izquierda + (radio + separacion_horizontal / 2.0) if tiene_izquierda else x_offset
+        if tiene_izquierda and tiene_derecha:
+            x = x_offset
+        xs[i], ys[i] = x, y_pos
+        max_x_nivel = max(max_x_nivel, x + radio)
+
+        x_derecha = x + (radio + separacion_horizontal / 2.0) if tiene_derecha else x
+        if tiene_izquierda and tiene_derecha:
+            x_derecha = x_offset + espacio_izquierda / 2.0 + separacion_horizontal / 2.0
+        max_x_derecha = colocar(derecha, x_derecha, y_pos + separacion_vertical, max_x_nivel)
+        return max(max_x_nivel, max_x_derecha)
+
+    colocar(0, 0, radio + 20, 0)
+    limites = (min(xs) - radio, max(xs) + radio, min(ys) - radio, max(ys) + radio)
+    return LayoutArbolCompleto(num_nodos, [QPointF(x, y) for x, y in zip(xs, ys)], limites)
+
+
+class ProveedorLayout:
+    """
+    Caché de layouts de árboles llenos por niveles, compartida por todas las partidas y
+    todos los widgets: dos partidas con el mismo número de plies tienen exactamente las
+    mismas posiciones, así que cambiar de una a otra (o redimensionar) no recalcula nada.
+    """
+
+    def __init__(self, max_nodos=250000):
+        """
+        Args:
+            max_nodos (int, optional): Suma máxima de nodos de los layouts en caché.
+        """
+        self._cache = CacheLRU(max_nodos)
+        self.aciertos = 0
+        self.calculados = 0
+
+    def layout(self, num_nodos, radio, separacion_horizontal, separacion_vertical):
+        """Layout para estos parámetros (ver calcular_layout_completo), de la caché si ya existe."""
+        clave = (num_nodos, radio, separacion_horizontal, separacion_vertical)
+        layout = self._cache.obtener(clave)
+        if layout is not None:
+            self.aciertos += 1
+            return layout
+        layout = calcular_layout_completo(num_nodos, radio, separacion_horizontal, separacion_vertical)
+        self.calculados += 1
+        self._cache.guardar(clave, layout, coste=num_nodos)
+        return layout
+
+
+# Proveedor compartido por todos los TreeVisualizerWidget.
+PROVEEDOR_LAYOUT = ProveedorLayout()
+
+
+# Coste de set_tree_data con el layout recursivo por nodos frente al layout compartido,
+# al cambiar entre partidas de la misma longitud. Ejecutar desde la raíz del proyecto:
+#   QT_QPA_PLATFORM=offscreen python -m src.ui.layout_arbol
+if __name__ == '__main__':
+    import sys
+    import time
+
+    from PyQt5.QtWidgets import QApplication
+    from ..tree.arbol_partida import ArbolBinarioPartida
+    from .tree_visualizer import TreeVisualizerWidget
+
+    app = QApplication(sys.argv)
+    widget = TreeVisualizerWidget()
+
+    def arbol_de(plies, jugada):
+        arbol = ArbolBinarioPartida()
+        for _ in range(plies):
+            arbol.agregar_jugada(jugada)
+        return arbol
+
+    for plies in (80, 300, 2000, 20000):
+        arboles = [arbol_de(plies, jugada) for jugada in ("e4", "d4", "Nf3")]
+        raices = [arbol.raiz for arbol in arboles]
+        inicio = time.perf_counter()
+        # Primera vez: se calcula y se guarda en la caché
+        widget.set_tree_data(raices[0], num_nodos=arboles[0].num_nodos_lleno)
+        primera = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        for arbol in arboles[1:]:
+            widget.set_tree_data(arbol.raiz, num_nodos=arbol.num_nodos_lleno)
+        compartido = (time.perf_counter() - inicio) / 2
+        inicio = time.perf_counter()
+        widget.set_tree_data(raices[1])   # Sin el número de nodos: se cuentan recorriendo el árbol
+        sin_numero = time.perf_counter() - inicio
+
+        recursivo = None
+        for raiz in raices[1:]:
+            widget.root_node = raiz
+            inicio = time.perf_counter()
+            widget.node_positions.clear()
+            widget._calculate_node_positions_recursive(raiz, x_offset=0, y_pos=widget.node_radius + 20, level_width_map={})
+            duracion = time.perf_counter() - inicio
+            recursivo = duracion if recursivo is None else min(recursivo, duracion)
+        print(f"{plies} plies: layout por nodos {recursivo * 1000:.2f} ms; compartido: primera vez "
+              f"{primera * 1000:.2f} ms, siguientes partidas {compartido * 1000:.3f} ms "
+              f"({sin_numero * 1000:.2f} ms sin num_nodos)")
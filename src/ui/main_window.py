@@ -23,7 +23,7 @@ except ImportError:
             layout = QHBoxLayout(self)
             layout.addWidget(self.placeholder_label)
             self.placeholder_label.setAlignment(Qt.AlignCenter)
-        def set_tree_data(self, root_node):
+        def set_tree_data(self, root_node, num_nodos=None):
             if hasattr(self, 'placeholder_label'):
                 self.placeholder_label.setText(f"TreeVisualizer Placeholder: set_tree_data con nodo raíz: {root_node.valor if root_node else 'None'}")
             print(f"TreeVisualizer Placeholder: set_tree_data con nodo raíz: {root_node.valor if root_node else 'None'}")
@@ -182,7 +182,7 @@ class MainWindow(QMainWindow):
                 raiz_arbol = arbol_constructor.construir_arbol(partida_obj.turnos)
                 
                 # Pasar el nodo raíz al widget visualizador.
-                self.tree_visualizer_widget.set_tree_data(raiz_arbol)
+                self.tree_visualizer_widget.set_tree_data(raiz_arbol, num_nodos=arbol_constructor.num_nodos_lleno)
                 self.status_label.setText(f"Estado: Partida VÁLIDA. Árbol generado con {len(partida_obj.turnos)} turno(s).")
 
             else:
@@ -0,0 +1,151 @@
+# src/ui/monitor_pintado.py
+import json
+import time
+from collections import deque
+
+
+class MonitorPintado:
+    """
+    Métricas de dibujo de TreeVisualizerWidget para el overlay de depuración.
+
+    Por cada fotograma (llamada a paintEvent) registra su duración, el tiempo del último
+    cálculo de layout, los nodos y aristas dibujados frente a los que caen dentro de la
+    región que había que repintar, y cuántas veces se llamó a setMinimumSize desde el
+    propio paintEvent (cada llamada puede provocar otro ciclo de layout y pintado).
+    Los últimos fotogramas se guardan en una traza circular que se puede volcar a un
+    archivo JSON Lines.
+
+    Un paintEvent que solo repinta el propio overlay (ver iniciar_fotograma) va a la traza
+    marcado con "solo_overlay", pero no cuenta como fotograma: ni para los FPS, ni para
+    el total, ni para las cifras que muestra el overlay.
+
+    Solo rect_overlay y dibujar usan Qt; el resto se puede usar (y probar) sin PyQt5.
+    """
+
+    def __init__(self, max_registros=1000, ruta_traza=None, intervalo_volcado=120):
+        """
+        Args:
+            max_registros (int, optional): Fotogramas que conserva la traza circular.
+            ruta_traza (str, optional): Archivo donde se vuelca la traza periódicamente.
+            intervalo_volcado (int, optional): Fotogramas entre volcados automáticos.
+        """
+        self.traza = deque(maxlen=max_registros)
+        self.ruta_traza = ruta_traza
+        self.intervalo_volcado = intervalo_volcado
+        self._instantes = deque()  # Instantes de los fotogramas del último segundo (para los FPS)
+        self.fotogramas = 0
+        self.ultimo_pintado_ms = 0.0
+        self.ultimo_layout_ms = 0.0
+        self.layouts = 0
+        self.set_minimum_size_en_pintado = 0  # Acumulado desde que se activó el monitor
+        self._inicio = None
+        self.solo_overlay = False
+        self.reiniciar_fotograma()
+        self._ultimo_registro = self._registro(0.0, 0.0, (0, 0, 0, 0))  # Último fotograma contado
+
+    def reiniciar_fotograma(self):
+        """Pone a cero los contadores del fotograma en curso."""
+        self.nodos_dibujados = 0
+        self.aristas_dibujadas = 0
+        self.nodos_en_region = 0   # Nodos dibujados que además intersecan la región a repintar
+        self.aristas_en_region = 0
+        self.nodos_total = 0
+        self.aristas_total = 0
+        self.set_minimum_size_fotograma = 0
+
+    def registrar_layout(self, duracion):
+        """Anota la duración (en segundos) de un cálculo de layout."""
+        self.ultimo_layout_ms = duracion * 1000.0
+        self.layouts += 1
+
+    def iniciar_fotograma(self, solo_overlay=False):
+        """
+        Args:
+            solo_overlay (bool, optional): Si el paintEvent es el que pidió el propio widget
+                                           para refrescar el overlay tras un repintado parcial.
+        """
+        self.reiniciar_fotograma()
+        self.solo_overlay = solo_overlay
+        self._inicio = time.perf_counter()
+
+    def _registro(self, ahora, pintado_ms, region):
+        return {
+            "t": round(ahora, 6),
+            "pintado_ms": round(pintado_ms, 3),
+            "layout_ms": round(self.ultimo_layout_ms, 3),
+            "region": list(region),
+            "nodos": [self.nodos_dibujados, self.nodos_en_region, self.nodos_total],
+            "aristas": [self.aristas_dibujadas, self.aristas_en_region, self.aristas_total],
+            "set_minimum_size": self.set_minimum_size_fotograma,
+        }
+
+    def terminar_fotograma(self, region):
+        """
+        Cierra el fotograma en curso y lo añade a la traza.
+
+        Args:
+            region (QRect): Región que se pidió repintar en este paintEvent.
+        """
+        ahora = time.perf_counter()
+        pintado_ms = (ahora - self._inicio) * 1000.0
+        registro = self._registro(ahora, pintado_ms, (region.x(), region.y(), region.width(), region.height()))
+        self.set_minimum_size_en_pintado += self.set_minimum_size_fotograma
+        if self.solo_overlay:
+            registro["solo_overlay"] = True
+            self.traza.append(registro)
+            return
+        self.ultimo_pintado_ms = pintado_ms
+        self.fotogramas += 1
+        self._instantes.append(ahora)
+        while self._instantes and ahora - self._instantes[0] > 1.0:
+            self._instantes.popleft()
+        self._ultimo_registro = registro
+        self.traza.append(registro)
+        if self.ruta_traza and self.fotogramas % self.intervalo_volcado == 0:
+            self.volcar_traza()
+
+    @property
+    def fps(self):
+        """Fotogramas pintados durante el último segundo."""
+        return len(self._instantes)
+
+    def volcar_traza(self, ruta=None):
+        """Escribe la traza circular (un fotograma JSON por línea) en 'ruta' o en ruta_traza."""
+        ruta = ruta or self.ruta_traza
+        if not ruta:
+            return
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            for registro in self.traza:
+                archivo.write(json.dumps(registro))
+                archivo.write("\n")
+
+    def lineas_overlay(self):
+        """Texto del overlay, con las cifras del último fotograma contado."""
+        registro = self._ultimo_registro
+        nodos, aristas = registro["nodos"], registro["aristas"]
+        return [
+            f"pintado: {self.ultimo_pintado_ms:.1f} ms   layout: {self.ultimo_layout_ms:.1f} ms   FPS: {self.fps}",
+            f"nodos: {nodos[0]} dibujados / {nodos[1]} en región / {nodos[2]} total",
+            f"aristas: {aristas[0]} dibujadas / {aristas[1]} en región / {aristas[2]} total",
+            f"setMinimumSize en paintEvent: {registro['set_minimum_size']} (acumulado {self.set_minimum_size_en_pintado})",
+        ]
+
+    def rect_overlay(self, esquina):
+        """Rectángulo del overlay con su esquina superior izquierda en 'esquina' (QPoint)."""
+        from PyQt5.QtCore import QRectF
+        return QRectF(esquina.x() + 8, esquina.y() + 8, 470, 74)
+
+    def dibujar(self, painter, esquina):
+        """Dibuja el panel de métricas del último fotograma completo en la esquina indicada."""
+        from PyQt5.QtGui import QColor, QFont, QPen, QBrush
+        from PyQt5.QtCore import Qt
+        rect = self.rect_overlay(esquina)
+        painter.save()
+        painter.setPen(QPen(QColor(0, 0, 0, 160), 1))
+        painter.setBrush(QBrush(QColor(20, 20, 20, 200)))
+        painter.drawRect(rect)
+        painter.setPen(QPen(QColor("#7CFC00")))
+        painter.setFont(QFont("Consolas", 8))
+        texto = "\n".join(self.lineas_overlay())
+        painter.drawText(rect.adjusted(6, 4, -6, -4), Qt.AlignLeft | Qt.AlignTop, texto)
+        painter.restore()
@@ -0,0 +1,184 @@
+# src/ui/navegador_partidas.py
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableView, QHeaderView, QAbstractItemView
+from PyQt5.QtGui import QColor
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+
+from ..core.cache_lru import CacheLRU
+from ..core.partida import Partida
+from ..tree.arbol_partida import ArbolBinarioPartida
+from ..corpus.lectura import indexar_partidas, leer_partida
+
+# Memoria aproximada por jugada (medida con tracemalloc): objetos Movimiento/Turno de una
+# Partida, y NodoArbol del árbol construido. Sirven para estimar el tamaño de las cachés.
+_BYTES_POR_JUGADA_PARTIDA = 230
+_BYTES_POR_JUGADA_ARBOL = 140
+
+
+def _contar_jugadas(partida):
+    return sum(1 if t.jugada_negra is None else 2 for t in partida.turnos)
+
+
+class ModeloPartidas(QAbstractTableModel):
+    """
+    Modelo de tabla perezoso sobre un archivo con muchas partidas SAN.
+
+    Al abrirse solo se indexan las posiciones en bytes de cada partida (16 bytes por
+    partida). El texto de una fila se lee del archivo, y la Partida se analiza y valida,
+    únicamente cuando la vista pide los datos de esa fila (es decir, cuando es visible)
+    o cuando se selecciona. Las partidas analizadas y los árboles construidos se guardan
+    en cachés LRU con un límite de memoria estimada.
+    """
+
+    COLUMNAS = ("#", "Estado", "Turnos", "Partida")
+    _LONGITUD_RESUMEN = 60  # Caracteres de la partida que se muestran en la última columna
+
+    def __init__(self, ruta, memoria_partidas=64 * 1024 * 1024, memoria_arboles=32 * 1024 * 1024, parent=None):
+        """
+        Args:
+            ruta (str): Archivo con partidas separadas por líneas en blanco.
+            memoria_partidas (int, optional): Límite (bytes estimados) de la caché de partidas.
+            memoria_arboles (int, optional): Límite (bytes estimados) de la caché de árboles.
+        """
+        super().__init__(parent)
+        self.ruta = ruta
+        self._inicios, self._fines = indexar_partidas(ruta)
+        self._archivo = open(ruta, "rb")
+        self._partidas = CacheLRU(memoria_partidas,
+                                  lambda p: 1000 + _BYTES_POR_JUGADA_PARTIDA * _contar_jugadas(p))
+        self._arboles = CacheLRU(memoria_arboles)
+        self.partidas_analizadas = 0  # Veces que se ha analizado una partida (incluye las re-analizadas)
+
+    def cerrar(self):
+        self._archivo.close()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._inicios)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNAS)
+
+    def headerData(self, seccion, orientacion, rol=Qt.DisplayRole):
+        if rol == Qt.DisplayRole and orientacion == Qt.Horizontal:
+            return self.COLUMNAS[seccion]
+        return None
+
+    def texto(self, fila):
+        """Texto SAN de la partida de la fila, leído del archivo."""
+        return leer_partida(self._archivo, self._inicios[fila], self._fines[fila])
+
+    def partida(self, fila):
+        """Partida de la fila, analizada y validada la primera vez que se pide."""
+        partida = self._partidas.obtener(fila)
+        if partida is None:
+            partida = Partida(self.texto(fila))
+            self.partidas_analizadas += 1
+            self._partidas.guardar(fila, partida)
+        return partida
+
+    def arbol(self, fila):
+        """ArbolBinarioPartida de la fila, o None si la partida es inválida."""
+        arbol = self._arboles.obtener(fila)
+        if arbol is None:
+            partida = self.partida(fila)
+            if not partida.es_valida_sintacticamente:
+                return None
+            arbol = ArbolBinarioPartida()
+            arbol.construir_arbol(partida.turnos)
+            self._arboles.guardar(fila, arbol, 1000 + _BYTES_POR_JUGADA_ARBOL * _contar_jugadas(partida))
+        return arbol
+
+    def data(self, indice, rol=Qt.DisplayRole):
+        if not indice.isValid():
+            return None
+        fila, columna = indice.row(), indice.column()
+        if rol == Qt.DisplayRole:
+            if columna == 0:
+                return fila + 1
+            partida = self.partida(fila)
+            if columna == 1:
+                return "Válida" if partida.es_valida_sintacticamente else "Inválida"
+            if columna == 2:
+                return len(partida.turnos)
+            resumen = " ".join(partida.texto_original.split())
+            if len(resumen) > self._LONGITUD_RESUMEN:
+                resumen = resumen[:self._LONGITUD_RESUMEN] + "..."
+            return resumen
+        if rol == Qt.ForegroundRole and columna == 1:
+            return QColor("#155724") if self.partida(fila).es_valida_sintacticamente else QColor("#721C24")
+        if rol == Qt.ToolTipRole and columna == 1:
+            return self.partida(fila).obtener_primer_error()
+        return None
+
+
+class NavegadorPartidas(QWidget):
+    """
+    Lista virtualizada de las partidas de un archivo (ver ModeloPartidas).
+
+    La tabla usa filas de altura fija, de modo que solo pide al modelo los datos de las
+    filas visibles; desplazarse por el archivo nunca lo carga entero en memoria.
+    """
+    # Se emite con el número de fila (0..n-1) de la partida seleccionada.
+    partida_seleccionada = pyqtSignal(int)
+
+    def __init__(self, ruta, parent=None):
+        super().__init__(parent)
+        self.modelo = ModeloPartidas(ruta, parent=self)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.etiqueta = QLabel(f"{self.modelo.rowCount()} partida(s) en {ruta}")
+        layout.addWidget(self.etiqueta)
+
+        self.tabla = QTableView()
+        self.tabla.setModel(self.modelo)
+        self.tabla.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tabla.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.tabla.setWordWrap(False)
+        # Altura fija: la vista no consulta el contenido de las filas para dimensionarlas.
+        self.tabla.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.tabla.verticalHeader().hide()
+        self.tabla.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.tabla.horizontalHeader().setStretchLastSection(True)
+        self.tabla.selectionModel().currentRowChanged.connect(
+            lambda actual, _anterior: self.partida_seleccionada.emit(actual.row()) if actual.isValid() else None)
+        layout.addWidget(self.tabla)
+
+    def closeEvent(self, event):
+        self.modelo.cerrar()
+        super().closeEvent(event)
+
+
+# Medición con un archivo sintético de 100.000 partidas (útil durante el desarrollo).
+# Ejecutar desde la raíz del proyecto: QT_QPA_PLATFORM=offscreen python -m src.ui.navegador_partidas
+if __name__ == '__main__':
+    import os
+    import sys
+    import tempfile
+    import time
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication(sys.argv)
+    descriptor, ruta = tempfile.mkstemp(suffix=".txt")
+    with os.fdopen(descriptor, "w", encoding="utf-8") as archivo:
+        for n in range(100000):
+            jugadas = " ".join(f"{t}. Nf3 Nf6 " if t % 2 else f"{t}. Ng1 Ng8" for t in range(1, 20 + n % 40))
+            archivo.write(jugadas + ("" if n % 7 else " 99. Zz9") + "\n\n")
+
+    inicio = time.perf_counter()
+    navegador = NavegadorPartidas(ruta)
+    navegador.resize(800, 600)
+    navegador.show()
+    app.processEvents()
+    print(f"Abrir {navegador.modelo.rowCount()} partidas: {time.perf_counter() - inicio:.2f}s, "
+          f"{navegador.modelo.partidas_analizadas} analizadas")
+
+    inicio = time.perf_counter()
+    barra = navegador.tabla.verticalScrollBar()
+    for valor in range(0, barra.maximum() + 1, max(1, barra.maximum() // 200)):
+        barra.setValue(valor)
+        app.processEvents()
+    print(f"Recorrer el archivo en 200 saltos: {time.perf_counter() - inicio:.2f}s, "
+          f"{navegador.modelo.partidas_analizadas} analizadas, "
+          f"{len(navegador.modelo._partidas)} en caché")
+    navegador.close()
+    os.remove(ruta)
@@ -0,0 +1,115 @@
+# src/ui/resaltador_san.py
+import re
+
+from PyQt5.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont
+
+from ..core.bnf_rules import obtener_reconocedor
+from ..core.partida import tokenizar, TOKEN_TURNO
+
+# Caracteres fuera del plano básico: en Qt (UTF-16) ocupan dos posiciones en vez de una.
+_PATRON_NO_BMP = re.compile("[\U00010000-\U0010FFFF]")
+
+
+def posiciones_utf16(texto):
+    """
+    Traduce las posiciones de 'texto' (str de Python) a posiciones UTF-16, que son las
+    que esperan QSyntaxHighlighter.setFormat y el resto de Qt.
+
+    Returns:
+        list | None: Lista con la posición UTF-16 de cada posición 0..len(texto), o None
+                     si el texto no tiene caracteres fuera del plano básico (las posiciones
+                     coinciden y no hace falta traducirlas).
+    """
+    if texto.isascii() or not _PATRON_NO_BMP.search(texto):
+        return None
+    posiciones = [0]
+    for caracter in texto:
+        posiciones.append(posiciones[-1] + (2 if caracter > "\uffff" else 1))
+    return posiciones
+
+
+class ResaltadorSAN(QSyntaxHighlighter):
+    """
+    Resalta en el editor los números de turno, las jugadas válidas y las inválidas,
+    mientras se escribe.
+
+    QSyntaxHighlighter solo vuelve a llamar a highlightBlock para los bloques (párrafos)
+    modificados; como el resaltado de un bloque no depende de los anteriores (no se usa
+    setCurrentBlockState), una edición nunca se propaga al resto del documento.
+    Los veredictos de cada jugada se piden al mismo ReconocedorSAN que usa Movimiento,
+    de modo que comparten su caché: una jugada que ya apareció no se vuelve a analizar,
+    ni al resaltarla de nuevo ni al validar la partida con Partida.
+    """
+
+    def __init__(self, documento, reconocedor=None):
+        """
+        Args:
+            documento (QTextDocument): Documento a resaltar (ej: QTextEdit.document()).
+            reconocedor (ReconocedorSAN, optional): Gramática de las jugadas. Por defecto, la estándar.
+        """
+        super().__init__(documento)
+        self.reconocedor = reconocedor if reconocedor is not None else obtener_reconocedor()
+
+        self.formato_turno = QTextCharFormat()
+        self.formato_turno.setForeground(QColor("#808080"))
+        self.formato_turno.setFontWeight(QFont.Bold)
+
+        self.formato_valida = QTextCharFormat()
+        self.formato_valida.setForeground(QColor("#2E7D32"))
+
+        self.formato_invalida = QTextCharFormat()
+        self.formato_invalida.setForeground(QColor("#D32F2F"))
+        self.formato_invalida.setUnderlineStyle(QTextCharFormat.SpellCheckUnderline)
+        self.formato_invalida.setUnderlineColor(QColor("#D32F2F"))
+
+    def set_reconocedor(self, reconocedor):
+        """Cambia la gramática (ej: otro dialecto) y vuelve a resaltar todo el documento."""
+        self.reconocedor = reconocedor
+        self.rehighlight()
+
+    def highlightBlock(self, texto):
+        """Resalta un bloque de texto. Qt lo llama solo para los bloques que cambian."""
+        reconocer = self.reconocedor.reconocer
+        # tokenizar devuelve posiciones de Python; setFormat las espera en UTF-16.
+        utf16 = posiciones_utf16(texto)
+        for tipo, inicio, fin in tokenizar(texto):
+            if tipo == TOKEN_TURNO:
+                formato = self.formato_turno
+            elif reconocer(texto[inicio:fin]) is not None:
+                formato = self.formato_valida
+            else:
+                formato = self.formato_invalida
+            if utf16 is not None:
+                inicio, fin = utf16[inicio], utf16[fin]
+            self.setFormat(inicio, fin - inicio, formato)
+
+
+# Medición del resaltado al pegar 10.000 jugadas (útil durante el desarrollo).
+# Ejecutar desde la raíz del proyecto: QT_QPA_PLATFORM=offscreen python -m src.ui.resaltador_san
+if __name__ == '__main__':
+    import sys
+    import time
+    from PyQt5.QtWidgets import QApplication, QTextEdit
+
+    app = QApplication(sys.argv)
+    editor = QTextEdit()
+    resaltador = ResaltadorSAN(editor.document())
+    jugadas = ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "Ba4", "Nf6", "0-0", "Be7", "Zz9"]
+    turnos = [f"{n // 2 + 1}. {jugadas[n % len(jugadas)]} {jugadas[(n + 1) % len(jugadas)]}"
+              for n in range(0, 10000, 2)]
+
+    for nombre, contenido in (("una línea", " ".join(turnos)), ("un turno por línea", "\n".join(turnos))):
+        editor.clear()
+        inicio = time.perf_counter()
+        editor.insertPlainText(contenido)
+        app.processEvents()
+        t_pegado = time.perf_counter() - inicio
+
+        # Una pulsación de tecla al final del texto: solo se resalta el último bloque.
+        inicio = time.perf_counter()
+        editor.moveCursor(editor.textCursor().End)
+        editor.insertPlainText(" ")
+        app.processEvents()
+        t_tecla = time.perf_counter() - inicio
+        print(f"{nombre}: pegar 10.000 jugadas {t_pegado * 1000:.0f} ms, "
+              f"una pulsación al final {t_tecla * 1000:.1f} ms")
@@ -1,7 +1,11 @@
 # src/ui/tree_visualizer.py
+import os
+import time
 from PyQt5.QtWidgets import QWidget, QSizePolicy, QLabel, QHBoxLayout
-from PyQt5.QtGui import QPainter, QPen, QBrush, QColor, QFont
-from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QPainter, QPen, QBrush, QColor, QFont, QStaticText, QTransform
+from PyQt5.QtCore import Qt, QPointF, QRectF, QLineF, pyqtSignal
+from .monitor_pintado import MonitorPintado
+from .layout_arbol import PROVEEDOR_LAYOUT
 
 # Intenta importar NodoArbol. Si falla, usa un placeholder.
 # Esto es útil para pruebas aisladas o si la estructura del proyecto aún no está completa.
@@ -18,11 +22,17 @@ except ImportError:
         def __str__(self):
             return str(self.valor)
 
+# Tamaño máximo de un QWidget (QWIDGETSIZE_MAX): setMinimumSize no admite más.
+_TAMANO_MAXIMO_WIDGET = (1 << 24) - 1
+
 class TreeVisualizerWidget(QWidget):
     """
     Un widget personalizado para dibujar el árbol binario de la partida de ajedrez.
     Hereda de QWidget y sobreescribe el método paintEvent para realizar el dibujo.
     """
+    # Se emite con el NodoArbol sobre el que el usuario hace clic.
+    nodo_seleccionado = pyqtSignal(object)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.root_node = None  # El nodo raíz del árbol a dibujar.
@@ -33,6 +43,16 @@ class TreeVisualizerWidget(QWidget):
         self.horizontal_spacing = 30  # Espacio horizontal mínimo entre nodos hermanos.
         self.vertical_spacing = 70    # Espacio vertical entre niveles del árbol.
 
+        # Layout por índice (seguimiento en vivo, ver agregar_nodos): la posición de cada nodo
+        # depende solo de su NodoArbol.indice y de la profundidad del árbol.
+        self._layout_por_indice = False
+        self._profundidad_layout = 0  # Número de niveles para el que se calculó el layout por índice.
+        self._limites = None  # (min_x, max_x, min_y, max_y) del árbol, en coordenadas de layout.
+        # Layout compartido (ver layout_arbol.ProveedorLayout) cuando el árbol está lleno por
+        # niveles: las posiciones se buscan por NodoArbol.indice en lugar de en node_positions.
+        self._layout_compartido = None
+        self._num_nodos_arbol = None  # Nodos del árbol lleno por niveles, si se conocen (ver set_tree_data)
+
         # Política de tamaño para que el widget se expanda con la ventana.
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.setMinimumSize(600, 400) # Tamaño mínimo inicial del widget.
@@ -46,20 +66,293 @@ class TreeVisualizerWidget(QWidget):
         self.color_texto = QColor("#000000")        # Negro para el texto dentro de los nodos.
         self.font_nodo = QFont("Arial", 8)          # Fuente para el texto de los nodos.
 
-    def set_tree_data(self, root_node: NodoArbol):
+        # Geometría del árbol lista para pintar (ver _escena_arbol), en coordenadas de layout.
+        # Se reconstruye cuando cambia el layout; los fotogramas solo la recorren.
+        self._escena = None
+        self._etiquetas = {}  # Texto del nodo -> QStaticText (texto ya maquetado con font_nodo)
+        self._fuente_etiquetas = None  # Copia de font_nodo con la que se maquetaron las etiquetas
+
+        # Overlay de depuración del pintado (F12 o AJEDREZ_DEPURAR_PINTADO=1; ver MonitorPintado).
+        self.monitor_pintado = None
+        self._region_pintado = None  # QRectF que se está repintando (solo con el overlay activo)
+        self._overlay_pendiente = None  # QRect del overlay cuyo repintado pidió el propio widget
+        self.setFocusPolicy(Qt.ClickFocus)
+        if os.environ.get("AJEDREZ_DEPURAR_PINTADO"):
+            self.set_overlay_depuracion(True, os.environ.get("AJEDREZ_TRAZA_PINTADO"))
+
+    def set_overlay_depuracion(self, activo, ruta_traza=None):
+        """
+        Activa o desactiva el overlay con las métricas de pintado.
+
+        Args:
+            activo (bool): Si se muestra el overlay (y se miden los fotogramas).
+            ruta_traza (str, optional): Archivo JSON Lines donde se vuelca periódicamente la
+                                        traza de los últimos fotogramas (y al desactivar).
+        """
+        if activo and self.monitor_pintado is None:
+            self.monitor_pintado = MonitorPintado(ruta_traza=ruta_traza)
+        elif not activo and self.monitor_pintado is not None:
+            self.monitor_pintado.volcar_traza()
+            self.monitor_pintado = None
+        self.update()
+
+    def keyPressEvent(self, event):
+        """F12 activa o desactiva el overlay de depuración del pintado."""
+        if event.key() == Qt.Key_F12:
+            self.set_overlay_depuracion(self.monitor_pintado is None)
+            return
+        super().keyPressEvent(event)
+
+    def set_tree_data(self, root_node: NodoArbol, layout_incremental=False, layout=None, num_nodos=None):
         """
         Establece el nodo raíz del árbol que se va a dibujar.
         Limpia las posiciones anteriores y recalcula las nuevas si hay un nodo raíz.
         Finalmente, solicita una actualización del widget para redibujar.
+
+        Si layout_incremental es True (y los nodos tienen índice, ver NodoArbol.indice),
+        el árbol se coloca por índice para poder seguirlo en vivo con agregar_nodos().
+        Si se da 'layout' (obtenido con exportar_layout() para este mismo árbol), se
+        restaura en lugar de recalcularse.
+        'num_nodos' es el número de nodos de un árbol lleno por niveles
+        (ArbolBinarioPartida.num_nodos_lleno): con él, el layout compartido se elige sin
+        recorrer el árbol (ver _nodos_arbol_completo).
         """
         self.root_node = root_node
+        self._num_nodos_arbol = num_nodos
         self.node_positions.clear() # Limpiar posiciones de nodos anteriores.
-        if self.root_node:
-            # Iniciar el cálculo de posiciones desde la raíz.
-            # El 'x_start_offset' inicial es 0; se ajustará después para centrar.
-            self._calculate_node_positions_recursive(self.root_node, x_offset=0, y_pos=self.node_radius + 20, level_width_map={})
+        self._escena = None
+        if layout is not None and root_node is not None:
+            (posiciones, self._limites, self._layout_por_indice, self._profundidad_layout,
+             self._layout_compartido) = layout
+            self.node_positions.update(posiciones)
+            self.update()
+            return
+        self._layout_por_indice = bool(layout_incremental and root_node is not None
+                                       and getattr(root_node, 'indice', None) is not None)
+        self._calcular_layout()
         self.update() # Solicitar un redibujo del widget.
 
+    def exportar_layout(self):
+        """
+        Copia del layout actual, para restaurarlo con set_tree_data(raiz, layout=...) sin
+        recalcularlo (ej: al deshacer). Solo es válido mientras se conserven los mismos nodos.
+        """
+        return (dict(self.node_positions), self._limites, self._layout_por_indice, self._profundidad_layout,
+                self._layout_compartido)
+
+    def _posicion(self, nodo):
+        """Posición (QPointF) de 'nodo' en coordenadas de layout, o None si no está colocado."""
+        if self._layout_compartido is not None:
+            return self._layout_compartido.posiciones[nodo.indice]
+        return self.node_positions.get(id(nodo))
+
+    def _num_nodos_colocados(self):
+        if self._layout_compartido is not None:
+            return self._layout_compartido.num_nodos
+        return len(self.node_positions)
+
+    def _nodos_arbol_completo(self):
+        """
+        Número de nodos del árbol si está lleno por niveles, es decir, si sus índices
+        (NodoArbol.indice) son exactamente 0..n-1; None en otro caso. Solo entonces sirve el
+        layout compartido, cuyo tamaño crece con el índice máximo: un árbol con huecos (un
+        turno intermedio sin jugada negra) tiene índices de hasta 2^turnos.
+
+        Si set_tree_data recibió el número de nodos, basta con confirmar que el último nodo
+        (el de mayor índice) tiene el índice n-1, bajando hasta él en O(log² n). Si no, se
+        recorre el árbol contando los nodos y el índice máximo, en O(n).
+        """
+        raiz = self.root_node
+        if getattr(raiz, 'indice', None) != 0:
+            return None
+        if self._num_nodos_arbol is None:
+            num_nodos = indice_maximo = 0
+            pendientes = [raiz]
+            while pendientes:
+                nodo = pendientes.pop()
+                if nodo.indice is None:
+                    return None
+                num_nodos += 1
+                indice_maximo = max(indice_maximo, nodo.indice)
+                if nodo.izquierda:
+                    pendientes.append(nodo.izquierda)
+                if nodo.derecha:
+                    pendientes.append(nodo.derecha)
+            return num_nodos if indice_maximo + 1 == num_nodos else None
+
+        def profundidad_izquierda(nodo):
+            profundidad = 0
+            while nodo is not None:
+                profundidad += 1
+                nodo = nodo.izquierda
+            return profundidad
+
+        nodo = raiz
+        while nodo.izquierda is not None:
+            # El último nodo está a la derecha si el subárbol derecho llega al último nivel.
+            if nodo.derecha is not None and \
+                    profundidad_izquierda(nodo.derecha) == profundidad_izquierda(nodo.izquierda):
+                nodo = nodo.derecha
+            else:
+                nodo = nodo.izquierda
+        if getattr(nodo, 'indice', None) != self._num_nodos_arbol - 1:
+            return None
+        return self._num_nodos_arbol
+
+    def _calcular_layout(self):
+        """Recalcula las posiciones de todos los nodos y los límites del árbol."""
+        inicio = time.perf_counter()
+        self._recalcular_posiciones()
+        if self.monitor_pintado is not None:
+            self.monitor_pintado.registrar_layout(time.perf_counter() - inicio)
+
+    def _recalcular_posiciones(self):
+        """Cuerpo de _calcular_layout (separado para poder medir su duración)."""
+        self.node_positions.clear()
+        self._limites = None
+        self._layout_compartido = None
+        self._escena = None
+        if not self.root_node:
+            return
+        if self._layout_por_indice:
+            if self._calcular_layout_por_indice():
+                return
+            self._layout_por_indice = False
+        num_nodos = self._nodos_arbol_completo()
+        if num_nodos is not None:
+            # La forma solo depende del número de nodos: layout compartido entre partidas.
+            self._layout_compartido = PROVEEDOR_LAYOUT.layout(num_nodos, self.node_radius, self.horizontal_spacing,
+                                                              self.vertical_spacing)
+            self._limites = self._layout_compartido.limites
+            return
+        # Iniciar el cálculo de posiciones desde la raíz.
+        # El 'x_start_offset' inicial es 0; se ajustará después para centrar.
+        self._calculate_node_positions_recursive(self.root_node, x_offset=0, y_pos=self.node_radius + 20, level_width_map={})
+        xs = [pos.x() for pos in self.node_positions.values()]
+        ys = [pos.y() for pos in self.node_positions.values()]
+        self._limites = (min(xs) - self.node_radius, max(xs) + self.node_radius,
+                         min(ys) - self.node_radius, max(ys) + self.node_radius)
+
+    # --- Layout por índice (seguimiento en vivo) ---
+    # El árbol se llena por niveles, así que cada nodo ocupa una casilla fija de una
+    # cuadrícula binaria: el nivel del índice i es floor(log2(i + 1)) y las casillas del
+    # último nivel tienen el ancho de un nodo. Añadir un nodo no mueve a los demás, salvo
+    # cuando el árbol gana un nivel (lo que ocurre O(log n) veces en toda la partida).
+
+    def _posicion_por_indice(self, indice):
+        """Posición (QPointF) de la casilla 'indice' para la profundidad actual del layout."""
+        nivel = (indice + 1).bit_length() - 1
+        posicion_en_nivel = indice - ((1 << nivel) - 1)
+        ancho_casilla = 2 * self.node_radius + self.horizontal_spacing
+        ancho_total = (1 << (self._profundidad_layout - 1)) * ancho_casilla
+        ancho_nivel = ancho_total / (1 << nivel)
+        x = (posicion_en_nivel + 0.5) * ancho_nivel - ancho_total / 2.0
+        y = self.node_radius + 20 + nivel * self.vertical_spacing
+        return QPointF(x, y)
+
+    def _limites_por_indice(self):
+        """Límites de la cuadrícula completa: solo cambian cuando cambia la profundidad."""
+        ancho_casilla = 2 * self.node_radius + self.horizontal_spacing
+        ancho_total = (1 << (self._profundidad_layout - 1)) * ancho_casilla
+        mitad = ancho_total / 2.0 - ancho_casilla / 2.0 + self.node_radius
+        y_max = 20 + (self._profundidad_layout - 1) * self.vertical_spacing + 2 * self.node_radius
+        return (-mitad, mitad, 20, y_max)
+
+    def _calcular_layout_por_indice(self):
+        """
+        Coloca todos los nodos por índice (recorrido completo, O(n)).
+
+        Solo sirve para árboles sin huecos en los índices (ej: un turno intermedio sin jugada
+        negra deja un hueco): el ancho de la cuadrícula crece con el índice máximo, que con
+        huecos puede crecer como 2^turnos.
+
+        Returns:
+            bool: False, sin colocar nada, si el árbol tiene huecos.
+        """
+        nodos = []
+        pendientes = [self.root_node]
+        while pendientes:
+            nodo = pendientes.pop()
+            nodos.append(nodo)
+            if nodo.izquierda:
+                pendientes.append(nodo.izquierda)
+            if nodo.derecha:
+                pendientes.append(nodo.derecha)
+        indice_maximo = max(nodo.indice for nodo in nodos)
+        if indice_maximo + 1 != len(nodos):
+            return False
+        self._profundidad_layout = (indice_maximo + 1).bit_length()
+        for nodo in nodos:
+            self.node_positions[id(nodo)] = self._posicion_por_indice(nodo.indice)
+        self._limites = self._limites_por_indice()
+        return True
+
+    def agregar_nodos(self, nodos_nuevos):
+        """
+        Dibuja nodos recién enlazados al árbol que ya se está mostrando (ej: los que
+        retorna ArbolBinarioPartida.agregar_turno durante una partida en vivo).
+
+        Con layout por índice solo se calcula la posición de los nodos nuevos y solo se
+        repinta la región que ocupan (el nodo y la arista a su padre). El layout completo
+        se recalcula únicamente cuando un nodo nuevo abre un nivel más de profundidad.
+        Sin layout por índice, o si los nodos nuevos dejan un hueco en los índices (ej: un
+        turno intermedio sin jugada negra), se recalcula el árbol completo como en set_tree_data().
+
+        Args:
+            nodos_nuevos (list): Nodos NodoArbol ya enlazados a self.root_node.
+        """
+        if not nodos_nuevos:
+            return
+        self._num_nodos_arbol = None  # El árbol ha cambiado: ya no se conoce su número de nodos.
+        indices = [getattr(n, 'indice', None) for n in nodos_nuevos]
+        colocados = len(self.node_positions)
+        if not self._layout_por_indice or None in indices \
+                or sorted(indices) != list(range(colocados, colocados + len(indices))):
+            # Sin índices, o los nuevos dejan un hueco en el árbol: layout completo.
+            self._layout_por_indice = False
+            self._calcular_layout()
+            self.update()
+            return
+
+        indice_maximo = max(nodo.indice for nodo in nodos_nuevos)
+        if (indice_maximo + 1).bit_length() > self._profundidad_layout:
+            # Nuevo nivel: cambia el ancho de la cuadrícula y con él todas las posiciones.
+            self._calcular_layout()
+            self.update()
+            return
+
+        offset_x, offset_y = self._desplazamiento_global()
+        region_sucia = QRectF()
+        margen = self.node_radius + 2
+        # La escena ya construida se amplía con los nodos nuevos en lugar de reconstruirse
+        # (O(n) por jugada); si no la hay, o cambió la fuente, se construirá al pintar.
+        escena = self._escena if self._fuente_etiquetas == self.font_nodo else None
+        for nodo in nodos_nuevos:
+            posicion = self._posicion_por_indice(nodo.indice)
+            self.node_positions[id(nodo)] = posicion
+            padre = self._posicion_por_indice((nodo.indice - 1) // 2)
+            if escena is not None:
+                aristas, nodos, etiquetas = escena
+                aristas.append(QLineF(padre, posicion))
+                # Los hijos izquierdos (índice impar) son jugadas blancas; los derechos, negras.
+                rol, rect_nodo, etiqueta = self._elementos_nodo(nodo, "blanca" if nodo.indice % 2 else "negra",
+                                                                posicion)
+                nodos[rol].append(rect_nodo)
+                etiquetas.append(etiqueta)
+            rect = QRectF(posicion, padre).normalized().adjusted(-margen, -margen, margen, margen)
+            region_sucia = region_sucia.united(rect.translated(offset_x, offset_y))
+        self.update(region_sucia.toAlignedRect())
+
+    def _desplazamiento_global(self):
+        """Desplazamiento (x, y) que centra el árbol horizontalmente en el widget."""
+        min_x_coord, max_x_coord, min_y_coord, _ = self._limites
+        tree_actual_width = max_x_coord - min_x_coord
+        # Offset X para centrar horizontalmente.
+        offset_x_global = (self.width() - tree_actual_width) / 2.0 - min_x_coord
+        # Offset Y para empezar desde arriba con un margen.
+        offset_y_global = self.node_radius + 10 - min_y_coord # Margen superior.
+        return offset_x_global, offset_y_global
+
     def _get_subtree_leaf_count(self, node):
         """
         Calcula recursivamente el número de nodos hoja en el subárbol de 'node'.
@@ -132,105 +425,185 @@ class TreeVisualizerWidget(QWidget):
         super().paintEvent(event)
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing) # Habilita antialiasing para bordes suaves.
-
-        if not self.root_node or not self.node_positions:
+        monitor = self.monitor_pintado
+        if monitor is not None:
+            # El repintado del overlay que se pidió en el fotograma anterior no es otro fotograma.
+            pendiente, self._overlay_pendiente = self._overlay_pendiente, None
+            monitor.iniciar_fotograma(solo_overlay=pendiente is not None and pendiente.contains(event.rect()))
+            self._region_pintado = QRectF(event.rect())
+
+        if not self.root_node or self._limites is None:
             # Si no hay árbol o posiciones, mostrar un mensaje.
             painter.drawText(self.rect(), Qt.AlignCenter, "Cargue una partida SAN válida para ver el árbol.")
+            self._dibujar_overlay_depuracion(painter, event)
             return
 
-        # Calcular límites del árbol para centrarlo en el widget.
-        min_x_coord = float('inf')
-        max_x_coord = float('-inf')
-        min_y_coord = float('inf') # Aunque y empieza positivo, es bueno tenerlo.
-        max_y_coord = float('-inf')
-
-        for pos in self.node_positions.values():
-            min_x_coord = min(min_x_coord, pos.x() - self.node_radius)
-            max_x_coord = max(max_x_coord, pos.x() + self.node_radius)
-            min_y_coord = min(min_y_coord, pos.y() - self.node_radius)
-            max_y_coord = max(max_y_coord, pos.y() + self.node_radius)
-
-        if not self.node_positions: return # Salir si no hay posiciones calculadas.
-
+        # Límites del árbol (calculados junto con el layout) para centrarlo en el widget.
+        min_x_coord, max_x_coord, min_y_coord, max_y_coord = self._limites
         tree_actual_width = max_x_coord - min_x_coord
         tree_actual_height = max_y_coord - min_y_coord
-        
+
         # Calcular desplazamientos para centrar el árbol.
-        # Offset X para centrar horizontalmente.
-        offset_x_global = (self.width() - tree_actual_width) / 2.0 - min_x_coord
-        # Offset Y para empezar desde arriba con un margen.
-        offset_y_global = self.node_radius + 10 - min_y_coord # Margen superior.
+        offset_x_global, offset_y_global = self._desplazamiento_global()
 
         # Ajustar el tamaño mínimo del widget si el árbol es más grande.
         # Esto ayuda a que QScrollArea funcione correctamente.
-        new_min_width = int(tree_actual_width + 2 * self.node_radius) # Añadir margen
-        new_min_height = int(tree_actual_height + 2 * self.node_radius)
+        new_min_width = min(int(tree_actual_width + 2 * self.node_radius), _TAMANO_MAXIMO_WIDGET) # Añadir margen
+        new_min_height = min(int(tree_actual_height + 2 * self.node_radius), _TAMANO_MAXIMO_WIDGET)
         
         # Solo ajustar si el nuevo tamaño es mayor que el actual mínimo para evitar bucles.
         if new_min_width > self.minimumWidth() or new_min_height > self.minimumHeight():
             self.setMinimumSize(max(new_min_width, self.width()), max(new_min_height, self.height()))
+            if monitor is not None:
+                monitor.set_minimum_size_fotograma += 1
 
 
-        # Dibujar primero las aristas (líneas) y luego los nodos.
-        self._draw_edges_recursive(painter, self.root_node, offset_x_global, offset_y_global)
-        self._draw_nodes_recursive(painter, self.root_node, None, offset_x_global, offset_y_global)
+        # Dibujar primero las aristas (líneas) y luego los nodos, con la escena ya preparada.
+        if self._escena is None or self._fuente_etiquetas != self.font_nodo:
+            self._escena = self._escena_arbol()
+        self._dibujar_escena(painter, self._escena, offset_x_global, offset_y_global)
+        self._dibujar_overlay_depuracion(painter, event)
 
-    def _draw_edges_recursive(self, painter, node, offset_x, offset_y):
-        """Dibuja recursivamente las aristas (líneas) del árbol."""
-        if node is None or id(node) not in self.node_positions:
+    def _dibujar_overlay_depuracion(self, painter, event):
+        """Cierra el fotograma del monitor y dibuja el overlay en la esquina visible del widget."""
+        monitor = self.monitor_pintado
+        if monitor is None:
             return
+        monitor.nodos_total = self._num_nodos_colocados()
+        monitor.aristas_total = max(0, monitor.nodos_total - 1)
+        monitor.terminar_fotograma(event.rect())
+        # Dentro de un QScrollArea, la parte visible no empieza necesariamente en (0, 0).
+        esquina = self.visibleRegion().boundingRect().topLeft()
+        monitor.dibujar(painter, esquina)
+        rect_overlay = monitor.rect_overlay(esquina).toAlignedRect()
+        if not event.rect().contains(rect_overlay):
+            # Al desplazarse, Qt repinta solo la franja nueva: se refresca también el overlay.
+            self._overlay_pendiente = rect_overlay
+            self.update(rect_overlay)
+
+    def _escena_arbol(self):
+        """
+        Geometría del árbol en coordenadas de layout, agrupada para pintarla por lotes.
 
-        pos_actual_nodo = self.node_positions[id(node)] + QPointF(offset_x, offset_y)
-
-        painter.setPen(QPen(self.color_linea, 1.5, Qt.SolidLine)) # Configurar pluma para las líneas.
-
-        # Dibujar línea al hijo izquierdo.
-        if node.izquierda and id(node.izquierda) in self.node_positions:
-            pos_hijo_izq = self.node_positions[id(node.izquierda)] + QPointF(offset_x, offset_y)
-            painter.drawLine(pos_actual_nodo, pos_hijo_izq)
-            self._draw_edges_recursive(painter, node.izquierda, offset_x, offset_y)
-
-        # Dibujar línea al hijo derecho.
-        if node.derecha and id(node.derecha) in self.node_positions:
-            pos_hijo_der = self.node_positions[id(node.derecha)] + QPointF(offset_x, offset_y)
-            painter.drawLine(pos_actual_nodo, pos_hijo_der)
-            self._draw_edges_recursive(painter, node.derecha, offset_x, offset_y)
-
-    def _draw_nodes_recursive(self, painter, node, parent_for_color_check, offset_x, offset_y):
-        """Dibuja recursivamente los nodos (círculos y texto) del árbol."""
-        if node is None or id(node) not in self.node_positions:
-            return
+        Returns:
+            tuple: (aristas, nodos, etiquetas): la lista de QLineF de todas las aristas, un
+                   dict {rol: [QRectF]} con los círculos de los nodos agrupados por color de
+                   relleno ("raiz", "blanca" o "negra"), y la lista de (QStaticText, QPointF)
+                   con el texto de cada nodo y su esquina superior izquierda.
+        """
+        if self._fuente_etiquetas != self.font_nodo:
+            self._etiquetas.clear()
+            self._fuente_etiquetas = QFont(self.font_nodo)
+        aristas = []
+        nodos = {"raiz": [], "blanca": [], "negra": []}
+        etiquetas = []
+        # Pila de (nodo, rol de su color de relleno).
+        pendientes = [(self.root_node, "blanca")]
+        while pendientes:
+            nodo, rol = pendientes.pop()
+            posicion = self._posicion(nodo)
+            if posicion is None:
+                continue
+            rol, rect, etiqueta = self._elementos_nodo(nodo, rol, posicion)
+            nodos[rol].append(rect)
+            etiquetas.append(etiqueta)
+
+            # Jugada blanca a la izquierda, negra a la derecha.
+            for hijo, rol_hijo in ((nodo.derecha, "negra"), (nodo.izquierda, "blanca")):
+                if hijo is None:
+                    continue
+                posicion_hijo = self._posicion(hijo)
+                if posicion_hijo is not None:
+                    aristas.append(QLineF(posicion, posicion_hijo))
+                    pendientes.append((hijo, rol_hijo))
+        return aristas, nodos, etiquetas
+
+    def _elementos_nodo(self, nodo, rol, posicion):
+        """
+        Elementos de la escena de un nodo colocado en 'posicion'.
 
-        pos_nodo_centro = self.node_positions[id(node)] + QPointF(offset_x, offset_y)
-        # Rectángulo que define el área del círculo del nodo.
-        rect_nodo = QRectF(pos_nodo_centro.x() - self.node_radius,
-                             pos_nodo_centro.y() - self.node_radius,
-                             2 * self.node_radius, 2 * self.node_radius)
-
-        # Determinar el color de relleno del nodo.
-        color_relleno_actual = self.color_jugada_blanca # Color por defecto.
-        if node.valor == "Partida":
-            color_relleno_actual = self.color_raiz
-        elif parent_for_color_check: # Solo si tiene padre, para determinar si es jugada blanca o negra.
-            if node == parent_for_color_check.izquierda: # Jugada blanca.
-                color_relleno_actual = self.color_jugada_blanca
-            elif node == parent_for_color_check.derecha: # Jugada negra.
-                color_relleno_actual = self.color_jugada_negra
-        
-        painter.setBrush(QBrush(color_relleno_actual))
-        painter.setPen(QPen(self.color_borde_nodo, 1)) # Configurar pluma para el borde del nodo.
-        painter.drawEllipse(rect_nodo) # Dibujar el círculo.
+        Returns:
+            tuple: (rol de su color de relleno, QRectF de su círculo, (QStaticText, QPointF) de su texto)
+        """
+        if nodo.valor == "Partida":
+            rol = "raiz"
+        radio = self.node_radius
+        rect = QRectF(posicion.x() - radio, posicion.y() - radio, 2 * radio, 2 * radio)
+
+        texto = str(nodo.valor)
+        etiqueta = self._etiquetas.get(texto)
+        if etiqueta is None:
+            etiqueta = QStaticText(texto)
+            etiqueta.setTextFormat(Qt.PlainText)
+            etiqueta.prepare(QTransform(), self._fuente_etiquetas)
+            self._etiquetas[texto] = etiqueta
+        tamano = etiqueta.size()
+        esquina = QPointF(posicion.x() - tamano.width() / 2.0, posicion.y() - tamano.height() / 2.0)
+        return rol, rect, (etiqueta, esquina)
+
+    def _dibujar_escena(self, painter, escena, offset_x, offset_y):
+        """
+        Pinta la escena de _escena_arbol desplazada (offset_x, offset_y): todas las aristas
+        con una sola llamada a drawLines, los círculos con un pincel por color de relleno y
+        las etiquetas con drawStaticText, sin volver a maquetar el texto en cada fotograma.
+        """
+        aristas, nodos, etiquetas = escena
+        painter.save()
+        painter.translate(offset_x, offset_y)
+        painter.setPen(QPen(self.color_linea, 1.5, Qt.SolidLine))
+        painter.drawLines(aristas)
+
+        painter.setPen(QPen(self.color_borde_nodo, 1))
+        colores = {"raiz": self.color_raiz, "blanca": self.color_jugada_blanca, "negra": self.color_jugada_negra}
+        for rol, rects in nodos.items():
+            if not rects:
+                continue
+            painter.setBrush(QBrush(colores[rol]))
+            for rect in rects:
+                painter.drawEllipse(rect)
 
-        # Dibujar el texto (valor del nodo) centrado en el círculo.
         painter.setPen(QPen(self.color_texto))
-        painter.setFont(self.font_nodo)
-        painter.drawText(rect_nodo, Qt.AlignCenter, str(node.valor))
-
-        # Llamadas recursivas para dibujar los hijos.
-        if node.izquierda:
-            self._draw_nodes_recursive(painter, node.izquierda, node, offset_x, offset_y)
-        if node.derecha:
-            self._draw_nodes_recursive(painter, node.derecha, node, offset_x, offset_y)
+        painter.setFont(self._fuente_etiquetas)
+        for etiqueta, esquina in etiquetas:
+            painter.drawStaticText(esquina, etiqueta)
+        painter.restore()
+        if self.monitor_pintado is not None:
+            self._contar_escena(escena, offset_x, offset_y)
+
+    def _contar_escena(self, escena, offset_x, offset_y):
+        """Cuenta en el monitor las aristas y nodos dibujados, y cuántos caen en la región a repintar."""
+        aristas, nodos, _ = escena
+        monitor = self.monitor_pintado
+        region = self._region_pintado.translated(-offset_x, -offset_y)
+        monitor.aristas_dibujadas += len(aristas)
+        for arista in aristas:
+            # Margen de 1 px: el rectángulo de una arista vertical u horizontal no tiene área.
+            if region.intersects(QRectF(arista.p1(), arista.p2()).normalized().adjusted(-1, -1, 1, 1)):
+                monitor.aristas_en_region += 1
+        for rects in nodos.values():
+            monitor.nodos_dibujados += len(rects)
+            monitor.nodos_en_region += sum(1 for rect in rects if region.intersects(rect))
+
+    def mousePressEvent(self, event):
+        """Emite nodo_seleccionado si el clic cae dentro del círculo de un nodo."""
+        super().mousePressEvent(event)
+        if not self.root_node or self._limites is None:
+            return
+        offset_x, offset_y = self._desplazamiento_global()
+        punto = QPointF(event.pos()) - QPointF(offset_x, offset_y)
+        pendientes = [self.root_node]
+        while pendientes:
+            nodo = pendientes.pop()
+            posicion = self._posicion(nodo)
+            if posicion is not None:
+                diferencia = posicion - punto
+                if diferencia.x() ** 2 + diferencia.y() ** 2 <= self.node_radius ** 2:
+                    self.nodo_seleccionado.emit(nodo)
+                    return
+            if nodo.izquierda:
+                pendientes.append(nodo.izquierda)
+            if nodo.derecha:
+                pendientes.append(nodo.derecha)
 
     def resizeEvent(self, event):
         """
@@ -238,10 +611,10 @@ class TreeVisualizerWidget(QWidget):
         Si hay un árbol cargado, se recalcula su layout y se redibuja.
         """
         super().resizeEvent(event)
-        if self.root_node:
+        if self.root_node and not self._layout_por_indice and self._layout_compartido is None:
             # Recalcular posiciones con el nuevo ancho del widget como referencia para el centro.
-            self.node_positions.clear()
-            self._calculate_node_positions_recursive(self.root_node, x_offset=0, y_pos=self.node_radius + 20, level_width_map={})
+            # (El layout por índice y el compartido no dependen del tamaño del widget.)
+            self._calcular_layout()
         self.update() # Solicitar redibujo.
 
     def sizeHint(self):
@@ -249,3 +622,94 @@ class TreeVisualizerWidget(QWidget):
         # Podría calcularse basado en el tamaño del árbol, pero por ahora usa el mínimo.
         return self.minimumSize()
 
+
+
+# Coste de un fotograma con el pintado anterior (setPen/drawLine por arista; pincel, pluma,
+# fuente y drawText por nodo) frente a la escena por lotes, pintando en una QImage del
+# tamaño de una ventana. Ejecutar desde la raíz del proyecto:
+#   QT_QPA_PLATFORM=offscreen python -m src.ui.tree_visualizer
+if __name__ == '__main__':
+    import sys
+    from PyQt5.QtGui import QImage
+    from PyQt5.QtWidgets import QApplication
+    from ..tree.arbol_partida import ArbolBinarioPartida
+
+    app = QApplication(sys.argv)
+
+    def nodos_por_nodo(widget, painter, nodo, padre, offset_x, offset_y):
+        # Pintado anterior de los nodos (sin recursión, para árboles profundos).
+        pendientes = [(nodo, padre)]
+        while pendientes:
+            nodo, padre = pendientes.pop()
+            posicion = widget._posicion(nodo) + QPointF(offset_x, offset_y)
+            rect = QRectF(posicion.x() - widget.node_radius, posicion.y() - widget.node_radius,
+                          2 * widget.node_radius, 2 * widget.node_radius)
+            color = widget.color_jugada_blanca
+            if nodo.valor == "Partida":
+                color = widget.color_raiz
+            elif padre is not None and nodo is padre.derecha:
+                color = widget.color_jugada_negra
+            painter.setBrush(QBrush(color))
+            painter.setPen(QPen(widget.color_borde_nodo, 1))
+            painter.drawEllipse(rect)
+            painter.setPen(QPen(widget.color_texto))
+            painter.setFont(widget.font_nodo)
+            painter.drawText(rect, Qt.AlignCenter, str(nodo.valor))
+            for hijo in (nodo.derecha, nodo.izquierda):
+                if hijo is not None:
+                    pendientes.append((hijo, nodo))
+
+    def aristas_por_nodo(widget, painter, raiz, offset_x, offset_y):
+        # Pintado anterior de las aristas.
+        pendientes = [raiz]
+        while pendientes:
+            nodo = pendientes.pop()
+            posicion = widget._posicion(nodo) + QPointF(offset_x, offset_y)
+            for hijo in (nodo.izquierda, nodo.derecha):
+                if hijo is not None:
+                    painter.setPen(QPen(widget.color_linea, 1.5, Qt.SolidLine))
+                    painter.drawLine(posicion, widget._posicion(hijo) + QPointF(offset_x, offset_y))
+                    pendientes.append(hijo)
+
+    def fotograma(imagen, pintar, repeticiones=5):
+        mejor = None
+        for _ in range(repeticiones):
+            imagen.fill(Qt.white)
+            painter = QPainter(imagen)
+            painter.setRenderHint(QPainter.Antialiasing)
+            inicio = time.perf_counter()
+            pintar(painter)
+            duracion = time.perf_counter() - inicio
+            painter.end()
+            mejor = duracion if mejor is None else min(mejor, duracion)
+        return mejor * 1000
+
+    widget = TreeVisualizerWidget()
+    for plies in (2000, 10000, 50000):
+        arbol = ArbolBinarioPartida()
+        for n in range(plies):
+            arbol.agregar_jugada(("e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "Ba4", "Nf6")[n % 8])
+        widget.set_tree_data(arbol.raiz, num_nodos=arbol.num_nodos_lleno)
+        # Ventana de 1600x900 centrada en la raíz (el resto del árbol queda recortado).
+        raiz = widget._posicion(arbol.raiz)
+        offset_x, offset_y = 800 - raiz.x(), widget.node_radius + 10 - widget._limites[2]
+        antes, despues = (QImage(1600, 900, QImage.Format_ARGB32_Premultiplied) for _ in range(2))
+
+        def anterior(painter):
+            aristas_por_nodo(widget, painter, arbol.raiz, offset_x, offset_y)
+            nodos_por_nodo(widget, painter, arbol.raiz, None, offset_x, offset_y)
+
+        def lotes(painter):
+            if widget._escena is None:
+                widget._escena = widget._escena_arbol()
+            widget._dibujar_escena(painter, widget._escena, offset_x, offset_y)
+
+        ms_anterior = fotograma(antes, anterior)
+        inicio = time.perf_counter()
+        widget._escena = widget._escena_arbol()
+        ms_escena = (time.perf_counter() - inicio) * 1000
+        ms_lotes = fotograma(despues, lotes)
+        distintos = sum(antes.pixel(x, y) != despues.pixel(x, y) for x in range(0, 1600, 4) for y in range(0, 900, 4))
+        print(f"{plies + 1} nodos: por nodo {ms_anterior:7.1f} ms/fotograma; por lotes {ms_lotes:6.1f} ms/fotograma "
+              f"(x{ms_anterior / ms_lotes:.1f}), preparar la escena {ms_escena:6.1f} ms; "
+              f"píxeles distintos (1 de cada 16) {distintos}/{400 * 225}")
@@ -0,0 +1,71 @@
+# tests/test_aperturas.py
+
+import random
+
+import pytest
+
+from src.core.aperturas import RUTA_TABLA_ECO, ClasificadorAperturas, normalizar_san
+from src.core.partida import Partida
+
+
+@pytest.fixture(scope="module")
+def filas():
+    return ClasificadorAperturas.leer_tabla(RUTA_TABLA_ECO)
+
+
+@pytest.fixture(scope="module")
+def clasificador(filas):
+    return ClasificadorAperturas.compilar(filas)
+
+
+def _por_recorrido(filas, partida):
+    """Apertura más larga de la tabla que es prefijo de la partida, comparando fila a fila."""
+    jugadas = [normalizar_san(j.san_string) for t in partida.turnos for j in (t.jugada_blanca, t.jugada_negra) if j]
+    mejor = None
+    for eco, nombre, secuencia in filas:
+        if jugadas[:len(secuencia)] == secuencia and (mejor is None or len(secuencia) > mejor[2]):
+            mejor = (eco, nombre, len(secuencia))
+    return mejor
+
+
+def test_igual_que_recorrer_la_tabla(filas, clasificador):
+    # Partidas que empiezan por una línea de la tabla (a veces cortada) y siguen con jugadas de relleno.
+    aleatorio = random.Random(7)
+    relleno = ["h3", "a6", "Kh1", "Kh8", "Rb1", "Rb8"] * 3
+    for _ in range(1500):
+        jugadas = [san.replace("O", "0") for san in aleatorio.choice(filas)[2]]
+        jugadas = jugadas[:aleatorio.randint(1, len(jugadas))] + relleno
+        if aleatorio.random() < 0.2 and not jugadas[-len(relleno) - 1].startswith("0"):
+            jugadas[-len(relleno) - 1] += "+"    # Jaque que la tabla no anota
+        texto = " ".join(f"{n // 2 + 1}. {' '.join(jugadas[n:n + 2])}" for n in range(0, len(jugadas), 2))
+        partida = Partida(texto)
+        apertura = clasificador.clasificar(partida)
+        esperada = _por_recorrido(filas, partida)
+        assert (apertura.eco, apertura.nombre, apertura.plies) == esperada, texto
+        assert clasificador.clasificar_texto(texto) == apertura
+
+
+def test_sin_apertura(clasificador):
+    assert clasificador.clasificar(Partida("1. Zz9")) is None
+    assert clasificador.clasificar_texto("1. Na3") == clasificador.clasificar(Partida("1. Na3"))
+
+
+def test_cache_en_disco(tmp_path, monkeypatch):
+    monkeypatch.setenv("AJEDREZ_CACHE_DIR", str(tmp_path))
+    tabla = tmp_path / "tabla.tsv"
+    tabla.write_text("eco\tname\tpgn\nC20\tKing's Pawn\t1. e4 e5\nC60\tRuy Lopez\t1. e4 e5 2. Nf3 Nc6 3. Bb5\n",
+                     encoding="utf-8")
+    compilado = ClasificadorAperturas.desde_archivos(str(tabla))
+    assert list(tmp_path.glob("eco_*.json"))
+    cargado = ClasificadorAperturas.desde_archivos(str(tabla))
+    partida = Partida("1. e4 e5 2. Nf3 Nc6 3. Bb5 a6")
+    assert cargado.clasificar(partida) == compilado.clasificar(partida)
+    assert cargado.clasificar(partida).eco == "C60"
+    assert cargado._hijos == compilado._hijos
+
+
+def test_tabla_mal_formada(tmp_path):
+    tabla = tmp_path / "mala.tsv"
+    tabla.write_text("C20\tSolo dos columnas\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        ClasificadorAperturas.leer_tabla(str(tabla))
@@ -0,0 +1,213 @@
+# tests/test_arbol_partida.py
+
+import pytest
+
+from src.core.turno import Turno
+from src.tree.arbol_partida import ArbolBinarioPartida
+
+
+def _indices(nodo, salida):
+    if nodo is not None:
+        salida.append(nodo.indice)
+        _indices(nodo.izquierda, salida)
+        _indices(nodo.derecha, salida)
+    return salida
+
+
+def test_contadores_sin_huecos():
+    arbol = ArbolBinarioPartida()
+    arbol.construir_arbol([Turno(1, "e4", "e5"), Turno(2, "Nf3", "Nc6"), Turno(3, "Bb5")])
+    indices = _indices(arbol.raiz, [])
+    assert arbol.num_nodos == len(indices) == 6
+    assert arbol.indice_maximo == max(indices) == 5
+    assert arbol.lleno_por_niveles
+    assert arbol.num_nodos_lleno == 6
+
+
+def test_contadores_con_hueco():
+    # Un turno intermedio sin jugada negra deja sin hijo derecho a su padre.
+    arbol = ArbolBinarioPartida()
+    arbol.construir_arbol([Turno(n, "e4") for n in range(1, 21)])
+    indices = _indices(arbol.raiz, [])
+    assert arbol.num_nodos == len(indices) == 21
+    assert arbol.indice_maximo == max(indices)
+    assert arbol.indice_maximo + 1 > arbol.num_nodos
+    assert not arbol.lleno_por_niveles
+    assert arbol.num_nodos_lleno is None
+
+
+def test_reconstruir_reinicia_contadores():
+    arbol = ArbolBinarioPartida()
+    arbol.construir_arbol([Turno(n, "e4") for n in range(1, 6)])
+    arbol.construir_arbol([Turno(1, "d4", "d5")])
+    assert (arbol.num_nodos, arbol.indice_maximo) == (3, 2)
+
+
+@pytest.fixture(scope="module")
+def widget():
+    pytest.importorskip("PyQt5")
+    import os
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    from src.ui.tree_visualizer import TreeVisualizerWidget
+    app = QApplication.instance() or QApplication([])
+    yield TreeVisualizerWidget()
+    del app
+
+
+@pytest.mark.parametrize("num_nodos", [False, True])
+def test_layout_con_huecos_usa_el_recursivo(widget, num_nodos):
+    arbol = ArbolBinarioPartida()
+    arbol.construir_arbol([Turno(n, "e4") for n in range(1, 31)])
+    if num_nodos:
+        widget.set_tree_data(arbol.raiz, num_nodos=arbol.num_nodos_lleno)
+    else:
+        widget.set_tree_data(arbol.raiz)
+    assert widget._layout_compartido is None
+    assert len(widget.node_positions) == arbol.num_nodos
+    min_x, max_x, min_y, max_y = widget._limites
+    # Con 2^turnos posiciones el ancho pasaría de millones de píxeles.
+    assert max_x - min_x < 10000
+
+
+def test_layout_sin_huecos_usa_el_compartido(widget):
+    arbol = ArbolBinarioPartida()
+    arbol.construir_arbol([Turno(n, "e4", "e5") for n in range(1, 11)])
+    widget.set_tree_data(arbol.raiz, num_nodos=arbol.num_nodos_lleno)
+    assert widget._layout_compartido is not None
+    assert len(widget._layout_compartido.posiciones) == arbol.num_nodos
+
+
+def test_layout_incremental_con_huecos(widget):
+    arbol = ArbolBinarioPartida()
+    arbol.construir_arbol([Turno(n, "e4") for n in range(1, 21)])
+    widget.set_tree_data(arbol.raiz, layout_incremental=True)
+    assert not widget._layout_por_indice
+    min_x, max_x, min_y, max_y = widget._limites
+    assert max_x - min_x < 10000
+
+
+@pytest.mark.parametrize("plies", [0, 1, 2, 3, 6, 7, 30, 63, 64, 200])
+def test_layout_compartido_igual_que_el_recursivo(widget, plies):
+    from src.ui.layout_arbol import calcular_layout_completo
+    arbol = ArbolBinarioPartida()
+    for n in range(plies):
+        arbol.agregar_jugada(("e4", "e5", "Nf3", "Nc6")[n % 4])
+    layout = calcular_layout_completo(arbol.num_nodos, widget.node_radius, widget.horizontal_spacing,
+                                      widget.vertical_spacing)
+    widget.root_node = arbol.raiz
+    widget.node_positions.clear()
+    widget._calculate_node_positions_recursive(arbol.raiz, x_offset=0, y_pos=widget.node_radius + 20,
+                                               level_width_map={})
+    pendientes = [arbol.raiz]
+    while pendientes:
+        nodo = pendientes.pop()
+        assert widget.node_positions[id(nodo)] == layout.posiciones[nodo.indice], nodo.indice
+        pendientes.extend(hijo for hijo in (nodo.izquierda, nodo.derecha) if hijo is not None)
+    assert len(widget.node_positions) == layout.num_nodos
+
+
+def _escena_comparable(escena):
+    aristas, nodos, etiquetas = escena
+    return (sorted((a.x1(), a.y1(), a.x2(), a.y2()) for a in aristas),
+            {rol: sorted((r.x(), r.y(), r.width(), r.height()) for r in rects) for rol, rects in nodos.items()},
+            sorted((e.text(), p.x(), p.y()) for e, p in etiquetas))
+
+
+def test_agregar_nodos_amplia_la_escena(widget, monkeypatch):
+    arbol = ArbolBinarioPartida()
+    arbol.construir_arbol([Turno(1, "e4", "e5"), Turno(2, "Nf3", "Nc6")])
+    widget.set_tree_data(arbol.raiz, layout_incremental=True)
+    widget.grab()
+
+    construcciones = []
+    escena_arbol = widget._escena_arbol
+    monkeypatch.setattr(widget, "_escena_arbol", lambda: construcciones.append(1) or escena_arbol())
+    plies = ["Bb5", "a6", "Ba4", "Nf6", "0-0", "Be7"] * 20
+    for san in plies:
+        widget.agregar_nodos([arbol.agregar_jugada(san)])
+        widget.grab()
+    # Solo se reconstruye al abrir un nivel (índices 7, 15, 31 y 63) de los 120 plies añadidos.
+    assert len(construcciones) == 4
+    assert _escena_comparable(widget._escena) == _escena_comparable(escena_arbol())
+
+
+def _nodos_por_indice(raiz):
+    """Diccionario indice -> (valor, indice del hijo izquierdo, indice del hijo derecho)."""
+    nodos = {}
+    pendientes = [raiz]
+    while pendientes:
+        nodo = pendientes.pop()
+        assert nodo.indice not in nodos
+        nodos[nodo.indice] = (nodo.valor,
+                              nodo.izquierda.indice if nodo.izquierda else None,
+                              nodo.derecha.indice if nodo.derecha else None)
+        pendientes.extend(hijo for hijo in (nodo.izquierda, nodo.derecha) if hijo is not None)
+    return nodos
+
+
+_PARTIDAS_INCREMENTALES = {
+    "completa": [Turno(n, ("e4", "d4", "Nf3")[n % 3], ("e5", "d5", "Nc6")[n % 3]) for n in range(1, 40)],
+    "sin_ultima_negra": [Turno(n, "Nf3", "Nf6") for n in range(1, 20)] + [Turno(20, "e4")],
+    "con_hueco": [Turno(n, "Nf3", "Nf6") for n in range(1, 6)] + [Turno(6, "e4")]
+                 + [Turno(n, "Ng1", "Ng8") for n in range(7, 12)],
+}
+
+
+@pytest.mark.parametrize("nombre", sorted(_PARTIDAS_INCREMENTALES))
+def test_agregar_turno_igual_que_construir(nombre):
+    turnos = _PARTIDAS_INCREMENTALES[nombre]
+    completo = ArbolBinarioPartida()
+    completo.construir_arbol(turnos)
+    por_turnos = ArbolBinarioPartida()
+    creados = [nodo for turno in turnos for nodo in por_turnos.agregar_turno(turno)]
+
+    assert _nodos_por_indice(por_turnos.raiz) == _nodos_por_indice(completo.raiz)
+    assert len(creados) == completo.num_nodos - 1
+    assert (por_turnos.num_nodos, por_turnos.indice_maximo) == (completo.num_nodos, completo.indice_maximo)
+
+
+def test_agregar_jugada_igual_que_construir():
+    turnos = _PARTIDAS_INCREMENTALES["sin_ultima_negra"]
+    completo = ArbolBinarioPartida()
+    completo.construir_arbol(turnos)
+    por_plies = ArbolBinarioPartida()
+    for turno in turnos:
+        por_plies.agregar_jugada(turno.jugada_blanca.san_string)
+        if turno.jugada_negra:
+            por_plies.agregar_jugada(turno.jugada_negra.san_string)
+    assert _nodos_por_indice(por_plies.raiz) == _nodos_por_indice(completo.raiz)
+
+
+def _posiciones_por_indice(widget, raiz):
+    posiciones = {}
+    pendientes = [raiz]
+    while pendientes:
+        nodo = pendientes.pop()
+        posicion = widget._posicion(nodo)
+        posiciones[nodo.indice] = (posicion.x(), posicion.y())
+        pendientes.extend(hijo for hijo in (nodo.izquierda, nodo.derecha) if hijo is not None)
+    return posiciones
+
+
+@pytest.mark.parametrize("nombre", sorted(_PARTIDAS_INCREMENTALES))
+def test_agregar_nodos_igual_que_layout_completo(widget, nombre):
+    from src.ui.tree_visualizer import TreeVisualizerWidget
+    turnos = _PARTIDAS_INCREMENTALES[nombre]
+    arbol = ArbolBinarioPartida()
+    arbol.construir_arbol(turnos[:1])
+    widget.set_tree_data(arbol.raiz, layout_incremental=True)
+    profundidades = {widget._profundidad_layout}
+    for turno in turnos[1:]:
+        widget.agregar_nodos(arbol.agregar_turno(turno))
+        if widget._layout_por_indice:
+            profundidades.add(widget._profundidad_layout)
+
+    nuevo = TreeVisualizerWidget()
+    nuevo.set_tree_data(arbol.raiz, layout_incremental=True)
+    assert widget._layout_por_indice == nuevo._layout_por_indice == (nombre != "con_hueco")
+    assert _posiciones_por_indice(widget, arbol.raiz) == _posiciones_por_indice(nuevo, arbol.raiz)
+    assert widget._limites == nuevo._limites
+    if nombre != "con_hueco":
+        # Ha pasado por el recálculo de cada nivel nuevo.
+        assert profundidades == set(range(2, (arbol.indice_maximo + 1).bit_length() + 1))
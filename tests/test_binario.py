@@ -0,0 +1,85 @@
+# tests/test_binario.py
+
+import struct
+
+import pytest
+
+from src.core.partida import Partida
+from src.corpus.binario import (BANDERA_ESCAPES, BANDERA_TURNOS_EXPLICITOS, LectorBinario, _REGISTRO,
+                                codificar_partida, escribir_partidas)
+from src.corpus.sintetico import GeneradorCorpus
+
+# Casos que no pasan por el camino normal: jugadas fuera del diccionario, turnos no
+# consecutivos, partidas inválidas con y sin posición de error, texto no ASCII.
+ESPECIALES = [
+    "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6",
+    "1. d4 d5 2. Qd1d3 Kd7",                  # Desambiguación por casilla completa (escapada)
+    "12. e4 e5 13. Nf3",                      # Primer turno distinto de 1
+    "1. e4 e5 5. Nf3 Nc6 9. Bc4",             # Turnos no consecutivos
+    "1. e4 e5 2. Zz9",                        # Inválida
+    "",                                       # Inválida, sin posición de error
+    "1. e4 ¿e5? 2. Nf3",                      # Inválida con texto no ASCII
+    "1. 0-0 0-0-0 2. e8=Q+ exd1=N#",
+]
+
+
+def _descripcion(partida):
+    turnos = [(t.numero_turno, t.jugada_blanca.san_string, t.jugada_blanca.regla,
+               t.jugada_negra and t.jugada_negra.san_string, t.jugada_negra and t.jugada_negra.regla)
+              for t in partida.turnos] if partida.es_valida_sintacticamente else None
+    return (partida.es_valida_sintacticamente, partida.obtener_primer_error(), turnos,
+            partida.texto_canonico() if partida.es_valida_sintacticamente else partida.texto_original)
+
+
+@pytest.fixture
+def partidas():
+    textos = ESPECIALES + [t for t, _ in GeneradorCorpus(4, tasa_errores=0.1, plies_medio=30).partidas(400)]
+    return [Partida(texto) for texto in textos]
+
+
+def test_ida_y_vuelta(partidas, tmp_path):
+    ruta = str(tmp_path / "partidas.ajzb")
+    assert escribir_partidas(ruta, partidas) == len(partidas)
+    esperadas = [_descripcion(p) for p in partidas]
+    with LectorBinario(ruta) as lector:
+        assert len(lector) == len(partidas)
+        assert [_descripcion(p) for p in lector.iterar_partidas()] == esperadas
+        # Acceso aleatorio por el índice, en orden inverso.
+        for i in reversed(range(len(partidas))):
+            assert _descripcion(lector[i]) == esperadas[i]
+            assert lector.es_valida(i) == partidas[i].es_valida_sintacticamente
+        plies = [[j.san_string for t in p.turnos for j in (t.jugada_blanca, t.jugada_negra) if j]
+                 if p.es_valida_sintacticamente else [] for p in partidas]
+        assert [j for _, j in lector.iterar_plies()] == plies
+        assert [lector.plies(i) for i in range(len(partidas))] == plies
+
+
+def test_banderas_de_los_casos_especiales():
+    def banderas(texto):
+        return _REGISTRO.unpack_from(codificar_partida(Partida(texto)))[2]
+    assert banderas(ESPECIALES[0]) == 0
+    assert banderas(ESPECIALES[1]) == BANDERA_ESCAPES
+    assert banderas(ESPECIALES[2]) == 0
+    assert banderas(ESPECIALES[3]) == BANDERA_TURNOS_EXPLICITOS
+
+
+def test_arbol(tmp_path):
+    ruta = str(tmp_path / "arbol.ajzb")
+    escribir_partidas(ruta, ["1. e4 e5 2. Nf3", "1. Zz9"])
+    with LectorBinario(ruta) as lector:
+        assert lector.arbol(0).a_texto(estilo="ascii") == "Partida\n|-- L: e4\n|   `-- L: Nf3\n`-- R: e5\n"
+        assert lector.arbol(1).num_nodos == 1
+        with pytest.raises(IndexError):
+            lector.partida(2)
+
+
+@pytest.mark.parametrize("contenido", [
+    b"AJZB",
+    b"XXXX" + bytes(20),
+    struct.pack("<4sHHQQ", b"AJZB", 99, 0, 0, 24),
+])
+def test_archivos_no_validos(tmp_path, contenido):
+    ruta = tmp_path / "malo.ajzb"
+    ruta.write_bytes(contenido)
+    with pytest.raises(ValueError):
+        LectorBinario(str(ruta))
@@ -0,0 +1,82 @@
+# tests/test_casi_duplicados.py
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.corpus.casi_duplicados import (FirmasMinHash, buscar_casi_duplicados, jaccard, ngramas,
+                                        pares_candidatos, plies_de)
+from src.corpus.sintetico import GeneradorCorpus
+
+
+def _texto(plies):
+    return " ".join(f"{i // 2 + 1}. {' '.join(plies[i:i + 2])}" for i in range(0, len(plies), 2))
+
+
+@pytest.fixture(scope="module")
+def etiquetado():
+    """Partidas base independientes más una copia con una errata y otra con otro final."""
+    generador = GeneradorCorpus(semilla=3, plies_min=60, plies_max=120)
+    textos = [texto for texto, _ in generador.partidas(30)]
+    aleatorio = random.Random(0)
+
+    erratas = plies_de(textos[4])
+    erratas[20] = erratas[20].rstrip("+#")[:-1] + "9"   # Casilla inexistente: la copia no es válida
+    erratas[41] = aleatorio.choice(generador.repertorio)
+    otro_final = plies_de(textos[17])[:-6] + aleatorio.choices(generador.repertorio, k=3)
+    textos += [_texto(erratas), _texto(otro_final)]
+    return textos, {(4, 30), (17, 31)}
+
+
+@pytest.mark.parametrize("procesos", [1, 2])
+def test_encuentra_los_pares_etiquetados(etiquetado, procesos):
+    textos, esperados = etiquetado
+    datos = {}
+    pares = buscar_casi_duplicados(textos, procesos=procesos, tam_lote=7, pares_por_lote=2, estadisticas=datos)
+    assert {(i, j) for i, j, _ in pares} == esperados
+    assert datos["partidas"] == len(textos)
+    assert datos["candidatos"] >= len(esperados)
+    n = FirmasMinHash().n
+    for i, j, similitud in pares:
+        assert similitud == jaccard(ngramas(plies_de(textos[i]), n), ngramas(plies_de(textos[j]), n)) >= 0.7
+
+
+def test_firmas_estiman_la_similitud(etiquetado):
+    textos, _ = etiquetado
+    minhash = FirmasMinHash(bandas=50, filas=4)
+    plies = [plies_de(texto) for texto in textos]
+    firmas, con_jugadas = minhash.firmas(plies)
+    assert firmas.shape == (len(textos), 200)
+    assert con_jugadas.all()
+    for i, j in [(4, 30), (17, 31), (0, 1)]:
+        exacta = jaccard(ngramas(plies[i], minhash.n), ngramas(plies[j], minhash.n))
+        assert abs((firmas[i] == firmas[j]).mean() - exacta) < 0.15
+    # Las firmas de una partida no dependen del resto del bloque.
+    assert (minhash.firmas([plies[5]])[0][0] == firmas[5]).all()
+
+
+def test_cubeta_grande_enlaza_a_todos(etiquetado):
+    textos, _ = etiquetado
+    copias = [textos[0]] * 100
+    pares = buscar_casi_duplicados(copias + textos[1:5], procesos=1, max_cubeta=10)
+    assert {(i, j) for i, j, _ in pares} >= {(0, j) for j in range(1, 100)}
+    assert all(j < 100 for _, j, _ in pares)
+
+    claves = np.arange(1000, 1300, dtype=np.uint64).reshape(100, 3)
+    claves[10:90, 1] = 7  # Una cubeta de 80 partidas en la segunda banda
+    candidatos = pares_candidatos(claves, max_cubeta=10)
+    assert sorted(map(tuple, candidatos.tolist())) == [(10, j) for j in range(11, 90)]
+    completos = pares_candidatos(claves, max_cubeta=100)
+    assert len(completos) == 80 * 79 // 2
+
+
+def test_entradas_vacias_o_invalidas():
+    assert buscar_casi_duplicados([], procesos=1) == []
+    datos = {}
+    assert buscar_casi_duplicados(["", "  \n ", "", "1."], procesos=1, estadisticas=datos) == []
+    assert datos == {"partidas": 4, "candidatos": 0}
+
+    textos = ["", "1. e4 e5 2. Nf3 Zz9 3. Bb5 a6", "", "1. e4 e5 2. Nf3 Zz9 3. Bb5 a6", "\n"]
+    assert buscar_casi_duplicados(textos, procesos=1) == [(1, 3, 1.0)]
+    assert len(pares_candidatos(np.zeros((0, 20), dtype=np.uint64))) == 0
@@ -0,0 +1,60 @@
+# tests/test_clasificador_masivo.py
+import itertools
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.core.clasificador_masivo import (NOMBRES_REGLAS, REGLA_INVALIDA, clasificar_lote,
+                                          empaquetar_tokens)
+from src.core.movimiento import Movimiento
+
+_IDS_POR_NOMBRE = {nombre: regla for regla, nombre in NOMBRES_REGLAS.items()}
+
+
+def _regla_de_movimiento(san):
+    movimiento = Movimiento(san)
+    return _IDS_POR_NOMBRE[movimiento.regla] if movimiento.es_valido else REGLA_INVALIDA
+
+
+def _diferencias(tokens):
+    validos, reglas = clasificar_lote(tokens)
+    esperado = [_regla_de_movimiento(token) for token in tokens]
+    assert validos.tolist() == [regla != REGLA_INVALIDA for regla in esperado]
+    return [(t, r, e) for t, r, e in zip(tokens, reglas.tolist(), esperado) if r != e]
+
+
+def test_coincide_con_movimiento_en_cadenas_cortas():
+    # Todas las cadenas de hasta 4 caracteres sobre los caracteres relevantes de la gramática.
+    # Sin espacios ni caracteres especiales: el lote va por el camino sin limpieza.
+    alfabeto = "aehx18KQ=+#0-"
+    tokens = ["".join(p) for k in range(1, 5) for p in itertools.product(alfabeto, repeat=k)]
+    assert _diferencias(tokens) == []
+
+
+def test_coincide_con_movimiento_en_cadenas_aleatorias():
+    rng = random.Random(42)
+    alfabeto = "abcdefghx12345678KQRBNP=+#0-O"
+    tokens = ["".join(rng.choice(alfabeto) for _ in range(rng.randint(1, 12))) for _ in range(50000)]
+    tokens += ["Qa1xb2=Q#", "Qa1xb2=Q", "Ka1xb2=Q#+", "Nbd7", "R1e2", "exd8=Q+", "0-0-0", "0-0+"]
+    assert _diferencias(tokens) == []
+
+
+def test_coincide_con_movimiento_con_espacios_nul_y_no_ascii():
+    rng = random.Random(7)
+    alfabeto = "aex18KQ=+#0- \t\x00\u00f1\u00a0"
+    tokens = ["".join(rng.choice(alfabeto) for _ in range(rng.randint(0, 10))) for _ in range(20000)]
+    tokens += ["e4\x00", "\x00e4", "e\x004", " e4 ", "e4\u00a0", " Nf3", "e 4", "", "   "]
+    assert _diferencias(tokens) == []
+
+
+def test_nul_final_no_se_descarta():
+    validos, _ = clasificar_lote(["e4\x00", "e4", "Nf3\x00\x00"])
+    assert validos.tolist() == [False, True, False]
+
+
+def test_longitudes_empaquetadas():
+    _, longitudes = empaquetar_tokens(["e4", "", "Qa1xb2=Q#", "e" * 40])
+    assert longitudes.tolist() == [2, 0, 9, 40]
+    assert clasificar_lote([])[0].tolist() == []
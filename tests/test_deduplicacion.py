@@ -0,0 +1,79 @@
+# tests/test_deduplicacion.py
+
+import hashlib
+
+from src.corpus.deduplicacion import ConjuntoHuellasDisco, Deduplicador, FiltroBloom
+
+_JUGADAS = ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "d4", "d5", "c4", "e6", "Nc3", "Nf6"]
+
+
+def _partidas_distintas(cantidad):
+    """Partidas distintas (al menos difieren en el número de su último turno)."""
+    partidas = []
+    for n in range(cantidad):
+        plies = [_JUGADAS[(n + i) % len(_JUGADAS)] for i in range(2 + n % 20)]
+        texto = " ".join(f"{i // 2 + 1}. {' '.join(plies[i:i + 2])}" for i in range(0, len(plies), 2))
+        partidas.append(f"{texto} {n + 30}. Kf1")
+    assert len(set(partidas)) == cantidad
+    return partidas
+
+
+def _huella(n):
+    return hashlib.blake2b(str(n).encode(), digest_size=16).digest()
+
+
+def test_filtro_bloom_sin_falsos_negativos():
+    filtro = FiltroBloom(1000, tasa_falsos_positivos=0.1)
+    huellas = [_huella(n) for n in range(5000)]  # Cinco veces la capacidad: muchos falsos positivos
+    for huella in huellas:
+        filtro.agregar_y_comprobar(huella)
+    assert all(huella in filtro for huella in huellas)
+    assert all(filtro.agregar_y_comprobar(huella) for huella in huellas)
+
+
+def test_filtro_bloom_tasa_de_falsos_positivos():
+    filtro = FiltroBloom(10000, tasa_falsos_positivos=0.01)
+    for n in range(10000):
+        filtro.agregar_y_comprobar(_huella(n))
+    falsos = sum(_huella(n) in filtro for n in range(10000, 30000))
+    assert falsos / 20000 < 0.03
+
+
+def test_duplicados_por_espacios_y_numeros_de_turno(tmp_path):
+    variantes = [
+        "1. e4 e5 2. Nf3 Nc6 3. Bb5",
+        "1.e4 e5 2.Nf3 Nc6 3.Bb5",
+        "  1 .  e4   e5\n2 . Nf3\tNc6\n\n3.   Bb5 ",
+        "01. e4 e5 002. Nf3 Nc6 3. Bb5",
+    ]
+    otras = ["1. e4 e5 2. Nf3 Nc6 3. Bc4", "1. e4 e5 2. Nf3 Nc6"]
+    with Deduplicador(str(tmp_path / "huellas.sqlite"), capacidad_estimada=100) as deduplicador:
+        unicas = list(deduplicador.filtrar(variantes + otras))
+    assert unicas == [variantes[0]] + otras
+    assert deduplicador.duplicadas == 3
+    assert deduplicador.unicas == 3
+
+
+def test_partidas_distintas_nunca_son_duplicadas(tmp_path):
+    partidas = _partidas_distintas(2000)
+    # Un filtro pequeño da muchos "quizá": el conjunto exacto debe descartarlos todos.
+    with Deduplicador(str(tmp_path / "huellas.sqlite"), capacidad_estimada=50) as deduplicador:
+        assert list(deduplicador.filtrar(partidas)) == partidas
+    assert deduplicador.duplicadas == 0
+    assert deduplicador.consultas_disco > 0
+
+
+def test_deduplicacion_incremental(tmp_path):
+    ruta = str(tmp_path / "huellas.sqlite")
+    partidas = _partidas_distintas(300)
+    with Deduplicador(ruta, capacidad_estimada=1000) as deduplicador:
+        assert list(deduplicador.filtrar(partidas[:200])) == partidas[:200]
+
+    with Deduplicador(ruta, capacidad_estimada=1000) as deduplicador:
+        nuevas = list(deduplicador.filtrar(partidas[100:] + partidas[:50]))
+    assert nuevas == partidas[200:]
+    assert deduplicador.duplicadas == 150
+
+    conjunto = ConjuntoHuellasDisco(ruta)
+    assert len(list(conjunto.huellas())) == 300
+    conjunto.cerrar()
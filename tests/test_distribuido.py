@@ -0,0 +1,133 @@
+# tests/test_distribuido.py
+
+import multiprocessing
+import socket
+import threading
+import time
+
+import pytest
+
+from src.corpus.distribuido import CoordinadorValidacion, ejecutar_trabajador
+from src.corpus.trabajos import TrabajoValidacion
+
+_JUGADAS = ["e4 e5", "Nf3 Nc6", "Bb5 a6", "Ba4 Nf6", "0-0 Be7", "Re1 b5", "Bb3 d6", "c3 0-0"]
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    ruta = tmp_path / "corpus.txt"
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        for n in range(1200):
+            turnos = [f"{t + 1}. {_JUGADAS[(t + n) % len(_JUGADAS)]}" for t in range(5 + n % 20)]
+            archivo.write(" ".join(turnos) + (" 99. Zz9" if n % 10 == 0 else "") + "\n\n")
+    return str(ruta)
+
+
+@pytest.fixture
+def referencia(corpus, tmp_path):
+    trabajo = TrabajoValidacion(corpus, str(tmp_path / "local"), partidas_por_fragmento=100)
+    trabajo.ejecutar(procesos=1)
+    return list(trabajo.resultados())
+
+
+def _trabajador(servidor, nombre, retardo=0.0):
+    return multiprocessing.Process(target=ejecutar_trabajador, args=(*servidor.direccion, nombre, retardo))
+
+
+def _esperar(condicion, limite=30.0):
+    fin = time.monotonic() + limite
+    while not condicion():
+        assert time.monotonic() < fin, "Tiempo de espera agotado"
+        time.sleep(0.02)
+
+
+@pytest.mark.parametrize("num_trabajadores", [1, 3])
+def test_trabajadores_completan_el_trabajo(corpus, referencia, tmp_path, num_trabajadores):
+    trabajo = TrabajoValidacion(corpus, str(tmp_path / "distribuido"), partidas_por_fragmento=100)
+    servidor = CoordinadorValidacion(trabajo)
+    procesos = [_trabajador(servidor, f"w{i}") for i in range(num_trabajadores)]
+    for proceso in procesos:
+        proceso.start()
+    resumen = servidor.ejecutar()
+    for proceso in procesos:
+        proceso.join(30)
+        assert proceso.exitcode == 0
+
+    assert resumen["completo"]
+    assert resumen["partidas_procesadas"] == resumen["partidas"] == 1200
+    assert sum(servidor.fragmentos_por_trabajador.values()) == 12
+    assert servidor.trabajadores_perdidos == []
+    assert list(trabajo.resultados()) == referencia
+    assert servidor.estadisticas.partidas_validas == resumen["validas"]
+    assert servidor.estadisticas.partidas_invalidas == resumen["invalidas"] == 120
+
+
+def test_reasignacion_tras_matar_un_trabajador(corpus, referencia, tmp_path):
+    trabajo = TrabajoValidacion(corpus, str(tmp_path / "caida"), partidas_por_fragmento=100)
+    servidor = CoordinadorValidacion(trabajo, en_vuelo=2)
+    resultado = {}
+    coordinador = threading.Thread(target=lambda: resultado.update(servidor.ejecutar()))
+    coordinador.start()
+
+    # Un trabajador que tarda en entregar: se le mata con fragmentos asignados.
+    lento = _trabajador(servidor, "lento", retardo=60.0)
+    lento.start()
+    _esperar(lambda: servidor._en_curso)
+    lento.kill()
+    lento.join()
+
+    rapido = _trabajador(servidor, "rapido")
+    rapido.start()
+    coordinador.join(60)
+    rapido.join(30)
+
+    assert not coordinador.is_alive()
+    assert resultado["completo"]
+    assert servidor.reasignados >= 1
+    assert len(servidor.trabajadores_perdidos) == 1
+    assert dict(servidor.fragmentos_por_trabajador) == {"rapido": 12}
+    assert list(trabajo.resultados()) == referencia
+
+
+def test_conexion_sin_saludo_no_bloquea_el_final(corpus, referencia, tmp_path):
+    trabajo = TrabajoValidacion(corpus, str(tmp_path / "ocioso"), partidas_por_fragmento=100)
+    servidor = CoordinadorValidacion(trabajo, espera_saludo=60.0)
+    resultado = {}
+    coordinador = threading.Thread(target=lambda: resultado.update(servidor.ejecutar()), daemon=True)
+    coordinador.start()
+
+    # Un cliente que conecta y nunca envía "hola" (escaneo de puertos, comprobación de salud).
+    ocioso = socket.create_connection(servidor.direccion)
+    _esperar(lambda: servidor._conexiones)
+    trabajador = _trabajador(servidor, "w0")
+    trabajador.start()
+    coordinador.join(30)
+    trabajador.join(30)
+
+    assert not coordinador.is_alive()
+    assert resultado["completo"]
+    assert servidor.trabajadores_perdidos == []
+    assert list(trabajo.resultados()) == referencia
+    ocioso.settimeout(5)
+    assert ocioso.recv(1) == b""
+    ocioso.close()
+
+
+def test_conexion_sin_saludo_se_cierra_por_tiempo(corpus, tmp_path):
+    trabajo = TrabajoValidacion(corpus, str(tmp_path / "espera"), partidas_por_fragmento=100)
+    servidor = CoordinadorValidacion(trabajo, espera_saludo=0.2)
+    coordinador = threading.Thread(target=servidor.ejecutar, daemon=True)
+    coordinador.start()
+
+    ocioso = socket.create_connection(servidor.direccion)
+    ocioso.settimeout(5)
+    assert ocioso.recv(1) == b""
+    ocioso.close()
+    _esperar(lambda: not servidor._conexiones)
+    assert servidor.trabajadores_perdidos == []
+
+    trabajador = _trabajador(servidor, "w0")
+    trabajador.start()
+    coordinador.join(30)
+    trabajador.join(30)
+    assert not coordinador.is_alive()
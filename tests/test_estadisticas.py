@@ -0,0 +1,54 @@
+# tests/test_estadisticas.py
+
+import json
+
+from src.core.partida import Partida
+from src.corpus.estadisticas import EstadisticasPartidas, calcular_estadisticas
+from src.corpus.sintetico import GeneradorCorpus
+
+
+def _textos(n=600, semilla=11):
+    return [texto for texto, _ in GeneradorCorpus(semilla, tasa_errores=0.1).partidas(n)]
+
+
+def _en_serie(textos):
+    estadisticas = EstadisticasPartidas()
+    for texto in textos:
+        estadisticas.agregar_partida(Partida(texto))
+    return estadisticas
+
+
+def test_map_reduce_igual_que_en_serie():
+    textos = _textos()
+    referencia = _en_serie(textos).a_dict()
+    assert referencia["partidas_invalidas"] > 0 and referencia["capturas"] > 0
+    # Con 1 proceso se calcula sin pool; con 2, en un pool de procesos con lotes pequeños.
+    assert calcular_estadisticas(iter(textos), procesos=1, tam_lote=50).a_dict() == referencia
+    assert calcular_estadisticas(iter(textos), procesos=2, tam_lote=37).a_dict() == referencia
+
+
+def test_combinar_no_depende_del_reparto():
+    textos = _textos(300, semilla=5)
+    referencia = _en_serie(textos).a_dict()
+    partes = [_en_serie(textos[i:i + 70]) for i in range(0, len(textos), 70)]
+    total = EstadisticasPartidas()
+    for parte in reversed(partes):
+        total.combinar(parte)
+    assert total.a_dict() == referencia
+
+
+def test_ida_y_vuelta_json():
+    estadisticas = _en_serie(_textos(200, semilla=2))
+    datos = json.loads(json.dumps(estadisticas.a_dict()))
+    assert EstadisticasPartidas.desde_dict(datos).a_dict() == estadisticas.a_dict()
+
+
+def test_contadores_de_una_partida():
+    estadisticas = _en_serie(["1. e4 d5 2. exd5 Qxd5 3. 0-0-0 Qd8+ 4. e8=Q#", "1. Zz9"])
+    assert estadisticas.partidas_validas == 1
+    assert estadisticas.partidas_invalidas == 1
+    assert estadisticas.jugadas == 7
+    assert (estadisticas.capturas, estadisticas.jaques, estadisticas.mates) == (2, 2, 1)
+    assert estadisticas.promociones == {"Q": 1}
+    assert estadisticas.enroques_por_turno["blancas_largo"] == {3: 1}
+    assert estadisticas.longitudes == {7: 1}
@@ -0,0 +1,125 @@
+# tests/test_historial.py
+
+import random
+
+from src.core.historial import TURNOS_POR_BLOQUE, HistorialEdicion, SecuenciaTurnos, arbol_persistente
+from src.core.partida import Partida
+from src.tree.arbol_partida import ArbolBinarioPartida
+
+_JUGADAS = ["Nf3", "Nf6", "Ng1", "Ng8", "Nc3", "Nc6", "Nb1", "Nb8", "e4", "e5", "d4", "d5"]
+
+
+def _texto(plies):
+    return " ".join(f"{n // 2 + 1}. {plies[n]} {plies[n + 1]}" for n in range(0, len(plies), 2))
+
+
+def _valores(nodo, salida):
+    """Diccionario indice -> (valor, indice del hijo izquierdo, indice del hijo derecho)."""
+    if nodo is not None:
+        salida[nodo.indice] = (nodo.valor,
+                               nodo.izquierda.indice if nodo.izquierda else None,
+                               nodo.derecha.indice if nodo.derecha else None)
+        _valores(nodo.izquierda, salida)
+        _valores(nodo.derecha, salida)
+    return salida
+
+
+def _ediciones(num_plies, num_ediciones, semilla=0):
+    rng = random.Random(semilla)
+    plies = [_JUGADAS[i % 8] for i in range(num_plies)]
+    textos = [_texto(plies)]
+    for _ in range(num_ediciones):
+        plies = list(plies)
+        plies[rng.randrange(len(plies))] = rng.choice(_JUGADAS)
+        textos.append(_texto(plies))
+    return textos
+
+
+def test_deshacer_y_rehacer_restauran_texto_y_arbol():
+    textos = _ediciones(200, 50)
+    historial = HistorialEdicion()
+    versiones = [historial.registrar(texto, Partida(texto)) for texto in textos]
+    assert len(historial) == len(textos)
+
+    for i in range(len(textos) - 2, -1, -1):
+        version = historial.deshacer()
+        assert version is versiones[i]
+        assert version.raiz is versiones[i].raiz
+        assert historial.texto_actual == textos[i]
+        assert list(map(str, version.partida().turnos)) == list(map(str, Partida(textos[i]).turnos))
+    assert historial.deshacer() is None
+    assert not historial.puede_deshacer()
+
+    for i in range(1, len(textos)):
+        version = historial.rehacer()
+        assert version.raiz is versiones[i].raiz
+        assert historial.texto_actual == textos[i]
+    assert historial.rehacer() is None
+
+
+def test_bloques_sin_cambios_se_comparten():
+    plies = [_JUGADAS[i % 8] for i in range(4 * TURNOS_POR_BLOQUE * 2)]
+    anterior = SecuenciaTurnos.desde_turnos(Partida(_texto(plies)).turnos)
+    plies[2 * TURNOS_POR_BLOQUE + 1] = "d5"  # Un ply del segundo bloque
+    nueva = SecuenciaTurnos.desde_turnos(Partida(_texto(plies)).turnos, anterior)
+
+    assert len(nueva.bloques) == 4
+    assert nueva.bloques_compartidos(anterior) == 3
+    assert nueva.bloques[1] is not anterior.bloques[1]
+    assert len(nueva) == len(nueva.turnos()) == 4 * TURNOS_POR_BLOQUE
+    assert nueva.turnos()[TURNOS_POR_BLOQUE].jugada_negra.san_string == "d5"
+
+
+def test_arbol_persistente_igual_que_uno_nuevo():
+    textos = _ediciones(120, 30, semilla=1) + [_texto(["e4", "e5"] * 10), _texto(["d4", "d5"] * 70)]
+    raiz_anterior = None
+    for texto in textos:
+        turnos = Partida(texto).turnos
+        raiz, creados = arbol_persistente(ArbolBinarioPartida().construir_arbol(turnos), raiz_anterior)
+        referencia = _valores(ArbolBinarioPartida().construir_arbol(turnos), {})
+        assert _valores(raiz, {}) == referencia
+        if raiz_anterior is None:
+            assert creados == len(referencia)
+        raiz_anterior = raiz
+
+
+def test_arbol_persistente_comparte_nodos():
+    plies = [_JUGADAS[i % 8] for i in range(200)]
+    anterior, _ = arbol_persistente(ArbolBinarioPartida().construir_arbol(Partida(_texto(plies)).turnos), None)
+    plies[150] = "e4"
+    raiz, creados = arbol_persistente(ArbolBinarioPartida().construir_arbol(Partida(_texto(plies)).turnos), anterior)
+    # Solo se crea el camino desde el nodo cambiado hasta la raíz.
+    assert creados <= 9
+    assert raiz is not anterior
+    assert raiz.izquierda is anterior.izquierda or raiz.derecha is anterior.derecha
+
+
+def test_registrar_tras_deshacer_descarta_rehacer():
+    textos = _ediciones(40, 3)
+    historial = HistorialEdicion()
+    versiones = [historial.registrar(texto, Partida(texto)) for texto in textos]
+    historial.guardar_layout(versiones[3], "layout de la versión 3")
+    historial.deshacer()
+    historial.deshacer()
+    assert historial.puede_rehacer()
+
+    texto = _texto(["e4", "e5"] * 20)
+    nueva = historial.registrar(texto, Partida(texto))
+    assert not historial.puede_rehacer()
+    assert historial.rehacer() is None
+    assert len(historial) == 3
+    assert historial.version_actual is nueva
+    assert historial.layout(versiones[3]) is None
+    assert historial.deshacer() is versiones[1]
+    assert historial.texto_actual == textos[1]
+
+
+def test_layouts_en_cache():
+    historial = HistorialEdicion(layouts_en_cache=2)
+    textos = _ediciones(20, 2)
+    versiones = [historial.registrar(texto, Partida(texto)) for texto in textos]
+    for n, version in enumerate(versiones):
+        historial.guardar_layout(version, n)
+    assert historial.layout(versiones[0]) is None
+    assert historial.layout(versiones[1]) == 1
+    assert historial.layout(versiones[2]) == 2
@@ -0,0 +1,119 @@
+# tests/test_indice.py
+
+import random
+
+import pytest
+
+from src.core.aperturas import normalizar_san
+from src.core.bnf_rules import obtener_reconocedor
+from src.core.partida import Partida
+from src.corpus.indice import IndiceJugadas
+from src.corpus.sintetico import GeneradorCorpus
+
+
+def _plies(partida):
+    """Ply -> jugada SAN normalizada de una partida válida (los turnos pueden no ser consecutivos)."""
+    plies = {}
+    for turno in partida.turnos:
+        plies[2 * (turno.numero_turno - 1)] = normalizar_san(turno.jugada_blanca.san_string)
+        if turno.jugada_negra:
+            plies[2 * (turno.numero_turno - 1) + 1] = normalizar_san(turno.jugada_negra.san_string)
+    return plies
+
+
+def _por_recorrido(partidas, jugadas, color=None, antes_del_turno=None, desde_turno=None):
+    """Misma consulta que IndiceJugadas.buscar, recorriendo las jugadas de cada partida."""
+    encontrados = []
+    for numero, partida in enumerate(partidas):
+        if not partida.es_valida_sintacticamente:
+            continue
+        plies = _plies(partida)
+        for ply in sorted(plies):
+            turno = ply // 2 + 1
+            if all(plies.get(ply + i) == normalizar_san(jugada) for i, jugada in enumerate(jugadas)) \
+                    and (color is None or ply % 2 == (color == "negras")) \
+                    and (antes_del_turno is None or turno < antes_del_turno) \
+                    and (desde_turno is None or turno >= desde_turno):
+                encontrados.append((numero, ply))
+    return encontrados
+
+
+@pytest.fixture(scope="module")
+def partidas():
+    textos = [t for t, _ in GeneradorCorpus(3, tasa_errores=0.05, plies_medio=40).partidas(3000)]
+    # Turnos no consecutivos: "e5 Nf3" no son jugadas consecutivas.
+    textos += ["1. e4 e5 5. Nf3 Nc6", "3. e4 e5 4. Nf3", "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6"]
+    return [Partida(t) for t in textos]
+
+
+@pytest.fixture(scope="module")
+def indice(partidas, tmp_path_factory):
+    # La mitad se indexa, se guarda y se carga de disco; el resto se añade al índice cargado.
+    indice = IndiceJugadas()
+    for partida in partidas[:1500]:
+        indice.agregar_partida(partida)
+    ruta = str(tmp_path_factory.mktemp("indice") / "indice.ajzi")
+    indice.guardar(ruta)
+    indice = IndiceJugadas.cargar(ruta)
+    for partida in partidas[1500:]:
+        indice.agregar_partida(partida)
+    return indice
+
+
+def _consultas(partidas):
+    rng = random.Random(5)
+    validas = [p for p in partidas if p.es_valida_sintacticamente]
+    consultas = [(["Qxf7#"], {}), (["0-0-0"], {"color": "negras", "antes_del_turno": 10}), (["e4", "e5"], {}),
+                 (["e5", "Nf3"], {}), (["0-0"], {"desde_turno": 12, "color": "blancas"}), (["Zz9"], {})]
+    for _ in range(60):
+        # Secuencias tomadas de partidas del corpus, para que tengan resultados.
+        plies = list(_plies(rng.choice(validas)).values())
+        k = rng.choice((1, 2, 3, 4, 5))
+        inicio = rng.randrange(max(len(plies) - k, 1))
+        filtros = rng.choice(({}, {"color": "blancas"}, {"color": "negras"}, {"antes_del_turno": 20},
+                              {"desde_turno": 5}))
+        consultas.append((plies[inicio:inicio + k], filtros))
+    return consultas
+
+
+def test_busqueda_igual_que_recorrido(partidas, indice):
+    assert len(indice) == len(partidas)
+    con_resultados = 0
+    for jugadas, filtros in _consultas(partidas):
+        esperado = _por_recorrido(partidas, jugadas, **filtros)
+        assert indice.buscar(jugadas, **filtros) == esperado, (jugadas, filtros)
+        assert indice.partidas_con(" ".join(jugadas), **filtros) == sorted({p for p, _ in esperado})
+        con_resultados += bool(esperado)
+    assert con_resultados > 30
+
+
+def test_turnos_no_consecutivos(partidas, indice):
+    ultima = len(partidas) - 1
+    assert (ultima - 2, 1) not in indice.buscar("e5 Nf3")
+    assert (ultima - 2, 8) in indice.buscar("Nf3 Nc6")
+    assert (ultima - 1, 4) in indice.buscar("e4 e5 Nf3")
+
+
+def test_cargar_archivo_que_no_es_un_indice(tmp_path):
+    ruta = tmp_path / "otro.ajzi"
+    ruta.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        IndiceJugadas.cargar(str(ruta))
+
+
+def test_enroques_y_sufijos_normalizados():
+    partidas = [Partida(texto) for texto in ("1. e4 e5 2. Qh5 Nc6 3. Bc4 Nf6 4. Qxf7#",
+                                             "1. d4 d5 2. Qd3 Qd6 3. Qxf7+ Kd8",
+                                             "1. d4 d5 2. Nc3 Nc6 3. Bf4 Bf5 4. Qd2 Qd7 5. 0-0-0 0-0-0")]
+    partidas.append(Partida("1. d4 d5 2. Nc3 Nc6 3. Bf4 Bf5 4. Qd2 Qd7 5. O-O-O O-O-O",
+                            obtener_reconocedor("enroque_o")))
+    indice = IndiceJugadas()
+    for partida in partidas:
+        assert partida.es_valida_sintacticamente
+        indice.agregar_partida(partida)
+
+    assert indice.partidas_con("Qxf7") == indice.partidas_con("Qxf7#") == [0, 1]
+    assert indice.buscar("Bc4 Nf6 Qxf7") == [(0, 4)]
+    assert indice.buscar("0-0-0") == indice.buscar("O-O-O") == [(2, 8), (2, 9), (3, 8), (3, 9)]
+    assert indice.buscar(["Qd7", "0-0-0", "O-O-O"]) == [(2, 7), (3, 7)]
+    assert len(indice.lista("0-0-0")) == 4
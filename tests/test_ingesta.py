@@ -0,0 +1,50 @@
+# tests/test_ingesta.py
+
+import bz2
+import gzip
+import lzma
+import threading
+
+import pytest
+
+from src.corpus.ingesta import leer_lineas_en_segundo_plano, leer_partidas_en_segundo_plano, validar_corpus
+from src.corpus.lectura import leer_partidas
+from src.corpus.sintetico import GeneradorCorpus
+
+_COMPRESORES = {"": None, ".gz": gzip, ".bz2": bz2, ".xz": lzma}
+
+
+@pytest.fixture(params=list(_COMPRESORES))
+def corpus(request, tmp_path):
+    textos = [t for t, _ in GeneradorCorpus(9, tasa_errores=0.1, plies_medio=20).partidas(300)]
+    textos.append("1. e4 ¿e5? 2. Nf3 «Nc6»")   # Caracteres de varios bytes partidos entre bloques
+    datos = ("\n\n".join(textos) + "\r\n\r\n").encode("utf-8")
+    modulo = _COMPRESORES[request.param]
+    ruta = tmp_path / f"corpus.txt{request.param}"
+    ruta.write_bytes(modulo.compress(datos) if modulo else datos)
+    return str(ruta)
+
+
+@pytest.mark.parametrize("tam_bloque", [7, 1 << 20])
+def test_igual_que_la_lectura_directa(corpus, tam_bloque):
+    esperadas = list(leer_partidas(corpus))
+    assert len(esperadas) == 301
+    assert list(leer_partidas_en_segundo_plano(corpus, tam_bloque=tam_bloque, bloques_en_cola=2)) == esperadas
+
+
+def test_validar_corpus_en_segundo_plano(corpus):
+    assert validar_corpus(corpus, en_segundo_plano=True) == validar_corpus(corpus, en_segundo_plano=False)
+
+
+def test_error_del_productor(tmp_path):
+    ruta = tmp_path / "roto.gz"
+    ruta.write_bytes(gzip.compress(b"1. e4 e5\n\n" * 1000)[:-40])
+    with pytest.raises(EOFError):
+        list(leer_lineas_en_segundo_plano(str(ruta), tam_bloque=64))
+
+
+def test_abandonar_la_lectura_detiene_el_productor(corpus):
+    lineas = leer_lineas_en_segundo_plano(corpus, tam_bloque=16, bloques_en_cola=1)
+    next(lineas)
+    lineas.close()
+    assert not any(hilo.name == "descompresion" for hilo in threading.enumerate())
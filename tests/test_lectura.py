@@ -0,0 +1,68 @@
+# tests/test_lectura.py
+
+import pytest
+
+from src.corpus.casi_duplicados import CorpusIndexado
+from src.corpus.lectura import indexar_partidas, leer_partida, leer_partidas
+from src.corpus.trabajos import TrabajoValidacion
+
+# Líneas que str.strip() y bytes.strip() no tratan igual, saltos '\r' sueltos y CRLF.
+CORPUS = (
+    "1. e4 e5 2. Nf3 Nc6\n"
+    "\n"
+    "1. d4 d5\n"
+    " \n"                # Espacio duro: no es una línea en blanco
+    "2. c4 e6\n"
+    " \t \n"
+    "1. c4 e5\r\n"
+    "\x1c\r\n"                # Separador de archivo: tampoco es blanco ASCII
+    "2. Nc3 Nf6\r\n"
+    "\r\n"
+    "\r\n"
+    "1. Nf3 d5\r2. g3 c5\n"   # '\r' suelto dentro de una línea
+    " 　\n"
+    "1. e4 c5 \n"
+    "\n"
+)
+
+
+@pytest.fixture
+def ruta_corpus(tmp_path):
+    ruta = tmp_path / "corpus.txt"
+    ruta.write_bytes(CORPUS.encode("utf-8"))
+    return str(ruta)
+
+
+def test_indice_y_recorrido_coinciden(ruta_corpus):
+    textos = list(leer_partidas(ruta_corpus))
+    inicios, fines = indexar_partidas(ruta_corpus)
+    with open(ruta_corpus, "rb") as archivo:
+        sueltas = [leer_partida(archivo, inicio, fin) for inicio, fin in zip(inicios, fines)]
+    assert sueltas == textos
+    assert len(textos) == 4
+    assert textos[1] == "1. d4 d5\n \n2. c4 e6"
+
+
+def test_corpus_indexado_recorrido_y_acceso(ruta_corpus):
+    with CorpusIndexado(ruta_corpus) as corpus:
+        recorridas = list(corpus)
+        assert len(recorridas) == len(corpus)
+        assert [corpus[i] for i in range(len(corpus))] == recorridas
+
+
+def test_trabajo_sin_partidas_duplicadas(ruta_corpus, tmp_path):
+    trabajo = TrabajoValidacion(ruta_corpus, str(tmp_path / "trabajo"), partidas_por_fragmento=1)
+    resumen = trabajo.ejecutar(procesos=1)
+    assert resumen["completo"]
+    assert resumen["partidas_procesadas"] == resumen["partidas"] == 4
+    assert [r["partida"] for r in trabajo.resultados()] == [0, 1, 2, 3]
+
+
+def test_indexar_comprimido(tmp_path):
+    import gzip
+    ruta = tmp_path / "corpus.txt.gz"
+    with gzip.open(ruta, "wb") as archivo:
+        archivo.write(CORPUS.encode("utf-8"))
+    assert len(list(leer_partidas(str(ruta)))) == 4
+    with pytest.raises(ValueError):
+        indexar_partidas(str(ruta))
@@ -0,0 +1,65 @@
+# tests/test_limites.py
+
+import random
+import time
+
+import pytest
+
+from src.core.limites import LimiteExcedido, LimitesValidacion
+from src.core.partida import Partida
+from tests.test_partida import _texto_aleatorio
+
+
+def _resultado(partida):
+    return (partida.es_valida_sintacticamente, partida.obtener_primer_error(), partida.posicion_error,
+            [(t.numero_turno, t.jugada_blanca.san_string, t.jugada_negra and t.jugada_negra.san_string)
+             for t in partida.turnos])
+
+
+@pytest.mark.parametrize("semilla", range(3))
+def test_modo_endurecido_mismo_resultado_dentro_de_los_limites(semilla):
+    # Sin superar ningún límite, el analizador sin retroceso da los mismos resultados.
+    rng = random.Random(semilla)
+    limites = LimitesValidacion(presupuesto_segundos=None)
+    for _ in range(5000):
+        texto = _texto_aleatorio(rng)
+        assert _resultado(Partida(texto, limites=limites)) == _resultado(Partida(texto)), texto
+
+
+@pytest.mark.parametrize("texto, limites, limite, posicion", [
+    ("1. e4 e5" + " " * 100, LimitesValidacion(max_bytes=100), "bytes", None),
+    ("1. e4 " + "é" * 60, LimitesValidacion(max_bytes=100), "bytes", None),   # 126 bytes UTF-8 en 66 caracteres
+    ("1. e4 " + "e" * 33, LimitesValidacion(), "longitud_token", 6),
+    ("1" * 40 + ". e4", LimitesValidacion(), "longitud_token", 0),
+    ("1. e4 e5 2. d4 d5 3. c4", LimitesValidacion(max_turnos=2), "turnos", 18),
+])
+def test_limite_excedido(texto, limites, limite, posicion):
+    with pytest.raises(LimiteExcedido) as excepcion:
+        Partida(texto, limites=limites)
+    assert excepcion.value.limite == limite
+    assert excepcion.value.posicion == posicion
+    assert excepcion.value.a_dict()["limite"] == limite
+
+
+def test_en_el_limite_se_acepta():
+    assert Partida("1. " + "e" * 32, limites=LimitesValidacion()).error_parseo_general is not None
+    assert Partida("1. e4 e5 2. d4", limites=LimitesValidacion(max_turnos=2)).es_valida_sintacticamente
+    LimitesValidacion(max_bytes=8).comprobar_tamano(b"12345678")
+    LimitesValidacion(max_bytes=None).comprobar_tamano("x" * 10_000_000)
+
+
+def test_presupuesto_de_tiempo():
+    texto = " ".join(f"{n}. e4 e5" for n in range(1, 200_001))
+    limites = LimitesValidacion(max_bytes=None, max_turnos=None, presupuesto_segundos=0.01)
+    with pytest.raises(LimiteExcedido) as excepcion:
+        Partida(texto, limites=limites)
+    assert excepcion.value.limite == "tiempo"
+
+
+def test_entrada_hostil_se_rechaza_deprisa():
+    limites = LimitesValidacion(max_bytes=None)
+    inicio = time.perf_counter()
+    for hostil in ("1. " + "e" * 5_000_000, "1" * 3_000_000 + ". e4"):
+        with pytest.raises(LimiteExcedido):
+            Partida(hostil, limites=limites)
+    assert time.perf_counter() - inicio < 0.5
@@ -0,0 +1,115 @@
+# tests/test_monitor_pintado.py
+
+import json
+
+import pytest
+
+from src.ui import monitor_pintado
+from src.ui.monitor_pintado import MonitorPintado
+
+
+class _Region:
+    """Lo que usa MonitorPintado de un QRect."""
+
+    def __init__(self, x, y, ancho, alto):
+        self._valores = (x, y, ancho, alto)
+
+    def x(self):
+        return self._valores[0]
+
+    def y(self):
+        return self._valores[1]
+
+    def width(self):
+        return self._valores[2]
+
+    def height(self):
+        return self._valores[3]
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    """Reloj manual: cada fotograma dura 'duracion' segundos a partir de 'ahora'."""
+    estado = {"ahora": 0.0}
+    monkeypatch.setattr(monitor_pintado.time, "perf_counter", lambda: estado["ahora"])
+    return estado
+
+
+def _fotograma(monitor, reloj, inicio, duracion=0.004, nodos=0, solo_overlay=False):
+    reloj["ahora"] = inicio
+    monitor.iniciar_fotograma(solo_overlay)
+    monitor.nodos_dibujados = monitor.nodos_en_region = monitor.nodos_total = nodos
+    reloj["ahora"] = inicio + duracion
+    monitor.terminar_fotograma(_Region(0, 0, 800, 600))
+
+
+def test_terminar_fotograma(reloj):
+    monitor = MonitorPintado()
+    monitor.registrar_layout(0.0125)
+    reloj["ahora"] = 10.0
+    monitor.iniciar_fotograma()
+    monitor.nodos_dibujados, monitor.nodos_en_region, monitor.nodos_total = 30, 12, 40
+    monitor.aristas_dibujadas, monitor.aristas_en_region, monitor.aristas_total = 29, 11, 39
+    monitor.set_minimum_size_fotograma = 1
+    reloj["ahora"] = 10.003
+    monitor.terminar_fotograma(_Region(5, 6, 7, 8))
+
+    assert monitor.fotogramas == 1
+    assert monitor.ultimo_pintado_ms == pytest.approx(3.0)
+    assert monitor.set_minimum_size_en_pintado == 1
+    assert list(monitor.traza) == [{
+        "t": 10.003, "pintado_ms": 3.0, "layout_ms": 12.5, "region": [5, 6, 7, 8],
+        "nodos": [30, 12, 40], "aristas": [29, 11, 39], "set_minimum_size": 1,
+    }]
+    assert monitor.lineas_overlay()[1] == "nodos: 30 dibujados / 12 en región / 40 total"
+
+
+def test_fps_del_ultimo_segundo(reloj):
+    monitor = MonitorPintado()
+    for inicio in (0.0, 0.3, 0.6, 0.9):
+        _fotograma(monitor, reloj, inicio)
+    assert monitor.fps == 4
+    _fotograma(monitor, reloj, 1.5)   # Los fotogramas de 0.0 y 0.3 quedan fuera del último segundo
+    assert monitor.fps == 3
+    _fotograma(monitor, reloj, 5.0)
+    assert monitor.fps == 1
+    assert monitor.fotogramas == 6
+
+
+def test_traza_circular(reloj):
+    monitor = MonitorPintado(max_registros=3)
+    for n in range(5):
+        _fotograma(monitor, reloj, float(n), nodos=n)
+    assert [registro["nodos"][0] for registro in monitor.traza] == [2, 3, 4]
+    assert monitor.fotogramas == 5
+
+
+def test_volcar_traza(reloj, tmp_path):
+    ruta = tmp_path / "traza.jsonl"
+    monitor = MonitorPintado(max_registros=4, ruta_traza=str(ruta), intervalo_volcado=3)
+    for n in range(2):
+        _fotograma(monitor, reloj, float(n), nodos=n)
+    assert not ruta.exists()
+    _fotograma(monitor, reloj, 2.0, nodos=2)   # Tercer fotograma: volcado automático
+    assert [json.loads(linea) for linea in ruta.read_text(encoding="utf-8").splitlines()] == list(monitor.traza)
+
+    for n in range(3, 6):
+        _fotograma(monitor, reloj, float(n), nodos=n)
+    otra = tmp_path / "otra.jsonl"
+    monitor.volcar_traza(str(otra))
+    registros = [json.loads(linea) for linea in otra.read_text(encoding="utf-8").splitlines()]
+    assert [registro["nodos"][0] for registro in registros] == [2, 3, 4, 5]
+    MonitorPintado().volcar_traza()   # Sin ruta no escribe nada
+
+
+def test_repintado_del_overlay_no_cuenta(reloj):
+    monitor = MonitorPintado()
+    _fotograma(monitor, reloj, 0.0, duracion=0.010, nodos=50)
+    _fotograma(monitor, reloj, 0.02, duracion=0.001, nodos=2, solo_overlay=True)
+
+    assert monitor.fotogramas == 1
+    assert monitor.fps == 1
+    assert monitor.ultimo_pintado_ms == pytest.approx(10.0)
+    assert monitor.lineas_overlay()[1] == "nodos: 50 dibujados / 50 en región / 50 total"
+    assert [registro.get("solo_overlay", False) for registro in monitor.traza] == [False, True]
+    assert monitor.traza[1]["nodos"] == [2, 2, 2]
@@ -0,0 +1,68 @@
+# tests/test_movimiento.py
+import pytest
+
+from src.core.bnf_rules import GramaticaBNF, obtener_reconocedor
+from src.core.movimiento import Movimiento
+
+VALIDAS = [
+    ("0-0", "enroque"), ("0-0-0", "enroque"),
+    ("e4", "peon_avance"), ("e8=Q", "peon_avance"), ("e8=Q#", "peon_avance"), ("h1+", "peon_avance"),
+    ("exd5", "peon_captura"), ("exd8=N+", "peon_captura"),
+    ("Nf3", "movimiento_pieza"), ("Nbd7", "movimiento_pieza"), ("R1e2", "movimiento_pieza"),
+    ("Qa1xb2=Q#", "movimiento_pieza"), ("Qxe6+", "movimiento_pieza"), ("Kh8", "movimiento_pieza"),
+]
+
+INVALIDAS = ["", "   ", "e9", "i4", "O-O", "0-0+", "0-0-0-0", "Pe4", "exd", "ex", "e4=", "e4=K+#",
+             "Ka1xb2=Q#+", "Nf3!", "e4\x00", "e 4", "xe4", "Nxx4", "N", "e8Q", "9"]
+
+
+@pytest.mark.parametrize("san, regla", VALIDAS)
+def test_jugadas_validas_con_su_regla(san, regla):
+    movimiento = Movimiento(san)
+    assert movimiento.es_valido
+    assert movimiento.regla == regla
+
+
+@pytest.mark.parametrize("san", INVALIDAS)
+def test_jugadas_invalidas(san):
+    movimiento = Movimiento(san)
+    assert not movimiento.es_valido
+    assert movimiento.tipo_error
+
+
+def test_recorta_espacios():
+    assert Movimiento("  Nf3 \n").san_string == "Nf3"
+    assert Movimiento("  Nf3 \n").es_valido
+
+
+def test_dialecto_enroque_o():
+    reconocedor = obtener_reconocedor("enroque_o")
+    assert Movimiento("O-O-O", reconocedor).regla == "enroque"
+    assert not Movimiento("0-0", reconocedor).es_valido
+
+
+def test_dialecto_desconocido():
+    with pytest.raises(ValueError):
+        obtener_reconocedor("no_existe")
+
+
+def test_compilar_sin_cache_da_el_mismo_reconocedor():
+    reconocedor = GramaticaBNF.desde_archivo().compilar(usar_cache=False)
+    for san, regla in VALIDAS:
+        assert reconocedor.reconocer(san) == regla
+    for san in INVALIDAS:
+        assert reconocedor.reconocer(san.strip()) is None
+
+
+def test_longitud_maxima_de_la_gramatica():
+    assert obtener_reconocedor().longitud_maxima == max(len(san) for san, _ in VALIDAS) == 9
+    assert obtener_reconocedor("anotaciones").longitud_maxima == 11
+
+
+def test_no_guarda_veredictos_de_tokens_largos():
+    reconocedor = GramaticaBNF.desde_archivo().compilar(usar_cache=False)
+    enormes = ["e4" + "x" * (1 << 16) + str(n) for n in range(20)]
+    assert all(reconocedor.reconocer(token) is None for token in enormes)
+    assert reconocedor.reconocer("Qa1xb2=Q#") == "movimiento_pieza"
+    assert reconocedor.reconocer("Qa1xb2=Q#+") is None
+    assert set(reconocedor._veredictos) == {"Qa1xb2=Q#"}
@@ -0,0 +1,82 @@
+# tests/test_paralelo.py
+
+import threading
+import time
+
+import pytest
+
+from src.corpus.estadisticas import EstadisticasPartidas, _estadisticas_de_lote
+from src.corpus.lectura import en_lotes
+from src.corpus.paralelo import _validar_lote, procesar_en_hilos, procesar_en_paralelo, validar_partidas
+from src.corpus.sintetico import GeneradorCorpus
+
+
+@pytest.fixture(scope="module")
+def textos():
+    return [texto for texto, _ in GeneradorCorpus(semilla=3, tasa_errores=0.2).partidas(600)]
+
+
+@pytest.fixture(scope="module")
+def veredictos(textos):
+    return [p.es_valida_sintacticamente for p in _validar_lote(textos)]
+
+
+@pytest.mark.parametrize("hilos", [1, 2, 4])
+def test_validar_partidas_igual_que_en_serie(textos, veredictos, hilos):
+    partidas = list(validar_partidas(iter(textos), hilos=hilos, tam_lote=37))
+    assert [p.texto_original for p in partidas] == textos
+    assert [p.es_valida_sintacticamente for p in partidas] == veredictos
+    assert True in veredictos and False in veredictos
+
+
+def test_procesar_en_hilos_mantiene_el_orden():
+    def lento(lote):
+        time.sleep(0.001 * (lote % 3))   # Los lotes terminan desordenados
+        return lote
+    assert list(procesar_en_hilos(lento, range(50), hilos=4, lotes_en_vuelo=6)) == list(range(50))
+
+
+def test_procesar_en_hilos_consume_bajo_demanda():
+    consumidos = []
+
+    def lotes():
+        for n in range(1000):
+            consumidos.append(n)
+            yield n
+
+    resultados = procesar_en_hilos(lambda lote: lote, lotes(), hilos=2, lotes_en_vuelo=4)
+    assert next(resultados) == 0
+    assert len(consumidos) <= 4
+    resultados.close()
+
+
+def test_abandonar_el_generador_cancela_el_trabajo():
+    llamadas = []
+    candado = threading.Lock()
+
+    def lento(lote):
+        with candado:
+            llamadas.append(lote)
+        time.sleep(0.02)
+        return lote
+
+    resultados = procesar_en_hilos(lento, range(200), hilos=2, lotes_en_vuelo=8)
+    assert next(resultados) == 0
+    resultados.close()   # Espera a los lotes en curso y cancela los que no han empezado
+    assert len(llamadas) < 10
+
+
+def test_procesar_en_paralelo_con_procesos(textos, veredictos):
+    # Sin orden garantizado: se comparan los totales y el conjunto de resultados.
+    total = EstadisticasPartidas()
+    for parciales in procesar_en_paralelo(_estadisticas_de_lote, en_lotes(textos, 50), procesos=2):
+        total.combinar(parciales)
+    assert total.partidas_validas == sum(veredictos)
+    assert total.partidas_invalidas == len(veredictos) - sum(veredictos)
+
+    tamanos = list(procesar_en_paralelo(len, en_lotes(textos, 50), procesos=2, lotes_en_vuelo=3))
+    assert sorted(tamanos) == sorted(len(lote) for lote in en_lotes(textos, 50))
+
+
+def test_procesar_en_paralelo_un_proceso_en_orden():
+    assert list(procesar_en_paralelo(len, [[1], [1, 2], [1, 2, 3]], procesos=1)) == [1, 2, 3]
@@ -0,0 +1,110 @@
+# tests/test_partida.py
+import random
+import re
+
+import pytest
+
+from src.core.partida import Partida, texto_canonico
+from src.core.turno import Turno
+
+# Analizador de la versión original de Partida (normalizar con re.sub y recorrer los turnos
+# con una expresión regular), como referencia para la prueba diferencial del analizador léxico.
+_PATRON_TURNO_ORIGINAL = re.compile(r"(\d+)\.\s*([^\s]+)(?:\s+([^\s]+))?")
+
+
+def _es_valida_original(san_completa):
+    san = san_completa.strip() if san_completa else ""
+    if not san:
+        return False
+    limpia = re.sub(r'\s*\.\s*', '. ', san)
+    limpia = re.sub(r'\s+', ' ', limpia).strip()
+    posicion = 0
+    turnos = []
+    for match in _PATRON_TURNO_ORIGINAL.finditer(limpia):
+        if match.start() != posicion and limpia[posicion:match.start()].strip():
+            return False
+        try:
+            numero = int(match.group(1))
+            if turnos and numero <= turnos[-1].numero_turno:
+                return False
+            turno = Turno(numero, match.group(2), match.group(3))
+        except ValueError:
+            return False
+        turnos.append(turno)
+        if not turno.es_valido:
+            return False
+        posicion = match.end()
+    if posicion < len(limpia) and limpia[posicion:].strip():
+        return False
+    return bool(turnos)
+
+
+_PIEZAS_TEXTO = ["1.", "2.", "3.", "1 .", "2 .", "10.", "1.e4", "2.d4", "e4", "e5", "Nf3", "0-0", "zz", ".",
+                 "...", "e4.", "1..", "2...", "x", "\n", "  ", "01.", "e4+", "4."]
+
+
+def _texto_aleatorio(rng):
+    if rng.random() < 0.5:
+        # Partida casi bien formada: turnos con una o dos jugadas, números repetidos o saltados.
+        partes = []
+        numero = 1
+        for _ in range(rng.randint(1, 5)):
+            partes.append(f"{numero}.")
+            partes.append(rng.choice(["e4", "Nf3", "d4"]))
+            if rng.random() < 0.7:
+                partes.append(rng.choice(["e5", "Nc6"]))
+            numero += rng.choice([1, 1, 1, 0, 2])
+        if rng.random() < 0.3:
+            partes.insert(rng.randrange(len(partes) + 1), rng.choice(_PIEZAS_TEXTO))
+        return rng.choice([" ", "  ", "\n"]).join(partes)
+    return rng.choice(["", " ", "  "]).join(rng.choice(_PIEZAS_TEXTO) + rng.choice(["", " "])
+                                           for _ in range(rng.randint(1, 8)))
+
+
+@pytest.mark.parametrize("semilla", range(4))
+def test_mismo_veredicto_que_el_analizador_original(semilla):
+    rng = random.Random(semilla)
+    distintos = []
+    for _ in range(25000):
+        texto = _texto_aleatorio(rng)
+        if Partida(texto).es_valida_sintacticamente != _es_valida_original(texto):
+            distintos.append(texto)
+    assert distintos == []
+
+
+@pytest.mark.parametrize("texto", ["1. e4 2. d4 d5", "1. e4 2. e4", "1.e4 2.d4", "1. e4 e5 2. Nf3 3. d4"])
+def test_solo_el_ultimo_turno_puede_no_tener_jugada_negra(texto):
+    partida = Partida(texto)
+    assert not partida.es_valida_sintacticamente
+    assert "Falta la jugada negra" in partida.obtener_primer_error()
+
+
+def test_turno_final_sin_jugada_negra():
+    partida = Partida("1. e4 e5\n2. Nf3")
+    assert partida.es_valida_sintacticamente
+    assert [t.jugada_negra is None for t in partida.turnos] == [False, True]
+
+
+def test_posicion_del_error_en_el_texto_original():
+    texto = "1. e4 e5\n2.  Nf3 zz9"
+    partida = Partida(texto)
+    assert not partida.es_valida_sintacticamente
+    assert partida.posicion_error == texto.index("zz9")
+    assert "(línea 2, columna 9)" in partida.obtener_primer_error()
+
+
+@pytest.mark.parametrize("texto, error", [
+    ("", "vacía"), ("e4 e5", "Texto inesperado"), ("1. e4 e5 Nf3", "Texto inesperado"),
+    ("2. e4 e5 1. d4", "secuencia"), ("1.", "Texto inesperado al final"),
+])
+def test_errores_generales(texto, error):
+    partida = Partida(texto)
+    assert not partida.es_valida_sintacticamente
+    assert error in partida.obtener_primer_error()
+
+
+def test_texto_canonico_y_huella():
+    a = Partida("1.e4   e5\n2 . Nf3")
+    b = Partida("1. e4 e5 2. Nf3")
+    assert a.texto_canonico() == "1. e4 e5 2. Nf3" == texto_canonico("01.e4 e5 2 .Nf3")
+    assert a.huella() == b.huella()
@@ -0,0 +1,119 @@
+# tests/test_pgn.py
+
+import io
+
+import pytest
+
+from src.core.pgn import PartidaPGN, leer_pgn, turno_inicial_fen
+
+FEN_NEGRAS_12 = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 2 12"
+
+
+def _colores(pgn):
+    return [(nodo.numero, nodo.valor) for nodo in pgn.arbol.recorrer()]
+
+
+def test_partida_normal():
+    pgn = PartidaPGN({}, "1. e4 e5 2. Nf3 Nc6 (2... d6 3. d4) 3. Bb5 1-0")
+    assert pgn.es_valida
+    assert _colores(pgn) == [("1.", "e4"), ("1...", "e5"), ("2.", "Nf3"), ("2...", "Nc6"),
+                             ("3.", "Bb5"), ("2...", "d6"), ("3.", "d4")]
+    partida = pgn.partida_principal()
+    assert [t.numero_turno for t in partida.turnos] == [1, 2, 3]
+
+
+def test_fen_con_negras():
+    pgn = PartidaPGN({"SetUp": "1", "FEN": FEN_NEGRAS_12}, "12... Nf6 13. d3 Bc5 *")
+    assert pgn.es_valida, pgn.errores
+    assert _colores(pgn) == [("12...", "Nf6"), ("13.", "d3"), ("13...", "Bc5")]
+    # Una Partida no puede empezar con una jugada negra.
+    assert pgn.partida_principal() is None
+
+
+def test_fen_con_blancas():
+    fen = FEN_NEGRAS_12.replace(" b ", " w ")
+    pgn = PartidaPGN({"SetUp": "1", "FEN": fen}, "12. d3 Nf6 13. c3 *")
+    assert pgn.es_valida, pgn.errores
+    partida = pgn.partida_principal()
+    assert [t.numero_turno for t in partida.turnos] == [12, 13]
+    assert partida.turnos[0].jugada_negra.san_string == "Nf6"
+
+
+def test_fragmento_que_empieza_con_negras():
+    pgn = PartidaPGN({}, "5... Nf6 6. d3 (6. c3 d5) 6... Bc5 *")
+    assert pgn.es_valida, pgn.errores
+    assert _colores(pgn) == [("5...", "Nf6"), ("6.", "d3"), ("6...", "Bc5"), ("6.", "c3"), ("6...", "d5")]
+
+
+def test_variante_de_negras_con_numero_separado():
+    pgn = PartidaPGN({}, "1. e4 e5 (1. ... c5 2. Nf3) 2. Nf3 *")
+    assert pgn.es_valida, pgn.errores
+    assert ("1...", "c5") in _colores(pgn)
+
+
+@pytest.mark.parametrize("etiquetas, texto", [
+    ({}, "1. e4 2. e5 *"),                                    # e5 es la jugada negra del turno 1
+    ({}, "1. e4 e5 3. Nf3 *"),
+    ({}, "1. e4 e5 (1... c5 2... Nf3) *"),
+    ({"SetUp": "1", "FEN": FEN_NEGRAS_12}, "12. d3 *"),      # El FEN dice que juegan las negras
+    ({"SetUp": "1", "FEN": FEN_NEGRAS_12}, "1. e4 *"),
+])
+def test_numero_que_no_corresponde(etiquetas, texto):
+    pgn = PartidaPGN(etiquetas, texto)
+    assert not pgn.es_valida
+    assert "Número de jugada" in pgn.obtener_primer_error()
+
+
+@pytest.mark.parametrize("etiquetas", [
+    {"SetUp": "1"},
+    {"SetUp": "1", "FEN": "8/8/8/8/8/8/8/8"},
+    {"SetUp": "1", "FEN": "8/8/8/8/8/8/8/8 x - - 0 1"},
+    {"SetUp": "1", "FEN": "8/8/8/8/8/8/8/8 w - - 0 0"},
+])
+def test_etiquetas_de_posicion_invalidas(etiquetas):
+    assert not PartidaPGN(etiquetas, "1. e4 *").es_valida
+
+
+def test_setup_0_ignora_el_fen():
+    pgn = PartidaPGN({"SetUp": "0", "FEN": FEN_NEGRAS_12}, "1. e4 e5 *")
+    assert pgn.es_valida
+
+
+def test_turno_inicial_fen():
+    assert turno_inicial_fen(FEN_NEGRAS_12) == (12, True)
+    assert turno_inicial_fen("8/8/8/8/8/8/8/8 w - -") == (1, False)
+    with pytest.raises(ValueError):
+        turno_inicial_fen("8/8/8/8/8/8/8/8")
+
+
+def test_leer_pgn_con_fen():
+    texto = f'[Event "?"]\n[SetUp "1"]\n[FEN "{FEN_NEGRAS_12}"]\n\n12... Nf6 13. d3 1-0\n\n' \
+            '[Event "?"]\n\n1. d4 d5 *\n'
+    partidas = list(leer_pgn(io.StringIO(texto)))
+    assert [p.es_valida for p in partidas] == [True, True]
+    assert partidas[0].arbol.linea_principal()[0].numero == "12..."
+    assert partidas[1].arbol.linea_principal()[0].numero == "1."
+
+
+def test_imprimir_arbol_variantes():
+    pgn = PartidaPGN({}, "1. e4 e5 (1... c5 2. Nf3 (2. c3 d5) 2... d6) 2. Nf3 *")
+    salida = io.StringIO()
+    pgn.arbol.imprimir_arbol_consola(estilo="ascii", salida=salida)
+    assert salida.getvalue() == (
+        "Partida\n"
+        "|-- 1.: e4\n"
+        "|-- 1...: e5\n"
+        "|   `-- 1...: c5\n"
+        "|       |-- 2.: Nf3\n"
+        "|       |   `-- 2.: c3\n"
+        "|       |       `-- 2...: d5\n"
+        "|       `-- 2...: d6\n"
+        "`-- 2.: Nf3\n"
+    )
+    assert pgn.arbol.a_texto(profundidad_max=1, estilo="ascii") == (
+        "Partida\n"
+        "|-- 1.: e4\n"
+        "|-- 1...: e5\n"
+        "|   `-- ... (5 nodos más)\n"
+        "`-- 2.: Nf3\n"
+    )
@@ -0,0 +1,80 @@
+# tests/test_resaltador_san.py
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from src.ui.resaltador_san import posiciones_utf16  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    import os
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+@pytest.fixture
+def documento(app):
+    from PyQt5.QtGui import QTextDocument
+    from src.ui.resaltador_san import ResaltadorSAN
+
+    class ResaltadorContado(ResaltadorSAN):
+        def highlightBlock(self, texto):
+            self.bloques.append(texto)
+            super().highlightBlock(texto)
+
+    documento = QTextDocument()
+    documento.documentLayout()  # como en un QTextEdit: sin layout, Qt no avisa de los cambios
+    resaltador = ResaltadorContado(documento)
+    # Qt aplaza el primer resaltado tras asociar el resaltador al documento.
+    app.processEvents()
+    resaltador.bloques = []
+    documento.resaltador = resaltador
+    return documento
+
+
+def _formatos(documento, resaltador, numero_bloque):
+    """Lista (inicio, longitud, tipo) de los formatos aplicados a un bloque."""
+    tipos = {resaltador.formato_turno.foreground().color().name(): "turno",
+             resaltador.formato_valida.foreground().color().name(): "valida",
+             resaltador.formato_invalida.foreground().color().name(): "invalida"}
+    bloque = documento.findBlockByNumber(numero_bloque)
+    return [(rango.start, rango.length, tipos[rango.format.foreground().color().name()])
+            for rango in bloque.layout().formats()]
+
+
+def test_posiciones_utf16():
+    assert posiciones_utf16("1. e4 e5") is None
+    assert posiciones_utf16("1. ñ e4") is None
+    assert posiciones_utf16("\U0001F600 e4") == [0, 2, 3, 4, 5]
+
+
+def test_formatos_por_bloque(documento):
+    resaltador = documento.resaltador
+    documento.setPlainText("1. e4 e5\n2. Nf3 Zz9")
+    assert _formatos(documento, resaltador, 0) == [(0, 2, "turno"), (3, 2, "valida"), (6, 2, "valida")]
+    assert _formatos(documento, resaltador, 1) == [(0, 2, "turno"), (3, 3, "valida"), (7, 3, "invalida")]
+
+
+def test_editar_un_bloque_no_resalta_los_demas(documento):
+    from PyQt5.QtGui import QTextCursor
+    resaltador = documento.resaltador
+    documento.setPlainText("\n".join(f"{n}. e4 e5" for n in range(1, 21)))
+    resaltador.bloques.clear()
+    cursor = QTextCursor(documento.findBlockByNumber(10))
+    cursor.movePosition(QTextCursor.EndOfBlock)
+    cursor.insertText("x")
+    assert resaltador.bloques == ["11. e4 e5x"]
+    assert _formatos(documento, resaltador, 10)[-1] == (7, 3, "invalida")
+    assert _formatos(documento, resaltador, 11)[-1] == (7, 2, "valida")
+
+
+def test_caracteres_fuera_del_plano_basico(documento):
+    resaltador = documento.resaltador
+    documento.setPlainText("\U0001F600\U0001F600 1. e4 Zz9")
+    # Cada emoji ocupa dos posiciones UTF-16, y los emojis forman una jugada (inválida).
+    assert _formatos(documento, resaltador, 0) == [(0, 4, "invalida"), (5, 2, "turno"),
+                                                   (8, 2, "valida"), (11, 3, "invalida")]
@@ -0,0 +1,43 @@
+# tests/test_sintetico.py
+
+import pytest
+
+from src.core.partida import Partida
+from src.corpus.lectura import descompresor_de, leer_partidas
+from src.corpus.sintetico import GeneradorCorpus
+
+
+def _contenido(ruta):
+    # Texto descomprimido: la cabecera gzip guarda el nombre y la fecha del archivo.
+    modulo = descompresor_de(ruta)
+    with (modulo.open(ruta, "rb") if modulo else open(ruta, "rb")) as archivo:
+        return archivo.read()
+
+
+def test_etiqueta_coincide_con_la_validacion():
+    # Cada partida normal (o "larga") es válida; cada error o token enorme la invalida.
+    generador = GeneradorCorpus(1, tasa_errores=0.3, tasa_patologicas=0.002, plies_partida_larga=2000,
+                                longitud_token_enorme=10000, prob_promocion=0.05)
+    vistas = set()
+    for texto, etiqueta in generador.partidas(5000):
+        partida = Partida(texto)
+        assert partida.es_valida_sintacticamente == (etiqueta in (None, "larga")), \
+            (etiqueta, partida.obtener_primer_error())
+        vistas.add(etiqueta)
+    assert vistas == {None, "casilla", "residual", "secuencia", "larga", "token_enorme"}
+
+
+def test_misma_semilla_mismo_corpus():
+    assert [t for t, _ in GeneradorCorpus(7).partidas(50)] == [t for t, _ in GeneradorCorpus(7).partidas(50)]
+    assert [t for t, _ in GeneradorCorpus(7).partidas(50)] != [t for t, _ in GeneradorCorpus(8).partidas(50)]
+
+
+@pytest.mark.parametrize("extension", ["", ".gz", ".bz2", ".xz"])
+def test_escribir_es_reproducible_y_legible(tmp_path, extension):
+    rutas = [str(tmp_path / f"corpus{n}.txt{extension}") for n in (1, 2)]
+    etiquetas = [GeneradorCorpus(3, tasa_errores=0.1).escribir(ruta, 1500, partidas_por_bloque=400) for ruta in rutas]
+    assert _contenido(rutas[0]) == _contenido(rutas[1])
+    assert etiquetas[0] == etiquetas[1]
+    assert sum(etiquetas[0].values()) == 1500
+    esperados = [t for t, _ in GeneradorCorpus(3, tasa_errores=0.1).partidas(1500)]
+    assert list(leer_partidas(rutas[0])) == esperados
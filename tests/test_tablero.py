@@ -0,0 +1,110 @@
+# tests/test_tablero.py
+import pytest
+
+from src.core.partida import Partida
+from src.core.reproduccion import ReproduccionPartida
+from src.core.tablero import Tablero
+
+_FEN_INICIAL = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+
+def _fen_tras(jugadas):
+    tablero = Tablero()
+    for san in jugadas.split():
+        tablero.aplicar_san(san)
+    return tablero.fen()
+
+
+def test_posicion_inicial():
+    assert Tablero().fen() == _FEN_INICIAL
+
+
+@pytest.mark.parametrize("jugadas, fen", [
+    # Enroque corto de los dos bandos.
+    ("e4 e5 Nf3 Nf6 Be2 Be7 O-O O-O",
+     "rnbq1rk1/ppppbppp/5n2/4p3/4P3/5N2/PPPPBPPP/RNBQ1RK1 w - - 6 5"),
+    # Enroque largo de los dos bandos (con ceros).
+    ("d4 d5 Nc3 Nc6 Bf4 Bf5 Qd2 Qd7 0-0-0 0-0-0",
+     "2kr1bnr/pppqpppp/2n5/3p1b2/3P1B2/2N5/PPPQPPPP/2KR1BNR w - - 8 6"),
+    # Avance doble junto a un peón rival: casilla de captura al paso.
+    ("e4 a6 e5 d5",
+     "rnbqkbnr/1pp1pppp/p7/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 3"),
+    # Captura al paso: desaparece el peón de d5.
+    ("e4 a6 e5 d5 exd6",
+     "rnbqkbnr/1pp1pppp/p2P4/8/8/8/PPPP1PPP/RNBQKBNR b KQkq - 0 3"),
+    # Promoción capturando la torre de a8: las negras pierden el enroque largo.
+    ("a4 b5 axb5 a6 bxa6 Bb7 axb7 Nc6 bxa8=Q+",
+     "Q2qkbnr/2pppppp/2n5/8/8/8/1PPPPPPP/RNBQKBNR b KQk - 0 5"),
+    # El caballo de c6 está clavado por Bb5: "Ne7" solo puede ser el de g8.
+    ("e4 e5 Nf3 Nc6 Bb5 d6 d3 Ne7",
+     "r1bqkb1r/ppp1nppp/2np4/1B2p3/4P3/3P1N2/PPP2PPP/RNBQK2R w KQkq - 1 5"),
+])
+def test_fen_tras_jugadas(jugadas, fen):
+    assert _fen_tras(jugadas) == fen
+
+
+@pytest.mark.parametrize("jugadas", [
+    "e4 e5 Nf3 Nc6 Bc4 Ne7",                   # Sin clavada, los dos caballos llegan a e7: ambigua.
+    "e4 e5 Nf3 Nc6 Bc4 Nf6 Rg1 a6 Rh1 a5 O-O",  # La torre ya se movió.
+    "f4 e5 fxe5 Bc5 Nf3 d6 g3 dxe5 Bg2 Nf6 O-O",  # El rey iría a g1, atacada por Bc5.
+    "h4 g5 hxg5 h6 gxh6 Nc6 h7 a6 hxg8",       # Falta la pieza de promoción.
+    "e4 e5 exd5",                              # Captura en una casilla vacía.
+])
+def test_jugadas_imposibles(jugadas):
+    *previas, ultima = jugadas.split()
+    tablero = Tablero()
+    for san in previas:
+        tablero.aplicar_san(san)
+    with pytest.raises(ValueError):
+        tablero.aplicar_san(ultima)
+
+
+def test_instantanea_restaura_el_estado():
+    tablero = Tablero()
+    for san in "e4 a6 e5 d5".split():
+        tablero.aplicar_san(san)
+    copia = Tablero.desde_instantanea(tablero.instantanea())
+    assert copia.fen() == tablero.fen()
+    copia.aplicar_san("exd6")
+    assert tablero.fen() == "rnbqkbnr/1pp1pppp/p7/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 3"
+
+
+_PARTIDAS = [
+    "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. 0-0 Be7 6. Re1 b5 7. Bb3 d6 8. c3 0-0 "
+    "9. h3 Nb8 10. d4 Nbd7 11. Nbd2 Bb7 12. Bc2 Re8",
+    "1. a4 b5 2. axb5 a6 3. bxa6 Bb7 4. axb7 Nc6 5. bxa8=Q Qb8 6. Qxb8+ Nxb8 7. e4 e5",
+    "1. e4 a6 2. e5 d5 3. exd6 cxd6 4. d4 Nc6 5. Nc3 Bf5 6. Be3 Qd7 7. Qd2 0-0-0 8. 0-0-0",
+]
+
+
+def _fens_desde_cero(reproduccion):
+    """FEN de cada ply reproduciendo siempre desde el ply 0, sin instantáneas."""
+    fens = []
+    for ply in range(len(reproduccion) + 1):
+        tablero = Tablero()
+        for san in reproduccion.plies[:ply]:
+            tablero.aplicar_san(san)
+        fens.append(tablero.fen())
+    return fens
+
+
+@pytest.mark.parametrize("texto", _PARTIDAS)
+@pytest.mark.parametrize("intervalo", [1, 2, 3, 7, 100])
+def test_reproduccion_igual_que_desde_cero(texto, intervalo):
+    reproduccion = ReproduccionPartida(Partida(texto), intervalo=intervalo)
+    referencia = _fens_desde_cero(reproduccion)
+    assert [reproduccion.fen(ply) for ply in range(len(reproduccion) + 1)] == referencia
+    assert list(reproduccion.fens()) == referencia
+
+
+def test_reproduccion_fuera_de_rango():
+    reproduccion = ReproduccionPartida(Partida(_PARTIDAS[0]), intervalo=5)
+    with pytest.raises(IndexError):
+        reproduccion.fen(len(reproduccion) + 1)
+    with pytest.raises(IndexError):
+        reproduccion.fen(-1)
+
+
+def test_reproduccion_jugada_imposible():
+    with pytest.raises(ValueError):
+        ReproduccionPartida(Partida("1. e4 e5 2. Ke3 Ke6 3. Kf5"))
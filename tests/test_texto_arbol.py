@@ -0,0 +1,71 @@
+# tests/test_texto_arbol.py
+
+import io
+
+import pytest
+
+from src.tree.arbol_partida import ArbolBinarioPartida
+from src.tree.texto_arbol import arbol_a_texto, escribir_arbol
+
+
+def _arbol(plies):
+    arbol = ArbolBinarioPartida()
+    for n in range(plies):
+        arbol.agregar_jugada(("e4", "e5", "Nf3", "Nc6", "Bb5", "a6")[n % 6])
+    return arbol
+
+
+def _recursivo(nodo, prefijo, lineas):
+    # Referencia: recorrido recursivo directo, sin límite de profundidad.
+    hijos = [(e, h) for e, h in (("L", nodo.izquierda), ("R", nodo.derecha)) if h is not None]
+    for posicion, (etiqueta, hijo) in enumerate(hijos):
+        ultimo = posicion == len(hijos) - 1
+        lineas.append(f"{prefijo}{'`-- ' if ultimo else '|-- '}{etiqueta}: {hijo.valor}")
+        _recursivo(hijo, prefijo + ("    " if ultimo else "|   "), lineas)
+    return lineas
+
+
+@pytest.mark.parametrize("plies", [0, 1, 2, 7, 100])
+def test_igual_que_el_recorrido_recursivo(plies):
+    arbol = _arbol(plies)
+    esperado = "\n".join(["Partida"] + _recursivo(arbol.raiz, "", [])) + "\n"
+    assert arbol_a_texto(arbol.raiz, estilo="ascii") == esperado
+
+
+def test_profundidad_cero_muestra_solo_la_raiz():
+    arbol = _arbol(6)
+    assert arbol_a_texto(arbol.raiz, "ascii", profundidad_max=0) == "Partida\n`-- ... (6 nodos más)\n"
+    assert arbol_a_texto(arbol.raiz, "plano", profundidad_max=0) == "0\t\tPartida\n1\t...\t6 nodos más\n"
+    assert arbol_a_texto(arbol.raiz, "ascii", profundidad_max=0) != arbol_a_texto(arbol.raiz, "ascii", profundidad_max=1)
+
+
+def test_profundidad_uno():
+    arbol = _arbol(6)
+    assert arbol_a_texto(arbol.raiz, "ascii", profundidad_max=1) == (
+        "Partida\n"
+        "|-- L: e4\n"
+        "|   `-- ... (2 nodos más)\n"
+        "`-- R: e5\n"
+        "    `-- ... (2 nodos más)\n"
+    )
+
+
+def test_nodos_escritos():
+    arbol = _arbol(20)
+    assert escribir_arbol(arbol.raiz, io.StringIO(), "ascii") == 21
+    assert escribir_arbol(arbol.raiz, io.StringIO(), "ascii", profundidad_max=0) == 1
+
+
+def test_estilo_desconocido():
+    with pytest.raises(ValueError):
+        escribir_arbol(_arbol(2).raiz, io.StringIO(), "R:")
+
+
+def test_imprimir_arbol_consola_por_nombre():
+    arbol = _arbol(6)
+    salida = io.StringIO()
+    arbol.imprimir_arbol_consola(profundidad_max=1, estilo="ascii", salida=salida)
+    assert salida.getvalue() == arbol.a_texto(profundidad_max=1, estilo="ascii")
+    # La firma anterior era (nodo, nivel, prefijo): los parámetros nuevos solo van por nombre.
+    with pytest.raises(TypeError):
+        arbol.imprimir_arbol_consola(arbol.raiz, 0, "R:")
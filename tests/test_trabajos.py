@@ -0,0 +1,101 @@
+# tests/test_trabajos.py
+
+import json
+import os
+
+import pytest
+
+from src.corpus.trabajos import NOMBRE_DIARIO, TrabajoValidacion
+
+_JUGADAS = ["e4 e5", "Nf3 Nc6", "Bb5 a6", "Ba4 Nf6", "0-0 Be7", "Re1 b5", "Bb3 d6", "c3 0-0"]
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    ruta = tmp_path / "corpus.txt"
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        for n in range(100):
+            turnos = [f"{t + 1}. {_JUGADAS[(t + n) % len(_JUGADAS)]}" for t in range(3 + n % 10)]
+            archivo.write(" ".join(turnos) + (" 99. Zz9" if n % 10 == 0 else "") + "\n\n")
+    return str(ruta)
+
+
+@pytest.fixture
+def referencia(corpus, tmp_path):
+    trabajo = TrabajoValidacion(corpus, str(tmp_path / "referencia"), partidas_por_fragmento=10)
+    resumen = trabajo.ejecutar(procesos=1)
+    assert resumen["completo"]
+    return list(trabajo.resultados())
+
+
+def _estado(directorio):
+    """Contenido de cada archivo del directorio del trabajo, para comprobar que no cambia."""
+    estado = {}
+    for nombre in sorted(os.listdir(directorio)):
+        ruta = os.path.join(directorio, nombre)
+        with open(ruta, "rb") as archivo:
+            estado[nombre] = (archivo.read(), os.stat(ruta).st_mtime_ns)
+    return estado
+
+
+def test_reanudar_tras_ejecucion_parcial(corpus, referencia, tmp_path):
+    directorio = str(tmp_path / "trabajo")
+    trabajo = TrabajoValidacion(corpus, directorio, partidas_por_fragmento=10)
+    resumen = trabajo.ejecutar(procesos=1, max_fragmentos=4)
+    assert resumen["fragmentos_terminados"] == 4
+    assert not resumen["completo"]
+
+    # El proceso muere mientras anota el cuarto fragmento y mientras escribe el quinto.
+    ruta_diario = os.path.join(directorio, NOMBRE_DIARIO)
+    with open(ruta_diario, "rb") as archivo:
+        diario = archivo.read()
+    with open(ruta_diario, "wb") as archivo:
+        archivo.write(diario[:-8])
+    temporal = os.path.join(directorio, "fragmento_00004.jsonl.tmp12345")
+    with open(temporal, "wb") as archivo:
+        archivo.write(b'{"partida": 40, "val')
+
+    trabajo = TrabajoValidacion(corpus, directorio)
+    assert trabajo.pendientes() == list(range(3, 10))
+    resumen = trabajo.ejecutar(procesos=1)
+
+    assert resumen["completo"]
+    assert resumen["partidas_procesadas"] == resumen["partidas"] == 100
+    assert resumen["invalidas"] == 10
+    assert list(trabajo.resultados()) == referencia
+    assert not os.path.exists(temporal)
+    with open(ruta_diario, encoding="utf-8") as archivo:
+        lineas = archivo.read().splitlines()
+    # La línea cortada queda en el diario, sola en su línea, y se ignora.
+    registros = [json.loads(linea) for linea in lineas[:3] + lineas[4:]]
+    assert sorted(r["fragmento"] for r in registros) == list(range(10))
+
+
+def test_reejecutar_trabajo_terminado_no_hace_nada(corpus, tmp_path):
+    directorio = str(tmp_path / "trabajo")
+    resumen = TrabajoValidacion(corpus, directorio, partidas_por_fragmento=10).ejecutar(procesos=1)
+    antes = _estado(directorio)
+
+    trabajo = TrabajoValidacion(corpus, directorio)
+    assert trabajo.pendientes() == []
+    assert trabajo.ejecutar(procesos=1) == resumen
+    assert _estado(directorio) == antes
+
+
+def test_entrada_modificada(corpus, tmp_path):
+    directorio = str(tmp_path / "trabajo")
+    TrabajoValidacion(corpus, directorio, partidas_por_fragmento=10).ejecutar(procesos=1, max_fragmentos=2)
+    with open(corpus, "a", encoding="utf-8") as archivo:
+        archivo.write("1. d4 d5\n\n")
+    with pytest.raises(ValueError):
+        TrabajoValidacion(corpus, directorio)
+
+
+def test_bytes_invalidos_no_bloquean_el_trabajo(tmp_path):
+    ruta = tmp_path / "corpus.txt"
+    ruta.write_bytes(b"1. e4 e5\n\n1. d4 \xff\xfe\n\n1. c4 e5\n\n")
+    trabajo = TrabajoValidacion(str(ruta), str(tmp_path / "trabajo"), partidas_por_fragmento=1)
+    resumen = trabajo.ejecutar(procesos=1)
+    assert resumen["completo"]
+    assert [r["valida"] for r in trabajo.resultados()] == [True, False, True]
+    assert "�" in trabajo.texto_fragmento(1)[0]